@@ -0,0 +1,266 @@
+"""
+Measures how slow requests affect the latency of the other requests.
+
+Runs the activities router in process (no server or network) against a
+SQLite database with 200k activities of a single user. 4 clients loop on
+/activities/name/contains (a full scan) while 12 clients fetch
+/activities/{id} with 10 ms of think time. The p50 and p99 latencies of both
+kinds are printed as JSON.
+
+Blocking work on the event loop shows up as a fast p99 close to the slow
+requests' latency. To compare two versions, run the script against each
+checkout of backend/app:
+
+    git worktree add /tmp/endurain-before <commit>^
+    DURATION=20 python aux_scripts/aux_loadtest_event_loop.py /tmp/endurain-before/backend/app
+    DURATION=20 python aux_scripts/aux_loadtest_event_loop.py backend/app
+
+The database is created on the first run (LOADTEST_DB, defaults to
+/tmp/endurain_loadtest.db) and reused by the next ones.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import types
+from datetime import datetime, timedelta
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+app_dir = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else "backend/app")
+db_path = os.getenv("LOADTEST_DB", "/tmp/endurain_loadtest.db")
+duration = float(os.getenv("DURATION", "20"))
+activities_count = 200_000
+
+os.chdir(app_dir)
+sys.path.insert(0, app_dir)
+
+# Replace core.database with a SQLite database before the app imports it
+database = types.ModuleType("core.database")
+database.Base = declarative_base()
+database.engine = create_engine(
+    f"sqlite:///{db_path}",
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=40,
+)
+database.SessionLocal = sessionmaker(bind=database.engine, autoflush=False)
+database.db_type = "postgres"
+database.db_url = database.engine.url
+
+
+def get_db():
+    db = database.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+database.get_db = get_db
+
+import core  # noqa: E402
+
+sys.modules["core.database"] = database
+core.database = database
+
+# Older trees read POLAR_WEBHOOK_SECRET before read_secret is defined, load
+# core.config with that line moved to the end
+config_source = open("core/config.py").read()
+polar_secret_line = 'POLAR_WEBHOOK_SECRET = read_secret("POLAR_WEBHOOK_SECRET")\n'
+config_source = config_source.replace(polar_secret_line, "") + "\n" + polar_secret_line
+config = types.ModuleType("core.config")
+config.__file__ = "core/config.py"
+sys.modules["core.config"] = config
+core.config = config
+exec(compile(config_source, "core/config.py", "exec"), config.__dict__)
+
+# Import every model (core.models doesn't exist in older trees)
+for model_module in [
+    "activities.activity.models",
+    "activities.activity_bulk_imports.models",
+    "activities.activity_exercise_titles.models",
+    "activities.activity_laps.models",
+    "activities.activity_location_enrichments.models",
+    "activities.activity_media.models",
+    "activities.activity_sets.models",
+    "activities.activity_streams.models",
+    "activities.activity_summaries.models",
+    "activities.activity_workout_steps.models",
+    "followers.models",
+    "gears.gear.models",
+    "gears.gear_components.models",
+    "geocoding.models",
+    "health_data.models",
+    "health_targets.models",
+    "migrations.models",
+    "notifications.models",
+    "password_reset_tokens.models",
+    "polar.models",
+    "sign_up_tokens.models",
+    "server_settings.models",
+    "session.models",
+    "users.user.models",
+    "users.user_goals.models",
+    "users.user_default_gear.models",
+    "users.user_integrations.models",
+    "users.user_privacy_settings.models",
+]:
+    try:
+        __import__(model_module)
+    except ModuleNotFoundError:
+        pass
+
+import activities.activity.models as activities_models  # noqa: E402
+import users.user.models as users_models  # noqa: E402
+
+
+def create_database():
+    database.Base.metadata.create_all(database.engine)
+    rnd = random.Random(1)
+
+    with database.engine.begin() as connection:
+        # A user with placeholder values in the required columns
+        user = {"id": 1}
+        for column in users_models.User.__table__.columns:
+            if column.nullable or column.server_default is not None:
+                continue
+            if isinstance(column.type, (Integer, Boolean)):
+                user.setdefault(column.name, 1)
+            elif isinstance(column.type, (Date, DateTime)):
+                user.setdefault(column.name, datetime(2020, 1, 1))
+            else:
+                user.setdefault(column.name, "user")
+        connection.execute(users_models.User.__table__.insert(), [user])
+
+        activities = []
+        for i in range(activities_count):
+            start_time = datetime(2020, 1, 1) + timedelta(minutes=17 * i)
+            activities.append(
+                {
+                    "user_id": 1,
+                    "name": f"Morning {rnd.choice(['Run', 'Ride', 'Walk', 'Swim'])} {i}",
+                    "distance": rnd.randint(0, 50000),
+                    "activity_type": rnd.choice([1, 4, 8]),
+                    "start_time": start_time,
+                    "end_time": start_time,
+                    "total_elapsed_time": 1,
+                    "total_timer_time": 100,
+                    "visibility": 0,
+                    "created_at": start_time,
+                    "hide_start_time": False,
+                    "hide_location": False,
+                    "hide_map": False,
+                    "hide_hr": False,
+                    "hide_power": False,
+                    "hide_cadence": False,
+                    "hide_elevation": False,
+                    "hide_speed": False,
+                    "hide_pace": False,
+                    "hide_laps": False,
+                    "hide_workout_sets_steps": False,
+                    "hide_gear": False,
+                    "is_hidden": False,
+                    "timezone": "UTC",
+                    "city": "Lisbon",
+                    "country": "PT",
+                }
+            )
+        connection.execute(activities_models.Activity.__table__.insert(), activities)
+
+
+if not os.path.exists(db_path):
+    print(f"Creating {db_path} with {activities_count} activities")
+    create_database()
+
+from fastapi import FastAPI  # noqa: E402
+
+import activities.activity.router as activities_router  # noqa: E402
+import session.security as session_security  # noqa: E402
+
+try:
+    import core.thread_pool as core_thread_pool
+except ModuleNotFoundError:
+    # Trees before the thread pool
+    core_thread_pool = None
+
+app = FastAPI()
+app.include_router(activities_router.router, prefix="/activities")
+app.dependency_overrides[session_security.get_user_id_from_access_token] = lambda: 1
+app.dependency_overrides[session_security.check_scopes] = lambda: None
+
+
+async def call(path: str) -> int | None:
+    """Sends a GET request to the app through ASGI and returns the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("loadtest", 1),
+        "server": ("loadtest", 80),
+    }
+    response = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+
+    await app(scope, receive, send)
+    return response.get("status")
+
+
+async def main():
+    if core_thread_pool is not None:
+        core_thread_pool.configure_thread_pool()
+
+    # Warm up
+    assert await call("/activities/5") == 200
+    assert await call("/activities/name/contains/Swim%20199") == 200
+
+    latencies = {"fast": [], "slow": []}
+    rnd = random.Random(7)
+    stop = time.perf_counter() + duration
+
+    async def client(kind: str):
+        while time.perf_counter() < stop:
+            if kind == "slow":
+                path = f"/activities/name/contains/Swim%20{rnd.randint(0, 9999)}"
+            else:
+                path = f"/activities/{rnd.randint(1, activities_count)}"
+            started = time.perf_counter()
+            status = await call(path)
+            latencies[kind].append(time.perf_counter() - started)
+            assert status == 200, (path, status)
+            if kind == "fast":
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        *[client("slow") for _ in range(4)], *[client("fast") for _ in range(12)]
+    )
+
+    results = {}
+    for kind, values in latencies.items():
+        values.sort()
+        results[kind] = {
+            "requests": len(values),
+            "p50_ms": round(values[len(values) // 2] * 1000, 1),
+            "p99_ms": round(values[int(len(values) * 0.99)] * 1000, 1),
+        }
+    print(json.dumps(results))
+
+
+asyncio.run(main())
@@ -1,13 +1,25 @@
-from datetime import date, datetime
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Callable
 from urllib.parse import unquote
 
 import activities.activity.models as activities_models
 import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
 
+import activities.activity_summaries.crud as activity_summaries_crud
+
 import followers.models as followers_models
 
 import core.logger as core_logger
+import core.pagination as core_pagination
+import core.thread_pool as core_thread_pool
+
+# Words of a search term, for the full text searches
+SEARCH_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Shortest word in the MariaDB/MySQL full text index (innodb_ft_min_token_size)
+FULLTEXT_MIN_WORD_LENGTH = 3
 
 import notifications.utils as notifications_utils
 
@@ -18,9 +30,121 @@ import websocket.schema as websocket_schema
 from fastapi import HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy import and_, desc, func, or_
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session, joinedload
 
 
+def start_time_in_days_filter(
+    start_day: date | datetime | None, end_day: date | datetime | None
+):
+    """
+    Builds the filter for activities starting between two days, both included.
+
+    The days are turned into a half-open [start, end) start time range instead
+    of comparing DATE(start_time), so the filter can use the start_time
+    indexes.
+
+    Args:
+        start_day (date | datetime | None): The first day, None for no lower bound.
+            The time of a datetime is ignored.
+        end_day (date | datetime | None): The last day, None for no upper bound.
+            The time of a datetime is ignored.
+
+    Returns:
+        The SQLAlchemy filter expression.
+    """
+    conditions = []
+    if start_day is not None:
+        if isinstance(start_day, datetime):
+            start_day = start_day.date()
+        conditions.append(
+            activities_models.Activity.start_time
+            >= datetime.combine(start_day, time.min)
+        )
+    if end_day is not None:
+        if isinstance(end_day, datetime):
+            end_day = end_day.date()
+        conditions.append(
+            activities_models.Activity.start_time
+            < datetime.combine(end_day + timedelta(days=1), time.min)
+        )
+    return and_(*conditions)
+
+
+def activity_search_filter_and_rank(name_search: str, db: Session):
+    """
+    Builds the filter and rank of a search across activity name and location.
+
+    Every word of the search term must start a word of the activity name,
+    town, city or country (prefix matching), using the full text indexes:
+    - PostgreSQL: the tsvector index, or the trigram index for activities
+      containing the term anywhere, as before.
+    - MariaDB/MySQL: the FULLTEXT index, in boolean mode. Terms with words
+      shorter than the indexed ones fall back to substring matching.
+
+    Args:
+        name_search (str): The URL encoded search term.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        tuple: The SQLAlchemy filter expression and the relevance expression
+            of each activity (higher is better), or None if the search can't
+            be ranked.
+    """
+    search_term = unquote(name_search).replace("+", " ").lower()
+    words = SEARCH_WORD_PATTERN.findall(search_term)
+    engine_name = db.bind.dialect.name
+
+    if engine_name == "postgresql" and words:
+        document = activities_models.search_document(
+            activities_models.Activity.name,
+            activities_models.Activity.town,
+            activities_models.Activity.city,
+            activities_models.Activity.country,
+        )
+        ts_document = func.to_tsvector(
+            activities_models.SEARCH_TEXT_CONFIG, document
+        )
+        ts_query = func.to_tsquery(
+            activities_models.SEARCH_TEXT_CONFIG,
+            " & ".join(f"{word}:*" for word in words),
+        )
+        return (
+            or_(
+                ts_document.bool_op("@@")(ts_query),
+                func.lower(document).like(f"%{search_term}%"),
+            ),
+            func.ts_rank(ts_document, ts_query),
+        )
+
+    if (
+        engine_name in ("mysql", "mariadb")
+        and words
+        and all(len(word) >= FULLTEXT_MIN_WORD_LENGTH for word in words)
+    ):
+        relevance = match(
+            activities_models.Activity.name,
+            activities_models.Activity.town,
+            activities_models.Activity.city,
+            activities_models.Activity.country,
+            against=" ".join(f"+{word}*" for word in words),
+        ).in_boolean_mode()
+        return relevance, relevance
+
+    # Substring search
+    return (
+        or_(
+            func.lower(activities_models.Activity.name).like(f"%{search_term}%"),
+            func.lower(activities_models.Activity.town).like(f"%{search_term}%"),
+            func.lower(activities_models.Activity.city).like(f"%{search_term}%"),
+            func.lower(activities_models.Activity.country).like(
+                f"%{search_term}%"
+            ),
+        ),
+        None,
+    )
+
+
 def get_all_activities(db: Session):
     try:
         # Get the activities from the database
@@ -93,38 +217,14 @@ def get_user_activities(
                 activities_models.Activity.activity_type == activity_type
             )
 
-        if start_date:
-            # add filter for start date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) >= start_date
-            )
-
-        if end_date:
-            # add filter for end date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) <= end_date
-            )
+        if start_date or end_date:
+            # add filter for start and end dates
+            query = query.filter(start_time_in_days_filter(start_date, end_date))
 
         if name_search:
-            # Decode and prepare search term
-            search_term = unquote(name_search).replace("+", " ").lower()
             # Apply search across name, town, city, and country
-            query = query.filter(
-                or_(
-                    func.lower(activities_models.Activity.name).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.town).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.city).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.country).like(
-                        f"%{search_term}%"
-                    ),
-                )
-            )
+            search_filter, _ = activity_search_filter_and_rank(name_search, db)
+            query = query.filter(search_filter)
 
         # Apply sorting
         query = query.order_by(desc(activities_models.Activity.start_time))
@@ -221,6 +321,52 @@ def get_user_activities_by_user_id_and_garminconnect_gear_set(
         ) from err
 
 
+def _paginate_activities_by_start_time(
+    query,
+    page_number: int,
+    num_records: int,
+    cursor: str | None,
+    user_is_owner: bool = True,
+) -> tuple[list[activities_models.Activity], str | None]:
+    """Helper function to get a page of a query ordered by start time and ID, newest first."""
+    if cursor:
+        cursor_values, cursor_id = core_pagination.decode_cursor(
+            cursor, "start_time:desc"
+        )
+        # Non owners only get cursors without values, don't trust forged ones
+        if cursor_values is None or not user_is_owner:
+            cursor_values = core_pagination.get_cursor_values(
+                query,
+                [activities_models.Activity.start_time],
+                activities_models.Activity.id,
+                cursor_id,
+            )
+        query = query.filter(
+            core_pagination.keyset_filter(
+                [activities_models.Activity.start_time],
+                cursor_values,
+                activities_models.Activity.id,
+                cursor_id,
+                False,
+            )
+        )
+    else:
+        query = query.offset((page_number - 1) * num_records)
+
+    activities = query.limit(num_records).all()
+
+    next_cursor = None
+    if len(activities) == num_records:
+        # Start times may be hidden from non owners, leave them out of the cursor
+        next_cursor = core_pagination.encode_cursor(
+            "start_time:desc",
+            [activities[-1].start_time] if user_is_owner else None,
+            activities[-1].id,
+        )
+
+    return activities, next_cursor
+
+
 def get_user_activities_with_pagination(
     user_id: int,
     db: Session,
@@ -233,7 +379,38 @@ def get_user_activities_with_pagination(
     sort_by: str | None = None,
     sort_order: str | None = None,
     user_is_owner: bool = False,
-) -> list[activities_schema.Activity] | None:
+    cursor: str | None = None,
+) -> tuple[list[activities_schema.Activity] | None, str | None]:
+    """
+    Get a page of the user activities, filtered and sorted.
+
+    Pages are selected by offset from the page number, or, if a cursor is
+    given, by keyset: the page starts right after the row the cursor points
+    to, which stays fast deep into the history. Rows with the same sort
+    value are ordered by ID, so every row is returned once.
+
+    Args:
+        user_id (int): The ID of the user whose activities are returned.
+        db (Session): The SQLAlchemy database session.
+        page_number (int): The page number, ignored if a cursor is given.
+        num_records (int): The number of activities per page.
+        activity_type (int | None): Only return activities of this type.
+        start_date (date | None): Only return activities starting on or after this day.
+        end_date (date | None): Only return activities starting on or before this day.
+        name_search (str | None): Only return activities whose name or location contains this.
+        sort_by (str | None): The sort key, "location" or a key of SORT_MAP. Defaults to start time.
+        sort_order (str | None): "asc" or "desc" (default).
+        user_is_owner (bool): Whether the user requesting the activities owns them.
+        cursor (str | None): The cursor of the page, as returned for the previous page.
+
+    Returns:
+        tuple[list[activities_schema.Activity] | None, str | None]: The activities
+            (None if there are none) and the cursor of the next page (None if
+            this is the last page).
+
+    Raises:
+        HTTPException: If the cursor is invalid (422) or an error occurs (500).
+    """
     try:
         # Mapping from frontend sort keys to database model fields
         SORT_MAP = {
@@ -260,57 +437,26 @@ def get_user_activities_with_pagination(
                 activities_models.Activity.activity_type == activity_type
             )
 
-        if start_date:
-            # add filter for start date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) >= start_date
-            )
-
-        if end_date:
-            # add filter for end date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) <= end_date
-            )
+        if start_date or end_date:
+            # add filter for start and end dates
+            query = query.filter(start_time_in_days_filter(start_date, end_date))
 
         if name_search:
-            # Decode and prepare search term
-            search_term = unquote(name_search).replace("+", " ").lower()
             # Apply search across name, town, city, and country
-            query = query.filter(
-                or_(
-                    func.lower(activities_models.Activity.name).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.town).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.city).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.country).like(
-                        f"%{search_term}%"
-                    ),
-                )
-            )
+            search_filter, _ = activity_search_filter_and_rank(name_search, db)
+            query = query.filter(search_filter)
 
         # Apply sorting
-        sort_ascending = sort_order and sort_order.lower() == "asc"
+        sort_ascending = bool(sort_order and sort_order.lower() == "asc")
 
         if sort_by == "location":
             # Special handling for location: sort by country, then city, then town
             # Handle nulls by using COALESCE with a maximum value for DESC or minimum value for ASC
-            if sort_ascending:
-                query = query.order_by(
-                    func.coalesce(activities_models.Activity.country, "").asc(),
-                    func.coalesce(activities_models.Activity.city, "").asc(),
-                    func.coalesce(activities_models.Activity.town, "").asc(),
-                )
-            else:
-                query = query.order_by(
-                    func.coalesce(activities_models.Activity.country, "").desc(),
-                    func.coalesce(activities_models.Activity.city, "").desc(),
-                    func.coalesce(activities_models.Activity.town, "").desc(),
-                )
+            sort_expressions = [
+                func.coalesce(activities_models.Activity.country, ""),
+                func.coalesce(activities_models.Activity.city, ""),
+                func.coalesce(activities_models.Activity.town, ""),
+            ]
         else:
             # Standard sorting for other columns
             sort_column = SORT_MAP.get(sort_by, activities_models.Activity.start_time)
@@ -324,24 +470,62 @@ def get_user_activities_with_pagination(
                 activities_models.Activity.pace,
                 activities_models.Activity.average_hr,
             ]:
-                if sort_ascending:
-                    query = query.order_by(func.coalesce(sort_column, -999999).asc())
-                else:
-                    query = query.order_by(func.coalesce(sort_column, -999999).desc())
-            # For string/date columns
+                sort_expressions = [func.coalesce(sort_column, -999999)]
+            # For the nullable name, sort missing names as empty
+            elif sort_column is activities_models.Activity.name:
+                sort_expressions = [func.coalesce(sort_column, "")]
+            # For the type and date columns
             else:
-                if sort_ascending:
-                    query = query.order_by(sort_column.asc())
-                else:
-                    query = query.order_by(sort_column.desc())
-
-        # Apply pagination
-        paginated_query = query.offset((page_number - 1) * num_records).limit(
-            num_records
+                sort_expressions = [sort_column]
+
+        # Rows with the same sort values are ordered by ID
+        sort_key = f"{sort_by or 'start_time'}:{'asc' if sort_ascending else 'desc'}"
+        query = query.order_by(
+            *[
+                expression.asc() if sort_ascending else expression.desc()
+                for expression in sort_expressions + [activities_models.Activity.id]
+            ]
         )
 
-        # Fetch activities
-        activities = paginated_query.all()
+        # Apply pagination, by keyset if a cursor is given, by offset otherwise
+        if cursor:
+            cursor_values, cursor_id = core_pagination.decode_cursor(
+                cursor, sort_key
+            )
+            # Non owners only get cursors without values, values in theirs
+            # are forged to probe hidden start times or locations
+            if cursor_values is None or not user_is_owner:
+                cursor_values = core_pagination.get_cursor_values(
+                    query,
+                    sort_expressions,
+                    activities_models.Activity.id,
+                    cursor_id,
+                )
+            query = query.filter(
+                core_pagination.keyset_filter(
+                    sort_expressions,
+                    cursor_values,
+                    activities_models.Activity.id,
+                    cursor_id,
+                    sort_ascending,
+                )
+            )
+        else:
+            query = query.offset((page_number - 1) * num_records)
+
+        # Fetch activities with their sort values, used for the next cursor
+        rows = query.add_columns(*sort_expressions).limit(num_records).all()
+        activities = [row[0] for row in rows]
+
+        next_cursor = None
+        if len(rows) == num_records:
+            # The sort values may be hidden from non owners (start time,
+            # location), leave them out of the cursor
+            next_cursor = core_pagination.encode_cursor(
+                sort_key,
+                list(rows[-1][1:]) if user_is_owner else None,
+                rows[-1][0].id,
+            )
 
         # Serialize activities
         serialized_activities = []
@@ -364,9 +548,10 @@ def get_user_activities_with_pagination(
                     activities_utils.serialize_activity(activity)
                 )
 
-        # Return the activities
-        return serialized_activities if serialized_activities else None
-
+        # Return the activities and the next page cursor
+        return serialized_activities or None, next_cursor
+    except HTTPException as http_err:
+        raise http_err
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -421,8 +606,7 @@ def get_user_activities_per_timeframe(
             db.query(activities_models.Activity)
             .filter(
                 activities_models.Activity.user_id == user_id,
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                start_time_in_days_filter(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -477,8 +661,7 @@ def get_user_activities_per_timeframe_and_activity_type(
             .filter(
                 activities_models.Activity.user_id == user_id,
                 activities_models.Activity.activity_type == activity_type,
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                start_time_in_days_filter(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -533,8 +716,7 @@ def get_user_activities_per_timeframe_and_activity_types(
             .filter(
                 activities_models.Activity.user_id == user_id,
                 activities_models.Activity.activity_type.in_(activity_types),
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                start_time_in_days_filter(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -589,8 +771,7 @@ def get_user_following_activities_per_timeframe(
                     activities_models.Activity.user_id == user_id,
                     activities_models.Activity.visibility.in_([0, 1]),
                 ),
-                func.date(activities_models.Activity.start_time) >= start,
-                func.date(activities_models.Activity.start_time) <= end,
+                start_time_in_days_filter(start, end),
                 activities_models.Activity.is_hidden.is_(False),
                 activities_models.Activity.strava_activity_id.is_(None),
             )
@@ -634,11 +815,36 @@ def get_user_following_activities_per_timeframe(
 
 
 def get_user_following_activities_with_pagination(
-    user_id: int, page_number: int, num_records: int, db: Session
-):
+    user_id: int,
+    page_number: int,
+    num_records: int,
+    db: Session,
+    cursor: str | None = None,
+) -> tuple[list[activities_schema.Activity] | None, str | None]:
+    """
+    Get a page of the activities of the users followed by a user, newest first.
+
+    Pages are selected by offset from the page number, or by keyset if a
+    cursor is given (see `get_user_activities_with_pagination`).
+
+    Args:
+        user_id (int): The ID of the follower.
+        page_number (int): The page number, ignored if a cursor is given.
+        num_records (int): The number of activities per page.
+        db (Session): The SQLAlchemy database session.
+        cursor (str | None): The cursor of the page, as returned for the previous page.
+
+    Returns:
+        tuple[list[activities_schema.Activity] | None, str | None]: The activities
+            (None if there are none) and the cursor of the next page (None if
+            this is the last page).
+
+    Raises:
+        HTTPException: If the cursor is invalid (422) or an error occurs (500).
+    """
     try:
         # Get the activities from the database
-        activities = (
+        query = (
             db.query(activities_models.Activity)
             .join(
                 followers_models.Follower,
@@ -654,15 +860,18 @@ def get_user_following_activities_with_pagination(
                 activities_models.Activity.is_hidden.is_(False),
                 activities_models.Activity.strava_activity_id.is_(None),
             )
-            .order_by(desc(activities_models.Activity.start_time))
-            .offset((page_number - 1) * num_records)
-            .limit(num_records)
-            .all()
+            .order_by(
+                desc(activities_models.Activity.start_time),
+                desc(activities_models.Activity.id),
+            )
+        )
+        activities, next_cursor = _paginate_activities_by_start_time(
+            query, page_number, num_records, cursor, user_is_owner=False
         )
 
         # Check if there are activities if not return None
         if not activities:
-            return None
+            return None, None
 
         # Iterate and format the dates
         for activity in activities:
@@ -680,8 +889,10 @@ def get_user_following_activities_with_pagination(
                 activity.strava_gear_id = None
                 activity.garminconnect_gear_id = None
 
-        # Return the activities
-        return activities
+        # Return the activities and the next page cursor
+        return activities, next_cursor
+    except HTTPException as http_err:
+        raise http_err
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -791,25 +1002,55 @@ def get_user_activities_by_gear_id_and_user_id(user_id: int, gear_id: int, db: S
 
 
 def get_user_activities_by_gear_id_and_user_id_with_pagination(
-    user_id: int, gear_id: int, page_number: int, num_records: int, db: Session
-):
+    user_id: int,
+    gear_id: int,
+    page_number: int,
+    num_records: int,
+    db: Session,
+    cursor: str | None = None,
+) -> tuple[list[activities_schema.Activity] | None, str | None]:
+    """
+    Get a page of the user activities with a gear, newest first.
+
+    Pages are selected by offset from the page number, or by keyset if a
+    cursor is given (see `get_user_activities_with_pagination`).
+
+    Args:
+        user_id (int): The ID of the user whose activities are returned.
+        gear_id (int): The ID of the gear.
+        page_number (int): The page number, ignored if a cursor is given.
+        num_records (int): The number of activities per page.
+        db (Session): The SQLAlchemy database session.
+        cursor (str | None): The cursor of the page, as returned for the previous page.
+
+    Returns:
+        tuple[list[activities_schema.Activity] | None, str | None]: The activities
+            (None if there are none) and the cursor of the next page (None if
+            this is the last page).
+
+    Raises:
+        HTTPException: If the cursor is invalid (422) or an error occurs (500).
+    """
     try:
         # Get the activities from the database
-        activities = (
+        query = (
             db.query(activities_models.Activity)
             .filter(
                 activities_models.Activity.user_id == user_id,
                 activities_models.Activity.gear_id == gear_id,
             )
-            .order_by(desc(activities_models.Activity.start_time))
-            .offset((page_number - 1) * num_records)
-            .limit(num_records)
-            .all()
+            .order_by(
+                desc(activities_models.Activity.start_time),
+                desc(activities_models.Activity.id),
+            )
+        )
+        activities, next_cursor = _paginate_activities_by_start_time(
+            query, page_number, num_records, cursor
         )
 
         # Check if there are activities if not return None
         if not activities:
-            return None
+            return None, None
 
         # Iterate and format the dates
         for activity in activities:
@@ -828,8 +1069,10 @@ def get_user_activities_by_gear_id_and_user_id_with_pagination(
                     activity.strava_gear_id = None
                     activity.garminconnect_gear_id = None
 
-        # Return the activities
-        return activities
+        # Return the activities and the next page cursor
+        return activities, next_cursor
+    except HTTPException as http_err:
+        raise http_err
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -1161,17 +1404,20 @@ def get_activity_by_polar_id_from_user_id(
 
 def get_activities_if_contains_name(name: str, user_id: int, db: Session):
     try:
-        # Define a search term
-        partial_name = unquote(name).replace("+", " ").lower()
+        # Define the search filter and relevance
+        search_filter, relevance = activity_search_filter_and_rank(name, db)
 
-        # Get the activities from the database
+        # Get the activities from the database, most relevant first
+        order_by = [desc(activities_models.Activity.start_time)]
+        if relevance is not None:
+            order_by.insert(0, desc(relevance))
         activities = (
             db.query(activities_models.Activity)
             .filter(
                 activities_models.Activity.user_id == user_id,
-                func.lower(activities_models.Activity.name).like(f"%{partial_name}%"),
+                search_filter,
             )
-            .order_by(desc(activities_models.Activity.start_time))
+            .order_by(*order_by)
             .all()
         )
 
@@ -1216,47 +1462,207 @@ async def create_activity(
     db: Session,
     create_notification: bool = True,
 ) -> activities_schema.Activity:
+    # Create the activity as a batch of one
+    created_activities = await create_activities(
+        [activity], websocket_manager, db, create_notification=create_notification
+    )
+
+    # Return the activity
+    return created_activities[0]
+
+
+def insert_activities(
+    activities: list[activities_schema.Activity],
+    db: Session,
+    children_builder: Callable[[int, int], list] | None = None,
+) -> list[bool]:
+    """
+    Insert activities and their child rows (streams, laps, workout steps, sets) in a single transaction.
+
+    Activities are inserted with one multi-row insert, their child rows with
+    one multi-row insert per table, and everything is committed once. An
+    activity with the same start time as an existing activity of the user, or
+    as a previous activity of the batch, is created hidden. The activities
+    get their IDs and creation dates.
+
+    Args:
+        activities (list[activities_schema.Activity]): The activities to insert.
+        db (Session): The SQLAlchemy database session.
+        children_builder (Callable[[int, int], list] | None): Called with the index
+            of each activity in the list and its new ID, returns the model objects
+            of its child rows.
+
+    Returns:
+        list[bool]: Whether each activity has a duplicated start time.
+
+    Raises:
+        HTTPException: If an error occurs while inserting the activities. Nothing is stored.
+    """
     try:
-        # Check if already is an activity created with the same start time
-        activity_start_time_exists = get_activity_by_start_time(
-            activity.start_time, activity.user_id, db
+        # Lock the users before writing their activities, see
+        # activity_summaries_crud.lock_user_summaries
+        activity_summaries_crud.lock_user_summaries(
+            {activity.user_id for activity in activities}, db
         )
 
-        if activity_start_time_exists:
-            activity.is_hidden = True
-
-        # Create a new activity
-        new_activity = activities_utils.transform_schema_activity_to_model_activity(
-            activity
+        # Get the start times already used by the users in a single query
+        start_times = [
+            (
+                datetime.strptime(activity.start_time, "%Y-%m-%dT%H:%M:%S")
+                if isinstance(activity.start_time, str)
+                else activity.start_time
+            )
+            for activity in activities
+        ]
+        used_start_times = set(
+            db.query(
+                activities_models.Activity.user_id,
+                activities_models.Activity.start_time,
+            )
+            .filter(
+                activities_models.Activity.user_id.in_(
+                    {activity.user_id for activity in activities}
+                ),
+                activities_models.Activity.start_time.in_(
+                    {start_time for start_time in start_times if start_time}
+                ),
+            )
+            .all()
         )
 
-        # Add the activity to the database
-        db.add(new_activity)
-        db.commit()
-        db.refresh(new_activity)
+        # Create the new activities, hiding the ones with a duplicated start time
+        duplicated_start_times = []
+        new_activities = []
+        for activity, start_time in zip(activities, start_times):
+            activity_start_time_exists = (activity.user_id, start_time) in used_start_times
+            if activity_start_time_exists:
+                activity.is_hidden = True
+            used_start_times.add((activity.user_id, start_time))
+            duplicated_start_times.append(activity_start_time_exists)
 
-        activity.id = new_activity.id
-        activity.created_at = new_activity.created_at
+            new_activities.append(
+                activities_utils.transform_schema_activity_to_model_activity(activity)
+            )
 
-        # Create a notification for the new activity
-        if create_notification:
-            if activity_start_time_exists:
-                await notifications_utils.create_new_duplicate_start_time_activity_notification(
-                    activity.user_id, new_activity.id, websocket_manager
-                )
-            else:
-                await notifications_utils.create_new_activity_notification(
-                    activity.user_id, new_activity.id, websocket_manager
+        # Insert the activities to get their IDs
+        db.add_all(new_activities)
+        db.flush()
+
+        for index, (activity, new_activity) in enumerate(
+            zip(activities, new_activities)
+        ):
+            activity.id = new_activity.id
+
+            # Add the activity child rows
+            if children_builder is not None:
+                db.add_all(children_builder(index, new_activity.id))
+
+        # Update the daily summaries of the activities start days
+        activity_summaries_crud.refresh_daily_summaries(
+            {
+                (activity.user_id, start_time.date())
+                for activity, start_time in zip(activities, start_times)
+                if start_time
+            },
+            db,
+        )
+
+        # Get the creation dates set by the database
+        created_at_by_id = dict(
+            db.query(
+                activities_models.Activity.id, activities_models.Activity.created_at
+            )
+            .filter(
+                activities_models.Activity.id.in_(
+                    [activity.id for activity in activities]
                 )
+            )
+            .all()
+        )
 
-        # Return the activity
-        return activity
+        # Commit the activities and their child rows at once
+        db.commit()
+
+        for activity in activities:
+            activity.created_at = created_at_by_id[activity.id]
+
+        # Return the duplicated start time flags
+        return duplicated_start_times
     except Exception as err:
         # Rollback the transaction
         db.rollback()
 
         # Log the exception
-        core_logger.print_to_log(f"Error in create_activity: {err}", "error", exc=err)
+        core_logger.print_to_log(
+            f"Error in insert_activities: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+async def create_activities(
+    activities: list[activities_schema.Activity],
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+    children_builder: Callable[[int, int], list] | None = None,
+    create_notification: bool = True,
+) -> list[activities_schema.Activity]:
+    """
+    Create activities and their child rows in a single transaction and notify the users.
+
+    The transaction runs in the thread pool (see `insert_activities`), so the
+    event loop keeps serving other requests while it runs.
+
+    Args:
+        activities (list[activities_schema.Activity]): The activities to create.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send the notifications.
+        db (Session): The SQLAlchemy database session.
+        children_builder (Callable[[int, int], list] | None): Called with the index
+            of each activity in the list and its new ID, returns the model objects
+            of its child rows.
+        create_notification (bool): Whether to notify the users of the new activities.
+
+    Returns:
+        list[activities_schema.Activity]: The created activities, with their IDs.
+
+    Raises:
+        HTTPException: If an error occurs while creating the activities. Nothing is stored.
+    """
+    try:
+        if not activities:
+            return []
+
+        # Insert the activities and their child rows
+        duplicated_start_times = await core_thread_pool.run_in_thread_pool(
+            insert_activities, activities, db, children_builder
+        )
+
+        for activity, activity_start_time_exists in zip(
+            activities, duplicated_start_times
+        ):
+            # Create a notification for the new activity
+            if create_notification:
+                if activity_start_time_exists:
+                    await notifications_utils.create_new_duplicate_start_time_activity_notification(
+                        activity.user_id, activity.id, websocket_manager
+                    )
+                else:
+                    await notifications_utils.create_new_activity_notification(
+                        activity.user_id, activity.id, websocket_manager
+                    )
+
+        # Return the activities
+        return activities
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in create_activities: {err}", "error", exc=err
+        )
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1295,10 +1701,22 @@ def edit_activity(
                 if value is not None
             }
 
+        # Lock the user before writing the activity
+        activity_summaries_crud.lock_user_summaries([db_activity.user_id], db)
+
+        # Keep the start day, its daily summary changes as well
+        summary_days = {(db_activity.user_id, db_activity.start_time.date())}
+
         # Iterate over the fields and update the db_activity dynamically
         for key, value in activity_data.items():
             setattr(db_activity, key, value)
 
+        # Update the daily summaries of the old and the new start days
+        db.flush()
+        db.refresh(db_activity, ["start_time"])
+        summary_days.add((db_activity.user_id, db_activity.start_time.date()))
+        activity_summaries_crud.refresh_daily_summaries(summary_days, db)
+
         # Commit the transaction
         db.commit()
     except HTTPException as http_err:
@@ -1391,6 +1809,20 @@ def edit_multiple_activities_gear_id(
 
 def delete_activity(activity_id: int, db: Session):
     try:
+        # Get the activity start day, its daily summary changes as well
+        activity_day = (
+            db.query(
+                activities_models.Activity.user_id,
+                activities_models.Activity.start_time,
+            )
+            .filter(activities_models.Activity.id == activity_id)
+            .first()
+        )
+
+        # Lock the user before deleting the activity
+        if activity_day is not None:
+            activity_summaries_crud.lock_user_summaries([activity_day.user_id], db)
+
         # Delete the activity
         num_deleted = (
             db.query(activities_models.Activity)
@@ -1405,6 +1837,11 @@ def delete_activity(activity_id: int, db: Session):
                 detail=f"Activity with id {activity_id} not found",
             )
 
+        # Update the daily summary of the activity start day
+        activity_summaries_crud.refresh_daily_summaries(
+            [(activity_day.user_id, activity_day.start_time.date())], db
+        )
+
         # Commit the transaction
         db.commit()
     except HTTPException as http_err:
@@ -1425,6 +1862,9 @@ def delete_activity(activity_id: int, db: Session):
 
 def delete_all_strava_activities_for_user(user_id: int, db: Session):
     try:
+        # Lock the user before deleting the activities
+        activity_summaries_crud.lock_user_summaries([user_id], db)
+
         # Delete the strava activities for the user
         num_deleted = (
             db.query(activities_models.Activity)
@@ -1437,6 +1877,9 @@ def delete_all_strava_activities_for_user(user_id: int, db: Session):
 
         # Check if activities were found and deleted and commit the transaction
         if num_deleted != 0:
+            # Rebuild the user daily summaries
+            activity_summaries_crud.rebuild_user_daily_summaries(user_id, db)
+
             # Commit the transaction
             db.commit()
     except Exception as err:
@@ -1457,6 +1900,7 @@ def delete_all_strava_activities_for_user(user_id: int, db: Session):
 
 def delete_all_polar_activities_for_user(user_id: int, db: Session):
     try:
+        activity_summaries_crud.lock_user_summaries([user_id], db)
         num_deleted = (
             db.query(activities_models.Activity)
             .filter(
@@ -1466,6 +1910,7 @@ def delete_all_polar_activities_for_user(user_id: int, db: Session):
             .delete()
         )
         if num_deleted:
+            activity_summaries_crud.rebuild_user_daily_summaries(user_id, db)
             db.commit()
     except Exception as err:
         db.rollback()
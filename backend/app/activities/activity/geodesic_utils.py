@@ -0,0 +1,306 @@
+import numpy as np
+
+import core.config as core_config
+
+# WGS-84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = (1 - WGS84_F) * WGS84_A
+
+# Mean earth radius (IUGG), same as geopy's great_circle
+EARTH_MEAN_RADIUS = 6371008.8
+
+DISTANCE_METHOD_GEODESIC = "geodesic"
+DISTANCE_METHOD_HAVERSINE = "haversine"
+DISTANCE_METHODS = (DISTANCE_METHOD_GEODESIC, DISTANCE_METHOD_HAVERSINE)
+
+_VINCENTY_MAX_ITERATIONS = 200
+_VINCENTY_TOLERANCE = 1e-12
+
+
+def _to_array(values) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    # None values (missing coordinates) become NaN
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+
+def haversine_distances(
+    latitudes_1: np.ndarray,
+    longitudes_1: np.ndarray,
+    latitudes_2: np.ndarray,
+    longitudes_2: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates great-circle distances on a spherical earth.
+
+    Args:
+        latitudes_1: Latitudes of the first points, in degrees.
+        longitudes_1: Longitudes of the first points, in degrees.
+        latitudes_2: Latitudes of the second points, in degrees.
+        longitudes_2: Longitudes of the second points, in degrees.
+
+    Returns:
+        Distances in meters (NaN where a coordinate is missing).
+    """
+    phi_1 = np.radians(latitudes_1)
+    phi_2 = np.radians(latitudes_2)
+    delta_phi = phi_2 - phi_1
+    delta_lambda = np.radians(longitudes_2 - longitudes_1)
+
+    h = (
+        np.sin(delta_phi / 2) ** 2
+        + np.cos(phi_1) * np.cos(phi_2) * np.sin(delta_lambda / 2) ** 2
+    )
+
+    return 2 * EARTH_MEAN_RADIUS * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+def geodesic_distances(
+    latitudes_1: np.ndarray,
+    longitudes_1: np.ndarray,
+    latitudes_2: np.ndarray,
+    longitudes_2: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates distances on the WGS-84 ellipsoid with Vincenty's inverse formula.
+
+    For the short segments between track points the result matches geopy's
+    Karney geodesic to well under a millimetre. The few pairs where Vincenty
+    doesn't converge (nearly antipodal points) fall back to haversine.
+
+    Args:
+        latitudes_1: Latitudes of the first points, in degrees.
+        longitudes_1: Longitudes of the first points, in degrees.
+        latitudes_2: Latitudes of the second points, in degrees.
+        longitudes_2: Longitudes of the second points, in degrees.
+
+    Returns:
+        Distances in meters (NaN where a coordinate is missing).
+    """
+    big_l = np.radians(longitudes_2 - longitudes_1)
+    u_1 = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitudes_1)))
+    u_2 = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitudes_2)))
+    sin_u_1, cos_u_1 = np.sin(u_1), np.cos(u_1)
+    sin_u_2, cos_u_2 = np.sin(u_2), np.cos(u_2)
+
+    lambda_ = big_l.copy()
+    converged = np.zeros(big_l.shape, dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(_VINCENTY_MAX_ITERATIONS):
+            sin_lambda, cos_lambda = np.sin(lambda_), np.cos(lambda_)
+            sin_sigma = np.sqrt(
+                (cos_u_2 * sin_lambda) ** 2
+                + (cos_u_1 * sin_u_2 - sin_u_1 * cos_u_2 * cos_lambda) ** 2
+            )
+            cos_sigma = sin_u_1 * sin_u_2 + cos_u_1 * cos_u_2 * cos_lambda
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            # Coincident points have sin_sigma == 0
+            sin_alpha = np.where(
+                sin_sigma == 0, 0.0, cos_u_1 * cos_u_2 * sin_lambda / sin_sigma
+            )
+            cos_sq_alpha = 1 - sin_alpha**2
+            # Points on the equator have cos_sq_alpha == 0
+            cos_2_sigma_m = np.where(
+                cos_sq_alpha == 0,
+                0.0,
+                cos_sigma - 2 * sin_u_1 * sin_u_2 / cos_sq_alpha,
+            )
+            c = WGS84_F / 16 * cos_sq_alpha * (4 + WGS84_F * (4 - 3 * cos_sq_alpha))
+            lambda_previous = lambda_
+            lambda_ = big_l + (1 - c) * WGS84_F * sin_alpha * (
+                sigma
+                + c
+                * sin_sigma
+                * (cos_2_sigma_m + c * cos_sigma * (-1 + 2 * cos_2_sigma_m**2))
+            )
+
+            converged = np.abs(lambda_ - lambda_previous) <= _VINCENTY_TOLERANCE
+            if np.all(converged | np.isnan(lambda_)):
+                break
+
+    u_sq = cos_sq_alpha * (WGS84_A**2 - WGS84_B**2) / WGS84_B**2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = (
+        big_b
+        * sin_sigma
+        * (
+            cos_2_sigma_m
+            + big_b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2_sigma_m**2)
+                - big_b
+                / 6
+                * cos_2_sigma_m
+                * (-3 + 4 * sin_sigma**2)
+                * (-3 + 4 * cos_2_sigma_m**2)
+            )
+        )
+    )
+    distances = WGS84_B * big_a * (sigma - delta_sigma)
+
+    not_converged = ~converged & ~np.isnan(distances)
+    if np.any(not_converged):
+        distances[not_converged] = haversine_distances(
+            latitudes_1[not_converged],
+            longitudes_1[not_converged],
+            latitudes_2[not_converged],
+            longitudes_2[not_converged],
+        )
+
+    return distances
+
+
+def segment_distances(latitudes, longitudes, method: str | None = None) -> np.ndarray:
+    """
+    Calculates the distance between each pair of consecutive points.
+
+    Args:
+        latitudes: Point latitudes in degrees (None for missing coordinates).
+        longitudes: Point longitudes in degrees (None for missing coordinates).
+        method: "geodesic" (ellipsoidal, default) or "haversine" (spherical,
+            faster). Defaults to the DISTANCE_CALCULATION_METHOD setting.
+
+    Returns:
+        Array with n - 1 distances in meters. Segments with a missing
+        coordinate are NaN.
+    """
+    latitudes = _to_array(latitudes)
+    longitudes = _to_array(longitudes)
+
+    if latitudes.size < 2:
+        return np.zeros(0)
+
+    method = method or core_config.DISTANCE_CALCULATION_METHOD
+    distance_function = (
+        haversine_distances
+        if method == DISTANCE_METHOD_HAVERSINE
+        else geodesic_distances
+    )
+
+    return distance_function(
+        latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+    )
+
+
+def cumulative_distances(
+    latitudes, longitudes, method: str | None = None
+) -> np.ndarray:
+    """
+    Calculates the distance travelled up to each point.
+
+    Args:
+        latitudes: Point latitudes in degrees (None for missing coordinates).
+        longitudes: Point longitudes in degrees (None for missing coordinates).
+        method: See `segment_distances`.
+
+    Returns:
+        Array with n cumulative distances in meters, starting at 0. Segments
+        with a missing coordinate don't add any distance.
+    """
+    distances = np.nan_to_num(segment_distances(latitudes, longitudes, method))
+    return np.concatenate(([0.0], np.cumsum(distances)))[: len(latitudes)]
+
+
+def instant_speeds(
+    times, latitudes, longitudes, method: str | None = None
+) -> np.ndarray:
+    """
+    Calculates the instantaneous speed at each point.
+
+    The speed at a point is the distance from the previous point divided by
+    the time between both. It is 0 for the first point and when no time has
+    passed.
+
+    Args:
+        times: Point times in seconds (epoch or relative, any int/float type).
+        latitudes: Point latitudes in degrees (None for missing coordinates).
+        longitudes: Point longitudes in degrees (None for missing coordinates).
+        method: See `segment_distances`.
+
+    Returns:
+        Array with n speeds in m/s. Points where the current or the previous
+        coordinate is missing are NaN.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    speeds = np.zeros(times.size)
+
+    if times.size < 2:
+        return speeds
+
+    distances = segment_distances(latitudes, longitudes, method)
+    time_differences = np.diff(times)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds[1:] = np.where(
+            time_differences > 0, distances / time_differences, 0.0
+        )
+    speeds[1:][np.isnan(distances)] = np.nan
+
+    return speeds
+
+
+def instant_paces(speeds: np.ndarray) -> np.ndarray:
+    """
+    Converts speeds to paces.
+
+    Args:
+        speeds: Speeds in m/s.
+
+    Returns:
+        Paces in s/m. Points that are not moving have a pace of 0 and NaN
+        speeds stay NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            speeds > 0, 1 / speeds, np.where(np.isnan(speeds), np.nan, 0.0)
+        )
+
+
+def waypoint_times_to_seconds(timestamps: list[str]) -> np.ndarray:
+    """
+    Converts waypoint timestamps ("%Y-%m-%dT%H:%M:%S") to epoch seconds.
+
+    Args:
+        timestamps: Waypoint timestamps.
+
+    Returns:
+        Int64 array with the epoch seconds of each timestamp.
+    """
+    return np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+
+
+def speed_and_pace_waypoints(
+    timestamps: list[str], speeds: np.ndarray, skip_zero_pace: bool = False
+) -> tuple[list[dict], list[dict]]:
+    """
+    Builds the velocity and pace waypoint lists from per-point speeds.
+
+    Args:
+        timestamps: Waypoint timestamps, one per speed.
+        speeds: Speeds in m/s, as returned by `instant_speeds`.
+        skip_zero_pace: Don't add a pace waypoint for points that are not
+            moving (FIT files), instead of a pace of 0 (GPX and TCX files).
+
+    Returns:
+        Tuple with the velocity and the pace waypoints. Points with an
+        unknown (NaN) speed are left out of both.
+    """
+    paces = instant_paces(speeds)
+    vel_waypoints = []
+    pace_waypoints = []
+
+    for timestamp, speed, pace in zip(timestamps, speeds.tolist(), paces.tolist()):
+        if speed != speed:
+            continue
+        vel_waypoints.append({"time": timestamp, "vel": speed})
+        if skip_zero_pace and speed == 0:
+            continue
+        pace_waypoints.append({"time": timestamp, "pace": pace})
+
+    return vel_waypoints, pace_waypoints
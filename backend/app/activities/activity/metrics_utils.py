@@ -0,0 +1,253 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Window of the rolling power average used by Normalized Power
+NORMALIZED_POWER_WINDOW_SECONDS = 30
+
+
+def to_array(values) -> np.ndarray:
+    """
+    Converts values to a float array.
+
+    Args:
+        values: Numbers, numeric strings or None (missing values).
+
+    Returns:
+        Float array with NaN for missing values.
+
+    Raises:
+        ValueError: If a value is not numeric.
+    """
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    return np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+
+def waypoint_values(waypoints: list[dict], key: str) -> np.ndarray:
+    """
+    Gets the values of a waypoint list.
+
+    Args:
+        waypoints: Waypoints, e.g. [{"time": ..., "hr": 120}, ...].
+        key: Key holding the value of each waypoint.
+
+    Returns:
+        Float array with NaN for missing values.
+
+    Raises:
+        KeyError: If a waypoint doesn't have the key.
+        ValueError: If a value is not numeric.
+    """
+    return to_array([waypoint[key] for waypoint in waypoints])
+
+
+def waypoint_seconds(waypoints: list[dict]) -> np.ndarray | None:
+    """
+    Gets the times of a waypoint list in seconds.
+
+    Args:
+        waypoints: Waypoints with a "time" key holding an ISO 8601 string, a
+            datetime or a number of seconds.
+
+    Returns:
+        Float array with the time of each waypoint in seconds, or None if the
+        times are missing or can't be converted.
+    """
+    try:
+        return np.array(
+            [waypoint["time"] for waypoint in waypoints], dtype="datetime64[s]"
+        ).astype(np.float64)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def rolling_window(values: np.ndarray, window_size: int, function) -> np.ndarray:
+    """
+    Applies a function to the centered rolling window of each value.
+
+    The window of each value spans window_size // 2 values on each side and
+    is cut at both ends of the array. Full windows are strided views of the
+    array, so the function runs once for all of them.
+
+    Args:
+        values: Float array.
+        window_size: Size of the window. Values are returned as is if < 2.
+        function: Reduction taking an array and an axis, e.g. np.median.
+
+    Returns:
+        Float array with the result of each window.
+    """
+    if window_size < 2 or values.size == 0:
+        return values.copy()
+
+    half = window_size // 2
+    results = np.empty(values.size)
+
+    if values.size > 2 * half:
+        results[half : values.size - half] = function(
+            sliding_window_view(values, 2 * half + 1), axis=1
+        )
+
+    # Windows cut at the ends of the array
+    for index in list(range(min(half, values.size))) + list(
+        range(max(values.size - half, half), values.size)
+    ):
+        results[index] = function(
+            values[max(0, index - half) : index + half + 1], axis=0
+        )
+
+    return results
+
+
+def precise_mean(values: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Calculates means with an extended precision sum.
+
+    Sums of float64 values are rounded at every step, so means of quantized
+    values (e.g. elevations in 0.1 m steps) can land on either side of a
+    threshold. Summing in extended precision rounds the mean once, as
+    statistics.mean does.
+
+    Args:
+        values: Float array.
+        axis: Axis to average.
+
+    Returns:
+        Float array with the means.
+    """
+    return (
+        values.astype(np.longdouble).sum(axis=axis) / values.shape[axis]
+    ).astype(np.float64)
+
+
+def rolling_median(values: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Calculates the centered rolling median of values.
+
+    Args:
+        values: Float array.
+        window_size: Size of the window, see `rolling_window`.
+
+    Returns:
+        Float array with the median of each window.
+    """
+    return rolling_window(values, window_size, np.median)
+
+
+def rolling_mean(values: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Calculates the centered rolling mean of values.
+
+    Args:
+        values: Float array.
+        window_size: Size of the window, see `rolling_window`.
+
+    Returns:
+        Float array with the mean of each window.
+    """
+    return rolling_window(values, window_size, precise_mean)
+
+
+def elevation_gain_and_loss(
+    elevations: np.ndarray,
+    median_window: int = 6,
+    avg_window: int = 3,
+    threshold: float = 0.1,
+) -> tuple[float, float]:
+    """
+    Calculates the elevation gain and loss of an elevation profile.
+
+    The profile is smoothed with a rolling median (removes spikes) and a
+    rolling mean, and only changes above threshold between consecutive
+    values are added up (ignores noise).
+
+    Args:
+        elevations: Float array with the elevations in meters. NaN values
+            are left out.
+        median_window: Window of the rolling median.
+        avg_window: Window of the rolling mean.
+        threshold: Minimum change in meters between consecutive values.
+
+    Returns:
+        Tuple with the elevation gain and loss in meters.
+    """
+    elevations = elevations[~np.isnan(elevations)]
+    smoothed = rolling_mean(rolling_median(elevations, median_window), avg_window)
+
+    differences = np.diff(smoothed)
+    gain = differences[differences > threshold].sum()
+    loss = -differences[differences < -threshold].sum()
+
+    return float(gain), float(loss)
+
+
+def average_and_max(values: np.ndarray) -> tuple[float, float]:
+    """
+    Calculates the average and maximum of values.
+
+    Args:
+        values: Float array. NaN values are left out.
+
+    Returns:
+        Tuple with the average and the maximum, (0, 0) if there are no values.
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return 0, 0
+
+    return float(values.mean()), float(values.max())
+
+
+def normalized_power(
+    powers: np.ndarray,
+    seconds: np.ndarray | None = None,
+    window_seconds: int = NORMALIZED_POWER_WINDOW_SECONDS,
+) -> float:
+    """
+    Calculates the Normalized Power of power samples.
+
+    Normalized Power is the fourth root of the mean of the fourth powers of
+    the rolling window_seconds average power. The rolling average of each
+    sample covers the samples in the window_seconds before it, so recording
+    gaps and rates other than 1 Hz are handled, and only samples with a full
+    window behind them are used. Activities shorter than the window use the
+    samples as is.
+
+    Args:
+        powers: Float array with the power in watts. NaN values are left out.
+        seconds: Time of each sample in seconds. Defaults to one sample per
+            second.
+        window_seconds: Window of the rolling average.
+
+    Returns:
+        The Normalized Power, 0 if there are no samples.
+    """
+    is_set = ~np.isnan(powers)
+    powers = powers[is_set]
+    if powers.size == 0:
+        return 0
+
+    if seconds is None:
+        seconds = np.arange(powers.size, dtype=np.float64)
+    else:
+        seconds = seconds[is_set]
+        # Times must be increasing for the window lookup
+        order = np.argsort(seconds, kind="stable")
+        seconds = seconds[order]
+        powers = powers[order]
+
+    has_full_window = seconds - seconds[0] >= window_seconds - 1
+    if not has_full_window.any():
+        rolling_powers = powers
+    else:
+        # The window of each sample is (time - window_seconds, time]
+        starts = np.searchsorted(seconds, seconds - window_seconds, side="right")
+        ends = np.arange(1, powers.size + 1)
+        sums = np.concatenate(([0.0], np.cumsum(powers)))
+        rolling_powers = ((sums[ends] - sums[starts]) / (ends - starts))[
+            has_full_window
+        ]
+
+    return float(np.mean(rolling_powers**4) ** 0.25)
@@ -8,10 +8,47 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     JSON,
+    Index,
+    func,
+    literal_column,
 )
 from sqlalchemy.orm import relationship
+
+# Registers the typed PostgreSQL full text search functions (to_tsvector, ...)
+import sqlalchemy.dialects.postgresql  # noqa: F401
+
 from core.database import Base
 
+# Text search configuration of the PostgreSQL search index, without stemming
+SEARCH_TEXT_CONFIG = literal_column("'simple'")
+
+
+def search_document(name, town, city, country):
+    """
+    Builds the searchable text of an activity: its name and location.
+
+    Only immutable functions are used (coalesce and ||, not concat_ws), so
+    the expression can be indexed on PostgreSQL.
+
+    Args:
+        name: The name column.
+        town: The town column.
+        city: The city column.
+        country: The country column.
+
+    Returns:
+        The SQL expression with the fields separated by spaces.
+    """
+    document = None
+    for column in (name, town, city, country):
+        part = func.coalesce(column, literal_column("''"))
+        document = (
+            part
+            if document is None
+            else document.op("||")(literal_column("' '")).op("||")(part)
+        )
+    return document
+
 
 # Data model for activities table using SQLAlchemy's ORM
 class Activity(Base):
@@ -263,3 +300,43 @@ class Activity(Base):
         back_populates="activity",
         cascade="all, delete-orphan",
     )
+
+    __table_args__ = (
+        # Keyset pagination of the activity lists and feeds, newest first
+        Index("ix_activities_user_id_start_time_id", "user_id", "start_time", "id"),
+        Index("ix_activities_gear_id_start_time_id", "gear_id", "start_time", "id"),
+        # Start time ranges of a user, filtered by activity type
+        Index(
+            "ix_activities_user_id_activity_type_start_time",
+            "user_id",
+            "activity_type",
+            "start_time",
+        ),
+        # Name and location search, full text and substring on PostgreSQL,
+        # full text on MariaDB/MySQL (declared last, the expressions use the
+        # columns above)
+        Index(
+            "ix_activities_search_document_tsvector",
+            func.to_tsvector(
+                SEARCH_TEXT_CONFIG, search_document(name, town, city, country)
+            ),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_activities_search_document_trgm",
+            func.lower(search_document(name, town, city, country)).label(
+                "search_document"
+            ),
+            postgresql_using="gin",
+            postgresql_ops={"search_document": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_activities_search_fulltext",
+            "name",
+            "town",
+            "city",
+            "country",
+            mysql_prefix="FULLTEXT",
+            mariadb_prefix="FULLTEXT",
+        ).ddl_if(dialect=("mysql", "mariadb")),
+    )
@@ -8,10 +8,15 @@ import activities.activity.crud as activities_crud
 import activities.activity.dependencies as activities_dependencies
 import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
+import activities.activity_bulk_imports.crud as activity_bulk_imports_crud
+import activities.activity_bulk_imports.schema as activity_bulk_imports_schema
+import activities.activity_bulk_imports.utils as activity_bulk_imports_utils
 import core.database as core_database
 import core.dependencies as core_dependencies
 import core.logger as core_logger
 import core.config as core_config
+import core.pagination as core_pagination
+import core.thread_pool as core_thread_pool
 import gears.gear.dependencies as gears_dependencies
 import session.security as session_security
 import users.user.dependencies as users_dependencies
@@ -20,11 +25,11 @@ import strava.activity_utils as strava_activity_utils
 import websocket.schema as websocket_schema
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     HTTPException,
     Security,
     Query,
+    Response,
     UploadFile,
     status,
 )
@@ -38,7 +43,7 @@ router = APIRouter()
     "/user/{user_id}/week/{week_number}",
     response_model=list[activities_schema.Activity] | None,
 )
-async def read_activities_user_activities_week(
+def read_activities_user_activities_week(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     week_number: int,
@@ -86,7 +91,7 @@ async def read_activities_user_activities_week(
     "/user/{user_id}/thisweek/distances",
     response_model=activities_schema.ActivityDistances | None,
 )
-async def read_activities_user_activities_this_week_distances(
+def read_activities_user_activities_this_week_distances(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -125,7 +130,7 @@ async def read_activities_user_activities_this_week_distances(
     "/user/{user_id}/thismonth/distances",
     response_model=activities_schema.ActivityDistances | None,
 )
-async def read_activities_user_activities_this_month_distances(
+def read_activities_user_activities_this_month_distances(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -170,7 +175,7 @@ async def read_activities_user_activities_this_month_distances(
     "/user/{user_id}/thismonth/number",
     response_model=int,
 )
-async def read_activities_user_activities_this_month_number(
+def read_activities_user_activities_this_month_number(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -215,7 +220,7 @@ async def read_activities_user_activities_this_month_number(
     "/gear/{gear_id}",
     response_model=list[activities_schema.Activity] | None,
 )
-async def read_activities_gear_activities(
+def read_activities_gear_activities(
     gear_id: int,
     validate_gear_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     check_scopes: Annotated[
@@ -240,7 +245,7 @@ async def read_activities_gear_activities(
     "/gear/{gear_id}/number",
     response_model=int,
 )
-async def read_activities_gear_activities_number(
+def read_activities_gear_activities_number(
     gear_id: int,
     validate_gear_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     check_scopes: Annotated[
@@ -268,7 +273,7 @@ async def read_activities_gear_activities_number(
     "/gear/{gear_id}/page_number/{page_number}/num_records/{num_records}",
     response_model=list[activities_schema.Activity] | None,
 )
-async def read_activities_gear_activities_with_pagination(
+def read_activities_gear_activities_with_pagination(
     gear_id: int,
     validate_gear_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     page_number: int,
@@ -287,18 +292,28 @@ async def read_activities_gear_activities_with_pagination(
         Session,
         Depends(core_database.get_db),
     ],
+    response: Response,
+    cursor: str | None = Query(None),
 ):
     # Get the activities for the gear with pagination
-    return activities_crud.get_user_activities_by_gear_id_and_user_id_with_pagination(
-        token_user_id, gear_id, page_number, num_records, db
+    activities, next_cursor = (
+        activities_crud.get_user_activities_by_gear_id_and_user_id_with_pagination(
+            token_user_id, gear_id, page_number, num_records, db, cursor
+        )
     )
 
+    # Return the cursor of the next page in a header
+    if next_cursor:
+        response.headers[core_pagination.NEXT_CURSOR_HEADER] = next_cursor
+
+    return activities
+
 
 @router.get(
     "/number",
     response_model=int,
 )
-async def read_activities_user_activities_number(
+def read_activities_user_activities_number(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["activities:read"])
     ],
@@ -342,7 +357,7 @@ async def read_activities_user_activities_number(
     "/types",
     response_model=dict | None,
 )
-async def read_activities_types(
+def read_activities_types(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["activities:read"])
     ],
@@ -362,7 +377,7 @@ async def read_activities_types(
     "/user/{user_id}/page_number/{page_number}/num_records/{num_records}",
     response_model=list[activities_schema.Activity] | None,
 )
-async def read_activities_user_activities_pagination(
+def read_activities_user_activities_pagination(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     page_number: int,
@@ -391,6 +406,7 @@ async def read_activities_user_activities_pagination(
     validate_sort_order: Annotated[
         Callable, Depends(activities_dependencies.validate_sort_order)
     ],
+    response: Response,
     # Added optional filter query parameters
     activity_type: int | None = Query(None, alias="type"),
     start_date: date | None = Query(None),
@@ -398,12 +414,13 @@ async def read_activities_user_activities_pagination(
     name_search: str | None = Query(None),
     sort_by: str | None = Query(None),
     sort_order: str | None = Query(None),
+    cursor: str | None = Query(None),
 ):
     user_is_owner = True
     if token_user_id != user_id:
         user_is_owner = False
-    # Get and return the activities for the user with pagination and filters
-    return activities_crud.get_user_activities_with_pagination(
+    # Get the activities for the user with pagination and filters
+    activities, next_cursor = activities_crud.get_user_activities_with_pagination(
         user_id=user_id,
         db=db,
         page_number=page_number,
@@ -415,15 +432,22 @@ async def read_activities_user_activities_pagination(
         sort_by=sort_by,
         sort_order=sort_order,
         user_is_owner=user_is_owner,
+        cursor=cursor,
     )
 
+    # Return the cursor of the next page in a header
+    if next_cursor:
+        response.headers[core_pagination.NEXT_CURSOR_HEADER] = next_cursor
+
+    return activities
+
 
 @router.get(
     "/user/{user_id}/followed/page_number/{page_number}/num_records/{num_records}",
     response_model=list[activities_schema.Activity]
     | None,  # Keep old response model for now
 )
-async def read_activities_followed_user_activities_pagination(
+def read_activities_followed_user_activities_pagination(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     page_number: int,
@@ -438,18 +462,28 @@ async def read_activities_followed_user_activities_pagination(
         Session,
         Depends(core_database.get_db),
     ],
+    response: Response,
+    cursor: str | None = Query(None),
 ):
     # Get the activities for the following users with pagination
-    return activities_crud.get_user_following_activities_with_pagination(
-        user_id, page_number, num_records, db
+    activities, next_cursor = (
+        activities_crud.get_user_following_activities_with_pagination(
+            user_id, page_number, num_records, db, cursor
+        )
     )
 
+    # Return the cursor of the next page in a header
+    if next_cursor:
+        response.headers[core_pagination.NEXT_CURSOR_HEADER] = next_cursor
+
+    return activities
+
 
 @router.get(
     "/user/{user_id}/followed/number",
     response_model=int,
 )
-async def read_activities_followed_user_activities_number(
+def read_activities_followed_user_activities_number(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -533,7 +567,7 @@ async def read_activities_user_activities_refresh(
     "/{activity_id}",
     response_model=activities_schema.Activity | None,
 )
-async def read_activities_activity_from_id(
+def read_activities_activity_from_id(
     activity_id: int,
     validate_activity_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
@@ -560,7 +594,7 @@ async def read_activities_activity_from_id(
     "/name/contains/{name}",
     response_model=list[activities_schema.Activity] | None,
 )
-async def read_activities_contain_name(
+def read_activities_contain_name(
     name: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["activities:read"])
@@ -618,6 +652,8 @@ async def create_activity_with_uploaded_file(
 
 @router.post(
     "/create/bulkimport",
+    status_code=201,
+    response_model=activity_bulk_imports_schema.ActivityBulkImport,
 )
 async def create_activity_with_bulk_import(
     token_user_id: Annotated[
@@ -635,46 +671,34 @@ async def create_activity_with_bulk_import(
         websocket_schema.WebSocketManager,
         Depends(websocket_schema.get_websocket_manager),
     ],
-    background_tasks: BackgroundTasks,
 ):
     try:
         core_logger.print_to_log_and_console("Bulk import initiated.")
 
-        # Ensure the 'bulk_import' directory exists
-        bulk_import_dir = core_config.FILES_BULK_IMPORT_DIR
-        os.makedirs(bulk_import_dir, exist_ok=True)
-
-        # Grab list of supported file formats
-        supported_file_formats = core_config.SUPPORTED_FILE_FORMATS
-
-        # Iterate over each file in the 'bulk_import' directory
-        for filename in os.listdir(bulk_import_dir):
-            file_path = os.path.join(bulk_import_dir, filename)
-
-            # Check if file is one we can process
-            _, file_extension = os.path.splitext(file_path)
-            if file_extension not in supported_file_formats:
-                core_logger.print_to_log_and_console(f"Skipping file {file_path} due to not having a supported file extension. Supported extensions are: {supported_file_formats}.")
-                # Might be good to notify the user, but background tasks cannot raise HTTPExceptions
-                continue
-
-            if os.path.isfile(file_path):
-                # Log the file being processed
-                core_logger.print_to_log_and_console(f"Queuing file for processing: {file_path}")
-                # Parse and store the activity
-                background_tasks.add_task(
-                    activities_utils.parse_and_store_activity_from_file,
-                    token_user_id,
-                    file_path,
-                    websocket_manager,
-                    db,
-                )
+        # List the files of the 'bulk_import' directory without blocking the event loop
+        file_paths = await core_thread_pool.run_in_thread_pool(
+            activity_bulk_imports_utils.get_bulk_import_file_paths
+        )
 
-        # Log a success message that explains processing will continue elsewhere.
-        core_logger.print_to_log_and_console("Bulk import initiated for all files found in the bulk_import directory. Processing of files will continue in the background.")
+        # Create the bulk import job with all the files queued
+        bulk_import = await core_thread_pool.run_in_thread_pool(
+            activity_bulk_imports_crud.create_bulk_import, token_user_id, file_paths, db
+        )
+
+        # Start the workers, they import the queued files in the background
+        activity_bulk_imports_utils.start_bulk_import_workers(websocket_manager)
 
-        # Return a success message
-        return {"Bulk import initiated for all files found in the bulk_import directory. Processing of files will continue in the background."}
+        # Log a success message that explains processing will continue elsewhere.
+        core_logger.print_to_log_and_console(f"Bulk import {bulk_import.id} initiated for {len(file_paths)} files found in the bulk_import directory. Processing of files will continue in the background.")
+
+        # Return the bulk import with its progress
+        return await core_thread_pool.run_in_thread_pool(
+            activity_bulk_imports_crud.get_user_bulk_import_by_id,
+            bulk_import.id,
+            token_user_id,
+            db,
+            include_files=False,
+        )
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -690,7 +714,7 @@ async def create_activity_with_bulk_import(
 @router.put(
     "/edit",
 )
-async def edit_activity(
+def edit_activity(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -714,7 +738,7 @@ async def edit_activity(
 @router.put(
     "/visibility/{visibility}",
 )
-async def edit_activity_visibility(
+def edit_activity_visibility(
     visibility: int,
     validate_visibility: Annotated[
         Callable, Depends(activities_dependencies.validate_visibility)
@@ -741,7 +765,7 @@ async def edit_activity_visibility(
 @router.delete(
     "/{activity_id}/delete",
 )
-async def delete_activity(
+def delete_activity(
     activity_id: int,
     validate_activity_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
@@ -4,31 +4,34 @@ import shutil
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+import numpy as np
 import requests
-import statistics
-import time
-from geopy.distance import geodesic
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException, status, UploadFile
 
 from datetime import datetime
 from urllib.parse import urlencode
-from statistics import mean
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 import activities.activity.schema as activities_schema
 import activities.activity.crud as activities_crud
 import activities.activity.models as activities_models
+import activities.activity.geodesic_utils as geodesic_utils
+import activities.activity.metrics_utils as metrics_utils
 
 import users.user.crud as users_crud
 
 import users.user_privacy_settings.crud as users_privacy_settings_crud
 import users.user_privacy_settings.schema as users_privacy_settings_schema
 
+import activities.activity_exercise_titles.crud as activity_exercise_titles_crud
+
 import activities.activity_laps.crud as activity_laps_crud
 
+import activities.activity_location_enrichments.utils as activity_location_enrichments_utils
+
 import activities.activity_sets.crud as activity_sets_crud
 
 import activities.activity_streams.crud as activity_streams_crud
@@ -38,12 +41,18 @@ import activities.activity_workout_steps.crud as activity_workout_steps_crud
 
 import websocket.schema as websocket_schema
 
+import geocoding.gazetteer_utils as geocoding_gazetteer_utils
+import geocoding.utils as geocoding_utils
+
 import gpx.utils as gpx_utils
 import tcx.utils as tcx_utils
 import fit.utils as fit_utils
 
 import core.logger as core_logger
 import core.config as core_config
+import core.database as core_database
+import core.process_pool as core_process_pool
+import core.thread_pool as core_thread_pool
 
 # Global Activity Type Mappings (ID to Name)
 ACTIVITY_ID_TO_NAME = {
@@ -357,6 +366,58 @@ def handle_gzipped_file(
             return temp_file.name, inner_file_extension
 
 
+def get_user_privacy_settings(
+    token_user_id: int, db: Session
+) -> users_privacy_settings_schema.UsersPrivacySettings:
+    """
+    Gets the privacy settings applied to the activities of a user.
+
+    Args:
+        token_user_id (int): The ID of the user.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        users_privacy_settings_schema.UsersPrivacySettings: The privacy settings.
+
+    Raises:
+        HTTPException: If the user doesn't exist.
+    """
+    user = users_crud.get_user_by_id(token_user_id, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    return users_privacy_settings_crud.get_user_privacy_settings_by_user_id(
+        user.id, db
+    )
+
+
+def save_uploaded_file(file: UploadFile, upload_dir: str) -> str:
+    """
+    Saves an uploaded file in a directory.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        upload_dir (str): The directory, created if it doesn't exist.
+
+    Returns:
+        str: The path of the saved file.
+    """
+    # Ensure the directory exists
+    os.makedirs(upload_dir, exist_ok=True)
+
+    # Build the full path where the file will be saved
+    file_path = os.path.join(upload_dir, file.filename)
+
+    # Copy the uploaded file in chunks
+    with open(file_path, "wb") as save_file:
+        shutil.copyfileobj(file.file, save_file)
+
+    return file_path
+
+
 async def parse_and_store_activity_from_file(
     token_user_id: int,
     file_path: str,
@@ -366,6 +427,51 @@ async def parse_and_store_activity_from_file(
     garminconnect_gear: dict = None,
     activity_overrides: dict | None = None,
 ):
+    # Parse the file, a file that fails is moved to the import errors directory
+    parsed_file = await parse_activity_file(
+        token_user_id,
+        file_path,
+        db,
+        from_garmin,
+        garminconnect_gear,
+        activity_overrides,
+    )
+    if parsed_file is None:
+        return None
+
+    try:
+        # Store the activities of the file and move it to the processed directory
+        return await store_activity_files([parsed_file], websocket_manager, db)
+    except Exception as err:
+        # Log the exception and move the file to the import errors directory
+        move_file_to_import_errors(parsed_file["file_path"], err)
+
+
+async def parse_activity_file(
+    token_user_id: int,
+    file_path: str,
+    db: Session,
+    from_garmin: bool = False,
+    garminconnect_gear: dict = None,
+    activity_overrides: dict | None = None,
+) -> dict | None:
+    """
+    Parses an activity file into the activities to store with `store_activity_files`.
+
+    Args:
+        token_user_id (int): The ID of the user importing the file.
+        file_path (str): The path of the .gpx, .tcx, .fit or gzipped file.
+        db (Session): The SQLAlchemy database session.
+        from_garmin (bool): Whether the file was downloaded from Garmin Connect.
+        garminconnect_gear (dict): The Garmin Connect gear of the activity.
+        activity_overrides (dict | None): Values set on the parsed activity.
+
+    Returns:
+        dict | None: The path and extension of the parsed file (the extracted
+            file of a gzipped file) and its parsed activities, or None if the
+            file has no activity or failed (it is then moved to the import
+            errors directory).
+    """
     try:
         core_logger.print_to_log_and_console(
             f"Bulk file import: Beginning processing of {file_path}"
@@ -379,25 +485,18 @@ async def parse_and_store_activity_from_file(
             garmin_connect_activity_id = os.path.basename(file_path).split("_")[0]
 
         if file_extension.lower() == ".gz":
-            file_path, file_extension = handle_gzipped_file(file_path)
+            file_path, file_extension = await core_thread_pool.run_in_thread_pool(
+                handle_gzipped_file, file_path
+            )
 
         # Open the file and process it
         with open(file_path, "rb"):
-            user = users_crud.get_user_by_id(token_user_id, db)
-            if user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found",
-                )
-
-            user_privacy_settings = (
-                users_privacy_settings_crud.get_user_privacy_settings_by_user_id(
-                    user.id, db
-                )
+            user_privacy_settings = await core_thread_pool.run_in_thread_pool(
+                get_user_privacy_settings, token_user_id, db
             )
 
             # Parse the file
-            parsed_info = parse_file(
+            parsed_info = await parse_file(
                 token_user_id,
                 user_privacy_settings,
                 file_extension,
@@ -405,105 +504,138 @@ async def parse_and_store_activity_from_file(
                 db,
             )
 
-            if parsed_info is not None:
-                if activity_overrides:
-                    for key, value in activity_overrides.items():
-                        setattr(parsed_info["activity"], key, value)
-                created_activities = []
-                idsToFileName = ""
-                if file_extension.lower() in (
-                    ".gpx",
-                    ".tcx",
-                ):
-                    # Store the activity in the database
-                    created_activity = await store_activity(
-                        parsed_info, websocket_manager, db
-                    )
-                    created_activities.append(created_activity)
-                    idsToFileName = idsToFileName + str(created_activity.id)
-                elif file_extension.lower() == ".fit":
-                    # Split the records by activity (check for multiple activities in the file)
-                    split_records_by_activity = fit_utils.split_records_by_activity(
-                        parsed_info
-                    )
-
-                    # Create activity objects for each activity in the file
-                    if from_garmin:
-                        created_activities_objects = fit_utils.create_activity_objects(
-                            split_records_by_activity,
-                            token_user_id,
-                            user_privacy_settings,
-                            int(garmin_connect_activity_id),
-                            garminconnect_gear,
-                            db,
-                        )
-                    else:
-                        created_activities_objects = fit_utils.create_activity_objects(
-                            split_records_by_activity,
-                            token_user_id,
-                            user_privacy_settings,
-                            None,
-                            None,
-                            db,
-                        )
+            if parsed_info is None:
+                return None
 
-                    for activity in created_activities_objects:
-                        # Store the activity in the database
-                        created_activity = await store_activity(
-                            activity, websocket_manager, db
-                        )
-                        created_activities.append(created_activity)
-
-                    for index, activity in enumerate(created_activities):
-                        idsToFileName += str(activity.id)  # Add the id to the string
-                        # Add an underscore if it's not the last item
-                        if index < len(created_activities) - 1:
-                            idsToFileName += (
-                                "_"  # Add an underscore if it's not the last item
-                            )
-                else:
-                    # Should no longer get here due to screening of extensions in router.py, but why not.
-                    core_logger.print_to_log_and_console(
-                        f"File extension not supported: {file_extension}", "error"
-                    )
-                # Define the directory where the processed files will be stored
-                processed_dir = core_config.FILES_PROCESSED_DIR
-
-                # Define new file path with activity ID as filename
-                new_file_name = f"{idsToFileName}{file_extension}"
-
-                # Move the file to the processed directory
-                move_file(processed_dir, new_file_name, file_path)
-                core_logger.print_to_log_and_console(
-                    f"Bulk file import: File successfully processed and moved. {file_path} - has become {new_file_name}"
+            if activity_overrides:
+                for key, value in activity_overrides.items():
+                    setattr(parsed_info["activity"], key, value)
+            parsed_infos = []
+            if file_extension.lower() in (
+                ".gpx",
+                ".tcx",
+            ):
+                parsed_infos.append(parsed_info)
+            elif file_extension.lower() == ".fit":
+                # Split the records by activity (check for multiple activities in the file)
+                split_records_by_activity = fit_utils.split_records_by_activity(
+                    parsed_info
                 )
 
-                # Return the created activity
-                return created_activities
+                # Create activity objects for each activity in the file
+                parsed_infos = await core_thread_pool.run_in_thread_pool(
+                    fit_utils.create_activity_objects,
+                    split_records_by_activity,
+                    token_user_id,
+                    user_privacy_settings,
+                    int(garmin_connect_activity_id) if from_garmin else None,
+                    garminconnect_gear if from_garmin else None,
+                    db,
+                )
             else:
-                return None
+                # Should no longer get here due to screening of extensions in router.py, but why not.
+                core_logger.print_to_log_and_console(
+                    f"File extension not supported: {file_extension}", "error"
+                )
+
+            # Return the parsed activities of the file
+            return {
+                "file_path": file_path,
+                "file_extension": file_extension,
+                "parsed_infos": parsed_infos,
+            }
     # except HTTPException as http_err:
     # This is causing a crash on the back end when the try fails.  Looks like we cannot raise an http exception in a background task.
     # raise http_err
     except Exception as err:
-        # Log the exception
-        core_logger.print_to_log(
-            f"Bulk file import: Error while parsing {file_path} in parse_and_store_activity_from_file - {str(err)}",
-            "error",
-            exc=err,
+        # Log the exception and move the file to the import errors directory
+        move_file_to_import_errors(file_path, err)
+
+
+async def store_activity_files(
+    parsed_files: list[dict],
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+) -> list[activities_schema.Activity]:
+    """
+    Stores the activities of parsed files in a single transaction.
+
+    Each file is then moved to the processed directory, named after the IDs
+    of its activities.
+
+    Args:
+        parsed_files (list[dict]): The files, as returned by `parse_activity_file`.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send the notifications.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[activities_schema.Activity]: The created activities, in the order of the files.
+    """
+    # Store the activities in the database
+    created_activities = await store_activities(
+        [
+            parsed_info
+            for parsed_file in parsed_files
+            for parsed_info in parsed_file["parsed_infos"]
+        ],
+        websocket_manager,
+        db,
+    )
+
+    index = 0
+    for parsed_file in parsed_files:
+        file_activities = created_activities[
+            index : index + len(parsed_file["parsed_infos"])
+        ]
+        index += len(file_activities)
+
+        # Define new file path with the activities IDs as filename
+        new_file_name = (
+            "_".join(str(activity.id) for activity in file_activities)
+            + parsed_file["file_extension"]
+        )
+
+        # Move the file to the processed directory
+        await core_thread_pool.run_in_thread_pool(
+            move_file,
+            core_config.FILES_PROCESSED_DIR,
+            new_file_name,
+            parsed_file["file_path"],
+        )
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: File successfully processed and moved. {parsed_file['file_path']} - has become {new_file_name}"
+        )
+
+    # Return the created activities
+    return created_activities
+
+
+def move_file_to_import_errors(file_path: str, err: Exception):
+    """
+    Logs an import error and moves the file to the import errors directory.
+
+    Args:
+        file_path (str): The path of the file that failed.
+        err (Exception): The import error.
+    """
+    # Log the exception
+    core_logger.print_to_log(
+        f"Bulk file import: Error while parsing {file_path} in parse_and_store_activity_from_file - {str(err)}",
+        "error",
+        exc=err,
+    )
+    try:
+        # Move the exception-causing file to an import errors directory.
+        error_file_dir = core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR
+        os.makedirs(error_file_dir, exist_ok=True)
+        move_file(error_file_dir, os.path.basename(file_path), file_path)
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Due to import error, file {file_path} has been moved to {error_file_dir}"
+        )
+    except Exception:
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Failed to move the error-producing file {file_path} to the import-error directory."
         )
-        try:
-            # Move the exception-causing file to an import errors directory.
-            error_file_dir = core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR
-            os.makedirs(error_file_dir, exist_ok=True)
-            move_file(error_file_dir, os.path.basename(file_path), file_path)
-            core_logger.print_to_log_and_console(
-                f"Bulk file import: Due to import error, file {file_path} has been moved to {error_file_dir}"
-            )
-        except Exception:
-            core_logger.print_to_log_and_console(
-                f"Bulk file import: Failed to move the error-producing file {file_path} to the import-error directory."
-            )
 
 
 async def parse_and_store_activity_from_uploaded_file(
@@ -517,35 +649,22 @@ async def parse_and_store_activity_from_uploaded_file(
     _, file_extension = os.path.splitext(file.filename)
 
     try:
-        # Ensure the 'files' directory exists
-        upload_dir = core_config.FILES_DIR
-        os.makedirs(upload_dir, exist_ok=True)
-
-        # Build the full path where the file will be saved
-        file_path = os.path.join(upload_dir, file.filename)
-
         # Save the uploaded file in the 'files' directory
-        with open(file_path, "wb") as save_file:
-            save_file.write(file.file.read())
+        file_path = await core_thread_pool.run_in_thread_pool(
+            save_uploaded_file, file, core_config.FILES_DIR
+        )
 
         if file_extension.lower() == ".gz":
-            file_path, file_extension = handle_gzipped_file(file_path)
-
-        user = users_crud.get_user_by_id(token_user_id, db)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
+            file_path, file_extension = await core_thread_pool.run_in_thread_pool(
+                handle_gzipped_file, file_path
             )
 
-        user_privacy_settings = (
-            users_privacy_settings_crud.get_user_privacy_settings_by_user_id(
-                user.id, db
-            )
+        user_privacy_settings = await core_thread_pool.run_in_thread_pool(
+            get_user_privacy_settings, token_user_id, db
         )
 
         # Parse the file
-        parsed_info = parse_file(
+        parsed_info = await parse_file(
             token_user_id,
             user_privacy_settings,
             file_extension,
@@ -570,7 +689,8 @@ async def parse_and_store_activity_from_uploaded_file(
                 )
 
                 # Create activity objects for each activity in the file
-                created_activities_objects = fit_utils.create_activity_objects(
+                created_activities_objects = await core_thread_pool.run_in_thread_pool(
+                    fit_utils.create_activity_objects,
                     split_records_by_activity,
                     token_user_id,
                     user_privacy_settings,
@@ -579,12 +699,10 @@ async def parse_and_store_activity_from_uploaded_file(
                     db,
                 )
 
-                for activity in created_activities_objects:
-                    # Store the activity in the database
-                    created_activity = await store_activity(
-                        activity, websocket_manager, db
-                    )
-                    created_activities.append(created_activity)
+                # Store the activities in the database
+                created_activities = await store_activities(
+                    created_activities_objects, websocket_manager, db
+                )
 
                 for index, activity in enumerate(created_activities):
                     idsToFileName += str(activity.id)  # Add the id to the string
@@ -605,7 +723,9 @@ async def parse_and_store_activity_from_uploaded_file(
             new_file_name = f"{idsToFileName}{file_extension}"
 
             # Move the file to the processed directory
-            move_file(processed_dir, new_file_name, file_path)
+            await core_thread_pool.run_in_thread_pool(
+                move_file, processed_dir, new_file_name, file_path
+            )
 
             for activity in created_activities:
                 # Serialize the activity
@@ -651,13 +771,45 @@ def move_file(new_dir: str, new_filename: str, file_path: str):
         ) from err
 
 
-def parse_file(
+async def parse_file(
     token_user_id: int,
     user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
     file_extension: str,
     filename: str,
     db: Session,
 ) -> dict:
+    # Parse the file in the process pool, the event loop only waits for the result
+    parsed_info = await core_process_pool.run_in_process_pool(
+        parse_file_in_worker,
+        token_user_id,
+        users_privacy_settings_schema.UsersPrivacySettings.model_validate(
+            user_privacy_settings
+        ),
+        file_extension,
+        filename,
+        description=f"parse {filename}",
+    )
+
+    # Store the exercise titles found in FIT files
+    if parsed_info is not None and parsed_info.get("exercises_titles"):
+        await core_thread_pool.run_in_thread_pool(
+            activity_exercise_titles_crud.create_activity_exercise_titles,
+            parsed_info["exercises_titles"],
+            db,
+        )
+
+    return parsed_info
+
+
+def parse_file_in_worker(
+    token_user_id: int,
+    user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
+    file_extension: str,
+    filename: str,
+) -> dict:
+    # Runs in a process pool worker, so it uses its own session (read only)
+    db = core_database.SessionLocal()
+
     try:
         if filename.lower() != "bulk_import/__init__.py":
             core_logger.print_to_log(f"Parsing file: {filename}")
@@ -679,7 +831,7 @@ def parse_file(
                 )
             elif file_extension.lower() == ".fit":
                 # Parse the FIT file
-                parsed_info = fit_utils.parse_fit_file(filename, db)
+                parsed_info = fit_utils.parse_fit_file(filename)
             else:
                 # file extension not supported raise an HTTPException with a 406 Not Acceptable status code
                 raise HTTPException(
@@ -700,58 +852,111 @@ def parse_file(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal Server Error: {str(err)}",
         ) from err
+    finally:
+        db.close()
 
 
 async def store_activity(
     parsed_info: dict, websocket_manager: websocket_schema.WebSocketManager, db: Session
 ):
-    # create the activity in the database
-    created_activity = await activities_crud.create_activity(
-        parsed_info["activity"], websocket_manager, db
+    # Store the activity as a batch of one
+    created_activities = await store_activities([parsed_info], websocket_manager, db)
+
+    # Return the created activity
+    return created_activities[0]
+
+
+async def store_activities(
+    parsed_infos: list[dict],
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+) -> list[activities_schema.Activity]:
+    """
+    Stores parsed activities and their streams, laps, workout steps and sets in a single transaction.
+
+    Args:
+        parsed_infos (list[dict]): The parsed activities, as returned by the file parsers.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send the notifications.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[activities_schema.Activity]: The created activities.
+    """
+    # Create the activities and their child rows in the database
+    created_activities = await activities_crud.create_activities(
+        [parsed_info["activity"] for parsed_info in parsed_infos],
+        websocket_manager,
+        db,
+        children_builder=lambda index, activity_id: create_activity_children_objects(
+            parsed_infos[index], activity_id
+        ),
     )
 
-    # Check if created_activity is None
-    if created_activity is None:
-        # Log the error
-        core_logger.print_to_log(
-            "Error in store_activity - activity is None, error creating activity",
-            "error",
-        )
-        # raise an HTTPException with a 500 Internal Server Error status code
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error creating activity",
+    # Resolve the pending locations in the background
+    if any(
+        not (activity.city or activity.town or activity.country)
+        for activity in created_activities
+    ):
+        activity_location_enrichments_utils.start_location_enrichment_worker(
+            websocket_manager
         )
 
+    # Return the created activities
+    return created_activities
+
+
+def create_activity_children_objects(parsed_info: dict, activity_id: int) -> list:
+    """
+    Builds the streams, laps, workout steps and sets model objects of a parsed activity.
+
+    Args:
+        parsed_info (dict): The parsed activity.
+        activity_id (int): The ID of the activity.
+
+    Returns:
+        list: The model objects, not yet added to the session.
+    """
+    children = []
+
     # Parse the activity streams from the parsed info
-    activity_streams = parse_activity_streams_from_file(
-        parsed_info, created_activity.id
-    )
+    activity_streams = parse_activity_streams_from_file(parsed_info, activity_id)
 
     if activity_streams is not None:
-        # Create activity streams in the database
-        activity_streams_crud.create_activity_streams(activity_streams, db)
+        children.extend(
+            activity_streams_crud.create_activity_streams_objects(activity_streams)
+        )
 
     if parsed_info.get("laps") is not None:
-        # Create activity laps in the database
-        activity_laps_crud.create_activity_laps(
-            parsed_info["laps"], created_activity.id, db
+        children.extend(
+            activity_laps_crud.create_activity_laps_objects(
+                parsed_info["laps"], activity_id
+            )
         )
 
     if parsed_info.get("workout_steps") is not None:
-        # Create activity workout steps in the database
-        activity_workout_steps_crud.create_activity_workout_steps(
-            parsed_info["workout_steps"], created_activity.id, db
+        children.extend(
+            activity_workout_steps_crud.create_activity_workout_steps_objects(
+                parsed_info["workout_steps"], activity_id
+            )
         )
 
     if parsed_info.get("sets") is not None:
-        # Create activity sets in the database
-        activity_sets_crud.create_activity_sets(
-            parsed_info["sets"], created_activity.id, db
+        children.extend(
+            activity_sets_crud.create_activity_sets_objects(
+                parsed_info["sets"], activity_id
+            )
         )
 
-    # Return the created activity
-    return created_activity
+    # Leave the location pending, it is resolved in the background
+    location_enrichment = (
+        activity_location_enrichments_utils.create_location_enrichment_object(
+            parsed_info, activity_id
+        )
+    )
+    if location_enrichment is not None:
+        children.append(location_enrichment)
+
+    return children
 
 
 def parse_activity_streams_from_file(parsed_info: dict, activity_id: int):
@@ -850,6 +1055,22 @@ def location_based_on_coordinates(latitude, longitude) -> dict | None:
             "country": None,
         }
 
+    # The local gazetteer needs no cache, rate limit or request
+    if core_config.REVERSE_GEO_PROVIDER == "local":
+        try:
+            return geocoding_gazetteer_utils.location_from_gazetteer(
+                latitude, longitude
+            )
+        except Exception as err:
+            # Log the error
+            core_logger.print_to_log_and_console(
+                f"Error in location_based_on_coordinates - {str(err)}", "error"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_424_FAILED_DEPENDENCY,
+                detail=f"Error in location_based_on_coordinates: {str(err)}",
+            ) from err
+
     # Create a dictionary with the parameters for the request
     if core_config.REVERSE_GEO_PROVIDER == "nominatim":
         # Create the URL for the request
@@ -895,54 +1116,56 @@ def location_based_on_coordinates(latitude, longitude) -> dict | None:
             "country": None,
         }
 
-    # Throttle requests according to configured rate limit
-    if core_config.REVERSE_GEO_MIN_INTERVAL > 0:
-        with core_config.REVERSE_GEO_LOCK:
-            now = time.monotonic()
-            interval = core_config.REVERSE_GEO_MIN_INTERVAL - (
-                now - core_config.REVERSE_GEO_LAST_CALL
-            )
-            if interval > 0:
-                time.sleep(interval)
-            core_config.REVERSE_GEO_LAST_CALL = time.monotonic()
+    # Check the cache before calling the provider
+    cached_location = geocoding_utils.get_cached_location(latitude, longitude)
+    if cached_location is not None:
+        return cached_location
 
-    # Make the request and get the response
-    try:
-        headers = {"User-Agent": "Endurain"}
+    # Throttle requests according to configured rate limit, across processes
+    with geocoding_utils.throttle_request():
         # Make the request and get the response
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        if core_config.REVERSE_GEO_PROVIDER in ("geocode", "nominatim"):
-            # Get the data from the response
-            data = response.json().get("address", {})
-            # Return the location based on the coordinates
-            # Note: 'town' is used for district in Geocode API
-            return {
-                "city": data.get("city"),
-                "town": data.get("town"),
-                "country": data.get("country"),
-            }
+        try:
+            headers = {"User-Agent": "Endurain"}
+            # Make the request and get the response
+            response = requests.get(url, headers=headers, timeout=10)
+            response.raise_for_status()
+
+            if core_config.REVERSE_GEO_PROVIDER in ("geocode", "nominatim"):
+                # Get the data from the response
+                data = response.json().get("address", {})
+                # Get the location based on the coordinates
+                # Note: 'town' is used for district in Geocode API
+                location = {
+                    "city": data.get("city"),
+                    "town": data.get("town"),
+                    "country": data.get("country"),
+                }
+            else:
+                # Get the data from the response
+                data_root = response.json().get("features", [])
+                data = data_root[0].get("properties", {}) if data_root else {}
+                # Get the location based on the coordinates
+                # Note: 'district' is used for city and 'city' is used for town in Photon API
+                location = {
+                    "city": data.get("district"),
+                    "town": data.get("city"),
+                    "country": data.get("country"),
+                }
+        except Exception as err:
+            # Log the error
+            core_logger.print_to_log_and_console(
+                f"Error in location_based_on_coordinates - {str(err)}", "error"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_424_FAILED_DEPENDENCY,
+                detail=f"Error in location_based_on_coordinates: {str(err)}",
+            ) from err
 
-        # Get the data from the response
-        data_root = response.json().get("features", [])
-        data = data_root[0].get("properties", {}) if data_root else {}
-        # Return the location based on the coordinates
-        # Note: 'district' is used for city and 'city' is used for town in Photon API
-        return {
-            "city": data.get("district"),
-            "town": data.get("city"),
-            "country": data.get("country"),
-        }
-    except Exception as err:
-        # Log the error
-        core_logger.print_to_log_and_console(
-            f"Error in location_based_on_coordinates - {str(err)}", "error"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error in location_based_on_coordinates: {str(err)}",
-        ) from err
+    # Cache the location of the grid cell
+    geocoding_utils.store_cached_location(latitude, longitude, location)
+
+    # Return the location based on the coordinates
+    return location
 
 
 def append_if_not_none(waypoint_list, waypoint_time, value, key):
@@ -950,6 +1173,46 @@ def append_if_not_none(waypoint_list, waypoint_time, value, key):
         waypoint_list.append({"time": waypoint_time, key: value})
 
 
+def waypoints_time_filter(waypoints: list[dict], time_key: str = "time"):
+    """
+    Builds a function that returns the waypoints within a time range.
+
+    The waypoint times are converted once, so each lookup is a binary search
+    (or a vectorized mask if the waypoints are not in chronological order)
+    instead of parsing every timestamp again.
+
+    Args:
+        waypoints: Waypoints (or laps) with a "%Y-%m-%dT%H:%M:%S" string or a
+            naive datetime under time_key.
+        time_key: Key holding the time of each waypoint.
+
+    Returns:
+        Function taking the inclusive start and end times (naive datetimes or
+        numpy datetime64) and returning the matching waypoints in their
+        original order.
+    """
+    times = np.array(
+        [waypoint[time_key] for waypoint in waypoints], dtype="datetime64[us]"
+    )
+    is_sorted = bool(np.all(times[1:] >= times[:-1]))
+
+    def filter_waypoints(start_time, end_time) -> list[dict]:
+        start_time = np.datetime64(start_time, "us")
+        end_time = np.datetime64(end_time, "us")
+
+        if is_sorted:
+            start = np.searchsorted(times, start_time, side="left")
+            end = np.searchsorted(times, end_time, side="right")
+            return waypoints[start:end]
+
+        return [
+            waypoints[index]
+            for index in np.flatnonzero((times >= start_time) & (times <= end_time))
+        ]
+
+    return filter_waypoints
+
+
 def calculate_instant_speed(
     prev_time, waypoint_time, latitude, longitude, prev_latitude, prev_longitude
 ):
@@ -969,9 +1232,9 @@ def calculate_instant_speed(
     # If the time difference is positive, calculate the instant speed
     if time_difference > 0:
         # Calculate the distance in meters
-        distance = geodesic(
-            (prev_latitude, prev_longitude), (latitude, longitude)
-        ).meters
+        distance = geodesic_utils.segment_distances(
+            [prev_latitude, latitude], [prev_longitude, longitude]
+        )[0].item()
 
         # Calculate the instant speed in m/s
         instant_speed = distance / time_difference
@@ -986,55 +1249,16 @@ def calculate_instant_speed(
 def compute_elevation_gain_and_loss(
     elevations, median_window=6, avg_window=3, threshold=0.1
 ):
-    # 1) Median Filter
-    def median_filter(values, window_size):
-        if window_size < 2:
-            return values[:]
-        half = window_size // 2
-        filtered = []
-        for i in range(len(values)):
-            start = max(0, i - half)
-            end = min(len(values), i + half + 1)
-            window_vals = values[start:end]
-            m = statistics.median(window_vals)
-            filtered.append(m)
-        return filtered
-
-    # 2) Moving-Average Smoothing
-    def moving_average(values, window_size):
-        if window_size < 2:
-            return values[:]
-        half = window_size // 2
-        smoothed = []
-        n = len(values)
-        for i in range(n):
-            start = max(0, i - half)
-            end = min(n, i + half + 1)
-            window_vals = values[start:end]
-            smoothed.append(statistics.mean(window_vals))
-        return smoothed
-
     try:
         # Get the values from the elevations
-        values = [float(waypoint["ele"]) for waypoint in elevations]
+        values = metrics_utils.waypoint_values(elevations, "ele")
     except (ValueError, KeyError):
         # If there are no valid values, return 0
         return 0, 0
 
-    # Apply median filter -> then average smoothing
-    filtered = median_filter(values, median_window)
-    filtered = moving_average(filtered, avg_window)
-
-    # 3) Compute gain/loss with threshold
-    total_gain = 0.0
-    total_loss = 0.0
-    for i in range(1, len(filtered)):
-        diff = filtered[i] - filtered[i - 1]
-        if diff > threshold:
-            total_gain += diff
-        elif diff < -threshold:
-            total_loss -= diff  # diff is negative, so subtracting it is adding positive
-    return total_gain, total_loss
+    return metrics_utils.elevation_gain_and_loss(
+        values, median_window, avg_window, threshold
+    )
 
 
 def calculate_pace(distance, first_waypoint_time, last_waypoint_time):
@@ -1063,44 +1287,29 @@ def calculate_pace(distance, first_waypoint_time, last_waypoint_time):
 def calculate_avg_and_max(data, stream_type):
     try:
         # Get the values from the data
-        values = [
-            float(waypoint[stream_type])
-            for waypoint in data
-            if waypoint.get(stream_type) is not None
-        ]
-    except (ValueError, KeyError):
+        values = metrics_utils.to_array(
+            [waypoint.get(stream_type) for waypoint in data]
+        )
+    except ValueError:
         # If there are no valid values, return 0
         return 0, 0
 
     # Calculate the average and max values
-    avg_value = mean(values)
-    max_value = max(values)
-
-    return avg_value, max_value
+    return metrics_utils.average_and_max(values)
 
 
 def calculate_np(data):
     try:
         # Get the power values from the data
-        values = [
-            float(waypoint["power"])
-            for waypoint in data
-            if waypoint["power"] is not None
-        ]
-    except:
+        values = metrics_utils.waypoint_values(data, "power")
+    except (ValueError, KeyError):
         # If there are no valid values, return 0
         return 0
 
-    # Calculate the fourth power of each power value
-    fourth_powers = [p**4 for p in values]
-
-    # Calculate the average of the fourth powers
-    avg_fourth_power = sum(fourth_powers) / len(fourth_powers)
-
-    # Take the fourth root of the average of the fourth powers to get Normalized Power
-    normalized_power = avg_fourth_power ** (1 / 4)
-
-    return normalized_power
+    # Calculate the 30 seconds rolling Normalized Power
+    return metrics_utils.normalized_power(
+        values, metrics_utils.waypoint_seconds(data)
+    )
 
 
 def define_activity_type(activity_type_name: str) -> int:
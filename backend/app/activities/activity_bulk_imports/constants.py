@@ -0,0 +1,17 @@
+# Constants for bulk import job status
+JOB_STATUS_RUNNING = 0
+JOB_STATUS_COMPLETED = 1
+
+# Constants for bulk import file status
+FILE_STATUS_QUEUED = 0
+FILE_STATUS_PARSING = 1
+FILE_STATUS_STORED = 2
+FILE_STATUS_ERROR = 3
+
+# Seconds after which a file still being parsed without an owner (claimed
+# before the owner was recorded) is considered interrupted and queued again
+PARSING_LEASE_SECONDS = 30 * 60
+
+# Prefix of the lock each process holds while it parses bulk import files,
+# files claimed by a process whose lock is free are queued again
+OWNER_LOCK_PREFIX = "endurain_bulk_import_"
@@ -0,0 +1,602 @@
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_
+
+import activities.activity_bulk_imports.constants as activity_bulk_imports_constants
+import activities.activity_bulk_imports.models as activity_bulk_imports_models
+import activities.activity_bulk_imports.schema as activity_bulk_imports_schema
+
+import core.logger as core_logger
+
+
+def serialize_bulk_import(
+    bulk_import: activity_bulk_imports_models.ActivityBulkImport,
+    counts: dict[int, int],
+    files: list[activity_bulk_imports_models.ActivityBulkImportFile] | None = None,
+) -> activity_bulk_imports_schema.ActivityBulkImport:
+    # Serialize the bulk import object with its progress
+    return activity_bulk_imports_schema.ActivityBulkImport(
+        id=bulk_import.id,
+        user_id=bulk_import.user_id,
+        status=bulk_import.status,
+        total_files=bulk_import.total_files,
+        queued_files=counts.get(activity_bulk_imports_constants.FILE_STATUS_QUEUED, 0),
+        parsing_files=counts.get(
+            activity_bulk_imports_constants.FILE_STATUS_PARSING, 0
+        ),
+        stored_files=counts.get(activity_bulk_imports_constants.FILE_STATUS_STORED, 0),
+        error_files=counts.get(activity_bulk_imports_constants.FILE_STATUS_ERROR, 0),
+        created_at=bulk_import.created_at.strftime("%Y-%m-%dT%H:%M:%S"),
+        finished_at=(
+            bulk_import.finished_at.strftime("%Y-%m-%dT%H:%M:%S")
+            if bulk_import.finished_at
+            else None
+        ),
+        files=(
+            [
+                activity_bulk_imports_schema.ActivityBulkImportFile(
+                    id=bulk_import_file.id,
+                    bulk_import_id=bulk_import_file.bulk_import_id,
+                    file_path=bulk_import_file.file_path,
+                    status=bulk_import_file.status,
+                    activity_ids=bulk_import_file.activity_ids,
+                    error=bulk_import_file.error,
+                    updated_at=bulk_import_file.updated_at.strftime(
+                        "%Y-%m-%dT%H:%M:%S"
+                    ),
+                )
+                for bulk_import_file in files
+            ]
+            if files is not None
+            else None
+        ),
+    )
+
+
+def get_bulk_imports_files_counts(
+    bulk_import_ids: list[int], db: Session
+) -> dict[int, dict[int, int]]:
+    """
+    Count the files of each bulk import by status.
+
+    Args:
+        bulk_import_ids (list[int]): The IDs of the bulk imports.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        dict[int, dict[int, int]]: Number of files per status for each bulk import ID.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        counts = {bulk_import_id: {} for bulk_import_id in bulk_import_ids}
+
+        if not bulk_import_ids:
+            return counts
+
+        rows = (
+            db.query(
+                activity_bulk_imports_models.ActivityBulkImportFile.bulk_import_id,
+                activity_bulk_imports_models.ActivityBulkImportFile.status,
+                func.count(activity_bulk_imports_models.ActivityBulkImportFile.id),
+            )
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.bulk_import_id.in_(
+                    bulk_import_ids
+                )
+            )
+            .group_by(
+                activity_bulk_imports_models.ActivityBulkImportFile.bulk_import_id,
+                activity_bulk_imports_models.ActivityBulkImportFile.status,
+            )
+            .all()
+        )
+
+        for bulk_import_id, file_status, count in rows:
+            counts[bulk_import_id][file_status] = count
+
+        # Return the counts
+        return counts
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_bulk_imports_files_counts: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_user_bulk_imports(
+    user_id: int, db: Session
+) -> list[activity_bulk_imports_schema.ActivityBulkImport] | None:
+    """
+    Retrieve the bulk imports of a user, newest first, with their progress.
+
+    Args:
+        user_id (int): The ID of the user.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[activity_bulk_imports_schema.ActivityBulkImport] | None: The bulk imports, or None if there are none.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        bulk_imports = (
+            db.query(activity_bulk_imports_models.ActivityBulkImport)
+            .filter(activity_bulk_imports_models.ActivityBulkImport.user_id == user_id)
+            .order_by(activity_bulk_imports_models.ActivityBulkImport.id.desc())
+            .all()
+        )
+
+        # Check if there are bulk imports if not return None
+        if not bulk_imports:
+            return None
+
+        counts = get_bulk_imports_files_counts(
+            [bulk_import.id for bulk_import in bulk_imports], db
+        )
+
+        # Return the serialized bulk imports
+        return [
+            serialize_bulk_import(
+                bulk_import, counts[bulk_import.id]
+            )
+            for bulk_import in bulk_imports
+        ]
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_bulk_imports: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_user_bulk_import_by_id(
+    bulk_import_id: int, user_id: int, db: Session, include_files: bool = True
+) -> activity_bulk_imports_schema.ActivityBulkImport | None:
+    """
+    Retrieve a bulk import of a user with its progress.
+
+    Args:
+        bulk_import_id (int): The ID of the bulk import.
+        user_id (int): The ID of the user that owns the bulk import.
+        db (Session): The SQLAlchemy database session.
+        include_files (bool): Whether to include the status of each file.
+
+    Returns:
+        activity_bulk_imports_schema.ActivityBulkImport | None: The bulk import, or None if not found.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        bulk_import = (
+            db.query(activity_bulk_imports_models.ActivityBulkImport)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImport.id == bulk_import_id,
+                activity_bulk_imports_models.ActivityBulkImport.user_id == user_id,
+            )
+            .first()
+        )
+
+        # Check if bulk import is None and return None if it is
+        if bulk_import is None:
+            return None
+
+        counts = get_bulk_imports_files_counts([bulk_import.id], db)
+
+        # Return the serialized bulk import
+        return serialize_bulk_import(
+            bulk_import,
+            counts[bulk_import.id],
+            bulk_import.files if include_files else None,
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_bulk_import_by_id: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def create_bulk_import(
+    user_id: int, file_paths: list[str], db: Session
+) -> activity_bulk_imports_models.ActivityBulkImport:
+    """
+    Create a bulk import job with all its files queued.
+
+    Args:
+        user_id (int): The ID of the user that started the bulk import.
+        file_paths (list[str]): The paths of the files to import.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        activity_bulk_imports_models.ActivityBulkImport: The created bulk import.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while creating the bulk import.
+    """
+    try:
+        # Create a new bulk import with its files
+        bulk_import = activity_bulk_imports_models.ActivityBulkImport(
+            user_id=user_id,
+            status=activity_bulk_imports_constants.JOB_STATUS_RUNNING,
+            total_files=len(file_paths),
+            created_at=datetime.now(),
+            finished_at=None if file_paths else datetime.now(),
+        )
+        if not file_paths:
+            bulk_import.status = activity_bulk_imports_constants.JOB_STATUS_COMPLETED
+        bulk_import.files = [
+            activity_bulk_imports_models.ActivityBulkImportFile(
+                file_path=file_path,
+                status=activity_bulk_imports_constants.FILE_STATUS_QUEUED,
+                updated_at=datetime.now(),
+            )
+            for file_path in file_paths
+        ]
+
+        # Add the bulk import to the database
+        db.add(bulk_import)
+        db.commit()
+        db.refresh(bulk_import)
+
+        # Return the bulk import
+        return bulk_import
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(f"Error in create_bulk_import: {err}", "error", exc=err)
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def claim_next_queued_file(
+    db: Session, claimed_by: str
+) -> activity_bulk_imports_models.ActivityBulkImportFile | None:
+    """
+    Claim the oldest queued bulk import file by marking it as parsing.
+
+    The row is locked with SKIP LOCKED so concurrent workers (also in other
+    processes) never claim the same file.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+        claimed_by (str): The owner lock held by the claiming process.
+
+    Returns:
+        activity_bulk_imports_models.ActivityBulkImportFile | None: The claimed file, or None if the queue is empty.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while claiming the file.
+    """
+    try:
+        bulk_import_file = (
+            db.query(activity_bulk_imports_models.ActivityBulkImportFile)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.status
+                == activity_bulk_imports_constants.FILE_STATUS_QUEUED
+            )
+            .order_by(activity_bulk_imports_models.ActivityBulkImportFile.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        # Check if there is a queued file and return None if not
+        if bulk_import_file is None:
+            db.rollback()
+            return None
+
+        # Mark the file as parsing
+        bulk_import_file.status = activity_bulk_imports_constants.FILE_STATUS_PARSING
+        bulk_import_file.claimed_by = claimed_by
+        bulk_import_file.updated_at = datetime.now()
+        db.commit()
+        db.refresh(bulk_import_file)
+
+        # Return the claimed file
+        return bulk_import_file
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in claim_next_queued_file: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def edit_bulk_import_file_status(
+    bulk_import_file_id: int,
+    file_status: int,
+    db: Session,
+    activity_ids: str | None = None,
+    error: str | None = None,
+):
+    """
+    Update the status of a bulk import file.
+
+    Args:
+        bulk_import_file_id (int): The ID of the bulk import file.
+        file_status (int): The new file status.
+        db (Session): The SQLAlchemy database session.
+        activity_ids (str | None): Comma separated IDs of the created activities.
+        error (str | None): Error message if the file could not be imported.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the file.
+    """
+    try:
+        db.query(activity_bulk_imports_models.ActivityBulkImportFile).filter(
+            activity_bulk_imports_models.ActivityBulkImportFile.id
+            == bulk_import_file_id
+        ).update(
+            {
+                activity_bulk_imports_models.ActivityBulkImportFile.status: file_status,
+                activity_bulk_imports_models.ActivityBulkImportFile.activity_ids: activity_ids,
+                activity_bulk_imports_models.ActivityBulkImportFile.error: (
+                    error[:500] if error else None
+                ),
+                activity_bulk_imports_models.ActivityBulkImportFile.updated_at: datetime.now(),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in edit_bulk_import_file_status: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_parsing_files_owners(db: Session) -> list[str]:
+    """
+    Get the owner locks of the processes parsing bulk import files.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[str]: The distinct owner locks of the files being parsed.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        return [
+            claimed_by
+            for (claimed_by,) in db.query(
+                activity_bulk_imports_models.ActivityBulkImportFile.claimed_by
+            )
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.status
+                == activity_bulk_imports_constants.FILE_STATUS_PARSING,
+                activity_bulk_imports_models.ActivityBulkImportFile.claimed_by.isnot(
+                    None
+                ),
+            )
+            .distinct()
+        ]
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_parsing_files_owners: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def requeue_interrupted_files(
+    db: Session, dead_owners: list[str], claimed_before: datetime
+) -> int:
+    """
+    Queue again the files that were being parsed when their process stopped.
+
+    Files claimed by a dead process are queued again at once. Files claimed
+    without an owner (before the owner was recorded) are only queued again
+    if claimed before `claimed_before`, they may still be parsed by another
+    API process.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+        dead_owners (list[str]): The owner locks no longer held by a process.
+        claimed_before (datetime): Files without an owner claimed before this
+            date are queued again.
+
+    Returns:
+        int: Number of files queued again.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the files.
+    """
+    try:
+        requeued = (
+            db.query(activity_bulk_imports_models.ActivityBulkImportFile)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.status
+                == activity_bulk_imports_constants.FILE_STATUS_PARSING,
+                or_(
+                    activity_bulk_imports_models.ActivityBulkImportFile.claimed_by.in_(
+                        dead_owners
+                    ),
+                    and_(
+                        activity_bulk_imports_models.ActivityBulkImportFile.claimed_by.is_(
+                            None
+                        ),
+                        activity_bulk_imports_models.ActivityBulkImportFile.updated_at
+                        < claimed_before,
+                    ),
+                ),
+            )
+            .update(
+                {
+                    activity_bulk_imports_models.ActivityBulkImportFile.status: activity_bulk_imports_constants.FILE_STATUS_QUEUED,
+                    activity_bulk_imports_models.ActivityBulkImportFile.claimed_by: None,
+                    activity_bulk_imports_models.ActivityBulkImportFile.updated_at: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+
+        # Return the number of files queued again
+        return requeued
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in requeue_interrupted_files: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def has_queued_files(db: Session) -> bool:
+    """
+    Check if there are bulk import files waiting to be imported.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        bool: True if at least one file is queued.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        return (
+            db.query(activity_bulk_imports_models.ActivityBulkImportFile.id)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.status
+                == activity_bulk_imports_constants.FILE_STATUS_QUEUED
+            )
+            .first()
+            is not None
+        )
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(f"Error in has_queued_files: {err}", "error", exc=err)
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def complete_bulk_import_if_finished(bulk_import_id: int, db: Session) -> bool:
+    """
+    Mark a running bulk import as completed if none of its files are pending.
+
+    Args:
+        bulk_import_id (int): The ID of the bulk import.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        bool: True if the bulk import was marked as completed by this call.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the bulk import.
+    """
+    try:
+        pending_files = (
+            db.query(activity_bulk_imports_models.ActivityBulkImportFile.id)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImportFile.bulk_import_id
+                == bulk_import_id,
+                activity_bulk_imports_models.ActivityBulkImportFile.status.in_(
+                    [
+                        activity_bulk_imports_constants.FILE_STATUS_QUEUED,
+                        activity_bulk_imports_constants.FILE_STATUS_PARSING,
+                    ]
+                ),
+            )
+            .first()
+        )
+
+        if pending_files is not None:
+            return False
+
+        completed = (
+            db.query(activity_bulk_imports_models.ActivityBulkImport)
+            .filter(
+                activity_bulk_imports_models.ActivityBulkImport.id == bulk_import_id,
+                activity_bulk_imports_models.ActivityBulkImport.status
+                == activity_bulk_imports_constants.JOB_STATUS_RUNNING,
+            )
+            .update(
+                {
+                    activity_bulk_imports_models.ActivityBulkImport.status: activity_bulk_imports_constants.JOB_STATUS_COMPLETED,
+                    activity_bulk_imports_models.ActivityBulkImport.finished_at: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+
+        # Return whether the bulk import was completed
+        return completed > 0
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in complete_bulk_import_if_finished: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
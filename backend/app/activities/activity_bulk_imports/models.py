@@ -0,0 +1,98 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class ActivityBulkImport(Base):
+    __tablename__ = "activities_bulk_imports"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="User ID that the bulk import belongs to",
+    )
+    status = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Bulk import status (0 - running, 1 - completed)",
+    )
+    total_files = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of files queued in the bulk import",
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        comment="Bulk import creation date (DateTime)",
+    )
+    finished_at = Column(
+        DateTime,
+        nullable=True,
+        comment="Bulk import completion date (DateTime)",
+    )
+
+    # Define a relationship to the ActivityBulkImportFile model
+    files = relationship(
+        "ActivityBulkImportFile",
+        back_populates="bulk_import",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class ActivityBulkImportFile(Base):
+    __tablename__ = "activities_bulk_import_files"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bulk_import_id = Column(
+        Integer,
+        ForeignKey("activities_bulk_imports.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Bulk import ID that the file belongs to",
+    )
+    file_path = Column(
+        String(length=500),
+        nullable=False,
+        comment="Path of the file to import",
+    )
+    status = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        index=True,
+        comment="File status (0 - queued, 1 - parsing, 2 - stored, 3 - error)",
+    )
+    claimed_by = Column(
+        String(length=64),
+        nullable=True,
+        comment="Owner lock of the process parsing the file",
+    )
+    activity_ids = Column(
+        String(length=250),
+        nullable=True,
+        comment="IDs of the activities created from the file (comma separated)",
+    )
+    error = Column(
+        String(length=500),
+        nullable=True,
+        comment="Error message if the file could not be imported",
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        onupdate=func.now(),
+        comment="File status last update date (DateTime)",
+    )
+
+    # Define a relationship to the ActivityBulkImport model
+    bulk_import = relationship("ActivityBulkImport", back_populates="files")
@@ -0,0 +1,69 @@
+from typing import Annotated, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Security, status
+from sqlalchemy.orm import Session
+
+import activities.activity_bulk_imports.crud as activity_bulk_imports_crud
+import activities.activity_bulk_imports.schema as activity_bulk_imports_schema
+
+import session.security as session_security
+
+import core.database as core_database
+
+# Define the API router
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_model=list[activity_bulk_imports_schema.ActivityBulkImport] | None,
+)
+def read_activities_bulk_imports(
+    check_scopes: Annotated[
+        Callable, Security(session_security.check_scopes, scopes=["activities:read"])
+    ],
+    token_user_id: Annotated[
+        int,
+        Depends(session_security.get_user_id_from_access_token),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+):
+    # Get the user bulk imports with their progress from the database and return them
+    return activity_bulk_imports_crud.get_user_bulk_imports(token_user_id, db)
+
+
+@router.get(
+    "/{bulk_import_id}",
+    response_model=activity_bulk_imports_schema.ActivityBulkImport,
+)
+def read_activities_bulk_import_by_id(
+    bulk_import_id: int,
+    check_scopes: Annotated[
+        Callable, Security(session_security.check_scopes, scopes=["activities:read"])
+    ],
+    token_user_id: Annotated[
+        int,
+        Depends(session_security.get_user_id_from_access_token),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+):
+    # Get the bulk import with the status of each file from the database
+    bulk_import = activity_bulk_imports_crud.get_user_bulk_import_by_id(
+        bulk_import_id, token_user_id, db
+    )
+
+    # Check if bulk import is None and raise an HTTPException if it is
+    if bulk_import is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bulk import {bulk_import_id} not found",
+        )
+
+    # Return the bulk import
+    return bulk_import
@@ -0,0 +1,63 @@
+from pydantic import BaseModel
+
+
+class ActivityBulkImportFile(BaseModel):
+    """
+    Represents a file queued in a bulk import.
+
+    Attributes:
+        id (int | None): Unique identifier of the file.
+        bulk_import_id (int | None): Identifier of the bulk import the file belongs to.
+        file_path (str): Path of the file to import.
+        status (int): File status (0 - queued, 1 - parsing, 2 - stored, 3 - error).
+        activity_ids (str | None): Comma separated IDs of the activities created from the file.
+        error (str | None): Error message if the file could not be imported.
+        updated_at (str | None): Timestamp of the last status change.
+    """
+
+    id: int | None = None
+    bulk_import_id: int | None = None
+    file_path: str
+    status: int = 0
+    activity_ids: str | None = None
+    error: str | None = None
+    updated_at: str | None = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ActivityBulkImport(BaseModel):
+    """
+    Represents a bulk import job and its progress.
+
+    Attributes:
+        id (int | None): Unique identifier of the bulk import.
+        user_id (int | None): Identifier of the user that started the bulk import.
+        status (int): Bulk import status (0 - running, 1 - completed).
+        total_files (int): Number of files queued in the bulk import.
+        queued_files (int): Number of files waiting to be imported.
+        parsing_files (int): Number of files being imported.
+        stored_files (int): Number of files imported successfully.
+        error_files (int): Number of files that could not be imported.
+        created_at (str | None): Timestamp of when the bulk import was created.
+        finished_at (str | None): Timestamp of when the bulk import completed.
+        files (list[ActivityBulkImportFile] | None): Files of the bulk import, if requested.
+    """
+
+    id: int | None = None
+    user_id: int | None = None
+    status: int = 0
+    total_files: int = 0
+    queued_files: int = 0
+    parsing_files: int = 0
+    stored_files: int = 0
+    error_files: int = 0
+    created_at: str | None = None
+    finished_at: str | None = None
+    files: list[ActivityBulkImportFile] | None = None
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -0,0 +1,366 @@
+import asyncio
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from core.database import SessionLocal
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+import activities.activity.utils as activities_utils
+
+import activities.activity_bulk_imports.constants as activity_bulk_imports_constants
+import activities.activity_bulk_imports.crud as activity_bulk_imports_crud
+import activities.activity_bulk_imports.models as activity_bulk_imports_models
+
+import websocket.utils as websocket_utils
+import websocket.schema as websocket_schema
+
+import core.config as core_config
+import core.locks as core_locks
+import core.logger as core_logger
+import core.thread_pool as core_thread_pool
+
+# Bulk import worker tasks running in this process
+workers: list[asyncio.Task] = []
+
+# Lock held by this process while it parses bulk import files, recorded in
+# the files it claims
+OWNER_LOCK_NAME = (
+    f"{activity_bulk_imports_constants.OWNER_LOCK_PREFIX}{uuid.uuid4().hex}"
+)
+
+# Connection holding the owner lock, None until this process claims a file
+owner_connection: Connection | None = None
+owner_connection_lock = threading.Lock()
+
+
+def get_bulk_import_file_paths() -> list[str]:
+    """
+    Lists the supported activity files of the bulk import directory.
+
+    Returns:
+        list[str]: The paths of the files, sorted by name.
+    """
+    # Ensure the 'bulk_import' directory exists
+    bulk_import_dir = core_config.FILES_BULK_IMPORT_DIR
+    os.makedirs(bulk_import_dir, exist_ok=True)
+
+    # Grab list of supported file formats
+    supported_file_formats = core_config.SUPPORTED_FILE_FORMATS
+
+    # Iterate over each file in the 'bulk_import' directory
+    file_paths = []
+    for filename in sorted(os.listdir(bulk_import_dir)):
+        file_path = os.path.join(bulk_import_dir, filename)
+
+        # Check if file is one we can process
+        _, file_extension = os.path.splitext(file_path)
+        if file_extension not in supported_file_formats:
+            core_logger.print_to_log_and_console(
+                f"Skipping file {file_path} due to not having a supported file extension. Supported extensions are: {supported_file_formats}."
+            )
+            continue
+
+        if os.path.isfile(file_path):
+            # Log the file being processed
+            core_logger.print_to_log_and_console(
+                f"Queuing file for processing: {file_path}"
+            )
+            file_paths.append(file_path)
+
+    return file_paths
+
+
+def start_bulk_import_workers(websocket_manager: websocket_schema.WebSocketManager):
+    """
+    Starts bulk import workers until BULK_IMPORT_WORKERS are running.
+
+    Workers take queued files from the database until the queue is empty, so
+    calling this again while they run only replaces the ones that finished.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send progress events.
+    """
+    # Forget the workers that already finished
+    workers[:] = [worker for worker in workers if not worker.done()]
+
+    for _ in range(core_config.BULK_IMPORT_WORKERS - len(workers)):
+        workers.append(asyncio.create_task(run_bulk_import_worker(websocket_manager)))
+
+
+async def run_bulk_import_worker(websocket_manager: websocket_schema.WebSocketManager):
+    """
+    Imports queued bulk import files until the queue is empty.
+
+    Each file is imported with its own database session.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send progress events.
+    """
+    while True:
+        # Create a new database session
+        db = SessionLocal()
+
+        try:
+            claimed_by = await core_thread_pool.run_in_thread_pool(hold_owner_lock)
+            bulk_import_file = await core_thread_pool.run_in_thread_pool(
+                activity_bulk_imports_crud.claim_next_queued_file, db, claimed_by
+            )
+
+            # Stop the worker if there are no queued files
+            if bulk_import_file is None:
+                return
+
+            await import_bulk_import_file(bulk_import_file, websocket_manager, db)
+        except Exception as err:
+            # Log the exception and stop the worker, the file stays in the queue
+            core_logger.print_to_log(
+                f"Error in run_bulk_import_worker: {err}", "error", exc=err
+            )
+            return
+        finally:
+            # Ensure the session is closed after use
+            db.close()
+
+
+async def import_bulk_import_file(
+    bulk_import_file: activity_bulk_imports_models.ActivityBulkImportFile,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+):
+    """
+    Imports a claimed bulk import file and records its status.
+
+    Args:
+        bulk_import_file (activity_bulk_imports_models.ActivityBulkImportFile): The claimed file.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send progress events.
+        db (Session): The SQLAlchemy database session.
+    """
+    # Keep the values needed after the import, the session may be rolled back meanwhile
+    bulk_import_file_id = bulk_import_file.id
+    bulk_import_id = bulk_import_file.bulk_import_id
+    file_path = bulk_import_file.file_path
+    user_id = bulk_import_file.bulk_import.user_id
+
+    await notify_bulk_import_progress(
+        user_id,
+        bulk_import_id,
+        file_path,
+        activity_bulk_imports_constants.FILE_STATUS_PARSING,
+        websocket_manager,
+        db,
+    )
+
+    activity_ids = None
+    error = None
+    if not os.path.isfile(file_path):
+        error = "File not found"
+    else:
+        # Parse and store the activity
+        created_activities = await activities_utils.parse_and_store_activity_from_file(
+            user_id, file_path, websocket_manager, db
+        )
+
+        if created_activities:
+            activity_ids = ",".join(str(activity.id) for activity in created_activities)
+        else:
+            error = f"Import failed, file moved to {core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR}"
+
+    file_status = (
+        activity_bulk_imports_constants.FILE_STATUS_ERROR
+        if error
+        else activity_bulk_imports_constants.FILE_STATUS_STORED
+    )
+    await core_thread_pool.run_in_thread_pool(
+        activity_bulk_imports_crud.edit_bulk_import_file_status,
+        bulk_import_file_id,
+        file_status,
+        db,
+        activity_ids,
+        error,
+    )
+
+    await notify_bulk_import_progress(
+        user_id, bulk_import_id, file_path, file_status, websocket_manager, db
+    )
+
+    # Mark the bulk import as completed if this was its last file
+    if await core_thread_pool.run_in_thread_pool(
+        activity_bulk_imports_crud.complete_bulk_import_if_finished, bulk_import_id, db
+    ):
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Bulk import {bulk_import_id} completed"
+        )
+        await notify_bulk_import_progress(
+            user_id, bulk_import_id, None, None, websocket_manager, db
+        )
+
+
+async def notify_bulk_import_progress(
+    user_id: int,
+    bulk_import_id: int,
+    file_path: str | None,
+    file_status: int | None,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+):
+    """
+    Sends the progress of a bulk import to the user's websockets.
+
+    Args:
+        user_id (int): The ID of the user that owns the bulk import.
+        bulk_import_id (int): The ID of the bulk import.
+        file_path (str | None): The file whose status changed (None when the bulk import completed).
+        file_status (int | None): The new status of the file.
+        websocket_manager (websocket_schema.WebSocketManager): The manager handling WebSocket connections.
+        db (Session): The SQLAlchemy database session.
+    """
+    try:
+        bulk_import = await core_thread_pool.run_in_thread_pool(
+            activity_bulk_imports_crud.get_user_bulk_import_by_id,
+            bulk_import_id,
+            user_id,
+            db,
+            include_files=False,
+        )
+        if bulk_import is None:
+            return
+
+        json_data = {
+            "message": (
+                "BULK_IMPORT_COMPLETED" if file_path is None else "BULK_IMPORT_PROGRESS"
+            ),
+            "bulk_import_id": bulk_import_id,
+            "file_name": os.path.basename(file_path) if file_path else None,
+            "file_status": file_status,
+            "total_files": bulk_import.total_files,
+            "queued_files": bulk_import.queued_files,
+            "parsing_files": bulk_import.parsing_files,
+            "stored_files": bulk_import.stored_files,
+            "error_files": bulk_import.error_files,
+        }
+        await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
+    except Exception as err:
+        # Progress events are best effort, the import goes on without them
+        core_logger.print_to_log(
+            f"Error in notify_bulk_import_progress: {err}", "warning"
+        )
+
+
+def hold_owner_lock() -> str:
+    """
+    Takes the owner lock of this process if it doesn't hold it yet.
+
+    The lock is held until the process stops, so the database releases it
+    if the process dies and its files can be queued again at once.
+
+    Returns:
+        str: The owner lock name, to record in the claimed files.
+
+    Raises:
+        RuntimeError: If another connection holds the owner lock.
+    """
+    global owner_connection
+
+    with owner_connection_lock:
+        if owner_connection is None or not core_locks.is_lock_alive(
+            owner_connection
+        ):
+            owner_connection = core_locks.acquire_lock(OWNER_LOCK_NAME)
+            if owner_connection is None:
+                raise RuntimeError(f"Lock {OWNER_LOCK_NAME} is held elsewhere")
+
+    return OWNER_LOCK_NAME
+
+
+def release_owner_lock():
+    """
+    Releases the owner lock of this process, called on shutdown.
+
+    The files left in parsing are then queued again by the other processes.
+    """
+    global owner_connection
+
+    with owner_connection_lock:
+        if owner_connection is not None:
+            core_locks.release_lock(owner_connection, OWNER_LOCK_NAME)
+            owner_connection = None
+
+
+def is_owner_alive(owner: str) -> bool:
+    """
+    Checks if the process that recorded an owner lock still holds it.
+
+    Args:
+        owner (str): The owner lock recorded in a claimed file.
+
+    Returns:
+        bool: False if the lock is free, its process died or stopped.
+    """
+    if owner == OWNER_LOCK_NAME:
+        return True
+
+    connection = core_locks.acquire_lock(owner)
+    if connection is None:
+        return True
+
+    core_locks.release_lock(connection, owner)
+    return False
+
+
+def requeue_interrupted_bulk_imports() -> bool:
+    """
+    Queues again the files being parsed by processes that died.
+
+    Files without an owner are queued again after PARSING_LEASE_SECONDS.
+
+    Returns:
+        bool: Whether there are queued files to import.
+    """
+    # Create a new database session
+    db = SessionLocal()
+
+    try:
+        dead_owners = [
+            owner
+            for owner in activity_bulk_imports_crud.get_parsing_files_owners(db)
+            if not is_owner_alive(owner)
+        ]
+        requeued = activity_bulk_imports_crud.requeue_interrupted_files(
+            db,
+            dead_owners,
+            datetime.now()
+            - timedelta(
+                seconds=activity_bulk_imports_constants.PARSING_LEASE_SECONDS
+            ),
+        )
+        if requeued:
+            core_logger.print_to_log_and_console(
+                f"Bulk file import: {requeued} interrupted files queued again"
+            )
+
+        return activity_bulk_imports_crud.has_queued_files(db)
+    finally:
+        # Ensure the session is closed after use
+        db.close()
+
+
+async def resume_bulk_imports(websocket_manager: websocket_schema.WebSocketManager):
+    """
+    Resumes the bulk imports interrupted by a restart or crash.
+
+    Files still being parsed by a process that died are queued again, and
+    workers are started if there are queued files. Run by every process at
+    startup and periodically by the scheduler leader, files of a process that
+    died are picked up by the other processes.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send progress events.
+    """
+    if await core_thread_pool.run_in_thread_pool(requeue_interrupted_bulk_imports):
+        core_logger.print_to_log_and_console(
+            "Bulk file import: Resuming queued bulk imports"
+        )
+        start_bulk_import_workers(websocket_manager)
@@ -180,65 +180,85 @@ def get_public_activity_laps(activity_id: int, db: Session):
         ) from err
 
 
+def create_activity_laps_objects(
+    activity_laps: list[activity_laps_schema.ActivityLaps],
+    activity_id: int | None = None,
+) -> list[activity_laps_models.ActivityLaps]:
+    """
+    Builds the ActivityLaps objects of an activity, without adding them to the session.
+
+    Args:
+        activity_laps (list[activity_laps_schema.ActivityLaps]): The laps to build.
+        activity_id (int | None): The ID of the activity. None if the laps are
+            attached to a new activity through its relationship.
+
+    Returns:
+        list[activity_laps_models.ActivityLaps]: The ActivityLaps objects.
+    """
+    # Create a list to store the ActivityLaps objects
+    laps = []
+
+    # Iterate over the list of ActivityLaps objects
+    for lap in activity_laps:
+        # Create an ActivityLaps object
+        db_stream = activity_laps_models.ActivityLaps(
+            activity_id=activity_id,
+            **{
+                key: lap.get(key)
+                for key in [
+                    "start_time",
+                    "start_position_lat",
+                    "start_position_long",
+                    "end_position_lat",
+                    "end_position_long",
+                    "total_elapsed_time",
+                    "total_timer_time",
+                    "total_distance",
+                    "total_cycles",
+                    "total_calories",
+                    "avg_heart_rate",
+                    "max_heart_rate",
+                    "avg_cadence",
+                    "max_cadence",
+                    "avg_power",
+                    "max_power",
+                    "total_ascent",
+                    "total_descent",
+                    "intensity",
+                    "lap_trigger",
+                    "sport",
+                    "sub_sport",
+                    "normalized_power",
+                    "total_work",
+                    "avg_vertical_oscillation",
+                    "avg_stance_time",
+                    "avg_fractional_cadence",
+                    "max_fractional_cadence",
+                    "enhanced_avg_pace",
+                    "enhanced_avg_speed",
+                    "enhanced_max_pace",
+                    "enhanced_max_speed",
+                    "enhanced_min_altitude",
+                    "enhanced_max_altitude",
+                    "avg_vertical_ratio",
+                    "avg_step_length",
+                ]
+            },
+        )
+
+        # Append the object to the list
+        laps.append(db_stream)
+
+    return laps
+
+
 def create_activity_laps(
     activity_laps: list[activity_laps_schema.ActivityLaps],
     activity_id: int,
     db: Session,
 ):
     try:
-        # Create a list to store the ActivityLaps objects
-        laps = []
-
-        # Iterate over the list of ActivityLaps objects
-        for lap in activity_laps:
-            # Create an ActivityLaps object
-            db_stream = activity_laps_models.ActivityLaps(
-                activity_id=activity_id,
-                **{
-                    key: lap.get(key)
-                    for key in [
-                        "start_time",
-                        "start_position_lat",
-                        "start_position_long",
-                        "end_position_lat",
-                        "end_position_long",
-                        "total_elapsed_time",
-                        "total_timer_time",
-                        "total_distance",
-                        "total_cycles",
-                        "total_calories",
-                        "avg_heart_rate",
-                        "max_heart_rate",
-                        "avg_cadence",
-                        "max_cadence",
-                        "avg_power",
-                        "max_power",
-                        "total_ascent",
-                        "total_descent",
-                        "intensity",
-                        "lap_trigger",
-                        "sport",
-                        "sub_sport",
-                        "normalized_power",
-                        "total_work",
-                        "avg_vertical_oscillation",
-                        "avg_stance_time",
-                        "avg_fractional_cadence",
-                        "max_fractional_cadence",
-                        "enhanced_avg_pace",
-                        "enhanced_avg_speed",
-                        "enhanced_max_pace",
-                        "enhanced_max_speed",
-                        "enhanced_min_altitude",
-                        "enhanced_max_altitude",
-                        "avg_vertical_ratio",
-                        "avg_step_length",
-                    ]
-                },
-            )
-
-            # Append the object to the list
-            laps.append(db_stream)
+        laps = create_activity_laps_objects(activity_laps, activity_id)
 
         # Bulk insert the list of ActivityLaps objects
         db.bulk_save_objects(laps)
@@ -248,7 +268,7 @@ def create_activity_laps(
         db.rollback()
 
         # Log the exception
-        core_logger(f"Error in create_activity_laps: {err}", "error", exc=err)
+        core_logger.print_to_log(f"Error in create_activity_laps: {err}", "error", exc=err)
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -20,7 +20,7 @@ router = APIRouter()
     "/activity_id/{activity_id}/all",
     response_model=list[activity_laps_schema.ActivityLaps] | None,
 )
-async def read_activities_laps_for_activity_all(
+def read_activities_laps_for_activity_all(
     activity_id: int,
     validate_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
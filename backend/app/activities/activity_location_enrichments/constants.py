@@ -0,0 +1,12 @@
+# Attempts before an activity location is given up on
+MAX_ATTEMPTS = 8
+
+# Seconds before the first retry, doubled on each failed attempt
+RETRY_DELAY_SECONDS = 60
+MAX_RETRY_DELAY_SECONDS = 6 * 60 * 60
+
+# Seconds a claimed enrichment is reserved for the worker that claimed it
+CLAIM_LEASE_SECONDS = 5 * 60
+
+# Maximum seconds the worker sleeps waiting for the next retry
+MAX_IDLE_SECONDS = 60
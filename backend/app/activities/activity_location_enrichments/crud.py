@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import activities.activity.models as activities_models
+
+import activities.activity_location_enrichments.constants as activity_location_enrichments_constants
+import activities.activity_location_enrichments.models as activity_location_enrichments_models
+
+import core.logger as core_logger
+
+
+def claim_next_location_enrichment(
+    db: Session,
+) -> activity_location_enrichments_models.ActivityLocationEnrichment | None:
+    """
+    Claim the oldest location enrichment that is due.
+
+    The row is locked with SKIP LOCKED and its next attempt is pushed back by
+    CLAIM_LEASE_SECONDS, so other workers skip it while it is resolved and it
+    is retried if the worker dies.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        activity_location_enrichments_models.ActivityLocationEnrichment | None: The claimed enrichment, or None if none is due.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while claiming the enrichment.
+    """
+    try:
+        now = datetime.now()
+        enrichment = (
+            db.query(activity_location_enrichments_models.ActivityLocationEnrichment)
+            .filter(
+                activity_location_enrichments_models.ActivityLocationEnrichment.next_attempt_at
+                <= now
+            )
+            .order_by(
+                activity_location_enrichments_models.ActivityLocationEnrichment.next_attempt_at,
+                activity_location_enrichments_models.ActivityLocationEnrichment.id,
+            )
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        # Check if there is an enrichment due and return None if not
+        if enrichment is None:
+            db.rollback()
+            return None
+
+        # Reserve the enrichment for this worker
+        enrichment.next_attempt_at = now + timedelta(
+            seconds=activity_location_enrichments_constants.CLAIM_LEASE_SECONDS
+        )
+        db.commit()
+        db.refresh(enrichment)
+
+        # Return the claimed enrichment
+        return enrichment
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in claim_next_location_enrichment: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_next_location_enrichment_date(db: Session) -> datetime | None:
+    """
+    Get the date of the next location enrichment attempt.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        datetime | None: The date of the next attempt, or None if no location is pending.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        # Return the earliest next attempt date
+        return db.query(
+            func.min(
+                activity_location_enrichments_models.ActivityLocationEnrichment.next_attempt_at
+            )
+        ).scalar()
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_next_location_enrichment_date: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def complete_location_enrichment(
+    enrichment_id: int, activity_id: int, location: dict, db: Session
+):
+    """
+    Back-fill the activity location and remove the enrichment, in one transaction.
+
+    Args:
+        enrichment_id (int): The ID of the location enrichment.
+        activity_id (int): The ID of the activity.
+        location (dict): The city, town and country of the activity.
+        db (Session): The SQLAlchemy database session.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the activity.
+    """
+    try:
+        db.query(activities_models.Activity).filter(
+            activities_models.Activity.id == activity_id
+        ).update(
+            {
+                activities_models.Activity.city: location.get("city"),
+                activities_models.Activity.town: location.get("town"),
+                activities_models.Activity.country: location.get("country"),
+            },
+            synchronize_session=False,
+        )
+        db.query(
+            activity_location_enrichments_models.ActivityLocationEnrichment
+        ).filter(
+            activity_location_enrichments_models.ActivityLocationEnrichment.id
+            == enrichment_id
+        ).delete(synchronize_session=False)
+
+        # Commit the transaction
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in complete_location_enrichment: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def fail_location_enrichment(enrichment_id: int, db: Session) -> bool:
+    """
+    Record a failed attempt, scheduling a retry with exponential backoff.
+
+    The enrichment is deleted after MAX_ATTEMPTS, leaving the activity
+    without a location.
+
+    Args:
+        enrichment_id (int): The ID of the location enrichment.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        bool: True if a retry was scheduled, False if the enrichment was given up.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the enrichment.
+    """
+    try:
+        enrichment = (
+            db.query(activity_location_enrichments_models.ActivityLocationEnrichment)
+            .filter(
+                activity_location_enrichments_models.ActivityLocationEnrichment.id
+                == enrichment_id
+            )
+            .first()
+        )
+
+        if enrichment is None:
+            return False
+
+        enrichment.attempts += 1
+        retry = (
+            enrichment.attempts
+            < activity_location_enrichments_constants.MAX_ATTEMPTS
+        )
+
+        if retry:
+            enrichment.next_attempt_at = datetime.now() + timedelta(
+                seconds=min(
+                    activity_location_enrichments_constants.RETRY_DELAY_SECONDS
+                    * 2 ** (enrichment.attempts - 1),
+                    activity_location_enrichments_constants.MAX_RETRY_DELAY_SECONDS,
+                )
+            )
+        else:
+            db.delete(enrichment)
+
+        # Commit the transaction
+        db.commit()
+
+        return retry
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in fail_location_enrichment: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, DECIMAL
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class ActivityLocationEnrichment(Base):
+    __tablename__ = "activities_location_enrichments"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    activity_id = Column(
+        Integer,
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+        comment="Activity ID whose location is pending",
+    )
+    latitude = Column(
+        DECIMAL(precision=20, scale=10),
+        nullable=False,
+        comment="Latitude used to resolve the activity location",
+    )
+    longitude = Column(
+        DECIMAL(precision=20, scale=10),
+        nullable=False,
+        comment="Longitude used to resolve the activity location",
+    )
+    attempts = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of failed attempts to resolve the location",
+    )
+    next_attempt_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        index=True,
+        comment="Date from which the location can be resolved (DateTime)",
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        comment="Enrichment creation date (DateTime)",
+    )
+
+    # Define a relationship to the Activity model
+    activity = relationship("Activity")
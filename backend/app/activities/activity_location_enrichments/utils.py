@@ -0,0 +1,222 @@
+import asyncio
+from datetime import datetime
+
+from core.database import SessionLocal
+from sqlalchemy.orm import Session
+
+import activities.activity.utils as activities_utils
+
+import activities.activity_location_enrichments.constants as activity_location_enrichments_constants
+import activities.activity_location_enrichments.crud as activity_location_enrichments_crud
+import activities.activity_location_enrichments.models as activity_location_enrichments_models
+
+import websocket.utils as websocket_utils
+import websocket.schema as websocket_schema
+
+import core.logger as core_logger
+import core.thread_pool as core_thread_pool
+
+# Location enrichment worker task running in this process
+worker: asyncio.Task | None = None
+
+
+def create_location_enrichment_object(
+    parsed_info: dict, activity_id: int
+) -> activity_location_enrichments_models.ActivityLocationEnrichment | None:
+    """
+    Builds the pending location enrichment of a parsed activity.
+
+    Args:
+        parsed_info (dict): The parsed activity.
+        activity_id (int): The ID of the activity.
+
+    Returns:
+        activity_location_enrichments_models.ActivityLocationEnrichment | None: The
+        enrichment, or None if the activity already has a location or has no coordinates.
+    """
+    activity = parsed_info["activity"]
+    if activity.city or activity.town or activity.country:
+        return None
+
+    # The location is resolved from the first waypoint
+    lat_lon_waypoints = parsed_info.get("lat_lon_waypoints")
+    if not parsed_info.get("is_lat_lon_set") or not lat_lon_waypoints:
+        return None
+
+    first_waypoint = lat_lon_waypoints[0]
+    if first_waypoint.get("lat") is None or first_waypoint.get("lon") is None:
+        return None
+
+    return activity_location_enrichments_models.ActivityLocationEnrichment(
+        activity_id=activity_id,
+        latitude=first_waypoint["lat"],
+        longitude=first_waypoint["lon"],
+        attempts=0,
+        next_attempt_at=datetime.now(),
+    )
+
+
+def start_location_enrichment_worker(
+    websocket_manager: websocket_schema.WebSocketManager | None,
+):
+    """
+    Starts the location enrichment worker, if it is not running.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send location updates.
+    """
+    global worker
+
+    if worker is None or worker.done():
+        worker = asyncio.create_task(
+            run_location_enrichment_worker(
+                websocket_manager or websocket_schema.get_websocket_manager()
+            )
+        )
+
+
+async def run_location_enrichment_worker(
+    websocket_manager: websocket_schema.WebSocketManager,
+):
+    """
+    Resolves pending activity locations until none is left.
+
+    Locations are resolved one at a time, under the reverse geocoding rate
+    limit. Failed attempts are retried later with exponential backoff.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send location updates.
+    """
+    while True:
+        # Create a new database session
+        db = SessionLocal()
+
+        try:
+            enrichment = await core_thread_pool.run_in_thread_pool(
+                activity_location_enrichments_crud.claim_next_location_enrichment, db
+            )
+
+            if enrichment is None:
+                next_attempt_at = await core_thread_pool.run_in_thread_pool(
+                    activity_location_enrichments_crud.get_next_location_enrichment_date,
+                    db,
+                )
+
+                # Stop the worker if there are no pending locations
+                if next_attempt_at is None:
+                    return
+
+                # Wait for the next retry
+                await asyncio.sleep(
+                    min(
+                        max((next_attempt_at - datetime.now()).total_seconds(), 1),
+                        activity_location_enrichments_constants.MAX_IDLE_SECONDS,
+                    )
+                )
+                continue
+
+            await enrich_activity_location(enrichment, websocket_manager, db)
+        except Exception as err:
+            # Log the exception and stop the worker, the location stays pending
+            core_logger.print_to_log(
+                f"Error in run_location_enrichment_worker: {err}", "error", exc=err
+            )
+            return
+        finally:
+            # Ensure the session is closed after use
+            db.close()
+
+
+async def enrich_activity_location(
+    enrichment: activity_location_enrichments_models.ActivityLocationEnrichment,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+):
+    """
+    Resolves the location of a claimed enrichment and back-fills the activity.
+
+    Args:
+        enrichment (activity_location_enrichments_models.ActivityLocationEnrichment): The claimed enrichment.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send location updates.
+        db (Session): The SQLAlchemy database session.
+    """
+    enrichment_id = enrichment.id
+    activity_id = enrichment.activity_id
+    user_id = enrichment.activity.user_id
+
+    try:
+        # The provider call and the rate limit wait run outside the event loop
+        location = await core_thread_pool.run_in_thread_pool(
+            activities_utils.location_based_on_coordinates,
+            float(enrichment.latitude),
+            float(enrichment.longitude),
+        )
+    except Exception as err:
+        retry = await core_thread_pool.run_in_thread_pool(
+            activity_location_enrichments_crud.fail_location_enrichment,
+            enrichment_id,
+            db,
+        )
+        core_logger.print_to_log(
+            f"Location of activity {activity_id} not resolved, {'will retry' if retry else 'giving up'}: {err}",
+            "warning",
+        )
+        return
+
+    await core_thread_pool.run_in_thread_pool(
+        activity_location_enrichments_crud.complete_location_enrichment,
+        enrichment_id,
+        activity_id,
+        location,
+        db,
+    )
+
+    try:
+        # Let the frontend update the activity
+        await websocket_utils.notify_frontend(
+            user_id,
+            websocket_manager,
+            {
+                "message": "ACTIVITY_LOCATION_UPDATED",
+                "activity_id": activity_id,
+                "city": location.get("city"),
+                "town": location.get("town"),
+                "country": location.get("country"),
+            },
+        )
+    except Exception as err:
+        # Location updates are best effort, the activity is already updated
+        core_logger.print_to_log(
+            f"Error notifying the location of activity {activity_id}: {err}", "warning"
+        )
+
+
+def has_pending_location_enrichments() -> bool:
+    """Helper function to check, in a new session, if there are pending locations."""
+    # Create a new database session
+    db = SessionLocal()
+
+    try:
+        return (
+            activity_location_enrichments_crud.get_next_location_enrichment_date(db)
+            is not None
+        )
+    finally:
+        # Ensure the session is closed after use
+        db.close()
+
+
+async def resume_location_enrichments(
+    websocket_manager: websocket_schema.WebSocketManager,
+):
+    """
+    Starts the location enrichment worker if there are pending locations.
+
+    Args:
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send location updates.
+    """
+    if await core_thread_pool.run_in_thread_pool(has_pending_location_enrichments):
+        core_logger.print_to_log_and_console(
+            "Resuming pending activity location enrichments"
+        )
+        start_location_enrichment_worker(websocket_manager)
@@ -26,7 +26,7 @@ router = APIRouter()
     "/activity_id/{activity_id}",
     response_model=list[activity_media_schema.ActivityMedia] | None,
 )
-async def read_activities_media_user(
+def read_activities_media_user(
     activity_id: int,
     validate_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
@@ -50,7 +50,7 @@ async def read_activities_media_user(
     "/upload/activity_id/{activity_id}",
     status_code=201,
 )
-async def upload_media(
+def upload_media(
     file: UploadFile,
     activity_id: int,
     validate_id: Annotated[
@@ -93,7 +93,7 @@ async def upload_media(
 @router.delete(
     "/{media_id}",
 )
-async def delete_activity_media(
+def delete_activity_media(
     media_id: int,
     validate_id: Annotated[
         Callable, Depends(activities_media_dependencies.validate_media_id)
@@ -181,63 +181,83 @@ def get_public_activity_sets(activity_id: int, db: Session):
         ) from err
 
 
+def create_activity_sets_objects(
+    activity_sets: list,
+    activity_id: int | None = None,
+) -> list[activity_sets_models.ActivitySets]:
+    """
+    Builds the ActivitySets objects of an activity, without adding them to the session.
+
+    Args:
+        activity_sets (list): The sets to build, as schemas or parsed FIT tuples.
+        activity_id (int | None): The ID of the activity. None if the sets are
+            attached to a new activity through its relationship.
+
+    Returns:
+        list[activity_sets_models.ActivitySets]: The ActivitySets objects.
+    """
+    # Create a list to store the ActivitySets objects
+    sets = []
+
+    # Iterate over the list of ActivitySets objects
+    for activity_set in activity_sets:
+        # Check if it's a Pydantic model (has attributes instead of being subscriptable)
+        if hasattr(activity_set, '__fields__'):
+            duration = activity_set.duration
+            repetitions = activity_set.repetitions
+            weight = activity_set.weight
+            set_type = activity_set.set_type
+            start_time = activity_set.start_time
+            category = activity_set.category if activity_set.category else None
+            category_subtype = activity_set.category_subtype if activity_set.category_subtype else None
+        else:
+            duration = activity_set[0]
+            repetitions = activity_set[1]
+            weight = activity_set[2]
+            set_type = activity_set[3]
+            start_time = activity_set[4]
+            # Handle category - check if it's a tuple
+            if activity_set[5] is not None:
+                if isinstance(activity_set[5], tuple):
+                    category = activity_set[5][0] if activity_set[5][0] is not None else None
+                else:
+                    category = activity_set[5]
+            else:
+                category = None
+            # Handle category_subtype - check if it's a tuple
+            if activity_set[6] is not None:
+                if isinstance(activity_set[6], tuple):
+                    category_subtype = activity_set[6][0] if activity_set[6][0] is not None else None
+                else:
+                    category_subtype = activity_set[6]
+            else:
+                category_subtype = None
+
+        # Create a new ActivitySets object
+        db_activity_set = activity_sets_models.ActivitySets(
+            activity_id=activity_id,
+            duration=duration,
+            repetitions=repetitions,
+            weight=weight,
+            set_type=set_type,
+            start_time=start_time,
+            category=category,
+            category_subtype=category_subtype,
+        )
+
+        # Append the object to the list
+        sets.append(db_activity_set)
+
+    return sets
+
+
 def create_activity_sets(
     activity_sets: list,
     activity_id: int,
     db: Session,
 ):
     try:
-        # Create a list to store the ActivitySets objects
-        sets = []
-
-        # Iterate over the list of ActivitySets objects
-        for activity_set in activity_sets:
-            # Check if it's a Pydantic model (has attributes instead of being subscriptable)
-            if hasattr(activity_set, '__fields__'):
-                duration = activity_set.duration
-                repetitions = activity_set.repetitions
-                weight = activity_set.weight
-                set_type = activity_set.set_type
-                start_time = activity_set.start_time
-                category = activity_set.category if activity_set.category else None
-                category_subtype = activity_set.category_subtype if activity_set.category_subtype else None
-            else:
-                duration = activity_set[0]
-                repetitions = activity_set[1]
-                weight = activity_set[2]
-                set_type = activity_set[3]
-                start_time = activity_set[4]
-                # Handle category - check if it's a tuple
-                if activity_set[5] is not None:
-                    if isinstance(activity_set[5], tuple):
-                        category = activity_set[5][0] if activity_set[5][0] is not None else None
-                    else:
-                        category = activity_set[5]
-                else:
-                    category = None
-                # Handle category_subtype - check if it's a tuple
-                if activity_set[6] is not None:
-                    if isinstance(activity_set[6], tuple):
-                        category_subtype = activity_set[6][0] if activity_set[6][0] is not None else None
-                    else:
-                        category_subtype = activity_set[6]
-                else:
-                    category_subtype = None
-
-            # Create a new ActivitySets object
-            db_activity_set = activity_sets_models.ActivitySets(
-                activity_id=activity_id,
-                duration=duration,
-                repetitions=repetitions,
-                weight=weight,
-                set_type=set_type,
-                start_time=start_time,
-                category=category,
-                category_subtype=category_subtype,
-            )
-
-            # Append the object to the list
-            sets.append(db_activity_set)
+        sets = create_activity_sets_objects(activity_sets, activity_id)
 
         # Bulk insert the list of ActivitySets objects
         db.bulk_save_objects(sets)
@@ -5,4 +5,7 @@ STREAM_TYPE_CADENCE = 3
 STREAM_TYPE_ELEVATION = 4
 STREAM_TYPE_SPEED = 5
 STREAM_TYPE_PACE = 6
-STREAM_TYPE_MAP = 7
\ No newline at end of file
+STREAM_TYPE_MAP = 7
+
+# Maximum number of points of each precomputed stream level of detail
+STREAM_LOD_MAX_POINTS = (500, 1000, 2000, 5000)
@@ -6,6 +6,7 @@ import datetime
 import activities.activity_streams.constants as activity_streams_constants
 import activities.activity_streams.schema as activity_streams_schema
 import activities.activity_streams.models as activity_streams_models
+import activities.activity_streams.utils as activity_streams_utils
 
 import activities.activity.crud as activity_crud
 import activities.activity.models as activity_models
@@ -19,7 +20,7 @@ import core.logger as core_logger
 
 
 def get_activity_streams(
-    activity_id: int, token_user_id: int, db: Session
+    activity_id: int, token_user_id: int, db: Session, max_points: int | None = None
 ) -> list[activity_streams_schema.ActivityStreams] | None:
     try:
         activity = activity_crud.get_activity_by_id(activity_id, db)
@@ -89,10 +90,14 @@ def get_activity_streams(
             ]
 
         # Return the activity streams
-        return [
-            transform_activity_streams(stream, activity, db)
-            for stream in activity_streams
-        ]
+        return get_activity_streams_resolution(
+            [
+                transform_activity_streams(stream, activity, db)
+                for stream in activity_streams
+            ],
+            max_points,
+            db,
+        )
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -164,7 +169,9 @@ def get_activities_streams(
         ) from err
 
 
-def get_public_activity_streams(activity_id: int, db: Session):
+def get_public_activity_streams(
+    activity_id: int, db: Session, max_points: int | None = None
+):
     try:
         # Check if public sharable links are enabled in server settings
         server_settings = server_settings_utils.get_server_settings(db)
@@ -240,10 +247,14 @@ def get_public_activity_streams(activity_id: int, db: Session):
         ]
 
         # Return the activity streams
-        return [
-            transform_activity_streams(stream, activity, db)
-            for stream in activity_streams
-        ]
+        return get_activity_streams_resolution(
+            [
+                transform_activity_streams(stream, activity, db)
+                for stream in activity_streams
+            ],
+            max_points,
+            db,
+        )
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -257,7 +268,11 @@ def get_public_activity_streams(activity_id: int, db: Session):
 
 
 def get_activity_stream_by_type(
-    activity_id: int, stream_type: int, token_user_id: int, db: Session
+    activity_id: int,
+    stream_type: int,
+    token_user_id: int,
+    db: Session,
+    max_points: int | None = None,
 ):
     try:
         activity = activity_crud.get_activity_by_id(activity_id, db)
@@ -329,7 +344,11 @@ def get_activity_stream_by_type(
                 return None
 
         # Return the activity stream
-        return transform_activity_streams(activity_stream, activity, db)
+        return get_activity_streams_resolution(
+            [transform_activity_streams(activity_stream, activity, db)],
+            max_points,
+            db,
+        )[0]
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -342,6 +361,81 @@ def get_activity_stream_by_type(
         ) from err
 
 
+def get_activity_streams_resolution(
+    activity_streams: list, max_points: int | None, db: Session
+) -> list:
+    """
+    Downsamples activity streams to at most `max_points` waypoints.
+
+    The largest precomputed level of detail that fits in `max_points` is used.
+    If there is none, the stream is downsampled on the fly. Streams that
+    already fit, or that are stored as JSON, are returned unchanged.
+    Args:
+        activity_streams: The (already transformed) activity stream objects.
+        max_points: Maximum number of waypoints per stream, or None for full resolution.
+        db: The database session.
+    Returns:
+        A list with the same order as `activity_streams` where downsampled
+        streams are replaced by `ActivityStreams` schema objects.
+    """
+    if max_points is None:
+        return activity_streams
+
+    # Streams that have more samples than requested
+    streams_to_downsample = [
+        stream
+        for stream in activity_streams
+        if stream.stream_waypoints_packed is not None
+        and activity_streams_utils.get_packed_stream_samples(
+            stream.stream_waypoints_packed
+        )
+        > max_points
+    ]
+
+    if not streams_to_downsample:
+        return activity_streams
+
+    # Get the levels of detail that fit in max_points, keeping the largest one
+    lods = (
+        db.query(activity_streams_models.ActivityStreamsLods)
+        .filter(
+            activity_streams_models.ActivityStreamsLods.activity_stream_id.in_(
+                [stream.id for stream in streams_to_downsample]
+            ),
+            activity_streams_models.ActivityStreamsLods.max_points <= max_points,
+        )
+        .all()
+    )
+    best_lods = {}
+    for lod in lods:
+        best_lod = best_lods.get(lod.activity_stream_id)
+        if best_lod is None or lod.max_points > best_lod.max_points:
+            best_lods[lod.activity_stream_id] = lod
+
+    downsampled_streams = {}
+    for stream in streams_to_downsample:
+        lod = best_lods.get(stream.id)
+        if lod is not None:
+            packed = lod.stream_waypoints_packed
+        else:
+            packed = activity_streams_utils.build_packed_stream_lods(
+                stream.stream_type, stream.stream_waypoints_packed, (max_points,)
+            ).get(max_points, stream.stream_waypoints_packed)
+
+        downsampled_streams[stream.id] = activity_streams_schema.ActivityStreams(
+            id=stream.id,
+            activity_id=stream.activity_id,
+            stream_type=stream.stream_type,
+            stream_waypoints=activity_streams_utils.decode_stream_waypoints(packed),
+            strava_activity_stream_id=stream.strava_activity_stream_id,
+            hr_zone_percentages=getattr(stream, "hr_zone_percentages", None),
+        )
+
+    return [
+        downsampled_streams.get(stream.id, stream) for stream in activity_streams
+    ]
+
+
 def transform_activity_streams(activity_stream, activity, db):
     """
     Transforms an activity stream based on its stream type.
@@ -372,14 +466,26 @@ def transform_activity_streams_hr(activity_stream, activity, db):
         The activity stream object with an added 'hr_zone_percentages' attribute, which contains the percentage of time spent in each heart rate zone and their respective HR boundaries. If waypoints or user details are missing, returns the original activity stream unchanged.
     Notes:
         - Heart rate zones are calculated using the formula: max_heart_rate = 220 - age.
-        - The function expects waypoints to be a list of dicts with an "hr" key.
+        - The function expects waypoints to be a list of dicts with an "hr" key, or packed columns with an "hr" field.
         - If no valid heart rate data is present, the activity stream is returned as is.
     """
-    # Check if the activity stream has waypoints
-    waypoints = activity_stream.stream_waypoints
-    if not waypoints or not isinstance(waypoints, list):
-        # If there are no waypoints, return the activity stream as is
-        return activity_stream
+    # Extract heart rate values, straight from the packed columns when available
+    if activity_stream.stream_waypoints_packed is not None:
+        _, _, columns = activity_streams_utils.decode_stream_columns(
+            activity_stream.stream_waypoints_packed
+        )
+        hr_values = columns.get("hr", np.array([])).astype(np.float64)
+        hr_values = hr_values[~np.isnan(hr_values)]
+    else:
+        # Check if the activity stream has waypoints
+        waypoints = activity_stream.stream_waypoints_json
+        if not waypoints or not isinstance(waypoints, list):
+            # If there are no waypoints, return the activity stream as is
+            return activity_stream
+
+        hr_values = np.array(
+            [float(wp.get("hr")) for wp in waypoints if wp.get("hr") is not None]
+        )
 
     # Get the user details to calculate heart rate zones
     detail_user = users_crud.get_user_by_id(activity.user_id, db)
@@ -398,11 +504,6 @@ def transform_activity_streams_hr(activity_stream, activity, db):
     zone_3 = max_heart_rate * 0.8
     zone_4 = max_heart_rate * 0.9
 
-    # Extract heart rate values from waypoints
-    hr_values = np.array(
-        [float(wp.get("hr")) for wp in waypoints if wp.get("hr") is not None]
-    )
-
     # If there are no valid heart rate values, return the activity stream as is
     total = len(hr_values)
     if total == 0:
@@ -437,7 +538,9 @@ def transform_activity_streams_hr(activity_stream, activity, db):
     return activity_stream
 
 
-def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: Session):
+def get_public_activity_stream_by_type(
+    activity_id: int, stream_type: int, db: Session, max_points: int | None = None
+):
     try:
         # Check if public sharable links are enabled in server settings
         server_settings = server_settings_utils.get_server_settings(db)
@@ -516,7 +619,11 @@ def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: S
             return None
 
         # Return the activity stream
-        return transform_activity_streams(activity_stream, activity, db)
+        return get_activity_streams_resolution(
+            [transform_activity_streams(activity_stream, activity, db)],
+            max_points,
+            db,
+        )[0]
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -529,36 +636,145 @@ def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: S
         ) from err
 
 
+def create_activity_stream_lods_objects(
+    db_stream: activity_streams_models.ActivityStreams,
+) -> list[activity_streams_models.ActivityStreamsLods]:
+    """
+    Builds the level of detail objects of an activity stream.
+    Args:
+        db_stream: The activity stream model object.
+    Returns:
+        The ActivityStreamsLods objects, empty if the stream isn't packed or
+        already has fewer points than the smallest level of detail.
+    """
+    if db_stream.stream_waypoints_packed is None:
+        return []
+
+    lods = activity_streams_utils.build_packed_stream_lods(
+        db_stream.stream_type,
+        db_stream.stream_waypoints_packed,
+        activity_streams_constants.STREAM_LOD_MAX_POINTS,
+    )
+
+    return [
+        activity_streams_models.ActivityStreamsLods(
+            max_points=max_points, stream_waypoints_packed=packed
+        )
+        for max_points, packed in lods.items()
+    ]
+
+
+def create_activity_streams_objects(
+    activity_streams: list[activity_streams_schema.ActivityStreams],
+) -> list[activity_streams_models.ActivityStreams]:
+    """
+    Builds the ActivityStreams objects and their levels of detail, without
+    adding them to the session.
+    Args:
+        activity_streams: The activity streams. Their activity_id may be None
+            if the streams are attached to a new activity through its relationship.
+    Returns:
+        The ActivityStreams objects.
+    """
+    # Create a list to store the ActivityStreams objects
+    streams = []
+
+    # Iterate over the list of ActivityStreams objects
+    for stream in activity_streams:
+        # Create an ActivityStreams object
+        db_stream = activity_streams_models.ActivityStreams(
+            activity_id=stream.activity_id,
+            stream_type=stream.stream_type,
+            stream_waypoints=stream.stream_waypoints,
+            strava_activity_stream_id=stream.strava_activity_stream_id,
+        )
+
+        # Precompute the stream levels of detail
+        db_stream.lods = create_activity_stream_lods_objects(db_stream)
+
+        # Append the object to the list
+        streams.append(db_stream)
+
+    return streams
+
+
 def create_activity_streams(
     activity_streams: list[activity_streams_schema.ActivityStreams], db: Session
 ):
     try:
-        # Create a list to store the ActivityStreams objects
-        streams = []
-
-        # Iterate over the list of ActivityStreams objects
-        for stream in activity_streams:
-            # Create an ActivityStreams object
-            db_stream = activity_streams_models.ActivityStreams(
-                activity_id=stream.activity_id,
-                stream_type=stream.stream_type,
-                stream_waypoints=stream.stream_waypoints,
-                strava_activity_stream_id=stream.strava_activity_stream_id,
+        streams = create_activity_streams_objects(activity_streams)
+
+        # Insert the list of ActivityStreams objects and their levels of detail
+        db.add_all(streams)
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log_and_console(
+            f"Error in create_activity_streams: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def pack_legacy_activity_streams(after_id: int, limit: int, db: Session) -> int | None:
+    """
+    Converts a batch of JSON activity streams to the packed columnar format.
+
+    Streams are processed by ascending ID, starting after `after_id`. Streams
+    whose waypoints can't be packed keep their JSON waypoints.
+
+    Args:
+        after_id: Only streams with an ID greater than this are processed.
+        limit: Maximum number of streams to process.
+        db: The database session.
+
+    Returns:
+        The ID of the last processed stream, or None if there was nothing left
+        to process.
+    """
+    try:
+        streams = (
+            db.query(activity_streams_models.ActivityStreams)
+            .filter(
+                activity_streams_models.ActivityStreams.id > after_id,
+                activity_streams_models.ActivityStreams.stream_waypoints_packed.is_(
+                    None
+                ),
+                activity_streams_models.ActivityStreams.stream_waypoints_json.is_not(
+                    None
+                ),
             )
+            .order_by(activity_streams_models.ActivityStreams.id)
+            .limit(limit)
+            .all()
+        )
 
-            # Append the object to the list
-            streams.append(db_stream)
+        if not streams:
+            return None
+
+        for stream in streams:
+            # The setter packs the waypoints and clears the JSON column
+            stream.stream_waypoints = stream.stream_waypoints_json
+
+            # Precompute the stream levels of detail
+            stream.lods = create_activity_stream_lods_objects(stream)
 
-        # Bulk insert the list of ActivityStreams objects
-        db.bulk_save_objects(streams)
         db.commit()
+
+        return streams[-1].id
     except Exception as err:
         # Rollback the transaction
         db.rollback()
 
         # Log the exception
         core_logger.print_to_log_and_console(
-            f"Error in create_activity_streams: {err}", "error", exc=err
+            f"Error in pack_legacy_activity_streams: {err}", "error", exc=err
         )
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
@@ -4,10 +4,15 @@ from sqlalchemy import (
     ForeignKey,
     BigInteger,
     JSON,
+    LargeBinary,
 )
+from sqlalchemy.dialects.mysql import LONGBLOB
 from sqlalchemy.orm import relationship
 from core.database import Base
 
+import activities.activity_streams.utils as activity_streams_utils
+
+
 class ActivityStreams(Base):
     __tablename__ = "activities_streams"
 
@@ -24,10 +29,70 @@ class ActivityStreams(Base):
         nullable=False,
         comment="Stream type (1 - HR, 2 - Power, 3 - Cadence, 4 - Elevation, 5 - Velocity, 6 - Pace, 7 - lat/lon)",
     )
-    stream_waypoints = Column(JSON, nullable=False, comment="Store waypoints data")
+    stream_waypoints_json = Column(
+        "stream_waypoints",
+        JSON(none_as_null=True),
+        nullable=True,
+        comment="Store waypoints data (JSON, used when the waypoints can't be packed)",
+    )
+    stream_waypoints_packed = Column(
+        LargeBinary().with_variant(LONGBLOB(), "mysql", "mariadb"),
+        nullable=True,
+        comment="Store waypoints data (packed columnar binary format)",
+    )
     strava_activity_stream_id = Column(
         BigInteger, nullable=True, comment="Strava activity stream ID"
     )
 
     # Define a relationship to the User model
-    activity = relationship("Activity", back_populates="activities_streams")
\ No newline at end of file
+    activity = relationship("Activity", back_populates="activities_streams")
+
+    # Establish a one-to-many relationship with 'activities_streams_lods'
+    lods = relationship(
+        "ActivityStreamsLods",
+        back_populates="activity_stream",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @property
+    def stream_waypoints(self) -> list[dict] | None:
+        # Decode the packed format, falling back to the legacy JSON column
+        if self.stream_waypoints_packed is not None:
+            return activity_streams_utils.decode_stream_waypoints(
+                self.stream_waypoints_packed
+            )
+        return self.stream_waypoints_json
+
+    @stream_waypoints.setter
+    def stream_waypoints(self, waypoints: list[dict] | None):
+        # Pack the waypoints when possible, otherwise keep them as JSON
+        packed = activity_streams_utils.encode_stream_waypoints(waypoints)
+        self.stream_waypoints_packed = packed
+        self.stream_waypoints_json = waypoints if packed is None else None
+
+
+class ActivityStreamsLods(Base):
+    __tablename__ = "activities_streams_lods"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    activity_stream_id = Column(
+        Integer,
+        ForeignKey("activities_streams.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Activity stream ID that the level of detail belongs",
+    )
+    max_points = Column(
+        Integer,
+        nullable=False,
+        comment="Maximum number of points of the level of detail",
+    )
+    stream_waypoints_packed = Column(
+        LargeBinary().with_variant(LONGBLOB(), "mysql", "mariadb"),
+        nullable=False,
+        comment="Store downsampled waypoints data (packed columnar binary format)",
+    )
+
+    # Define a relationship to the ActivityStreams model
+    activity_stream = relationship("ActivityStreams", back_populates="lods")
@@ -1,6 +1,6 @@
 from typing import Annotated, Callable
 
-from fastapi import APIRouter, Depends, Security
+from fastapi import APIRouter, Depends, Query, Security
 from sqlalchemy.orm import Session
 
 import activities.activity_streams.schema as activity_streams_schema
@@ -28,9 +28,18 @@ async def read_public_activities_streams_for_activity_all(
         Session,
         Depends(core_database.get_db),
     ],
+    max_points: Annotated[
+        int | None,
+        Query(
+            ge=2,
+            description="Maximum number of waypoints per stream. Defaults to full resolution.",
+        ),
+    ] = None,
 ):
     # Get the activity streams from the database and return them
-    return activity_streams_crud.get_public_activity_streams(activity_id, db)
+    return activity_streams_crud.get_public_activity_streams(
+        activity_id, db, max_points
+    )
 
 
 @router.get(
@@ -50,8 +59,15 @@ async def read_public_activities_streams_for_activity_stream_type(
         Session,
         Depends(core_database.get_db),
     ],
+    max_points: Annotated[
+        int | None,
+        Query(
+            ge=2,
+            description="Maximum number of waypoints per stream. Defaults to full resolution.",
+        ),
+    ] = None,
 ):
     # Get the activity stream from the database and return them
     return activity_streams_crud.get_public_activity_stream_by_type(
-        activity_id, stream_type, db
+        activity_id, stream_type, db, max_points
     )
\ No newline at end of file
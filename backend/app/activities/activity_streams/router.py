@@ -1,6 +1,6 @@
 from typing import Annotated, Callable
 
-from fastapi import APIRouter, Depends, Security
+from fastapi import APIRouter, Depends, Query, Security
 from sqlalchemy.orm import Session
 
 import activities.activity_streams.schema as activity_streams_schema
@@ -21,7 +21,7 @@ router = APIRouter()
     "/activity_id/{activity_id}/all",
     response_model=list[activity_streams_schema.ActivityStreams] | None,
 )
-async def read_activities_streams_for_activity_all(
+def read_activities_streams_for_activity_all(
     activity_id: int,
     validate_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
@@ -37,16 +37,25 @@ async def read_activities_streams_for_activity_all(
         Session,
         Depends(core_database.get_db),
     ],
+    max_points: Annotated[
+        int | None,
+        Query(
+            ge=2,
+            description="Maximum number of waypoints per stream. Defaults to full resolution.",
+        ),
+    ] = None,
 ):
     # Get the activity streams from the database and return them
-    return activity_streams_crud.get_activity_streams(activity_id, token_user_id, db)
+    return activity_streams_crud.get_activity_streams(
+        activity_id, token_user_id, db, max_points
+    )
 
 
 @router.get(
     "/activity_id/{activity_id}/stream_type/{stream_type}",
     response_model=activity_streams_schema.ActivityStreams | None,
 )
-async def read_activities_streams_for_activity_stream_type(
+def read_activities_streams_for_activity_stream_type(
     activity_id: int,
     validate_activity_id: Annotated[
         Callable, Depends(activities_dependencies.validate_activity_id)
@@ -66,8 +75,15 @@ async def read_activities_streams_for_activity_stream_type(
         Session,
         Depends(core_database.get_db),
     ],
+    max_points: Annotated[
+        int | None,
+        Query(
+            ge=2,
+            description="Maximum number of waypoints per stream. Defaults to full resolution.",
+        ),
+    ] = None,
 ):
     # Get the activity stream from the database and return them
     return activity_streams_crud.get_activity_stream_by_type(
-        activity_id, stream_type, token_user_id, db
+        activity_id, stream_type, token_user_id, db, max_points
     )
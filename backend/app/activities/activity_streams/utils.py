@@ -0,0 +1,425 @@
+import heapq
+import struct
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+import activities.activity_streams.constants as activity_streams_constants
+
+# Packed stream layout (all values little-endian):
+#   header: magic (3s) | version (B) | time kind (B) | samples (I) |
+#           base time (q) | fields (B)
+#   per field: name length (B) | name (utf-8) | numpy dtype char (c)
+#   body (zlib): int32 time deltas | one array per field, in header order
+PACKED_STREAM_MAGIC = b"EST"
+PACKED_STREAM_VERSION = 1
+PACKED_STREAM_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Timestamps ("%Y-%m-%dT%H:%M:%S") from file imports
+PACKED_STREAM_TIME_KIND_TIMESTAMP = 0
+# Seconds since the activity start, as sent by Strava
+PACKED_STREAM_TIME_KIND_SECONDS = 1
+
+_HEADER = struct.Struct("<3sBBIqB")
+
+# Coordinates need sub-metre precision, float32 would round to ~1 m
+_FLOAT64_FIELDS = {"lat", "lon"}
+
+_INT16_MIN, _INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _parse_waypoint_times(values: list, time_kind: int) -> np.ndarray:
+    if time_kind == PACKED_STREAM_TIME_KIND_SECONDS:
+        if any(isinstance(value, bool) or not isinstance(value, int) for value in values):
+            raise ValueError("Unsupported waypoint time")
+        return np.array(values, dtype=np.int64)
+
+    values = [
+        (
+            value.strftime(PACKED_STREAM_TIME_FORMAT)
+            if isinstance(value, datetime)
+            else value
+        )
+        for value in values
+    ]
+    # Only "%Y-%m-%dT%H:%M:%S" round-trips, numpy also accepts other ISO forms
+    if any(
+        not isinstance(value, str) or len(value) != 19 or value[10] != "T"
+        for value in values
+    ):
+        raise ValueError("Unsupported waypoint time")
+    return np.array(values, dtype="datetime64[s]").astype(np.int64)
+
+
+def _field_array(name: str, values: list) -> np.ndarray:
+    # None and non numeric values are stored as NaN, so they force a float array
+    array = np.array(
+        [np.nan if value is None else value for value in values], dtype=np.float64
+    )
+
+    if name in _FLOAT64_FIELDS:
+        return array.astype("<f8")
+
+    if np.all(np.isfinite(array)) and np.all(array == np.floor(array)):
+        if array.size == 0 or (
+            array.min() >= _INT16_MIN and array.max() <= _INT16_MAX
+        ):
+            return array.astype("<i2")
+        if array.min() >= _INT32_MIN and array.max() <= _INT32_MAX:
+            return array.astype("<i4")
+
+    return array.astype("<f4")
+
+
+def _round_float32(array: np.ndarray) -> np.ndarray:
+    # Round to the 7 significant digits float32 holds, so 3.21 is served as
+    # 3.21 and not as 3.2100000381469727
+    values = array.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    magnitude[~np.isfinite(magnitude)] = 0
+    factor = 10.0 ** (6 - magnitude)
+    return np.round(values * factor) / factor
+
+
+def encode_stream_waypoints(waypoints: list[dict] | None) -> bytes | None:
+    """
+    Packs a list of waypoints into the columnar binary stream format.
+
+    Timestamps are stored as a base epoch plus int32 deltas and every other
+    waypoint key becomes a typed array (int16/int32 for integral values,
+    float32 otherwise and float64 for coordinates).
+
+    Args:
+        waypoints: List of waypoint dicts, each with a "time" key.
+
+    Returns:
+        The packed bytes, or None if the waypoints can't be represented in the
+        packed format (in which case they should be stored as JSON).
+    """
+    if not waypoints or not isinstance(waypoints, list):
+        return None
+
+    try:
+        # Keep the key order of the waypoints so the decoded dicts match
+        field_names = []
+        for waypoint in waypoints:
+            for key in waypoint:
+                if key != "time" and key not in field_names:
+                    field_names.append(key)
+
+        time_kind = (
+            PACKED_STREAM_TIME_KIND_SECONDS
+            if isinstance(waypoints[0]["time"], int)
+            else PACKED_STREAM_TIME_KIND_TIMESTAMP
+        )
+        times = _parse_waypoint_times(
+            [waypoint["time"] for waypoint in waypoints], time_kind
+        )
+        arrays = [
+            _field_array(name, [waypoint.get(name) for waypoint in waypoints])
+            for name in field_names
+        ]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+    return encode_stream_columns(time_kind, times, dict(zip(field_names, arrays)))
+
+
+def encode_stream_columns(
+    time_kind: int, times: np.ndarray, columns: dict[str, np.ndarray]
+) -> bytes | None:
+    """
+    Packs already typed stream columns into the columnar binary stream format.
+
+    Args:
+        time_kind: One of the PACKED_STREAM_TIME_KIND_* constants.
+        times: Int64 times of every sample.
+        columns: Dict mapping each field name to its typed value array.
+
+    Returns:
+        The packed bytes, or None if there are no samples or the time deltas
+        don't fit in int32.
+    """
+    if times.size == 0:
+        return None
+
+    deltas = np.diff(times, prepend=times[0])
+    if deltas.min() < _INT32_MIN or deltas.max() > _INT32_MAX:
+        return None
+
+    header = bytearray(
+        _HEADER.pack(
+            PACKED_STREAM_MAGIC,
+            PACKED_STREAM_VERSION,
+            time_kind,
+            times.size,
+            int(times[0]),
+            len(columns),
+        )
+    )
+    for name, array in columns.items():
+        encoded_name = name.encode("utf-8")
+        header += struct.pack("<B", len(encoded_name)) + encoded_name
+        header += array.dtype.char.encode("ascii")
+
+    body = deltas.astype("<i4").tobytes() + b"".join(
+        np.ascontiguousarray(array).tobytes() for array in columns.values()
+    )
+
+    return bytes(header) + zlib.compress(body)
+
+
+def decode_stream_columns(
+    packed: bytes,
+) -> tuple[int, np.ndarray, dict[str, np.ndarray]]:
+    """
+    Unpacks a packed stream into its columns without building waypoint dicts.
+
+    Args:
+        packed: Bytes produced by `encode_stream_waypoints`.
+
+    Returns:
+        A tuple with the time kind, the int64 times of every sample (epoch
+        seconds or seconds since start, depending on the time kind) and a dict
+        mapping each field name to its value array.
+
+    Raises:
+        ValueError: If the bytes are not a packed stream.
+    """
+    magic, version, time_kind, samples, base_time, fields = _HEADER.unpack_from(
+        packed, 0
+    )
+    if magic != PACKED_STREAM_MAGIC or version != PACKED_STREAM_VERSION:
+        raise ValueError("Unsupported packed stream format")
+
+    offset = _HEADER.size
+    field_specs = []
+    for _ in range(fields):
+        name_length = packed[offset]
+        offset += 1
+        name = packed[offset : offset + name_length].decode("utf-8")
+        offset += name_length
+        dtype = np.dtype(packed[offset : offset + 1].decode("ascii")).newbyteorder("<")
+        offset += 1
+        field_specs.append((name, dtype))
+
+    body = zlib.decompress(packed[offset:])
+
+    times = np.cumsum(
+        np.frombuffer(body, dtype="<i4", count=samples), dtype=np.int64
+    ) + np.int64(base_time)
+    offset = samples * 4
+
+    columns = {}
+    for name, dtype in field_specs:
+        columns[name] = np.frombuffer(body, dtype=dtype, count=samples, offset=offset)
+        offset += samples * dtype.itemsize
+
+    return time_kind, times, columns
+
+
+def decode_stream_waypoints(packed: bytes) -> list[dict]:
+    """
+    Unpacks a packed stream into the JSON waypoint list served by the API.
+
+    Args:
+        packed: Bytes produced by `encode_stream_waypoints`.
+
+    Returns:
+        List of waypoint dicts ({"time": ..., <field>: ...}). Missing values
+        are returned as None.
+    """
+    time_kind, times, columns = decode_stream_columns(packed)
+
+    keys = ["time", *columns]
+    if time_kind == PACKED_STREAM_TIME_KIND_SECONDS:
+        values = [times.tolist()]
+    else:
+        values = [times.astype("datetime64[s]").astype(str).tolist()]
+    for array in columns.values():
+        if array.dtype.kind == "f":
+            if array.dtype.itemsize == 4:
+                array = _round_float32(array)
+            values.append(
+                [None if value != value else value for value in array.tolist()]
+            )
+        else:
+            values.append(array.tolist())
+
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def get_packed_stream_samples(packed: bytes) -> int:
+    """
+    Returns the number of samples of a packed stream without decoding it.
+
+    Args:
+        packed: Bytes produced by `encode_stream_waypoints`.
+
+    Returns:
+        The number of samples in the stream.
+    """
+    return _HEADER.unpack_from(packed, 0)[3]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Selects the samples to keep using largest-triangle-three-buckets.
+
+    The first and last samples are always kept. The samples in between are
+    split into `max_points - 2` buckets and, for each bucket, the sample that
+    forms the largest triangle with the previously selected sample and the
+    average of the next bucket is kept.
+
+    Args:
+        x: Sample positions (e.g. times).
+        y: Sample values.
+        max_points: Maximum number of samples to keep.
+
+    Returns:
+        Sorted indices of the samples to keep.
+    """
+    samples = x.size
+    if max_points >= samples:
+        return np.arange(samples)
+    if max_points < 3:
+        return np.array([0, samples - 1][:max_points], dtype=np.int64)
+
+    x = x.astype(np.float64)
+    y = np.nan_to_num(y.astype(np.float64))
+
+    every = (samples - 2) / (max_points - 2)
+    bounds = (np.arange(max_points - 1) * every).astype(np.int64) + 1
+    bounds[-1] = samples - 1
+
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = samples - 1
+
+    selected = 0
+    for bucket in range(max_points - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        next_end = bounds[bucket + 2] if bucket + 2 < bounds.size else samples
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+
+    return indices
+
+
+def rdp_ranking(latitudes: np.ndarray, longitudes: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Ranks track points by Ramer-Douglas-Peucker significance.
+
+    Instead of a fixed epsilon, the segment with the farthest point is always
+    split first, so the first N ranked points are the RDP simplification of
+    the track with N points. That allows every level of detail to be taken
+    from a single run.
+
+    Args:
+        latitudes: Point latitudes in degrees.
+        longitudes: Point longitudes in degrees.
+        max_points: Number of points to rank.
+
+    Returns:
+        Indices of up to `max_points` points, in order of significance.
+    """
+    samples = latitudes.size
+    if samples <= 2:
+        return np.arange(samples)
+
+    # Equirectangular projection is accurate enough to compare distances
+    y = np.nan_to_num(latitudes.astype(np.float64))
+    x = np.nan_to_num(longitudes.astype(np.float64)) * np.cos(
+        np.radians(np.mean(y))
+    )
+
+    def farthest_point(start: int, end: int):
+        points_x = x[start + 1 : end] - x[start]
+        points_y = y[start + 1 : end] - y[start]
+        segment_x = x[end] - x[start]
+        segment_y = y[end] - y[start]
+        segment_length = segment_x * segment_x + segment_y * segment_y
+        if segment_length > 0:
+            position = np.clip(
+                (points_x * segment_x + points_y * segment_y) / segment_length, 0, 1
+            )
+            points_x = points_x - position * segment_x
+            points_y = points_y - position * segment_y
+        distances = points_x * points_x + points_y * points_y
+        farthest = int(np.argmax(distances))
+        return distances[farthest], start + 1 + farthest
+
+    ranking = [0, samples - 1]
+    segments = []
+
+    def push_segment(start: int, end: int):
+        if end - start > 1:
+            distance, farthest = farthest_point(start, end)
+            heapq.heappush(segments, (-distance, start, end, farthest))
+
+    push_segment(0, samples - 1)
+    while segments and len(ranking) < max_points:
+        _, start, end, farthest = heapq.heappop(segments)
+        ranking.append(farthest)
+        push_segment(start, farthest)
+        push_segment(farthest, end)
+
+    return np.array(ranking[:max_points], dtype=np.int64)
+
+
+def build_packed_stream_lods(
+    stream_type: int, packed: bytes, levels: tuple[int, ...]
+) -> dict[int, bytes]:
+    """
+    Builds the downsampled levels of detail of a packed stream.
+
+    Map streams are simplified with Ramer-Douglas-Peucker, every other stream
+    with largest-triangle-three-buckets over time.
+
+    Args:
+        stream_type: Stream type of the packed stream.
+        packed: Bytes produced by `encode_stream_waypoints`.
+        levels: Maximum number of points of each level of detail.
+
+    Returns:
+        Dict mapping each level smaller than the stream to its packed bytes.
+    """
+    time_kind, times, columns = decode_stream_columns(packed)
+    levels = sorted(level for level in levels if level < times.size)
+    if not levels or not columns:
+        return {}
+
+    if stream_type == activity_streams_constants.STREAM_TYPE_MAP:
+        ranking = rdp_ranking(
+            columns.get("lat", np.zeros(times.size)),
+            columns.get("lon", np.zeros(times.size)),
+            levels[-1],
+        )
+        selections = {level: np.sort(ranking[:level]) for level in levels}
+    else:
+        values = next(iter(columns.values()))
+        selections = {
+            level: lttb_indices(times, values, level) for level in levels
+        }
+
+    lods = {}
+    for level, indices in selections.items():
+        lod = encode_stream_columns(
+            time_kind,
+            times[indices],
+            {name: array[indices] for name, array in columns.items()},
+        )
+        if lod is not None:
+            lods[level] = lod
+
+    return lods
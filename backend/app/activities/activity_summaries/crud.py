@@ -1,13 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, case
+from sqlalchemy import func, extract, case, Date
 from datetime import timedelta, date
+from fastapi import HTTPException, status
 
-from typing import List
+from typing import Iterable, List
 from activities.activity.models import Activity
-from activities.activity.utils import (
-    set_activity_name_based_on_activity_type,
-    ACTIVITY_NAME_TO_ID,
-)
+import activities.activity.utils as activities_utils
+from activities.activity_summaries.models import ActivityDailySummary
+from users.user.models import User
+import core.logger as core_logger
+
 from activities.activity_summaries.schema import (
     WeeklySummaryResponse,
     MonthlySummaryResponse,
@@ -22,6 +24,27 @@ from activities.activity_summaries.schema import (
 )
 
 
+def _summary_metrics_columns() -> list:
+    """Summed daily summary columns, labeled as the SummaryMetrics fields."""
+    return [
+        func.coalesce(func.sum(ActivityDailySummary.total_distance), 0).label(
+            "total_distance"
+        ),
+        func.coalesce(func.sum(ActivityDailySummary.total_duration), 0.0).label(
+            "total_duration"
+        ),
+        func.coalesce(func.sum(ActivityDailySummary.total_elevation_gain), 0).label(
+            "total_elevation_gain"
+        ),
+        func.coalesce(func.sum(ActivityDailySummary.total_calories), 0).label(
+            "total_calories"
+        ),
+        func.coalesce(func.sum(ActivityDailySummary.activity_count), 0).label(
+            "activity_count"
+        ),
+    ]
+
+
 def _get_type_breakdown(
     db: Session,
     user_id: int,
@@ -31,36 +54,35 @@ def _get_type_breakdown(
 ) -> List[TypeBreakdownItem]:
     """Helper function to get summary breakdown by activity type, optionally filtered by a specific type."""
     query = db.query(
-        Activity.activity_type.label("activity_type"),
-        func.coalesce(func.sum(Activity.distance), 0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
-    ).filter(Activity.user_id == user_id)
+        ActivityDailySummary.activity_type.label("activity_type"),
+        *_summary_metrics_columns(),
+    ).filter(ActivityDailySummary.user_id == user_id)
 
     if not (start_date == date.min and end_date == date.max):
         query = query.filter(
-            Activity.start_time >= start_date, Activity.start_time < end_date
+            ActivityDailySummary.day >= start_date, ActivityDailySummary.day < end_date
         )
 
     if activity_type:
-        activity_type_id = ACTIVITY_NAME_TO_ID.get(activity_type.lower())
+        activity_type_id = activities_utils.ACTIVITY_NAME_TO_ID.get(
+            activity_type.lower()
+        )
         if activity_type_id is not None:
-            query = query.filter(Activity.activity_type == activity_type_id)
+            query = query.filter(ActivityDailySummary.activity_type == activity_type_id)
         else:
             return []
 
-    query = query.group_by(Activity.activity_type).order_by(
-        func.count(Activity.id).desc(), Activity.activity_type.asc()
+    query = query.group_by(ActivityDailySummary.activity_type).order_by(
+        func.sum(ActivityDailySummary.activity_count).desc(),
+        ActivityDailySummary.activity_type.asc(),
     )
 
     type_results = query.all()
     type_breakdown_list = []
     for row in type_results:
-        activity_type_name = set_activity_name_based_on_activity_type(row.activity_type)
+        activity_type_name = activities_utils.set_activity_name_based_on_activity_type(
+            row.activity_type
+        )
         type_breakdown_list.append(
             TypeBreakdownItem(
                 activity_type_id=int(row.activity_type),
@@ -86,35 +108,31 @@ def get_weekly_summary(
     # For MySQL: convert DAYOFWEEK (1=Sunday, 7=Saturday) to ISO format
     engine_name = db.bind.dialect.name
     if engine_name == 'postgresql':
-        iso_day_of_week = extract("isodow", Activity.start_time)
+        iso_day_of_week = extract("isodow", ActivityDailySummary.day)
     else:  # MySQL/MariaDB and others
         iso_day_of_week = case(
-            (func.dayofweek(Activity.start_time) == 1, 7),  # Sunday -> 7
-            else_=func.dayofweek(Activity.start_time) - 1   # Mon-Sat -> 1-6
+            (func.dayofweek(ActivityDailySummary.day) == 1, 7),  # Sunday -> 7
+            else_=func.dayofweek(ActivityDailySummary.day) - 1   # Mon-Sat -> 1-6
         )
 
     query = db.query(
         iso_day_of_week.label("day_of_week"),
-        func.coalesce(func.sum(Activity.distance), 0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
+        *_summary_metrics_columns(),
     ).filter(
-        Activity.user_id == user_id,
-        Activity.start_time >= start_of_week,
-        Activity.start_time < end_of_week,
+        ActivityDailySummary.user_id == user_id,
+        ActivityDailySummary.day >= start_of_week,
+        ActivityDailySummary.day < end_of_week,
     )
 
     activity_type_id = None
     if activity_type:
-        activity_type_id = ACTIVITY_NAME_TO_ID.get(activity_type.lower())
+        activity_type_id = activities_utils.ACTIVITY_NAME_TO_ID.get(
+            activity_type.lower()
+        )
         if activity_type_id is not None:
-            query = query.filter(Activity.activity_type == activity_type_id)
+            query = query.filter(ActivityDailySummary.activity_type == activity_type_id)
         else:
-            query = query.filter(Activity.id == -1)  # Force no results
+            query = query.filter(ActivityDailySummary.id == -1)  # Force no results
 
     query = query.group_by(iso_day_of_week).order_by(iso_day_of_week)
 
@@ -165,30 +183,26 @@ def get_monthly_summary(
     end_of_month = next_month
 
     query = db.query(
-        extract("week", Activity.start_time).label("week_number"),
-        func.coalesce(func.sum(Activity.distance), 0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
+        extract("week", ActivityDailySummary.day).label("week_number"),
+        *_summary_metrics_columns(),
     ).filter(
-        Activity.user_id == user_id,
-        Activity.start_time >= start_of_month,
-        Activity.start_time < end_of_month,
+        ActivityDailySummary.user_id == user_id,
+        ActivityDailySummary.day >= start_of_month,
+        ActivityDailySummary.day < end_of_month,
     )
 
     activity_type_id = None
     if activity_type:
-        activity_type_id = ACTIVITY_NAME_TO_ID.get(activity_type.lower())
+        activity_type_id = activities_utils.ACTIVITY_NAME_TO_ID.get(
+            activity_type.lower()
+        )
         if activity_type_id is not None:
-            query = query.filter(Activity.activity_type == activity_type_id)
+            query = query.filter(ActivityDailySummary.activity_type == activity_type_id)
         else:
-            query = query.filter(Activity.id == -1)  # Force no results
+            query = query.filter(ActivityDailySummary.id == -1)  # Force no results
 
-    query = query.group_by(extract("week", Activity.start_time)).order_by(
-        extract("week", Activity.start_time)
+    query = query.group_by(extract("week", ActivityDailySummary.day)).order_by(
+        extract("week", ActivityDailySummary.day)
     )
 
     weekly_results = query.all()
@@ -231,30 +245,26 @@ def get_yearly_summary(
     end_of_year = date(year + 1, 1, 1)
 
     query = db.query(
-        extract("month", Activity.start_time).label("month_number"),
-        func.coalesce(func.sum(Activity.distance), 0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
+        extract("month", ActivityDailySummary.day).label("month_number"),
+        *_summary_metrics_columns(),
     ).filter(
-        Activity.user_id == user_id,
-        Activity.start_time >= start_of_year,
-        Activity.start_time < end_of_year,
+        ActivityDailySummary.user_id == user_id,
+        ActivityDailySummary.day >= start_of_year,
+        ActivityDailySummary.day < end_of_year,
     )
 
     activity_type_id = None
     if activity_type:
-        activity_type_id = ACTIVITY_NAME_TO_ID.get(activity_type.lower())
+        activity_type_id = activities_utils.ACTIVITY_NAME_TO_ID.get(
+            activity_type.lower()
+        )
         if activity_type_id is not None:
-            query = query.filter(Activity.activity_type == activity_type_id)
+            query = query.filter(ActivityDailySummary.activity_type == activity_type_id)
         else:
-            query = query.filter(Activity.id == -1)  # Force no results
+            query = query.filter(ActivityDailySummary.id == -1)  # Force no results
 
-    query = query.group_by(extract("month", Activity.start_time)).order_by(
-        extract("month", Activity.start_time)
+    query = query.group_by(extract("month", ActivityDailySummary.day)).order_by(
+        extract("month", ActivityDailySummary.day)
     )
 
     monthly_results = query.all()
@@ -300,55 +310,47 @@ def get_lifetime_summary(
 ) -> LifetimeSummaryResponse:
     # Base query for overall metrics and yearly breakdown
     base_metrics_query = db.query(
-        func.coalesce(func.sum(Activity.distance), 0.0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0.0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0.0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
-    ).filter(Activity.user_id == user_id)
+        *_summary_metrics_columns(),
+    ).filter(ActivityDailySummary.user_id == user_id)
 
     # Apply activity type filter if provided
     activity_type_id_filter = None
     if activity_type:
-        activity_type_id_filter = ACTIVITY_NAME_TO_ID.get(activity_type.lower())
+        activity_type_id_filter = activities_utils.ACTIVITY_NAME_TO_ID.get(
+            activity_type.lower()
+        )
         if activity_type_id_filter is not None:
             base_metrics_query = base_metrics_query.filter(
-                Activity.activity_type == activity_type_id_filter
+                ActivityDailySummary.activity_type == activity_type_id_filter
             )
         else:
             # Invalid activity type, force no results for metrics
-            base_metrics_query = base_metrics_query.filter(Activity.id == -1)
+            base_metrics_query = base_metrics_query.filter(
+                ActivityDailySummary.id == -1
+            )
 
     overall_totals = base_metrics_query.one_or_none()
 
     # Yearly breakdown query
     yearly_breakdown_query = db.query(
-        extract("year", Activity.start_time).label("year_number"),
-        func.coalesce(func.sum(Activity.distance), 0.0).label("total_distance"),
-        func.coalesce(func.sum(Activity.total_timer_time), 0.0).label("total_duration"),
-        func.coalesce(func.sum(Activity.elevation_gain), 0.0).label(
-            "total_elevation_gain"
-        ),
-        func.coalesce(func.sum(Activity.calories), 0.0).label("total_calories"),
-        func.count(Activity.id).label("activity_count"),
-    ).filter(Activity.user_id == user_id)
+        extract("year", ActivityDailySummary.day).label("year_number"),
+        *_summary_metrics_columns(),
+    ).filter(ActivityDailySummary.user_id == user_id)
 
     if activity_type:  # Apply same activity type filter to breakdown
         if activity_type_id_filter is not None:
             yearly_breakdown_query = yearly_breakdown_query.filter(
-                Activity.activity_type == activity_type_id_filter
+                ActivityDailySummary.activity_type == activity_type_id_filter
             )
         else:
             yearly_breakdown_query = yearly_breakdown_query.filter(
-                Activity.id == -1
+                ActivityDailySummary.id == -1
             )  # Force no results
 
     yearly_breakdown_query = yearly_breakdown_query.group_by(
-        extract("year", Activity.start_time)
+        extract("year", ActivityDailySummary.day)
     ).order_by(
-        extract("year", Activity.start_time).desc()  # Show recent years first
+        extract("year", ActivityDailySummary.day).desc()  # Show recent years first
     )
 
     yearly_results = yearly_breakdown_query.all()
@@ -391,3 +393,206 @@ def get_lifetime_summary(
         )
 
     return response
+
+
+def lock_user_summaries(user_ids: Iterable[int], db: Session) -> None:
+    """
+    Locks the rows of the users until the transaction ends.
+
+    Serializes the transactions changing activities of a user, so they don't
+    insert the same daily summaries at once (unique constraint error) or
+    rebuild them from activities the other one hasn't committed yet.
+
+    Called before the activities are written: inserting an activity takes a
+    shared lock on its user row (foreign key check), and two transactions
+    holding it would deadlock upgrading it. The users are locked in ID
+    order for the same reason.
+
+    Args:
+        user_ids (Iterable[int]): The IDs of the users.
+        db (Session): The SQLAlchemy database session.
+    """
+    for user_id in sorted(set(user_ids)):
+        # FOR NO KEY UPDATE on PostgreSQL, which doesn't conflict with the
+        # foreign key checks of other transactions
+        db.query(User.id).filter(User.id == user_id).with_for_update(
+            key_share=True
+        ).first()
+
+
+def _get_activities_daily_totals(
+    db: Session,
+    user_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list:
+    """Helper function to sum the user activities by start day and activity type."""
+    activity_day = func.date(Activity.start_time, type_=Date)
+    query = db.query(
+        activity_day.label("day"),
+        Activity.activity_type.label("activity_type"),
+        func.coalesce(func.sum(Activity.distance), 0).label("total_distance"),
+        func.coalesce(func.sum(Activity.total_timer_time), 0).label("total_duration"),
+        func.coalesce(func.sum(Activity.elevation_gain), 0).label(
+            "total_elevation_gain"
+        ),
+        func.coalesce(func.sum(Activity.calories), 0).label("total_calories"),
+        func.count(Activity.id).label("activity_count"),
+    ).filter(Activity.user_id == user_id)
+
+    if start_date is not None:
+        query = query.filter(
+            Activity.start_time >= start_date, Activity.start_time < end_date
+        )
+
+    # MySQL/MariaDB transactions are REPEATABLE READ, a locking read sees the
+    # activities committed while waiting for lock_user_summaries
+    if db.bind.dialect.name != "postgresql":
+        query = query.with_for_update(read=True)
+
+    return query.group_by(activity_day, Activity.activity_type).all()
+
+
+def _add_daily_summaries(db: Session, user_id: int, rows: list) -> None:
+    """Helper function to add daily summaries from the rows of _get_activities_daily_totals."""
+    db.add_all(
+        [
+            ActivityDailySummary(
+                user_id=user_id,
+                day=row.day,
+                activity_type=row.activity_type,
+                total_distance=row.total_distance,
+                total_duration=row.total_duration,
+                total_elevation_gain=row.total_elevation_gain,
+                total_calories=row.total_calories,
+                activity_count=row.activity_count,
+            )
+            for row in rows
+        ]
+    )
+
+
+def refresh_daily_summaries(
+    user_days: Iterable[tuple[int, date]], db: Session
+) -> None:
+    """
+    Recalculates the daily summaries of the given users and days.
+
+    The summaries are rebuilt from the activities in the session, so this is
+    called after activities are created, edited or deleted, before the
+    transaction is committed. The users must be locked with
+    `lock_user_summaries` before their activities are written. Nothing is
+    committed here.
+
+    Args:
+        user_days (Iterable[tuple[int, date]]): Pairs of user ID and start day
+            of the changed activities (both the old and the new day if the
+            start time changed).
+        db (Session): The SQLAlchemy database session.
+    """
+    days_by_user = {}
+    for user_id, day in user_days:
+        days_by_user.setdefault(user_id, set()).add(day)
+
+    if not days_by_user:
+        return
+
+    # Make the pending activity changes visible to the queries
+    db.flush()
+
+    # Locked already by the caller, a no-op then
+    lock_user_summaries(days_by_user, db)
+
+    for user_id, days in days_by_user.items():
+        db.query(ActivityDailySummary).filter(
+            ActivityDailySummary.user_id == user_id,
+            ActivityDailySummary.day.in_(days),
+        ).delete(synchronize_session=False)
+
+        rows = _get_activities_daily_totals(
+            db, user_id, min(days), max(days) + timedelta(days=1)
+        )
+        _add_daily_summaries(db, user_id, [row for row in rows if row.day in days])
+
+    db.flush()
+
+
+def rebuild_user_daily_summaries(user_id: int, db: Session) -> None:
+    """
+    Recalculates all the daily summaries of a user.
+
+    Used when many activities of the user change at once. The user must be
+    locked with `lock_user_summaries` before the activities are written.
+    Nothing is committed here.
+
+    Args:
+        user_id (int): The user ID.
+        db (Session): The SQLAlchemy database session.
+    """
+    # Make the pending activity changes visible to the queries
+    db.flush()
+
+    # Locked already by the caller, a no-op then
+    lock_user_summaries([user_id], db)
+
+    db.query(ActivityDailySummary).filter(
+        ActivityDailySummary.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    _add_daily_summaries(db, user_id, _get_activities_daily_totals(db, user_id))
+
+    db.flush()
+
+
+def backfill_daily_summaries(after_user_id: int, limit: int, db: Session) -> int | None:
+    """
+    Rebuilds the daily summaries of a batch of users from their activities.
+
+    Users with activities are processed by ascending ID, starting after
+    `after_user_id`, and each batch is committed at once.
+
+    Args:
+        after_user_id (int): Only users with an ID greater than this are processed.
+        limit (int): Maximum number of users to process.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        int | None: The ID of the last processed user, or None if there was
+            nothing left to process.
+
+    Raises:
+        HTTPException: If an error occurs while rebuilding the summaries.
+    """
+    try:
+        user_ids = [
+            row.user_id
+            for row in db.query(Activity.user_id)
+            .filter(Activity.user_id > after_user_id)
+            .distinct()
+            .order_by(Activity.user_id)
+            .limit(limit)
+            .all()
+        ]
+
+        if not user_ids:
+            return None
+
+        for user_id in user_ids:
+            rebuild_user_daily_summaries(user_id, db)
+
+        db.commit()
+
+        return user_ids[-1]
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log_and_console(
+            f"Error in backfill_daily_summaries: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
@@ -0,0 +1,60 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    Date,
+    ForeignKey,
+    DECIMAL,
+    UniqueConstraint,
+)
+from core.database import Base
+
+
+# Data model for the per user, day and activity type summaries table
+class ActivityDailySummary(Base):
+    __tablename__ = "activities_daily_summaries"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "day",
+            "activity_type",
+            name="uq_activities_daily_summaries_user_id_day_activity_type",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="User ID that the summary belongs",
+    )
+    day = Column(
+        Date, nullable=False, comment="Day of the activities start time (DATE)"
+    )
+    activity_type = Column(
+        Integer,
+        nullable=False,
+        comment="Activity type of the summarized activities",
+    )
+    total_distance = Column(
+        BigInteger, nullable=False, default=0, comment="Total distance in meters"
+    )
+    total_duration = Column(
+        DECIMAL(precision=20, scale=10),
+        nullable=False,
+        default=0,
+        comment="Total timer time (s)",
+    )
+    total_elevation_gain = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Total elevation gain in meters",
+    )
+    total_calories = Column(
+        BigInteger, nullable=False, default=0, comment="Total calories in kcal"
+    )
+    activity_count = Column(
+        Integer, nullable=False, default=0, comment="Number of activities"
+    )
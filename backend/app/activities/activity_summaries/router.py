@@ -22,7 +22,7 @@ router = APIRouter()
         activities_summary_schema.LifetimeSummaryResponse,
     ],
 )
-async def read_activity_summary(
+def read_activity_summary(
     view_type: str,
     validate_view_type: Annotated[
         Callable, Depends(activities_summary_dependencies.validate_view_type)
@@ -168,36 +168,58 @@ def get_public_activity_workout_steps(activity_id: int, db: Session):
         ) from err
 
 
+def create_activity_workout_steps_objects(
+    activity_workout_steps: list[activity_workout_steps_schema.ActivityWorkoutSteps],
+    activity_id: int | None = None,
+) -> list[activity_workout_steps_models.ActivityWorkoutSteps]:
+    """
+    Builds the ActivityWorkoutSteps objects of an activity, without adding them to the session.
+
+    Args:
+        activity_workout_steps (list[activity_workout_steps_schema.ActivityWorkoutSteps]): The workout steps to build.
+        activity_id (int | None): The ID of the activity. None if the workout
+            steps are attached to a new activity through its relationship.
+
+    Returns:
+        list[activity_workout_steps_models.ActivityWorkoutSteps]: The ActivityWorkoutSteps objects.
+    """
+    # Create a list to store the ActivityWorkoutSteps objects
+    workout_steps = []
+
+    # Iterate over the list of ActivityWorkoutSteps objects
+    for step in activity_workout_steps:
+        # Create an ActivityWorkoutSteps object
+        db_stream = activity_workout_steps_models.ActivityWorkoutSteps(
+            activity_id=activity_id,
+            message_index=step.message_index,
+            duration_type=step.duration_type,
+            duration_value=step.duration_value,
+            target_type=step.target_type,
+            target_value=step.target_value,
+            intensity=step.intensity,
+            notes=step.notes,
+            exercise_category=step.exercise_category,
+            exercise_name=step.exercise_name,
+            exercise_weight=step.exercise_weight,
+            weight_display_unit=step.weight_display_unit,
+            secondary_target_value=step.secondary_target_value,
+        )
+
+        # Append the object to the list
+        workout_steps.append(db_stream)
+
+    return workout_steps
+
+
 def create_activity_workout_steps(
     activity_workout_steps: list[activity_workout_steps_schema.ActivityWorkoutSteps],
     activity_id: int,
     db: Session,
 ):
     try:
-        # Create a list to store the ActivityWorkoutSteps objects
-        workout_steps = []
-
-        # Iterate over the list of ActivityWorkoutSteps objects
-        for step in activity_workout_steps:
-            # Create an ActivityWorkoutSteps object
-            db_stream = activity_workout_steps_models.ActivityWorkoutSteps(
-                activity_id=activity_id,
-                message_index=step.message_index,
-                duration_type=step.duration_type,
-                duration_value=step.duration_value,
-                target_type=step.target_type,
-                target_value=step.target_value,
-                intensity=step.intensity,
-                notes=step.notes,
-                exercise_category=step.exercise_category,
-                exercise_name=step.exercise_name,
-                exercise_weight=step.exercise_weight,
-                weight_display_unit=step.weight_display_unit,
-                secondary_target_value=step.secondary_target_value,
-            )
-
-            # Append the object to the list
-            workout_steps.append(db_stream)
+        workout_steps = create_activity_workout_steps_objects(
+            activity_workout_steps, activity_id
+        )
 
         # Bulk insert the list of ActivityWorkoutSteps objects
         db.bulk_save_objects(workout_steps)
@@ -207,7 +229,7 @@ def create_activity_workout_steps(
         db.rollback()
 
         # Log the exception
-        core_logger(f"Error in create_activity_workout_steps: {err}", "error", exc=err)
+        core_logger.print_to_log(f"Error in create_activity_workout_steps: {err}", "error", exc=err)
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
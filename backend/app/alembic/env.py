@@ -6,29 +6,8 @@ from sqlalchemy import pool
 from alembic import context
 
 
-import activities.activity.models
-import activities.activity_exercise_titles.models
-import activities.activity_laps.models
-import activities.activity_media.models
-import activities.activity_sets.models
-import activities.activity_streams.models
-import activities.activity_workout_steps.models
-import followers.models
-import gears.gear.models
-import gears.gear_components.models
-import health_data.models
-import health_targets.models
-import migrations.models
-import notifications.models
-import password_reset_tokens.models
-import sign_up_tokens.models
-import server_settings.models
-import session.models
-import users.user.models
-import users.user_goals.models
-import users.user_default_gear.models
-import users.user_integrations.models
-import users.user_privacy_settings.models
+# import all the models so Base.metadata is complete
+import core.models  # noqa: F401
 
 # import Base and engine from database file
 from core.database import Base, engine
@@ -0,0 +1,36 @@
+"""v0.16.0 activities bulk import files owner
+
+Revision ID: 0c7e2f5a9b13
+Revises: 6d1f8b3e9a47
+Create Date: 2025-02-22 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0c7e2f5a9b13"
+down_revision: Union[str, None] = "6d1f8b3e9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the process parsing the file to activities_bulk_import_files table
+    op.add_column(
+        "activities_bulk_import_files",
+        sa.Column(
+            "claimed_by",
+            sa.String(length=64),
+            nullable=True,
+            comment="Owner lock of the process parsing the file",
+        ),
+    )
+
+
+def downgrade() -> None:
+    # Remove the process parsing the file from activities_bulk_import_files table
+    op.drop_column("activities_bulk_import_files", "claimed_by")
@@ -0,0 +1,140 @@
+"""v0.16.0 activities bulk imports
+
+Revision ID: 3b7e9c1a5d42
+Revises: 9d3f6a2b4c81
+Create Date: 2025-02-14 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e9c1a5d42"
+down_revision: Union[str, None] = "9d3f6a2b4c81"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create activities_bulk_imports table
+    op.create_table(
+        "activities_bulk_imports",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            nullable=False,
+            comment="User ID that the bulk import belongs to",
+        ),
+        sa.Column(
+            "status",
+            sa.Integer(),
+            nullable=False,
+            comment="Bulk import status (0 - running, 1 - completed)",
+        ),
+        sa.Column(
+            "total_files",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of files queued in the bulk import",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Bulk import creation date (DateTime)",
+        ),
+        sa.Column(
+            "finished_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Bulk import completion date (DateTime)",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_activities_bulk_imports_user_id"),
+        "activities_bulk_imports",
+        ["user_id"],
+        unique=False,
+    )
+    # Create activities_bulk_import_files table
+    op.create_table(
+        "activities_bulk_import_files",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "bulk_import_id",
+            sa.Integer(),
+            nullable=False,
+            comment="Bulk import ID that the file belongs to",
+        ),
+        sa.Column(
+            "file_path",
+            sa.String(length=500),
+            nullable=False,
+            comment="Path of the file to import",
+        ),
+        sa.Column(
+            "status",
+            sa.Integer(),
+            nullable=False,
+            comment="File status (0 - queued, 1 - parsing, 2 - stored, 3 - error)",
+        ),
+        sa.Column(
+            "activity_ids",
+            sa.String(length=250),
+            nullable=True,
+            comment="IDs of the activities created from the file (comma separated)",
+        ),
+        sa.Column(
+            "error",
+            sa.String(length=500),
+            nullable=True,
+            comment="Error message if the file could not be imported",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="File status last update date (DateTime)",
+        ),
+        sa.ForeignKeyConstraint(
+            ["bulk_import_id"], ["activities_bulk_imports.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_activities_bulk_import_files_bulk_import_id"),
+        "activities_bulk_import_files",
+        ["bulk_import_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_activities_bulk_import_files_status"),
+        "activities_bulk_import_files",
+        ["status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Drop activities_bulk_import_files table
+    op.drop_index(
+        op.f("ix_activities_bulk_import_files_status"),
+        table_name="activities_bulk_import_files",
+    )
+    op.drop_index(
+        op.f("ix_activities_bulk_import_files_bulk_import_id"),
+        table_name="activities_bulk_import_files",
+    )
+    op.drop_table("activities_bulk_import_files")
+    # Drop activities_bulk_imports table
+    op.drop_index(
+        op.f("ix_activities_bulk_imports_user_id"),
+        table_name="activities_bulk_imports",
+    )
+    op.drop_table("activities_bulk_imports")
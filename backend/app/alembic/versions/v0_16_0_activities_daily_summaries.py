@@ -0,0 +1,97 @@
+"""v0.16.0 activities daily summaries
+
+Revision ID: 4f6c2a9e8b15
+Revises: 1e5a9b3c7d24
+Create Date: 2025-02-20 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f6c2a9e8b15"
+down_revision: Union[str, None] = "1e5a9b3c7d24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create activities_daily_summaries table
+    op.create_table(
+        "activities_daily_summaries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            nullable=False,
+            comment="User ID that the summary belongs",
+        ),
+        sa.Column(
+            "day",
+            sa.Date(),
+            nullable=False,
+            comment="Day of the activities start time (DATE)",
+        ),
+        sa.Column(
+            "activity_type",
+            sa.Integer(),
+            nullable=False,
+            comment="Activity type of the summarized activities",
+        ),
+        sa.Column(
+            "total_distance",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total distance in meters",
+        ),
+        sa.Column(
+            "total_duration",
+            sa.DECIMAL(precision=20, scale=10),
+            nullable=False,
+            comment="Total timer time (s)",
+        ),
+        sa.Column(
+            "total_elevation_gain",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total elevation gain in meters",
+        ),
+        sa.Column(
+            "total_calories",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total calories in kcal",
+        ),
+        sa.Column(
+            "activity_count",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of activities",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "day",
+            "activity_type",
+            name="uq_activities_daily_summaries_user_id_day_activity_type",
+        ),
+    )
+    # Add the new entry to the migrations table
+    op.execute("""
+    INSERT INTO migrations (id, name, description, executed) VALUES
+    (8, 'v0.16.0', 'Backfill activities daily summaries', false);
+    """)
+
+
+def downgrade() -> None:
+    # Remove the entry from the migrations table
+    op.execute("""
+    DELETE FROM migrations 
+    WHERE id = 8;
+    """)
+    # Drop activities_daily_summaries table
+    op.drop_table("activities_daily_summaries")
@@ -0,0 +1,91 @@
+"""v0.16.0 activities location enrichments
+
+Revision ID: 1e5a9b3c7d24
+Revises: 7c2d4e8f1a63
+Create Date: 2025-02-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "1e5a9b3c7d24"
+down_revision: Union[str, None] = "7c2d4e8f1a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create activities_location_enrichments table
+    op.create_table(
+        "activities_location_enrichments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "activity_id",
+            sa.Integer(),
+            nullable=False,
+            comment="Activity ID whose location is pending",
+        ),
+        sa.Column(
+            "latitude",
+            sa.DECIMAL(precision=20, scale=10),
+            nullable=False,
+            comment="Latitude used to resolve the activity location",
+        ),
+        sa.Column(
+            "longitude",
+            sa.DECIMAL(precision=20, scale=10),
+            nullable=False,
+            comment="Longitude used to resolve the activity location",
+        ),
+        sa.Column(
+            "attempts",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of failed attempts to resolve the location",
+        ),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Date from which the location can be resolved (DateTime)",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Enrichment creation date (DateTime)",
+        ),
+        sa.ForeignKeyConstraint(
+            ["activity_id"], ["activities.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_activities_location_enrichments_activity_id"),
+        "activities_location_enrichments",
+        ["activity_id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_activities_location_enrichments_next_attempt_at"),
+        "activities_location_enrichments",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Drop activities_location_enrichments table
+    op.drop_index(
+        op.f("ix_activities_location_enrichments_next_attempt_at"),
+        table_name="activities_location_enrichments",
+    )
+    op.drop_index(
+        op.f("ix_activities_location_enrichments_activity_id"),
+        table_name="activities_location_enrichments",
+    )
+    op.drop_table("activities_location_enrichments")
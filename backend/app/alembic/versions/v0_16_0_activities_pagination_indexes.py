@@ -0,0 +1,39 @@
+"""v0.16.0 activities pagination indexes
+
+Revision ID: 8a3d5f1c6e72
+Revises: 4f6c2a9e8b15
+Create Date: 2025-02-22 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3d5f1c6e72"
+down_revision: Union[str, None] = "4f6c2a9e8b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the keyset pagination indexes to activities table
+    op.create_index(
+        "ix_activities_user_id_start_time_id",
+        "activities",
+        ["user_id", "start_time", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activities_gear_id_start_time_id",
+        "activities",
+        ["gear_id", "start_time", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Remove the keyset pagination indexes from activities table
+    op.drop_index("ix_activities_gear_id_start_time_id", table_name="activities")
+    op.drop_index("ix_activities_user_id_start_time_id", table_name="activities")
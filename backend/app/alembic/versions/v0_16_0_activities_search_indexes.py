@@ -0,0 +1,67 @@
+"""v0.16.0 activities name and location search indexes
+
+Revision ID: 6d1f8b3e9a47
+Revises: 2b9e7d4a1f38
+Create Date: 2025-02-24 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6d1f8b3e9a47"
+down_revision: Union[str, None] = "2b9e7d4a1f38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Searchable text of an activity, must match activities.activity.models.search_document
+SEARCH_DOCUMENT = (
+    "coalesce(name, '') || ' ' || coalesce(town, '') || ' ' "
+    "|| coalesce(city, '') || ' ' || coalesce(country, '')"
+)
+
+
+def upgrade() -> None:
+    # Get the current connection
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "postgresql":
+        # Trigram operator classes for the substring search index
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        op.execute(f"""
+        CREATE INDEX ix_activities_search_document_tsvector ON activities
+        USING gin (to_tsvector('simple', {SEARCH_DOCUMENT}));
+        """)
+        op.execute(f"""
+        CREATE INDEX ix_activities_search_document_trgm ON activities
+        USING gin (lower({SEARCH_DOCUMENT}) gin_trgm_ops);
+        """)
+    elif dialect_name in ["mysql", "mariadb"]:
+        op.create_index(
+            "ix_activities_search_fulltext",
+            "activities",
+            ["name", "town", "city", "country"],
+            unique=False,
+            mysql_prefix="FULLTEXT",
+        )
+    else:
+        raise Exception(f"Unsupported database dialect: {dialect_name}")
+
+
+def downgrade() -> None:
+    # Get the current connection
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "postgresql":
+        op.drop_index("ix_activities_search_document_trgm", table_name="activities")
+        op.drop_index(
+            "ix_activities_search_document_tsvector", table_name="activities"
+        )
+    elif dialect_name in ["mysql", "mariadb"]:
+        op.drop_index("ix_activities_search_fulltext", table_name="activities")
+    else:
+        raise Exception(f"Unsupported database dialect: {dialect_name}")
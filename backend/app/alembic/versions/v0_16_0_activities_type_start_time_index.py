@@ -0,0 +1,34 @@
+"""v0.16.0 activities user, activity type and start time index
+
+Revision ID: 2b9e7d4a1f38
+Revises: 8a3d5f1c6e72
+Create Date: 2025-02-23 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b9e7d4a1f38"
+down_revision: Union[str, None] = "8a3d5f1c6e72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the start time range index for type filtered queries to activities table
+    op.create_index(
+        "ix_activities_user_id_activity_type_start_time",
+        "activities",
+        ["user_id", "activity_type", "start_time"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Remove the start time range index for type filtered queries from activities table
+    op.drop_index(
+        "ix_activities_user_id_activity_type_start_time", table_name="activities"
+    )
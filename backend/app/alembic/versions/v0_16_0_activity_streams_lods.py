@@ -0,0 +1,64 @@
+"""v0.16.0 activity streams levels of detail
+
+Revision ID: 9d3f6a2b4c81
+Revises: 5e8b1c7d9f20
+Create Date: 2025-02-12 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3f6a2b4c81"
+down_revision: Union[str, None] = "5e8b1c7d9f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create activities_streams_lods table
+    op.create_table(
+        "activities_streams_lods",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "activity_stream_id",
+            sa.Integer(),
+            nullable=False,
+            comment="Activity stream ID that the level of detail belongs",
+        ),
+        sa.Column(
+            "max_points",
+            sa.Integer(),
+            nullable=False,
+            comment="Maximum number of points of the level of detail",
+        ),
+        sa.Column(
+            "stream_waypoints_packed",
+            sa.LargeBinary().with_variant(mysql.LONGBLOB(), "mysql", "mariadb"),
+            nullable=False,
+            comment="Store downsampled waypoints data (packed columnar binary format)",
+        ),
+        sa.ForeignKeyConstraint(
+            ["activity_stream_id"], ["activities_streams.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_activities_streams_lods_activity_stream_id"),
+        "activities_streams_lods",
+        ["activity_stream_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Drop activities_streams_lods table
+    op.drop_index(
+        op.f("ix_activities_streams_lods_activity_stream_id"),
+        table_name="activities_streams_lods",
+    )
+    op.drop_table("activities_streams_lods")
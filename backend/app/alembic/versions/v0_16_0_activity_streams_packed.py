@@ -0,0 +1,88 @@
+"""v0.16.0 activity streams packed storage
+
+Revision ID: 5e8b1c7d9f20
+Revises: a1b2c3d4e5f6
+Create Date: 2025-02-10 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+import activities.activity_streams.utils as activity_streams_utils
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b1c7d9f20"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the packed waypoints column to activities_streams table
+    op.add_column(
+        "activities_streams",
+        sa.Column(
+            "stream_waypoints_packed",
+            sa.LargeBinary().with_variant(mysql.LONGBLOB(), "mysql", "mariadb"),
+            nullable=True,
+            comment="Store waypoints data (packed columnar binary format)",
+        ),
+    )
+    # JSON waypoints are only kept for streams that can't be packed
+    op.alter_column(
+        "activities_streams",
+        "stream_waypoints",
+        existing_type=sa.JSON(),
+        nullable=True,
+        comment="Store waypoints data (JSON, used when the waypoints can't be packed)",
+        existing_comment="Store waypoints data",
+    )
+    # Add the new entry to the migrations table
+    op.execute("""
+    INSERT INTO migrations (id, name, description, executed) VALUES
+    (7, 'v0.16.0', 'Pack activity streams waypoints into columnar binary format', false);
+    """)
+
+
+def downgrade() -> None:
+    # Remove the entry from the migrations table
+    op.execute("""
+    DELETE FROM migrations 
+    WHERE id = 7;
+    """)
+    # Unpack the streams back into the JSON column
+    conn = op.get_bind()
+    activities_streams = sa.table(
+        "activities_streams",
+        sa.column("id", sa.Integer()),
+        sa.column("stream_waypoints", sa.JSON()),
+        sa.column("stream_waypoints_packed", sa.LargeBinary()),
+    )
+    packed_streams = conn.execute(
+        sa.select(
+            activities_streams.c.id, activities_streams.c.stream_waypoints_packed
+        ).where(activities_streams.c.stream_waypoints_packed.is_not(None))
+    ).fetchall()
+    for stream_id, packed in packed_streams:
+        conn.execute(
+            activities_streams.update()
+            .where(activities_streams.c.id == stream_id)
+            .values(
+                stream_waypoints=activity_streams_utils.decode_stream_waypoints(
+                    packed
+                )
+            )
+        )
+    op.alter_column(
+        "activities_streams",
+        "stream_waypoints",
+        existing_type=sa.JSON(),
+        nullable=False,
+        comment="Store waypoints data",
+        existing_comment="Store waypoints data (JSON, used when the waypoints can't be packed)",
+    )
+    op.drop_column("activities_streams", "stream_waypoints_packed")
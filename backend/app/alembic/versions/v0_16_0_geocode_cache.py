@@ -0,0 +1,78 @@
+"""v0.16.0 reverse geocoding cache
+
+Revision ID: 7c2d4e8f1a63
+Revises: 3b7e9c1a5d42
+Create Date: 2025-02-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2d4e8f1a63"
+down_revision: Union[str, None] = "3b7e9c1a5d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create geocode_cache table
+    op.create_table(
+        "geocode_cache",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "provider",
+            sa.String(length=20),
+            nullable=False,
+            comment="Reverse geocoding provider that resolved the location",
+        ),
+        sa.Column(
+            "cell",
+            sa.String(length=12),
+            nullable=False,
+            comment="Geohash of the grid cell the location belongs to",
+        ),
+        sa.Column(
+            "city",
+            sa.String(length=250),
+            nullable=True,
+            comment="Cell city (May include spaces)",
+        ),
+        sa.Column(
+            "town",
+            sa.String(length=250),
+            nullable=True,
+            comment="Cell town (May include spaces)",
+        ),
+        sa.Column(
+            "country",
+            sa.String(length=250),
+            nullable=True,
+            comment="Cell country (May include spaces)",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Cache entry creation date (DateTime)",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "provider", "cell", name="uq_geocode_cache_provider_cell"
+        ),
+    )
+    op.create_index(
+        op.f("ix_geocode_cache_created_at"),
+        "geocode_cache",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Drop geocode_cache table
+    op.drop_index(op.f("ix_geocode_cache_created_at"), table_name="geocode_cache")
+    op.drop_table("geocode_cache")
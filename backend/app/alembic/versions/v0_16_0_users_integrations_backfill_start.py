@@ -0,0 +1,46 @@
+"""v0.16.0 users integrations backfill start
+
+Revision ID: 5a8d3c1e7f24
+Revises: 0c7e2f5a9b13
+Create Date: 2025-02-22 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8d3c1e7f24"
+down_revision: Union[str, None] = "0c7e2f5a9b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the start of the paused backfills to users_integrations table
+    op.add_column(
+        "users_integrations",
+        sa.Column(
+            "strava_backfill_start",
+            sa.DateTime(),
+            nullable=True,
+            comment="Start date (UTC) of the Strava sync paused by the rate limits",
+        ),
+    )
+    op.add_column(
+        "users_integrations",
+        sa.Column(
+            "garminconnect_backfill_start",
+            sa.DateTime(),
+            nullable=True,
+            comment="Start date (UTC) of the Garmin Connect sync paused by the rate limits",
+        ),
+    )
+
+
+def downgrade() -> None:
+    # Remove the start of the paused backfills from users_integrations table
+    op.drop_column("users_integrations", "garminconnect_backfill_start")
+    op.drop_column("users_integrations", "strava_backfill_start")
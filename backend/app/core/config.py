@@ -1,5 +1,5 @@
 import os
-import threading
+import multiprocessing
 import stat
 from pathlib import Path
 from cryptography.fernet import Fernet
@@ -39,6 +39,12 @@ NOMINATIM_API_HOST = os.getenv(
 ).lower()
 NOMINATIM_API_USE_HTTPS = os.getenv("NOMINATIM_API_USE_HTTPS", "true").lower() == "true"
 GEOCODES_MAPS_API = os.getenv("GEOCODES_MAPS_API", "changeme")
+REVERSE_GEO_LOCAL_DATASET = os.getenv(
+    "REVERSE_GEO_LOCAL_DATASET", f"{DATA_DIR}/geonames/cities500.txt"
+)
+REVERSE_GEO_LOCAL_COUNTRIES = os.getenv(
+    "REVERSE_GEO_LOCAL_COUNTRIES", f"{DATA_DIR}/geonames/countryInfo.txt"
+)
 try:
     REVERSE_GEO_RATE_LIMIT = float(os.getenv("REVERSE_GEO_RATE_LIMIT", "1"))
 except ValueError:
@@ -50,15 +56,147 @@ except ValueError:
 REVERSE_GEO_MIN_INTERVAL = (
     1.0 / REVERSE_GEO_RATE_LIMIT if REVERSE_GEO_RATE_LIMIT > 0 else 0
 )
-REVERSE_GEO_LOCK = threading.Lock()
-REVERSE_GEO_LAST_CALL = 0.0
+# Shared with the process pool workers, see geocoding.utils.throttle_request
+REVERSE_GEO_LOCK = multiprocessing.get_context("spawn").Lock()
+try:
+    REVERSE_GEO_CACHE_PRECISION = min(
+        max(int(os.getenv("REVERSE_GEO_CACHE_PRECISION", "6")), 0), 12
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid REVERSE_GEO_CACHE_PRECISION value, expected an int; defaulting to 6",
+        "warning",
+    )
+    REVERSE_GEO_CACHE_PRECISION = 6
+try:
+    REVERSE_GEO_CACHE_TTL_DAYS = max(
+        int(os.getenv("REVERSE_GEO_CACHE_TTL_DAYS", "180")), 0
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid REVERSE_GEO_CACHE_TTL_DAYS value, expected an int; defaulting to 180",
+        "warning",
+    )
+    REVERSE_GEO_CACHE_TTL_DAYS = 180
+# Shared with the process pool workers so lookups in any process are counted
+REVERSE_GEO_CACHE_HITS = multiprocessing.get_context("spawn").Value("q", 0)
+REVERSE_GEO_CACHE_MISSES = multiprocessing.get_context("spawn").Value("q", 0)
+DISTANCE_CALCULATION_METHOD = os.getenv(
+    "DISTANCE_CALCULATION_METHOD", "geodesic"
+).lower()
+if DISTANCE_CALCULATION_METHOD not in ("geodesic", "haversine"):
+    core_logger.print_to_log_and_console(
+        "Invalid DISTANCE_CALCULATION_METHOD value, expected geodesic or haversine; defaulting to geodesic",
+        "warning",
+    )
+    DISTANCE_CALCULATION_METHOD = "geodesic"
+try:
+    ACTIVITY_PARSE_WORKERS = int(
+        os.getenv("ACTIVITY_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid ACTIVITY_PARSE_WORKERS value, expected an int; defaulting to 1",
+        "warning",
+    )
+    ACTIVITY_PARSE_WORKERS = 1
+try:
+    BULK_IMPORT_WORKERS = max(
+        int(os.getenv("BULK_IMPORT_WORKERS", str(max(ACTIVITY_PARSE_WORKERS, 1)))), 1
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid BULK_IMPORT_WORKERS value, expected an int; defaulting to 1",
+        "warning",
+    )
+    BULK_IMPORT_WORKERS = 1
+try:
+    THREAD_POOL_WORKERS = max(int(os.getenv("THREAD_POOL_WORKERS", "20")), 1)
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid THREAD_POOL_WORKERS value, expected an int; defaulting to 20",
+        "warning",
+    )
+    THREAD_POOL_WORKERS = 20
+PUBSUB_BACKEND = os.getenv(
+    "PUBSUB_BACKEND",
+    "postgres" if os.getenv("DB_TYPE", "postgres").lower() == "postgres" else "memory",
+).lower()
+if PUBSUB_BACKEND not in ("postgres", "memory"):
+    core_logger.print_to_log_and_console(
+        "Invalid PUBSUB_BACKEND value, expected postgres or memory; defaulting to memory",
+        "warning",
+    )
+    PUBSUB_BACKEND = "memory"
+try:
+    STRAVA_SYNC_CONCURRENCY = max(int(os.getenv("STRAVA_SYNC_CONCURRENCY", "4")), 1)
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid STRAVA_SYNC_CONCURRENCY value, expected an int; defaulting to 4",
+        "warning",
+    )
+    STRAVA_SYNC_CONCURRENCY = 4
+try:
+    GARMINCONNECT_SYNC_CONCURRENCY = max(
+        int(os.getenv("GARMINCONNECT_SYNC_CONCURRENCY", "2")), 1
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid GARMINCONNECT_SYNC_CONCURRENCY value, expected an int; defaulting to 2",
+        "warning",
+    )
+    GARMINCONNECT_SYNC_CONCURRENCY = 2
+try:
+    SYNC_SPREAD_MINUTES = max(int(os.getenv("SYNC_SPREAD_MINUTES", "30")), 0)
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid SYNC_SPREAD_MINUTES value, expected an int; defaulting to 30",
+        "warning",
+    )
+    SYNC_SPREAD_MINUTES = 30
+try:
+    STRAVA_RATE_LIMIT_15MIN = max(int(os.getenv("STRAVA_RATE_LIMIT_15MIN", "100")), 1)
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid STRAVA_RATE_LIMIT_15MIN value, expected an int; defaulting to 100",
+        "warning",
+    )
+    STRAVA_RATE_LIMIT_15MIN = 100
+try:
+    STRAVA_RATE_LIMIT_DAILY = max(int(os.getenv("STRAVA_RATE_LIMIT_DAILY", "1000")), 1)
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid STRAVA_RATE_LIMIT_DAILY value, expected an int; defaulting to 1000",
+        "warning",
+    )
+    STRAVA_RATE_LIMIT_DAILY = 1000
+try:
+    GARMINCONNECT_RATE_LIMIT_15MIN = max(
+        int(os.getenv("GARMINCONNECT_RATE_LIMIT_15MIN", "100")), 1
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid GARMINCONNECT_RATE_LIMIT_15MIN value, expected an int; defaulting to 100",
+        "warning",
+    )
+    GARMINCONNECT_RATE_LIMIT_15MIN = 100
+try:
+    GARMINCONNECT_RATE_LIMIT_DAILY = max(
+        int(os.getenv("GARMINCONNECT_RATE_LIMIT_DAILY", "2000")), 1
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid GARMINCONNECT_RATE_LIMIT_DAILY value, expected an int; defaulting to 2000",
+        "warning",
+    )
+    GARMINCONNECT_RATE_LIMIT_DAILY = 2000
+ACTIVITIES_STORE_BATCH_SIZE = 100  # activities stored per transaction by syncs
 SUPPORTED_FILE_FORMATS = [
     ".fit",
     ".gpx",
     ".tcx",
     ".gz",
 ]  # used to screen bulk import files
-POLAR_WEBHOOK_SECRET = read_secret("POLAR_WEBHOOK_SECRET")
 
 
 def read_secret(env_var_name: str, default_value: str | None = None) -> str | None:
@@ -316,3 +454,7 @@ def check_required_dirs():
             raise EnvironmentError(
                 f"Required directory is not a directory: {required_dir}"
             )
+
+
+# Read once read_secret and its helpers are defined
+POLAR_WEBHOOK_SECRET = read_secret("POLAR_WEBHOOK_SECRET")
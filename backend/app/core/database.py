@@ -28,9 +28,14 @@ db_url = URL.create(
     database=os.environ.get("DB_DATABASE", "endurain"),
 )
 
-# Create the SQLAlchemy engine
+# Create the SQLAlchemy engine, with a connection for every thread pool thread
+# plus the connections of the background jobs
 engine = create_engine(
-    db_url, pool_size=10, max_overflow=20, pool_timeout=180, pool_recycle=3600
+    db_url,
+    pool_size=10,
+    max_overflow=max(core_config.THREAD_POOL_WORKERS, 20),
+    pool_timeout=180,
+    pool_recycle=3600,
 )
 
 # Create a session factory
@@ -0,0 +1,147 @@
+import zlib
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+import core.logger as core_logger
+
+from core.database import engine
+
+# Seconds a blocking lock waits before giving up (MariaDB needs a timeout)
+LOCK_WAIT_SECONDS = 60 * 60
+
+
+def lock_key(name: str) -> int:
+    """
+    Converts a lock name to a PostgreSQL advisory lock key.
+
+    Args:
+        name (str): The lock name.
+
+    Returns:
+        int: A stable 32 bit key.
+    """
+    return zlib.crc32(name.encode())
+
+
+def acquire_lock(name: str, wait: bool = False) -> Connection | None:
+    """
+    Acquires a cluster wide named lock.
+
+    The lock is a PostgreSQL session advisory lock or a MariaDB named lock,
+    so it is held by a database connection: every API process of every
+    replica sees it, and it is released by the database if the process dies.
+    The connection is in autocommit mode so holding the lock doesn't keep a
+    transaction open.
+
+    Args:
+        name (str): The lock name.
+        wait (bool): Whether to wait for the lock (up to LOCK_WAIT_SECONDS)
+            or give up at once if another connection holds it.
+
+    Returns:
+        Connection | None: The connection holding the lock, to be passed to
+            `release_lock`, or None if the lock is held by another connection.
+
+    Raises:
+        Exception: If the lock can't be requested (e.g. the database is down).
+    """
+    connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    try:
+        if connection.dialect.name == "postgresql":
+            if wait:
+                connection.execute(
+                    text("SELECT pg_advisory_lock(:key)"), {"key": lock_key(name)}
+                )
+                acquired = True
+            else:
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key(name)}
+                ).scalar()
+        else:
+            acquired = (
+                connection.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"),
+                    {"name": name, "timeout": LOCK_WAIT_SECONDS if wait else 0},
+                ).scalar()
+                == 1
+            )
+    except Exception:
+        connection.invalidate()
+        connection.close()
+        raise
+
+    if not acquired:
+        connection.close()
+        return None
+
+    return connection
+
+
+def release_lock(connection: Connection, name: str):
+    """
+    Releases a lock acquired with `acquire_lock` and closes its connection.
+
+    Args:
+        connection (Connection): The connection holding the lock.
+        name (str): The lock name.
+    """
+    try:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key(name)}
+            )
+        else:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+    except Exception as err:
+        # Drop the connection, the database releases its locks
+        core_logger.print_to_log(
+            f"Error releasing lock {name}, closing its connection: {err}",
+            "warning",
+        )
+        connection.invalidate()
+    finally:
+        connection.close()
+
+
+def is_lock_alive(connection: Connection) -> bool:
+    """
+    Checks that the connection holding a lock is still open.
+
+    Args:
+        connection (Connection): The connection holding the lock.
+
+    Returns:
+        bool: False if the connection dropped, and with it the lock.
+    """
+    try:
+        connection.execute(text("SELECT 1"))
+        return True
+    except Exception as err:
+        core_logger.print_to_log(f"Lock connection lost: {err}", "warning")
+        connection.invalidate()
+        connection.close()
+        return False
+
+
+@contextmanager
+def hold_lock(name: str):
+    """
+    Waits for a cluster wide named lock and holds it for the block.
+
+    Args:
+        name (str): The lock name.
+
+    Raises:
+        TimeoutError: If the lock isn't acquired within LOCK_WAIT_SECONDS.
+    """
+    connection = acquire_lock(name, wait=True)
+    if connection is None:
+        raise TimeoutError(f"Timed out waiting for lock {name}")
+
+    try:
+        yield
+    finally:
+        release_lock(connection, name)
@@ -1,9 +1,36 @@
+from alembic.config import Config
+from alembic import command
+
 import migrations.utils as migrations_utils
 
+import core.locks as core_locks
+import core.models  # noqa: F401
 import core.logger as core_logger
 
 from core.database import SessionLocal
 
+# Lock serializing the migrations of the API processes
+MIGRATIONS_LOCK_NAME = "endurain_migrations"
+
+
+def run_migrations():
+    """
+    Runs the Alembic migrations and the data migrations not executed yet.
+
+    The migrations run under a cluster wide lock, so when several API
+    processes or replicas start at once the first one migrates the database
+    and the others wait and find nothing left to do.
+    """
+    with core_locks.hold_lock(MIGRATIONS_LOCK_NAME):
+        # Run Alembic migrations to ensure the database is up to date
+        alembic_cfg = Config("alembic.ini")
+        # Disable the logger configuration in Alembic to avoid conflicts with FastAPI
+        alembic_cfg.attributes["configure_logger"] = False
+        command.upgrade(alembic_cfg, "head")
+
+        # Migration check
+        check_migrations()
+
 
 def check_migrations():
     core_logger.print_to_log_and_console("Checking for migrations not executed")
@@ -18,3 +45,9 @@ def check_migrations():
         db.close()
 
         core_logger.print_to_log_and_console("Migration check completed")
+
+
+if __name__ == "__main__":
+    # Migrate before the API workers start, see docker/start.sh
+    core_logger.setup_main_logger()
+    run_migrations()
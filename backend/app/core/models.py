@@ -0,0 +1,31 @@
+# Imports every model, so the mappers resolve their relationships (e.g. User
+# to PolarAccount) in processes that don't import the routers, like the
+# migrations run by docker/start.sh and Alembic
+import activities.activity.models  # noqa: F401
+import activities.activity_bulk_imports.models  # noqa: F401
+import activities.activity_exercise_titles.models  # noqa: F401
+import activities.activity_laps.models  # noqa: F401
+import activities.activity_location_enrichments.models  # noqa: F401
+import activities.activity_media.models  # noqa: F401
+import activities.activity_sets.models  # noqa: F401
+import activities.activity_streams.models  # noqa: F401
+import activities.activity_summaries.models  # noqa: F401
+import activities.activity_workout_steps.models  # noqa: F401
+import followers.models  # noqa: F401
+import gears.gear.models  # noqa: F401
+import gears.gear_components.models  # noqa: F401
+import geocoding.models  # noqa: F401
+import health_data.models  # noqa: F401
+import health_targets.models  # noqa: F401
+import migrations.models  # noqa: F401
+import notifications.models  # noqa: F401
+import password_reset_tokens.models  # noqa: F401
+import polar.models  # noqa: F401
+import sign_up_tokens.models  # noqa: F401
+import server_settings.models  # noqa: F401
+import session.models  # noqa: F401
+import users.user.models  # noqa: F401
+import users.user_goals.models  # noqa: F401
+import users.user_default_gear.models  # noqa: F401
+import users.user_integrations.models  # noqa: F401
+import users.user_privacy_settings.models  # noqa: F401
@@ -0,0 +1,157 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+# Response header holding the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value):
+    # JSON has no datetime or decimal types, tag them to restore them
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+        if "decimal" in value:
+            return Decimal(value["decimal"])
+        raise ValueError("Unknown cursor value")
+    return value
+
+
+def encode_cursor(sort_key: str, values: list | None, last_id: int) -> str:
+    """
+    Encodes the position after a row as an opaque cursor.
+
+    The cursor is only base64 encoded, so anyone can read and forge it. The
+    sort values are left out (None) when the requester may not see them,
+    e.g. a hidden start time. They are then always looked up with
+    `get_cursor_values`, even if the cursor holds values.
+
+    Args:
+        sort_key (str): The sorting the cursor belongs to, e.g. "start_time:desc".
+        values (list | None): The values of the sort expressions of the row,
+            or None to leave them out.
+        last_id (int): The ID of the row.
+
+    Returns:
+        str: The URL safe cursor.
+    """
+    content = {"sort": sort_key, "id": last_id}
+    if values is not None:
+        content["values"] = [_encode_value(value) for value in values]
+    payload = json.dumps(content, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[list | None, int]:
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+        sort_key (str): The sorting of the request, must match the cursor's.
+
+    Returns:
+        tuple[list | None, int]: The values of the sort expressions (None if
+            the cursor leaves them out) and the ID of the row the cursor
+            points after.
+
+    Raises:
+        HTTPException: If the cursor is malformed or belongs to another sorting.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        if payload["sort"] != sort_key:
+            raise ValueError("Cursor sorting mismatch")
+        values = payload.get("values")
+        if values is not None:
+            values = [_decode_value(value) for value in values]
+        return values, int(payload["id"])
+    except (ValueError, TypeError, KeyError) as err:
+        # Raise an HTTPException with a 422 Unprocessable Entity status code
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid Cursor",
+        ) from err
+
+
+def keyset_filter(
+    sort_expressions: list, values: list, id_column, last_id: int, ascending: bool
+):
+    """
+    Builds the filter selecting the rows after a cursor.
+
+    Rows are ordered by the sort expressions and then by ID, all in the same
+    direction. The filter is expanded into OR terms (a > x OR (a = x AND
+    b > y) ...) instead of a row value comparison, so every database can
+    use an index on the leading columns.
+
+    Args:
+        sort_expressions (list): The expressions the rows are ordered by.
+            They must not be NULL.
+        values (list): The values of the sort expressions of the cursor row.
+        id_column: The ID column, the last sort key.
+        last_id (int): The ID of the cursor row.
+        ascending (bool): Whether the rows are in ascending order.
+
+    Returns:
+        The SQLAlchemy filter expression.
+    """
+    keys = list(zip(sort_expressions, values)) + [(id_column, last_id)]
+
+    terms = []
+    for index, (expression, value) in enumerate(keys):
+        after = expression > value if ascending else expression < value
+        terms.append(
+            and_(*[previous == v for previous, v in keys[:index]], after)
+        )
+
+    return or_(*terms)
+
+
+def get_cursor_values(query, sort_expressions: list, id_column, last_id: int) -> list:
+    """
+    Looks up the sort values of the row a cursor without values points after.
+
+    Args:
+        query: The query being paginated, so only its rows can be pointed to.
+        sort_expressions (list): The expressions the rows are ordered by.
+        id_column: The ID column.
+        last_id (int): The ID of the cursor row.
+
+    Returns:
+        list: The values of the sort expressions of the row.
+
+    Raises:
+        HTTPException: If the row isn't part of the query (anymore).
+    """
+    row = (
+        query.filter(id_column == last_id)
+        .with_entities(*sort_expressions)
+        .order_by(None)
+        .first()
+    )
+    if row is None:
+        # Raise an HTTPException with a 422 Unprocessable Entity status code
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid Cursor",
+        )
+    return list(row)
@@ -0,0 +1,184 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+
+import core.config as core_config
+import core.logger as core_logger
+
+# Process pool used to run CPU-bound work (activity file parsing) outside the event loop
+executor: ProcessPoolExecutor | None = None
+executor_lock = threading.Lock()
+
+# Tasks submitted to the process pool and not finished yet, logged with each task
+queue_depth_lock = threading.Lock()
+queue_depth = 0
+
+
+def initialize_worker(
+    reverse_geo_lock,
+    reverse_geo_cache_hits,
+    reverse_geo_cache_misses,
+):
+    """
+    Initializes a process pool worker.
+
+    Shares the reverse geocoding throttle and cache counters with the main
+    process, so parsing files in parallel keeps the configured
+    REVERSE_GEO_RATE_LIMIT, and sets up the worker logger.
+
+    Args:
+        reverse_geo_lock: Lock queuing the reverse geocoding requests.
+        reverse_geo_cache_hits: Shared reverse geocoding cache hits counter.
+        reverse_geo_cache_misses: Shared reverse geocoding cache misses counter.
+    """
+    core_config.REVERSE_GEO_LOCK = reverse_geo_lock
+    core_config.REVERSE_GEO_CACHE_HITS = reverse_geo_cache_hits
+    core_config.REVERSE_GEO_CACHE_MISSES = reverse_geo_cache_misses
+    core_logger.setup_main_logger()
+
+
+def run_timed(func, args: tuple):
+    """
+    Runs a function in a worker and measures how long it takes.
+
+    HTTPExceptions can't be pickled back to the main process, so they are
+    returned as (status_code, detail) instead of raised.
+
+    Args:
+        func: Module level function to run.
+        args: Positional arguments for the function.
+
+    Returns:
+        Tuple with the result, the run time in seconds and the HTTPException
+        details (None if the function succeeded).
+    """
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+        return result, time.perf_counter() - start, None
+    except HTTPException as http_err:
+        return (
+            None,
+            time.perf_counter() - start,
+            (http_err.status_code, http_err.detail),
+        )
+
+
+def get_executor() -> ProcessPoolExecutor | None:
+    """
+    Returns the process pool, creating it on first use.
+
+    Returns:
+        The process pool, or None if ACTIVITY_PARSE_WORKERS is 0 and work
+        should run in the calling process.
+    """
+    global executor
+
+    if core_config.ACTIVITY_PARSE_WORKERS <= 0:
+        return None
+
+    with executor_lock:
+        if executor is None:
+            # Spawn fresh interpreters instead of forking the running server
+            # (event loop, scheduler threads and open DB connections)
+            executor = ProcessPoolExecutor(
+                max_workers=core_config.ACTIVITY_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_worker,
+                initargs=(
+                    core_config.REVERSE_GEO_LOCK,
+                    core_config.REVERSE_GEO_CACHE_HITS,
+                    core_config.REVERSE_GEO_CACHE_MISSES,
+                ),
+            )
+            core_logger.print_to_log(
+                f"Started process pool with {core_config.ACTIVITY_PARSE_WORKERS} workers"
+            )
+
+        return executor
+
+
+def shutdown_executor():
+    """
+    Shuts down the process pool, if it was started.
+    """
+    global executor
+
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
+
+
+async def run_in_process_pool(func, *args, description: str = ""):
+    """
+    Runs a CPU-bound function in the process pool without blocking the event loop.
+
+    Args:
+        func: Module level (picklable) function to run. Its arguments and
+            result must be picklable.
+        *args: Positional arguments for the function.
+        description: Description of the task used in the logs (e.g. the file name).
+
+    Returns:
+        The function result.
+
+    Raises:
+        HTTPException: If the function raised one, or with a 500 status code
+            if the pool broke (e.g. a worker was killed).
+    """
+    global queue_depth
+
+    pool = get_executor()
+
+    with queue_depth_lock:
+        queue_depth += 1
+        task_queue_depth = queue_depth
+
+    start = time.perf_counter()
+    error = None
+    try:
+        if pool is None:
+            result, run_seconds, error = run_timed(func, args)
+        else:
+            loop = asyncio.get_running_loop()
+            result, run_seconds, error = await loop.run_in_executor(
+                pool, run_timed, func, args
+            )
+    except BrokenProcessPool as err:
+        # Drop the broken pool so the next task starts a new one
+        shutdown_executor()
+        with queue_depth_lock:
+            queue_depth -= 1
+        core_logger.print_to_log(
+            f"Process pool broke while running {description} - {str(err)}",
+            "error",
+            exc=err,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+    except Exception:
+        with queue_depth_lock:
+            queue_depth -= 1
+        raise
+
+    wait_seconds = max(time.perf_counter() - start - run_seconds, 0.0)
+    with queue_depth_lock:
+        queue_depth -= 1
+
+    core_logger.print_to_log(
+        f"Process pool: {description} took {run_seconds:.2f}s "
+        f"(waited {wait_seconds:.2f}s, queue depth {task_queue_depth})"
+    )
+
+    if error is not None:
+        raise HTTPException(status_code=error[0], detail=error[1])
+
+    return result
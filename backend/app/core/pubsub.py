@@ -0,0 +1,188 @@
+import asyncio
+import inspect
+import json
+
+import psycopg
+from sqlalchemy import text
+
+import core.config as core_config
+import core.logger as core_logger
+import core.thread_pool as core_thread_pool
+
+from core.database import db_type, db_url, engine
+
+# PostgreSQL channel carrying the events of all topics
+CHANNEL = "endurain_events"
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7999
+
+# Seconds to wait before reconnecting a lost PostgreSQL listener
+RECONNECT_SECONDS = 5
+
+# Handlers of the events received by this process, by topic
+handlers: dict[str, list] = {}
+
+
+def subscribe(topic: str, handler):
+    """
+    Registers a handler for the events of a topic.
+
+    Every process receives every published event, including its own, so
+    handlers act on the state of their process only (e.g. its websockets).
+
+    Args:
+        topic (str): The topic name.
+        handler: Function or coroutine function called with the event data.
+    """
+    handlers.setdefault(topic, []).append(handler)
+
+
+async def deliver(topic: str, data: dict):
+    """
+    Calls the handlers of a topic with an event received by this process.
+
+    Args:
+        topic (str): The topic name.
+        data (dict): The event data.
+    """
+    for handler in handlers.get(topic, []):
+        try:
+            result = handler(data)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error handling {topic} event: {err}", "error", exc=err
+            )
+
+
+class InProcessBackend:
+    """
+    Delivers the events to the handlers of the publishing process only.
+
+    Enough for a single API process, and the fallback on MariaDB.
+    """
+
+    async def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    async def publish(self, topic: str, data: dict):
+        await deliver(topic, data)
+
+
+class PostgresBackend:
+    """
+    Delivers the events to every API process through PostgreSQL LISTEN/NOTIFY.
+
+    Each process listens on CHANNEL with its own connection and publishes
+    with NOTIFY, so events reach the handlers of all workers and replicas
+    sharing the database. Events published while a listener reconnects are
+    lost for its process.
+    """
+
+    def __init__(self):
+        self.conninfo = db_url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.listener: asyncio.Task | None = None
+
+    async def start(self):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self.listen())
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.cancel()
+            self.listener = None
+
+    async def listen(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    core_logger.print_to_log(f"Listening on channel {CHANNEL}")
+
+                    async for notify in connection.notifies():
+                        event = json.loads(notify.payload)
+                        await deliver(event["topic"], event["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                core_logger.print_to_log(
+                    f"Channel {CHANNEL} listener lost, reconnecting: {err}", "warning"
+                )
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def publish(self, topic: str, data: dict):
+        payload = json.dumps({"topic": topic, "data": data})
+
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            core_logger.print_to_log(
+                f"{topic} event too large for channel {CHANNEL}, delivered to "
+                "this process only",
+                "warning",
+            )
+            await deliver(topic, data)
+            return
+
+        await core_thread_pool.run_in_thread_pool(self.notify, payload)
+
+    def notify(self, payload: str):
+        with engine.connect() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": payload},
+            )
+            connection.commit()
+
+
+def create_backend() -> InProcessBackend | PostgresBackend:
+    """
+    Creates the backend selected by PUBSUB_BACKEND.
+
+    Returns:
+        InProcessBackend | PostgresBackend: The pub/sub backend.
+    """
+    if core_config.PUBSUB_BACKEND == "postgres":
+        if db_type == "postgres":
+            return PostgresBackend()
+
+        core_logger.print_to_log_and_console(
+            "PUBSUB_BACKEND postgres requires DB_TYPE postgres; events will only "
+            "reach this process",
+            "warning",
+        )
+
+    return InProcessBackend()
+
+
+async def start():
+    """
+    Starts receiving the events of the other processes. Must be called from
+    the event loop.
+    """
+    await backend.start()
+
+
+def stop():
+    backend.stop()
+
+
+async def publish(topic: str, data: dict):
+    """
+    Publishes an event to the handlers of the topic in every API process.
+
+    Args:
+        topic (str): The topic name.
+        data (dict): JSON serializable event data.
+    """
+    await backend.publish(topic, data)
+
+
+backend = create_backend()
@@ -0,0 +1,341 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from stravalib.util import limiter as strava_limiter
+
+from sqlalchemy.orm import Session
+
+import users.user_integrations.crud as user_integrations_crud
+
+import core.config as core_config
+import core.logger as core_logger
+import core.thread_pool as core_thread_pool
+
+# Seconds a provider call waits for its budget before the sync is paused
+MAX_WAIT_SECONDS = 60
+
+# Share of the budget the backfills leave to the syncs of recent activities
+BACKFILL_RESERVE = 0.2
+
+# Syncs starting more than these days ago are backfills
+BACKFILL_AFTER_DAYS = 2
+
+# Seconds a provider is paused after a 429 without a Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 15 * 60
+
+# Requests made to sync an activity
+STRAVA_ACTIVITY_REQUESTS = 3  # detailed activity, streams and laps
+GARMINCONNECT_ACTIVITY_REQUESTS = 2  # gear and original file
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a provider request budget is spent for longer than
+    MAX_WAIT_SECONDS. The sync stops and is resumed by a later run.
+    """
+
+    def __init__(self, budget_name: str, retry_after: float):
+        super().__init__(
+            f"{budget_name} request budget spent, available again in {retry_after:.0f}s"
+        )
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Requests available in a rate limit window, refilled continuously.
+    """
+
+    def __init__(self, capacity: int, window_seconds: int):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.capacity / self.window_seconds,
+        )
+        self.updated = now
+
+    def wait_time(self, cost: int, reserve: float) -> float:
+        needed = cost + reserve * self.capacity
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) * self.window_seconds / self.capacity
+
+    def set_usage(self, usage: int, limit: int, now: float):
+        self.capacity = limit
+        self.tokens = float(max(limit - usage, 0))
+        self.updated = now
+
+
+class RequestBudget:
+    """
+    Request budget of a provider account, with a 15 minutes and a daily
+    bucket like the Strava rate limits.
+
+    Provider calls acquire their requests first, waiting up to
+    MAX_WAIT_SECONDS. The buckets are corrected with the usage reported by
+    the provider, so budgets of several processes sharing an account stay in
+    line with the real quota. Thread safe.
+    """
+
+    def __init__(self, name: str, short_limit: int, daily_limit: int):
+        self.name = name
+        self.lock = threading.Lock()
+        self.short = TokenBucket(short_limit, 15 * 60)
+        self.daily = TokenBucket(daily_limit, 24 * 60 * 60)
+        self.paused_until = 0.0
+
+    def acquire(self, cost: int = 1, reserve: float = 0.0):
+        """
+        Takes requests from the budget, waiting for them if needed.
+
+        Args:
+            cost (int): Number of requests about to be made.
+            reserve (float): Share of the buckets to leave untouched, so
+                lower priority work (backfills) stops before the budget of
+                the syncs of recent activities is spent.
+
+        Raises:
+            RateLimitExceeded: If the requests aren't available within
+                MAX_WAIT_SECONDS.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.short.refill(now)
+                self.daily.refill(now)
+                wait = max(
+                    self.paused_until - now,
+                    self.short.wait_time(cost, reserve),
+                    self.daily.wait_time(cost, reserve),
+                )
+                if wait <= 0:
+                    self.short.tokens -= cost
+                    self.daily.tokens -= cost
+                    return
+
+            if wait > MAX_WAIT_SECONDS:
+                raise RateLimitExceeded(self.name, wait)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.pause_locked(seconds)
+
+    def pause_locked(self, seconds: float):
+        paused_until = time.monotonic() + seconds
+        if paused_until > self.paused_until:
+            self.paused_until = paused_until
+            core_logger.print_to_log(
+                f"{self.name} requests paused for {seconds:.0f}s", "warning"
+            )
+
+    def is_paused(self) -> bool:
+        with self.lock:
+            return self.paused_until > time.monotonic()
+
+    def update_usage(
+        self, short_usage: int, daily_usage: int, short_limit: int, daily_limit: int
+    ):
+        """
+        Sets the buckets to the usage reported by the provider.
+
+        The provider windows are fixed (quarter hours and UTC days), so the
+        budget is paused until the next window when a limit is reached.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.short.set_usage(short_usage, short_limit, now)
+            self.daily.set_usage(daily_usage, daily_limit, now)
+
+            if daily_usage >= daily_limit:
+                self.pause_locked(strava_limiter.get_seconds_until_next_day())
+            elif short_usage >= short_limit:
+                self.pause_locked(strava_limiter.get_seconds_until_next_quarter())
+
+
+class StravaRateLimiter(strava_limiter.RateLimiter):
+    """
+    Feeds the rate limit headers of the Strava responses to a request budget.
+
+    Replaces the stravalib default limiter, which sleeps until the limits
+    reset instead of letting the sync pause.
+    """
+
+    def __init__(self, budget: RequestBudget):
+        super().__init__()
+        self.budget = budget
+        self.rules.append(self.update_budget)
+
+    def update_budget(self, response_headers: dict[str, str], method):
+        rates = strava_limiter.get_rates_from_response_headers(
+            response_headers, method
+        )
+        if rates is not None:
+            self.budget.update_usage(
+                rates.short_usage, rates.long_usage, rates.short_limit, rates.long_limit
+            )
+
+
+# Request budgets of this process, by name
+budgets_lock = threading.Lock()
+budgets: dict[str, RequestBudget] = {}
+
+
+def get_budget(name: str, short_limit: int, daily_limit: int) -> RequestBudget:
+    with budgets_lock:
+        budget = budgets.get(name)
+        if budget is None:
+            budget = budgets[name] = RequestBudget(name, short_limit, daily_limit)
+        return budget
+
+
+def get_strava_budget(user_id: int) -> RequestBudget:
+    """
+    Returns the Strava request budget of a user.
+
+    Users link Strava with their own API application, so each one has its
+    own quota.
+    """
+    return get_budget(
+        f"Strava user {user_id}",
+        core_config.STRAVA_RATE_LIMIT_15MIN,
+        core_config.STRAVA_RATE_LIMIT_DAILY,
+    )
+
+
+def get_garminconnect_budget() -> RequestBudget:
+    """
+    Returns the Garmin Connect request budget, shared by all users as Garmin
+    Connect throttles the server.
+    """
+    return get_budget(
+        "Garmin Connect",
+        core_config.GARMINCONNECT_RATE_LIMIT_15MIN,
+        core_config.GARMINCONNECT_RATE_LIMIT_DAILY,
+    )
+
+
+def watch_garminconnect_responses(session):
+    """
+    Pauses the Garmin Connect budget when a response of the session is a 429.
+
+    Args:
+        session (requests.Session): The session of the Garmin Connect client.
+    """
+
+    def check_response(response, *args, **kwargs):
+        if response.status_code != 429:
+            return
+
+        try:
+            retry_after = float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            retry_after = DEFAULT_RETRY_AFTER_SECONDS
+        get_garminconnect_budget().pause(retry_after)
+
+    session.hooks["response"].append(check_response)
+
+
+def as_utc(date: datetime) -> datetime:
+    return date.replace(tzinfo=timezone.utc) if date.tzinfo is None else date
+
+
+def as_naive_utc(date: datetime) -> datetime:
+    return as_utc(date).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def get_backfill_reserve(start_date: datetime) -> float:
+    """
+    Returns the budget reserve of a sync, BACKFILL_RESERVE for backfills.
+
+    Args:
+        start_date (datetime): Start date of the synced activities.
+
+    Returns:
+        float: The share of the budget the sync must leave untouched.
+    """
+    if as_utc(start_date) < datetime.now(timezone.utc) - timedelta(
+        days=BACKFILL_AFTER_DAYS
+    ):
+        return BACKFILL_RESERVE
+    return 0.0
+
+
+def get_backfill_start(
+    provider: str, user_id: int, start_date: datetime, db: Session
+) -> datetime:
+    """
+    Extends a sync to the start of the paused backfill of the user, if any.
+
+    Paused backfills are stored in the users integrations, so they survive
+    restarts and leader changes.
+
+    Args:
+        provider (str): The provider, e.g. "strava".
+        user_id (int): The ID of the user.
+        start_date (datetime): Start date of the sync.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        datetime: The earliest of both start dates.
+    """
+    paused_start = user_integrations_crud.get_user_backfill_start(user_id, provider, db)
+    if paused_start is not None and as_utc(paused_start) < as_utc(start_date):
+        return as_utc(paused_start)
+    return as_utc(start_date)
+
+
+async def pause_backfill(
+    provider: str, user_id: int, start_date: datetime, db: Session
+):
+    """
+    Records a sync stopped by a spent budget, the scheduled syncs resume it.
+
+    Activities are synced newest first, so the activities left are the
+    oldest ones and the stored ones aren't downloaded again.
+
+    Args:
+        provider (str): The provider.
+        user_id (int): The ID of the user.
+        start_date (datetime): Start date of the paused sync.
+        db (Session): The SQLAlchemy database session.
+    """
+    core_logger.print_to_log(
+        f"User {user_id}: {provider} sync paused by the rate limits, it will be "
+        "resumed by the next scheduled sync",
+        "warning",
+    )
+    await core_thread_pool.run_in_thread_pool(
+        user_integrations_crud.pause_user_backfill,
+        user_id,
+        provider,
+        as_naive_utc(start_date),
+        db,
+    )
+
+
+async def complete_backfill(
+    provider: str, user_id: int, start_date: datetime, db: Session
+):
+    """
+    Forgets the paused backfill of a user covered by a completed sync.
+
+    Args:
+        provider (str): The provider.
+        user_id (int): The ID of the user.
+        start_date (datetime): Start date of the completed sync.
+        db (Session): The SQLAlchemy database session.
+    """
+    await core_thread_pool.run_in_thread_pool(
+        user_integrations_crud.complete_user_backfill,
+        user_id,
+        provider,
+        as_naive_utc(start_date),
+        db,
+    )
@@ -10,7 +10,7 @@ router = APIRouter()
 @router.get(
     core_config.ROOT_PATH + "/about",
 )
-async def about():
+def about():
     return {
         "name": "Endurain API",
         "version": core_config.API_VERSION,
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, Security
 # Alphabetized router imports
 import activities.activity.router as activities_router
 import activities.activity.public_router as activities_public_router
+import activities.activity_bulk_imports.router as activity_bulk_imports_router
 import activities.activity_exercise_titles.router as activity_exercise_titles_router
 import activities.activity_exercise_titles.public_router as activity_exercise_titles_public_router
 import activities.activity_laps.router as activity_laps_router
@@ -21,6 +22,7 @@ import followers.router as followers_router
 import garmin.router as garmin_router
 import gears.gear.router as gears_router
 import gears.gear_components.router as gear_components_router
+import geocoding.router as geocoding_router
 import health_data.router as health_data_router
 import health_targets.router as health_targets_router
 import notifications.router as notifications_router
@@ -49,6 +51,12 @@ router.include_router(
     tags=["activities"],
     dependencies=[Depends(session_security.validate_access_token)],
 )
+router.include_router(
+    activity_bulk_imports_router.router,
+    prefix=core_config.ROOT_PATH + "/activities_bulk_imports",
+    tags=["activity_bulk_imports"],
+    dependencies=[Depends(session_security.validate_access_token)],
+)
 router.include_router(
     activity_exercise_titles_router.router,
     prefix=core_config.ROOT_PATH + "/activities_exercise_titles",
@@ -118,6 +126,12 @@ router.include_router(
     tags=["gears"],
     dependencies=[Depends(session_security.validate_access_token)],
 )
+router.include_router(
+    geocoding_router.router,
+    prefix=core_config.ROOT_PATH + "/geocoding",
+    tags=["geocoding"],
+    dependencies=[Depends(session_security.validate_access_token)],
+)
 router.include_router(
     health_data_router.router,
     prefix=core_config.ROOT_PATH + "/health",
@@ -1,5 +1,12 @@
+import asyncio
+from datetime import datetime
+
 # from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.engine import Connection
+
+import activities.activity_bulk_imports.utils as activity_bulk_imports_utils
+import activities.activity_location_enrichments.utils as activity_location_enrichments_utils
 
 import strava.activity_utils as strava_activity_utils
 import strava.utils as strava_utils
@@ -11,63 +18,222 @@ import password_reset_tokens.utils as password_reset_tokens_utils
 
 import sign_up_tokens.utils as sign_up_tokens_utils
 
+import websocket.schema as websocket_schema
+
+import core.config as core_config
+import core.locks as core_locks
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 
 # scheduler = BackgroundScheduler()
 scheduler = AsyncIOScheduler()
 
+# Lock held by the API process running the scheduled jobs
+LEADER_LOCK_NAME = "endurain_scheduler_leader"
+
+# Connection holding the leader lock, None if this process is not the leader
+leader_connection: Connection | None = None
+
+# Jobs added while this process is the leader
+leader_jobs: list = []
+
 
 def start_scheduler():
+    """
+    Starts the scheduler and the leader election.
+
+    Every API process (uvicorn worker or replica) runs a scheduler, but only
+    the one holding the leader lock runs the background jobs, so they run
+    once across the cluster. The others try to take over every minute, which
+    also happens when the leader process dies and the database releases its
+    lock.
+    """
     if not scheduler.running:
         # Start the scheduler
         scheduler.start()
-    
-    add_scheduler_job(
-        strava_utils.refresh_strava_tokens,
-        "interval",
-        60,
-        [True],
-        "refresh Strava user tokens every 60 minutes",
+
+    # Run the first election right away
+    scheduler.add_job(
+        elect_leader, "interval", minutes=1, next_run_time=datetime.now()
     )
 
-    add_scheduler_job(
-        strava_activity_utils.retrieve_strava_users_activities_for_days,
-        "interval",
-        60,
-        [1, True],
-        "retrieve last day Strava users activities",
+    # Queue again the bulk import files of the processes that died, on every
+    # process as a restarted process may not become the leader
+    scheduler.add_job(
+        activity_bulk_imports_utils.resume_bulk_imports,
+        args=[websocket_schema.get_websocket_manager()],
     )
 
-    add_scheduler_job(
-        garmin_activity_utils.retrieve_garminconnect_users_activities_for_days,
-        "interval",
-        60,
-        [1],
-        "retrieve last day Garmin Connect users activities",
+
+async def elect_leader():
+    """
+    Takes the leader lock if it is free and starts the leader jobs.
+
+    The leader checks that its lock connection is still open and stops the
+    leader jobs if it lost the lock.
+    """
+    global leader_connection
+
+    if leader_connection is not None:
+        if await core_thread_pool.run_in_thread_pool(
+            core_locks.is_lock_alive, leader_connection
+        ):
+            return
+
+        core_logger.print_to_log_and_console(
+            "Scheduler leader lock lost, stopping background jobs", "warning"
+        )
+        leader_connection = None
+        remove_leader_jobs()
+
+    try:
+        leader_connection = await core_thread_pool.run_in_thread_pool(
+            core_locks.acquire_lock, LEADER_LOCK_NAME
+        )
+    except Exception as err:
+        core_logger.print_to_log(f"Error in elect_leader: {err}", "error", exc=err)
+        return
+
+    # Another process is the leader
+    if leader_connection is None:
+        return
+
+    core_logger.print_to_log_and_console(
+        "This process is the scheduler leader, starting background jobs"
     )
+    add_leader_jobs()
+
+    # Run the startup jobs once, in the background
+    scheduler.add_job(run_startup_jobs)
 
-    add_scheduler_job(
-        garmin_health_utils.retrieve_garminconnect_users_bc_for_days,
-        "interval",
-        240,
-        [1],
-        "retrieve last day Garmin Connect users body composition",
+
+def add_leader_jobs():
+    leader_jobs.extend(
+        job
+        for job in (
+            add_scheduler_job(
+                strava_utils.refresh_strava_tokens,
+                "interval",
+                60,
+                [True],
+                "refresh Strava user tokens every 60 minutes",
+            ),
+            add_scheduler_job(
+                strava_activity_utils.retrieve_strava_users_activities_for_days,
+                "interval",
+                60,
+                [1, True, core_config.SYNC_SPREAD_MINUTES * 60],
+                "retrieve last day Strava users activities",
+            ),
+            add_scheduler_job(
+                garmin_activity_utils.retrieve_garminconnect_users_activities_for_days,
+                "interval",
+                60,
+                [1, core_config.SYNC_SPREAD_MINUTES * 60],
+                "retrieve last day Garmin Connect users activities",
+            ),
+            add_scheduler_job(
+                garmin_health_utils.retrieve_garminconnect_users_bc_for_days,
+                "interval",
+                240,
+                [1, core_config.SYNC_SPREAD_MINUTES * 60],
+                "retrieve last day Garmin Connect users body composition",
+            ),
+            add_scheduler_job(
+                password_reset_tokens_utils.delete_invalid_tokens_from_db,
+                "interval",
+                60,
+                [],
+                "delete invalid password reset tokens from the database",
+            ),
+            add_scheduler_job(
+                sign_up_tokens_utils.delete_invalid_tokens_from_db,
+                "interval",
+                60,
+                [],
+                "delete invalid sign-up tokens from the database",
+            ),
+            add_scheduler_job(
+                resume_background_work,
+                "interval",
+                10,
+                [],
+                "resume the interrupted bulk imports and location enrichments",
+            ),
+        )
+        if job is not None
     )
 
-    add_scheduler_job(
-        password_reset_tokens_utils.delete_invalid_tokens_from_db,
-        "interval",
-        60,
-        [],
-        "delete invalid password reset tokens from the database",
+
+def remove_leader_jobs():
+    for job in leader_jobs:
+        try:
+            job.remove()
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Failed to remove scheduler job {job.id}: {err}", "warning"
+            )
+    leader_jobs.clear()
+
+
+async def run_startup_jobs():
+    """
+    Runs the background work due at startup, on the leader process only.
+    """
+    # Resume the bulk imports and location enrichments interrupted by a restart
+    await resume_background_work()
+
+    # Retrieve last day activities from Garmin Connect and Strava
+    core_logger.print_to_log_and_console("Refreshing Strava tokens on startup")
+    await core_thread_pool.run_in_thread_pool(strava_utils.refresh_strava_tokens, True)
+
+    # Retrieve last day activities from Garmin Connect and Strava
+    core_logger.print_to_log_and_console(
+        "Retrieving last day activities from Garmin Connect and Strava on startup"
+    )
+    await asyncio.gather(
+        garmin_activity_utils.retrieve_garminconnect_users_activities_for_days(1),
+        strava_activity_utils.retrieve_strava_users_activities_for_days(1, True),
+    )
+
+    # Retrieve last day body composition from Garmin Connect
+    core_logger.print_to_log_and_console(
+        "Retrieving last day body composition from Garmin Connect on startup"
+    )
+    await garmin_health_utils.retrieve_garminconnect_users_bc_for_days(1)
+
+    # Delete invalid password reset tokens
+    core_logger.print_to_log_and_console(
+        "Deleting invalid password reset tokens from the database"
     )
+    await core_thread_pool.run_in_thread_pool(
+        password_reset_tokens_utils.delete_invalid_tokens_from_db
+    )
+
+    # Delete invalid sign-up tokens
+    core_logger.print_to_log_and_console(
+        "Deleting invalid sign-up tokens from the database"
+    )
+    await core_thread_pool.run_in_thread_pool(
+        sign_up_tokens_utils.delete_invalid_tokens_from_db
+    )
+
 
-    add_scheduler_job(
-        sign_up_tokens_utils.delete_invalid_tokens_from_db,
-        "interval",
-        60,
-        [],
-        "delete invalid sign-up tokens from the database",
+async def resume_background_work():
+    """
+    Resumes the bulk imports and location enrichments left by dead processes.
+
+    The database checks run in the thread pool, the workers are started as
+    asyncio tasks in the event loop.
+    """
+    websocket_manager = websocket_schema.get_websocket_manager()
+
+    # Resume the interrupted bulk imports
+    await activity_bulk_imports_utils.resume_bulk_imports(websocket_manager)
+
+    # Resume the pending activity location enrichments
+    await activity_location_enrichments_utils.resume_location_enrichments(
+        websocket_manager
     )
 
 
@@ -76,7 +242,7 @@ def add_scheduler_job(func, interval, minutes, args, description):
         core_logger.print_to_log(
             f"Added scheduler job to {description} every {minutes} minutes"
         )
-        scheduler.add_job(func, interval, minutes=minutes, args=args)
+        return scheduler.add_job(func, interval, minutes=minutes, args=args)
     except Exception as e:
         core_logger.print_to_log(
             f"Failed to add scheduler job to {description}: {str(e)}", "error"
@@ -84,4 +250,11 @@ def add_scheduler_job(func, interval, minutes, args, description):
 
 
 def stop_scheduler():
+    global leader_connection
+
     scheduler.shutdown()
+
+    # Let another process take over the background jobs
+    if leader_connection is not None:
+        core_locks.release_lock(leader_connection, LEADER_LOCK_NAME)
+        leader_connection = None
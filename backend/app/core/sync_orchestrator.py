@@ -0,0 +1,151 @@
+import asyncio
+import inspect
+import random
+import time
+
+import core.logger as core_logger
+import core.thread_pool as core_thread_pool
+
+from core.database import SessionLocal
+
+# Provider names used by the syncs
+PROVIDER_STRAVA = "strava"
+PROVIDER_GARMINCONNECT = "garminconnect"
+
+# Running user syncs of each provider are bounded by these semaphores
+semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def get_user_delay(sync_name: str, user_id: int, spread_seconds: float) -> float:
+    """
+    Returns the delay before a user sync starts.
+
+    The delay is random but stable for a sync and user, so each user is
+    synced at about the same minute of every run and the users are spread
+    across the window.
+
+    Args:
+        sync_name (str): The sync name.
+        user_id (int): The ID of the user.
+        spread_seconds (float): Window the users are spread across.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    if spread_seconds <= 0:
+        return 0.0
+    return random.Random(f"{sync_name}:{user_id}").uniform(0, spread_seconds)
+
+
+async def sync_users(
+    provider: str,
+    sync_name: str,
+    user_ids: list[int],
+    sync_user,
+    concurrency: int,
+    spread_seconds: float = 0,
+) -> dict[int, bool]:
+    """
+    Syncs the users of a provider concurrently.
+
+    Each user is synced with its own database session and its failures are
+    logged without affecting the other users. At most `concurrency` users of
+    the provider are synced at once, across all the syncs of the provider.
+
+    Args:
+        provider (str): The provider, e.g. PROVIDER_STRAVA.
+        sync_name (str): The sync name used in the logs.
+        user_ids (list[int]): The IDs of the users to sync.
+        sync_user: Function or coroutine function called with the user ID and
+            the database session. Functions run in the thread pool.
+        concurrency (int): Maximum concurrent user syncs of the provider.
+        spread_seconds (float): Window the user syncs are spread across.
+
+    Returns:
+        dict[int, bool]: Whether the sync succeeded, by user ID.
+    """
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        semaphore = semaphores[provider] = asyncio.Semaphore(concurrency)
+
+    core_logger.print_to_log(
+        f"Started {sync_name} sync of {len(user_ids)} users, spread across "
+        f"{spread_seconds:.0f}s"
+    )
+    start = time.perf_counter()
+
+    results = await asyncio.gather(
+        *(
+            sync_one_user(
+                sync_name,
+                user_id,
+                sync_user,
+                semaphore,
+                get_user_delay(sync_name, user_id, spread_seconds),
+            )
+            for user_id in user_ids
+        )
+    )
+
+    failed = results.count(False)
+    core_logger.print_to_log(
+        f"Finished {sync_name} sync: {len(results) - failed} users synced, "
+        f"{failed} failed in {time.perf_counter() - start:.1f}s",
+        "warning" if failed else "info",
+    )
+    return dict(zip(user_ids, results))
+
+
+async def sync_one_user(
+    sync_name: str,
+    user_id: int,
+    sync_user,
+    semaphore: asyncio.Semaphore,
+    delay: float,
+) -> bool:
+    """
+    Syncs a user after its delay, once the provider has a free sync slot.
+
+    Args:
+        sync_name (str): The sync name.
+        user_id (int): The ID of the user.
+        sync_user: The user sync function, see `sync_users`.
+        semaphore (asyncio.Semaphore): The provider concurrency limit.
+        delay (float): Seconds to wait before the sync.
+
+    Returns:
+        bool: Whether the sync succeeded.
+    """
+    await asyncio.sleep(delay)
+
+    async with semaphore:
+        # Create a new database session
+        db = SessionLocal()
+        start = time.perf_counter()
+        error = None
+
+        try:
+            if inspect.iscoroutinefunction(sync_user):
+                await sync_user(user_id, db)
+            else:
+                await core_thread_pool.run_in_thread_pool(sync_user, user_id, db)
+        except Exception as err:
+            error = err
+
+            # Log the exception, the other users go on
+            core_logger.print_to_log(
+                f"User {user_id}: {sync_name} sync failed after "
+                f"{time.perf_counter() - start:.1f}s: {err}",
+                "error",
+                exc=err,
+            )
+        finally:
+            # Ensure the session is closed after use
+            db.close()
+
+    duration = time.perf_counter() - start
+    if error is None:
+        core_logger.print_to_log(
+            f"User {user_id}: {sync_name} sync completed in {duration:.1f}s"
+        )
+    return error is None
@@ -0,0 +1,41 @@
+import functools
+
+import anyio.to_thread
+
+import core.config as core_config
+import core.logger as core_logger
+
+
+def configure_thread_pool():
+    """
+    Bounds the thread pool running blocking work to THREAD_POOL_WORKERS threads.
+
+    FastAPI runs plain `def` endpoints and dependencies in the default anyio
+    thread pool, and `run_in_thread_pool` uses the same pool, so a single
+    limit caps the blocking work (and the database connections it holds) of
+    the whole API. Must be called from the event loop.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = core_config.THREAD_POOL_WORKERS
+    core_logger.print_to_log(
+        f"Thread pool limited to {core_config.THREAD_POOL_WORKERS} threads"
+    )
+
+
+async def run_in_thread_pool(func, *args, **kwargs):
+    """
+    Runs a blocking function in the thread pool without blocking the event loop.
+
+    Use it from `async def` code for synchronous database queries and file
+    I/O. CPU-bound work belongs in the process pool (see
+    `core.process_pool.run_in_process_pool`), threads don't release the GIL.
+
+    Args:
+        func: Function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The function result. Exceptions raised by the function are re-raised.
+    """
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs))
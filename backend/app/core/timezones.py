@@ -0,0 +1,136 @@
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+from timezonefinder import TimezoneFinder
+
+# Decimal places coordinates are rounded to before the timezone lookup (about 110 m)
+COORDINATE_CELL_PRECISION = 3
+
+# Coordinate cells and dates kept in the lookup caches
+COORDINATE_CACHE_SIZE = 4096
+OFFSET_CACHE_SIZE = 366
+
+# TimezoneFinder shared by this process
+timezone_finder: TimezoneFinder | None = None
+timezone_finder_lock = threading.Lock()
+
+
+def get_timezone_finder() -> TimezoneFinder:
+    """
+    Returns the TimezoneFinder of this process, creating it on first use.
+
+    The finder loads its polygon data in memory once, instead of every parser
+    call creating its own finder and reading the data files again.
+
+    Returns:
+        The shared TimezoneFinder.
+    """
+    global timezone_finder
+
+    with timezone_finder_lock:
+        if timezone_finder is None:
+            timezone_finder = TimezoneFinder(in_memory=True)
+        return timezone_finder
+
+
+@lru_cache(maxsize=COORDINATE_CACHE_SIZE)
+def timezone_at_cell(latitude: float, longitude: float) -> str | None:
+    """
+    Returns the timezone name of a rounded coordinate cell.
+
+    Args:
+        latitude: The rounded latitude.
+        longitude: The rounded longitude.
+
+    Returns:
+        The timezone name, or None if the coordinates are not in a timezone.
+    """
+    return get_timezone_finder().timezone_at(lat=latitude, lng=longitude)
+
+
+def timezone_at(latitude: float, longitude: float) -> str | None:
+    """
+    Returns the timezone name of coordinates.
+
+    Coordinates are rounded to COORDINATE_CELL_PRECISION decimal places, so
+    activities starting close to each other share one lookup.
+
+    Args:
+        latitude: The latitude in degrees.
+        longitude: The longitude in degrees.
+
+    Returns:
+        The timezone name, or None if the coordinates are not in a timezone.
+    """
+    return timezone_at_cell(
+        round(float(latitude), COORDINATE_CELL_PRECISION),
+        round(float(longitude), COORDINATE_CELL_PRECISION),
+    )
+
+
+@lru_cache(maxsize=1)
+def sorted_timezone_names() -> tuple[str, ...]:
+    """
+    Returns the available timezone names in alphabetical order.
+
+    Returns:
+        Tuple with the timezone names.
+    """
+    return tuple(sorted(available_timezones()))
+
+
+@lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def timezones_by_offset(reference_day: datetime) -> dict[int, tuple[str, ...]]:
+    """
+    Maps each UTC offset in use during a day to the timezones using it.
+
+    Offsets are taken at the start and at the end of the day, so a timezone
+    changing offset (e.g. for daylight saving) during the day is listed under
+    both offsets.
+
+    Args:
+        reference_day: Midnight UTC of the day.
+
+    Returns:
+        Dictionary with the timezone names of each offset in seconds.
+    """
+    offsets = {}
+    for tz_name in sorted_timezone_names():
+        tz = ZoneInfo(tz_name)
+        for boundary in (reference_day, reference_day + timedelta(days=1)):
+            utc_offset = int(boundary.astimezone(tz).utcoffset().total_seconds())
+            zones = offsets.setdefault(utc_offset, [])
+            if not zones or zones[-1] != tz_name:
+                zones.append(tz_name)
+    return {offset: tuple(zones) for offset, zones in offsets.items()}
+
+
+def timezone_from_offset(offset_seconds: int, reference_date: datetime) -> str | None:
+    """
+    Returns a timezone with a UTC offset at a given time.
+
+    The offsets of all timezones are computed once per day, so only the few
+    timezones using the offset that day are checked at the exact time.
+
+    Args:
+        offset_seconds: The UTC offset in seconds.
+        reference_date: Timezone aware date the offset applies to.
+
+    Returns:
+        The first timezone name in alphabetical order with the offset, or None
+        if no timezone has it or the date is naive.
+    """
+    if reference_date.utcoffset() is None:
+        return None
+
+    reference_day = reference_date.astimezone(dt_timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    for tz_name in timezones_by_offset(reference_day).get(int(offset_seconds), ()):
+        utc_offset = reference_date.astimezone(ZoneInfo(tz_name)).utcoffset()
+        if utc_offset.total_seconds() == offset_seconds:
+            return tz_name
+
+    return None
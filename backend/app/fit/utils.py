@@ -1,17 +1,17 @@
 import fitdecode
+import numpy as np
 
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
+from array import array
+from datetime import datetime, timedelta, timezone as dt_timezone
 import time as timelib
 from sqlalchemy.orm import Session
-from timezonefinder import TimezoneFinder
-from zoneinfo import ZoneInfo, available_timezones
 
 import activities.activity.utils as activities_utils
+import activities.activity.geodesic_utils as geodesic_utils
 import activities.activity.schema as activities_schema
 
 import activities.activity_exercise_titles.schema as activity_exercise_titles_schema
-import activities.activity_exercise_titles.crud as activity_exercise_titles_crud
 
 import activities.activity_workout_steps.schema as activity_workout_steps_schema
 
@@ -26,6 +26,20 @@ import users.user_privacy_settings.schema as users_privacy_settings_schema
 import core.logger as core_logger
 
 import core.config as core_config
+import core.timezones as core_timezones
+
+# Record fields accumulated by the columnar decoding path
+RECORD_FIELDS = frozenset(
+    (
+        "timestamp",
+        "position_lat",
+        "position_long",
+        "enhanced_altitude",
+        "heart_rate",
+        "cadence",
+        "power",
+    )
+)
 
 
 def create_activity_objects(
@@ -37,8 +51,6 @@ def create_activity_objects(
     db: Session = None,
 ) -> list:
     try:
-        # Create an instance of TimezoneFinder
-        tf = TimezoneFinder()
         timezone = core_config.TZ
 
         # Define variables
@@ -96,13 +108,13 @@ def create_activity_objects(
 
             if activity_type != 3 and activity_type != 7:
                 if session_record["is_lat_lon_set"]:
-                    timezone = tf.timezone_at(
-                        lat=session_record["lat_lon_waypoints"][0]["lat"],
-                        lng=session_record["lat_lon_waypoints"][0]["lon"],
+                    timezone = core_timezones.timezone_at(
+                        session_record["lat_lon_waypoints"][0]["lat"],
+                        session_record["lat_lon_waypoints"][0]["lon"],
                     )
                 else:
                     if session_record["time_offset"]:
-                        timezone = find_timezone_name(
+                        timezone = core_timezones.timezone_from_offset(
                             session_record["time_offset"],
                             session_record["session"]["first_waypoint_time"],
                         )
@@ -225,13 +237,7 @@ def create_activity_objects(
 
 def split_records_by_activity(parsed_data: dict) -> dict:
     sessions = parsed_data["sessions"]
-    lat_lon_waypoints = parsed_data["lat_lon_waypoints"]
-    ele_waypoints = parsed_data.get("ele_waypoints", [])
-    hr_waypoints = parsed_data.get("hr_waypoints", [])
-    cad_waypoints = parsed_data.get("cad_waypoints", [])
-    power_waypoints = parsed_data.get("power_waypoints", [])
-    vel_waypoints = parsed_data.get("vel_waypoints", [])
-    pace_waypoints = parsed_data.get("pace_waypoints", [])
+    records = parsed_data["records"]
 
     # Check for each auxiliary flag
     is_lat_lon_set = parsed_data.get("is_lat_lon_set", False)
@@ -241,24 +247,15 @@ def split_records_by_activity(parsed_data: dict) -> dict:
     is_power_set = parsed_data.get("is_power_set", False)
     is_velocity_set = parsed_data.get("is_velocity_set", False)
 
-    # Dictionary to hold split waypoints per activity
-    activity_waypoints = {
-        i: {
-            "lat_lon_waypoints": [] if is_lat_lon_set else None,
-            "ele_waypoints": [] if is_elevation_set else None,
-            "hr_waypoints": [] if is_heart_rate_set else None,
-            "cad_waypoints": [] if is_cadence_set else None,
-            "power_waypoints": [] if is_power_set else None,
-            "vel_waypoints": [] if is_velocity_set else None,
-            "pace_waypoints": [] if is_velocity_set else None,
-        }
-        for i in range(len(sessions))
-    }
-
     sessions_records = []
 
+    # Index the laps times once, each session then only looks up its time range
+    filter_laps = activities_utils.waypoints_time_filter(
+        parsed_data["laps"] or [], "start_time"
+    )
+
     # Convert session times to datetime objects for easier comparison
-    for i, session in enumerate(sessions):
+    for session in sessions:
         # Use the time as is if it’s already a datetime object; otherwise, parse it
         start_time = session["first_waypoint_time"]
         if not isinstance(start_time, datetime):
@@ -272,14 +269,17 @@ def split_records_by_activity(parsed_data: dict) -> dict:
         start_time = start_time.replace(tzinfo=None)
         end_time = end_time.replace(tzinfo=None)
 
-        laps_records = []
+        # Get the laps starting within the session's start and end times
+        laps_records = filter_laps(start_time, end_time)
 
-        if parsed_data["laps"]:
-            for lap in parsed_data["laps"]:
-                # Check if the lap's start time is within the session's start and end times
-                if start_time <= lap["start_time"] <= end_time:
-                    # Append the lap to the session's laps
-                    laps_records.append(lap)
+        # Get the waypoints of the records within the session's start and end times
+        waypoints = get_record_waypoints(
+            records,
+            np.flatnonzero(
+                (records["times"] >= np.datetime64(start_time, "s"))
+                & (records["times"] <= np.datetime64(end_time, "s"))
+            ),
+        )
 
         # Initialize a parsed session dictionary
         parsed_session = {
@@ -305,120 +305,41 @@ def split_records_by_activity(parsed_data: dict) -> dict:
             "sets": parsed_data["sets"],
         }
 
-        # Only parse arrays if the respective flag is set
-        if is_lat_lon_set:
-            activity_waypoints[i]["lat_lon_waypoints"] = [
-                wp
-                for wp in lat_lon_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["lat_lon_waypoints"]:
-                parsed_session["lat_lon_waypoints"] = activity_waypoints[i][
-                    "lat_lon_waypoints"
-                ]
-                parsed_session["is_lat_lon_set"] = True
-
-                # If initial latitude and longitude are not set, set them to the first waypoint's coordinates
-                if (
-                    parsed_session["session"]["initial_latitude"] is None
-                    or parsed_session["session"]["initial_longitude"] is None
-                ):
-                    # Set initial latitude and longitude to the first waypoint's coordinates
-                    parsed_session["session"]["initial_latitude"] = activity_waypoints[
-                        i
-                    ]["lat_lon_waypoints"][0]["lat"]
-                    parsed_session["session"]["initial_longitude"] = activity_waypoints[
-                        i
-                    ]["lat_lon_waypoints"][0]["lon"]
-
-                # Use geocoding API to get city, town, and country based on coordinates
-                location_data = activities_utils.location_based_on_coordinates(
-                    session["initial_latitude"], session["initial_longitude"]
-                )
+        # Only set the waypoints if the respective flag is set and there are waypoints
+        if is_lat_lon_set and waypoints["lat_lon_waypoints"]:
+            parsed_session["lat_lon_waypoints"] = waypoints["lat_lon_waypoints"]
+            parsed_session["is_lat_lon_set"] = True
 
-                # Extract city, town, and country from location data
-                if location_data:
-                    parsed_session["session"]["city"] = location_data["city"]
-                    parsed_session["session"]["town"] = location_data["town"]
-                    parsed_session["session"]["country"] = location_data["country"]
-
-        if is_elevation_set:
-            activity_waypoints[i]["ele_waypoints"] = [
-                wp
-                for wp in ele_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["ele_waypoints"]:
-                parsed_session["ele_waypoints"] = activity_waypoints[i]["ele_waypoints"]
-                parsed_session["is_elevation_set"] = True
-        if is_heart_rate_set:
-            activity_waypoints[i]["hr_waypoints"] = [
-                wp
-                for wp in hr_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["hr_waypoints"]:
-                parsed_session["hr_waypoints"] = activity_waypoints[i]["hr_waypoints"]
-                parsed_session["is_heart_rate_set"] = True
-        if is_cadence_set:
-            activity_waypoints[i]["cad_waypoints"] = [
-                wp
-                for wp in cad_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["cad_waypoints"]:
-                parsed_session["cad_waypoints"] = activity_waypoints[i]["cad_waypoints"]
-                parsed_session["is_cadence_set"] = True
-        if is_power_set:
-            activity_waypoints[i]["power_waypoints"] = [
-                wp
-                for wp in power_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["power_waypoints"]:
-                parsed_session["power_waypoints"] = activity_waypoints[i][
-                    "power_waypoints"
-                ]
-                parsed_session["is_power_set"] = True
+            # If initial latitude and longitude are not set, set them to the first waypoint's coordinates
+            if (
+                parsed_session["session"]["initial_latitude"] is None
+                or parsed_session["session"]["initial_longitude"] is None
+            ):
+                parsed_session["session"]["initial_latitude"] = waypoints[
+                    "lat_lon_waypoints"
+                ][0]["lat"]
+                parsed_session["session"]["initial_longitude"] = waypoints[
+                    "lat_lon_waypoints"
+                ][0]["lon"]
+
+        if is_elevation_set and waypoints["ele_waypoints"]:
+            parsed_session["ele_waypoints"] = waypoints["ele_waypoints"]
+            parsed_session["is_elevation_set"] = True
+        if is_heart_rate_set and waypoints["hr_waypoints"]:
+            parsed_session["hr_waypoints"] = waypoints["hr_waypoints"]
+            parsed_session["is_heart_rate_set"] = True
+        if is_cadence_set and waypoints["cad_waypoints"]:
+            parsed_session["cad_waypoints"] = waypoints["cad_waypoints"]
+            parsed_session["is_cadence_set"] = True
+        if is_power_set and waypoints["power_waypoints"]:
+            parsed_session["power_waypoints"] = waypoints["power_waypoints"]
+            parsed_session["is_power_set"] = True
         if is_velocity_set:
-            activity_waypoints[i]["vel_waypoints"] = [
-                wp
-                for wp in vel_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["vel_waypoints"]:
-                parsed_session["vel_waypoints"] = activity_waypoints[i]["vel_waypoints"]
+            if waypoints["vel_waypoints"]:
+                parsed_session["vel_waypoints"] = waypoints["vel_waypoints"]
                 parsed_session["is_velocity_set"] = True
-            activity_waypoints[i]["pace_waypoints"] = [
-                wp
-                for wp in pace_waypoints
-                if start_time
-                <= datetime.strptime(wp["time"], "%Y-%m-%dT%H:%M:%S")
-                <= end_time
-            ]
-            # If there are waypoints, set the parsed session's waypoints and flag
-            if activity_waypoints[i]["pace_waypoints"]:
-                parsed_session["pace_waypoints"] = activity_waypoints[i][
-                    "pace_waypoints"
-                ]
+            if waypoints["pace_waypoints"]:
+                parsed_session["pace_waypoints"] = waypoints["pace_waypoints"]
                 parsed_session["is_velocity_set"] = True
 
         # Append the parsed session to the sessions list
@@ -428,22 +349,15 @@ def split_records_by_activity(parsed_data: dict) -> dict:
     return sessions_records
 
 
-def parse_fit_file(file: str, db: Session) -> dict:
+def parse_fit_file(file: str) -> dict:
     try:
         # Initialize default values for various variables
         sessions = []
         time_offset = 0
-        last_waypoint_time = None
         activity_name = "Workout"
 
-        # Arrays to store waypoint data
-        lat_lon_waypoints = []
-        ele_waypoints = []
-        hr_waypoints = []
-        cad_waypoints = []
-        power_waypoints = []
-        vel_waypoints = []
-        pace_waypoints = []
+        # Typed arrays to store the record fields
+        record_columns = create_record_columns()
 
         # Array to store laps
         laps = []
@@ -463,17 +377,6 @@ def parse_fit_file(file: str, db: Session) -> dict:
         # Array to store exercises titles
         exercises_titles = []
 
-        # Initialize variables to store previous latitude and longitude
-        prev_latitude, prev_longitude = None, None
-
-        # Initialize variables to store whether elevation, power, heart rate, cadence, and velocity are set
-        is_lat_lon_set = False
-        is_elevation_set = False
-        is_power_set = False
-        is_heart_rate_set = False
-        is_cadence_set = False
-        is_velocity_set = False
-
         # Open the FIT file
         with open(file, "rb") as fit_file:
             fit_data = fitdecode.FitReader(fit_file)
@@ -503,31 +406,13 @@ def parse_fit_file(file: str, db: Session) -> dict:
                             max_power,
                             ele_gain,
                             ele_loss,
-                            np,
+                            normalized_power,
                             avg_speed,
                             max_speed,
                             workout_feeling,
                             workout_rpe,
                         ) = parse_frame_session(frame)
 
-                        # If initial latitude and longitude are set, use them to get city, town, and country
-                        if (
-                            initial_latitude is not None
-                            and initial_longitude is not None
-                        ):
-                            # Use geocoding API to get city, town, and country based on coordinates
-                            location_data = (
-                                activities_utils.location_based_on_coordinates(
-                                    initial_latitude, initial_longitude
-                                )
-                            )
-
-                            # Extract city, town, and country from location data
-                            if location_data:
-                                city = location_data["city"]
-                                town = location_data["town"]
-                                country = location_data["country"]
-
                         # Initialize the session dictionary with parsed data
                         session_data = {
                             "initial_latitude": initial_latitude,
@@ -551,7 +436,7 @@ def parse_fit_file(file: str, db: Session) -> dict:
                             "max_power": max_power,
                             "ele_gain": ele_gain,
                             "ele_loss": ele_loss,
-                            "np": np,
+                            "np": normalized_power,
                             "avg_speed": avg_speed,
                             "max_speed": max_speed,
                             "workout_feeling": workout_feeling,
@@ -620,124 +505,31 @@ def parse_fit_file(file: str, db: Session) -> dict:
 
                     # Extract waypoint data
                     if frame.name == "record":
-                        # Extract values from record frame
-                        (
-                            latitude,
-                            longitude,
-                            elevation,
-                            time,
-                            heart_rate,
-                            cadence,
-                            power,
-                        ) = parse_frame_record(frame)
-
-                        # Check elevation
-                        if elevation is not None:
-                            is_elevation_set = True
-
-                        # Check if heart rate, cadence, power are set
-                        if heart_rate is not None:
-                            is_heart_rate_set = True
-
-                        if cadence is not None:
-                            is_cadence_set = True
-
-                        if power is not None:
-                            is_power_set = True
-
-                        instant_speed = None
-                        # Calculate instant speed, pace, and update waypoint arrays
-                        if (
-                            latitude is not None
-                            and prev_latitude is not None
-                            and longitude is not None
-                            and prev_longitude is not None
-                        ):
-                            instant_speed = activities_utils.calculate_instant_speed(
-                                last_waypoint_time,
-                                time,
-                                latitude,
-                                longitude,
-                                prev_latitude,
-                                prev_longitude,
-                            )
-
-                        # Calculate instance pace
-                        instant_pace = None
-                        if instant_speed:
-                            instant_pace = 1 / instant_speed
-                            is_velocity_set = True
-
-                        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-                        # Append waypoint data to respective arrays
-                        if latitude is not None and longitude is not None:
-                            lat_lon_waypoints.append(
-                                {
-                                    "time": timestamp,
-                                    "lat": latitude,
-                                    "lon": longitude,
-                                }
-                            )
-                            is_lat_lon_set = True
-
-                        activities_utils.append_if_not_none(
-                            ele_waypoints, timestamp, elevation, "ele"
-                        )
-                        activities_utils.append_if_not_none(
-                            hr_waypoints, timestamp, heart_rate, "hr"
-                        )
-                        activities_utils.append_if_not_none(
-                            cad_waypoints, timestamp, cadence, "cad"
-                        )
-                        activities_utils.append_if_not_none(
-                            power_waypoints, timestamp, power, "power"
-                        )
-                        activities_utils.append_if_not_none(
-                            vel_waypoints, timestamp, instant_speed, "vel"
-                        )
-                        activities_utils.append_if_not_none(
-                            pace_waypoints, timestamp, instant_pace, "pace"
-                        )
-
-                        # Update previous latitude, longitude, and last waypoint time
-                        prev_latitude, prev_longitude, last_waypoint_time = (
-                            latitude,
-                            longitude,
-                            time,
-                        )
+                        append_frame_record(frame, record_columns)
 
                     if frame.name == "device_settings":
                         time_offset = parse_frame_device_settings(frame)
                         time_offset = interpret_time_offset(time_offset)
 
-        # Check if exercises titles is not none
-        if exercises_titles:
-            activity_exercise_titles_crud.create_activity_exercise_titles(
-                exercises_titles, db
-            )
+        # Convert the coordinates and calculate the speed of all records at once
+        records = finalize_record_columns(record_columns)
 
         # Return parsed data as a dictionary
         return {
             "sessions": sessions,
             "time_offset": time_offset,
             "activity_name": activity_name,
-            "is_elevation_set": is_elevation_set,
-            "ele_waypoints": ele_waypoints,
-            "is_power_set": is_power_set,
-            "power_waypoints": power_waypoints,
-            "is_heart_rate_set": is_heart_rate_set,
-            "hr_waypoints": hr_waypoints,
-            "is_velocity_set": is_velocity_set,
-            "vel_waypoints": vel_waypoints,
-            "pace_waypoints": pace_waypoints,
-            "is_cadence_set": is_cadence_set,
-            "cad_waypoints": cad_waypoints,
-            "is_lat_lon_set": is_lat_lon_set,
-            "lat_lon_waypoints": lat_lon_waypoints,
+            "records": records,
+            "is_elevation_set": bool((~np.isnan(records["elevations"])).any()),
+            "is_power_set": bool((records["powers"] != 0).any()),
+            "is_heart_rate_set": bool((records["heart_rates"] != 0).any()),
+            "is_velocity_set": bool((records["speeds"] > 0).any()),
+            "is_cadence_set": bool((records["cadences"] != 0).any()),
+            "is_lat_lon_set": bool((~np.isnan(records["latitudes"])).any()),
             "laps": laps,
             "splits": splits,
             "split_summary": split_summary,
+            "exercises_titles": exercises_titles,
             "sets": sets,
             "workout_steps": workout_steps,
         }
@@ -813,22 +605,154 @@ def parse_frame_workout(frame):
     return get_value_from_frame(frame, "wkt_name", "Workout")
 
 
-def parse_frame_record(frame):
-    # Extracting data using the helper function
-    latitude = get_value_from_frame(frame, "position_lat")
-    longitude = get_value_from_frame(frame, "position_long")
-    elevation = get_value_from_frame(frame, "enhanced_altitude")
-    time = get_value_from_frame(frame, "timestamp")
-    if time:
-        time = time.replace(tzinfo=None)
-    heart_rate = get_value_from_frame(frame, "heart_rate")
-    cadence = get_value_from_frame(frame, "cadence")
-    power = get_value_from_frame(frame, "power")
+def create_record_columns() -> dict:
+    """
+    Creates the typed arrays record fields are accumulated into.
+
+    Returns:
+        Dictionary with an empty array per record column.
+    """
+    return {
+        "times": array("q"),
+        "latitudes": array("d"),
+        "longitudes": array("d"),
+        "elevations": array("d"),
+        "heart_rates": array("l"),
+        "cadences": array("l"),
+        "powers": array("l"),
+    }
+
+
+def append_frame_record(frame, record_columns: dict):
+    """
+    Appends the fields of a record frame to the record columns.
+
+    The frame fields are scanned once, instead of once per field looked up.
+    Like `get_value_from_frame`, empty and zero values are missing: NaN for
+    coordinates and elevation, 0 for heart rate, cadence and power. Records
+    without a timestamp are skipped.
+
+    Args:
+        frame: The record FitDataMessage.
+        record_columns: Columns created by `create_record_columns`.
+    """
+    values = {}
+    for field in frame.fields:
+        if field.name in RECORD_FIELDS and field.name not in values:
+            values[field.name] = field.value
+
+    time = values.get("timestamp")
+    if not isinstance(time, datetime):
+        return
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=dt_timezone.utc)
+
+    record_columns["times"].append(int(time.timestamp()))
+    record_columns["latitudes"].append(values.get("position_lat") or np.nan)
+    record_columns["longitudes"].append(values.get("position_long") or np.nan)
+    record_columns["elevations"].append(values.get("enhanced_altitude") or np.nan)
+    record_columns["heart_rates"].append(int(values.get("heart_rate") or 0))
+    record_columns["cadences"].append(int(values.get("cadence") or 0))
+    record_columns["powers"].append(int(values.get("power") or 0))
+
+
+def finalize_record_columns(record_columns: dict) -> dict:
+    """
+    Converts the record columns to numpy arrays.
+
+    Coordinates are converted from semicircles to degrees and the instant
+    speed of every record is calculated at once.
+
+    Args:
+        record_columns: Columns filled by `append_frame_record`.
+
+    Returns:
+        Dictionary with the times (datetime64[s], UTC), latitudes, longitudes,
+        elevations and speeds (floats, NaN if missing) and heart rates,
+        cadences and powers (integers, 0 if missing) of the records.
+    """
+    times = np.frombuffer(record_columns["times"], dtype=np.int64)
+    latitudes = np.frombuffer(record_columns["latitudes"], dtype=np.float64) * (
+        180 / 2**31
+    )
+    longitudes = np.frombuffer(record_columns["longitudes"], dtype=np.float64) * (
+        180 / 2**31
+    )
+
+    # A coordinate without the other one is not a position
+    is_position_missing = np.isnan(latitudes) | np.isnan(longitudes)
+    latitudes[is_position_missing] = np.nan
+    longitudes[is_position_missing] = np.nan
+
+    # Records without a position (or following one without) have no speed
+    speeds = geodesic_utils.instant_speeds(times, latitudes, longitudes)
+    if speeds.size:
+        speeds[0] = np.nan
+
+    return {
+        "times": times.astype("datetime64[s]"),
+        "latitudes": latitudes,
+        "longitudes": longitudes,
+        "elevations": np.frombuffer(record_columns["elevations"], dtype=np.float64),
+        "heart_rates": np.asarray(record_columns["heart_rates"], dtype=np.int64),
+        "cadences": np.asarray(record_columns["cadences"], dtype=np.int64),
+        "powers": np.asarray(record_columns["powers"], dtype=np.int64),
+        "speeds": speeds,
+    }
+
+
+def get_record_waypoints(records: dict, indexes: np.ndarray | None = None) -> dict:
+    """
+    Builds the waypoint lists of records.
 
-    latitude, longitude = convert_coordinates_to_degrees(latitude, longitude)
+    Args:
+        records: Records returned by `finalize_record_columns`.
+        indexes: Indexes of the records to use. Defaults to all records.
 
-    # Return all extracted values
-    return latitude, longitude, elevation, time, heart_rate, cadence, power
+    Returns:
+        Dictionary with the lat_lon, ele, hr, cad, power, vel and pace
+        waypoint lists. Records with a missing value are left out of the
+        respective list.
+    """
+    if indexes is not None:
+        records = {key: values[indexes] for key, values in records.items()}
+
+    timestamps = np.datetime_as_string(records["times"], unit="s").tolist()
+
+    def waypoints(values: np.ndarray, is_set: np.ndarray, key: str) -> list[dict]:
+        return [
+            {"time": timestamps[index], key: value}
+            for index, value in zip(
+                np.flatnonzero(is_set).tolist(), values[is_set].tolist()
+            )
+        ]
+
+    has_position = ~np.isnan(records["latitudes"])
+    lat_lon_waypoints = [
+        {"time": timestamps[index], "lat": latitude, "lon": longitude}
+        for index, latitude, longitude in zip(
+            np.flatnonzero(has_position).tolist(),
+            records["latitudes"][has_position].tolist(),
+            records["longitudes"][has_position].tolist(),
+        )
+    ]
+    vel_waypoints, pace_waypoints = geodesic_utils.speed_and_pace_waypoints(
+        timestamps, records["speeds"], skip_zero_pace=True
+    )
+
+    return {
+        "lat_lon_waypoints": lat_lon_waypoints,
+        "ele_waypoints": waypoints(
+            records["elevations"], ~np.isnan(records["elevations"]), "ele"
+        ),
+        "hr_waypoints": waypoints(
+            records["heart_rates"], records["heart_rates"] != 0, "hr"
+        ),
+        "cad_waypoints": waypoints(records["cadences"], records["cadences"] != 0, "cad"),
+        "power_waypoints": waypoints(records["powers"], records["powers"] != 0, "power"),
+        "vel_waypoints": vel_waypoints,
+        "pace_waypoints": pace_waypoints,
+    }
 
 
 def parse_frame_lap(frame):
@@ -1094,16 +1018,3 @@ def calculate_pace(distance, total_timer_time, activity_type, split_summary):
 
         return time_active, time_active / distance
     return total_timer_time, 0
-
-
-def find_timezone_name(offset_seconds, reference_date):
-    for tz_name in available_timezones():
-        tz = ZoneInfo(tz_name)
-        if reference_date.utcoffset() is None:  # Skip invalid timezones
-            continue
-
-        # Get the UTC offset for the reference date
-        utc_offset = reference_date.astimezone(tz).utcoffset()
-
-        if utc_offset.total_seconds() == offset_seconds:
-            return tz_name
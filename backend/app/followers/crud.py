@@ -7,10 +7,6 @@ import followers.models as followers_models
 
 import core.logger as core_logger
 
-import notifications.utils as notifications_utils
-
-import websocket.schema as websocket_schema
-
 
 def get_all_followers_by_user_id(user_id: int, db: Session):
     try:
@@ -160,12 +156,7 @@ def get_follower_for_user_id_and_target_user_id(
         ) from err
 
 
-async def create_follower(
-    user_id: int,
-    target_user_id: int,
-    websocket_manager: websocket_schema.WebSocketManager,
-    db: Session,
-):
+def create_follower(user_id: int, target_user_id: int, db: Session):
     try:
         # Create a new follow relationship
         new_follow = followers_models.Follower(
@@ -175,10 +166,6 @@ async def create_follower(
         # Add the new follow relationship to the database
         db.add(new_follow)
         db.commit()
-        
-        await notifications_utils.create_new_follower_request_notification(
-            user_id, target_user_id, websocket_manager, db
-        )
 
         # Return the gear
         return new_follow
@@ -196,12 +183,7 @@ async def create_follower(
         ) from err
 
 
-async def accept_follower(
-    user_id: int,
-    target_user_id: int,
-    websocket_manager: websocket_schema.WebSocketManager,
-    db: Session,
-):
+def accept_follower(user_id: int, target_user_id: int, db: Session):
     try:
         # Get the follower record
         accept_follow = (
@@ -226,10 +208,6 @@ async def accept_follower(
 
         # Commit the transaction
         db.commit()
-        
-        await notifications_utils.create_accepted_follower_request_notification(
-            user_id, target_user_id, websocket_manager, db
-        )
     except HTTPException as http_err:
         raise http_err
     except Exception as err:
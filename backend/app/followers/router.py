@@ -13,6 +13,9 @@ import users.user.dependencies as users_dependencies
 import session.security as session_security
 
 import core.database as core_database
+import core.thread_pool as core_thread_pool
+
+import notifications.utils as notifications_utils
 
 import websocket.schema as websocket_schema
 
@@ -24,7 +27,7 @@ router = APIRouter()
     "/user/{user_id}/followers/all",
     response_model=list[followers_schema.Follower] | None,
 )
-async def get_user_follower_all(
+def get_user_follower_all(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -43,7 +46,7 @@ async def get_user_follower_all(
     "/user/{user_id}/followers/count/all",
     response_model=int,
 )
-async def get_user_follower_count_all(
+def get_user_follower_count_all(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -69,7 +72,7 @@ async def get_user_follower_count_all(
     "/user/{user_id}/followers/count/accepted",
     response_model=int,
 )
-async def get_user_follower_count(
+def get_user_follower_count(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -95,7 +98,7 @@ async def get_user_follower_count(
     "/user/{user_id}/following/all",
     response_model=list[followers_schema.Follower] | None,
 )
-async def get_user_following_all(
+def get_user_following_all(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -114,7 +117,7 @@ async def get_user_following_all(
     "/user/{user_id}/following/count/all",
     response_model=int,
 )
-async def get_user_following_count_all(
+def get_user_following_count_all(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -140,7 +143,7 @@ async def get_user_following_count_all(
     "/user/{user_id}/following/count/accepted",
     response_model=int,
 )
-async def get_user_following_count(
+def get_user_following_count(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -166,7 +169,7 @@ async def get_user_following_count(
     "/user/{user_id}/targetUser/{target_user_id}",
     response_model=followers_schema.Follower | None,
 )
-async def read_followers_user_specific_user(
+def read_followers_user_specific_user(
     user_id: int,
     validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     target_user_id: int,
@@ -215,11 +218,19 @@ async def create_follow(
         Depends(core_database.get_db),
     ],
 ):
-    # Create the follower and return it
-    return await followers_crud.create_follower(
+    # Create the follower
+    follower = await core_thread_pool.run_in_thread_pool(
+        followers_crud.create_follower, token_user_id, target_user_id, db
+    )
+
+    # Notify the target user about the follow request
+    await notifications_utils.create_new_follower_request_notification(
         token_user_id, target_user_id, websocket_manager, db
     )
 
+    # Return the follower
+    return follower
+
 
 @router.put(
     "/accept/targetUser/{target_user_id}",
@@ -248,7 +259,12 @@ async def accept_follow(
     ],
 ):
     # Accept the follower
-    await followers_crud.accept_follower(
+    await core_thread_pool.run_in_thread_pool(
+        followers_crud.accept_follower, token_user_id, target_user_id, db
+    )
+
+    # Notify the user about the accepted follow request
+    await notifications_utils.create_accepted_follower_request_notification(
         token_user_id, target_user_id, websocket_manager, db
     )
 
@@ -259,7 +275,7 @@ async def accept_follow(
 @router.delete(
     "/delete/follower/targetUser/{target_user_id}",
 )
-async def delete_follower(
+def delete_follower(
     # user_id: int,
     # validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     target_user_id: int,
@@ -288,7 +304,7 @@ async def delete_follower(
 @router.delete(
     "/delete/following/targetUser/{target_user_id}",
 )
-async def delete_following(
+def delete_following(
     # user_id: int,
     # validate_user_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     target_user_id: int,
@@ -7,6 +7,9 @@ from sqlalchemy.orm import Session
 
 import core.logger as core_logger
 import core.config as core_config
+import core.rate_limits as core_rate_limits
+import core.sync_orchestrator as core_sync_orchestrator
+import core.thread_pool as core_thread_pool
 
 import garmin.utils as garmin_utils
 
@@ -14,7 +17,7 @@ import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
 import activities.activity.crud as activities_crud
 
-import users.user.crud as users_crud
+import users.user_integrations.crud as user_integrations_crud
 
 import websocket.schema as websocket_schema
 
@@ -29,11 +32,26 @@ async def fetch_and_process_activities_by_dates(
     websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
 ) -> list[activities_schema.Activity] | None:
+    # Backfills leave part of the request budget to the recent activities
+    budget = core_rate_limits.get_garminconnect_budget()
+    budget_reserve = core_rate_limits.get_backfill_reserve(start_date)
+
+    def get_activities_by_date():
+        budget.acquire(1, budget_reserve)
+        return garminconnect_client.get_activities_by_date(
+            str(start_date.date()), str(end_date.date())
+        )
+
     try:
         # Fetch Garmin Connect activities for the specified date range
-        garmin_activities = garminconnect_client.get_activities_by_date(
-            str(start_date.date()), str(end_date.date())
+        garmin_activities = await core_thread_pool.run_in_thread_pool(
+            get_activities_by_date
+        )
+    except core_rate_limits.RateLimitExceeded:
+        await core_rate_limits.pause_backfill(
+            core_sync_orchestrator.PROVIDER_GARMINCONNECT, user_id, start_date, db
         )
+        return None
     except Exception as err:
         core_logger.print_to_log(
             f"Error fetching activities for user {user_id} between {start_date.date()} and {end_date.date()}: {err}",
@@ -51,6 +69,13 @@ async def fetch_and_process_activities_by_dates(
         return None
 
     parsed_activities = []
+    parsed_files = []
+    paused = False
+
+    # Download the newest activities first, they are kept if the budget runs out
+    garmin_activities.sort(
+        key=lambda activity: activity.get("startTimeGMT") or "", reverse=True
+    )
 
     # Download activities
     for activity in garmin_activities:
@@ -58,8 +83,11 @@ async def fetch_and_process_activities_by_dates(
         activity_id = activity["activityId"]
 
         # Check if the activity is already stored in the database
-        activity_db = activities_crud.get_activity_by_garminconnect_id_from_user_id(
-            activity_id, user_id, db
+        activity_db = await core_thread_pool.run_in_thread_pool(
+            activities_crud.get_activity_by_garminconnect_id_from_user_id,
+            activity_id,
+            user_id,
+            db,
         )
 
         if activity_db:
@@ -71,97 +99,231 @@ async def fetch_and_process_activities_by_dates(
 
         core_logger.print_to_log(f"User {user_id}: Processing activity {activity_id}")
 
-        # Get activity gear
-        activity_gear = garminconnect_client.get_activity_gear(activity_id)
-
-        # Download the activity in original format (.zip file)
-        zip_data = garminconnect_client.download_activity(
-            activity_id, dl_fmt=garminconnect_client.ActivityDownloadFormat.ORIGINAL
-        )
-        # Save the zip file
-        output_file = f"{core_config.FILES_DIR}/{str(activity_id)}.zip"
-
-        # Write the ZIP data to the output file
-        with open(output_file, "wb") as fb:
-            fb.write(zip_data)
-
-        # Array to store the names of extracted files
-        extracted_files = []
-
-        # Open the ZIP file
-        with zipfile.ZipFile(output_file, "r") as zip_ref:
-            # Extract all contents to the specified directory
-            zip_ref.extractall(core_config.FILES_DIR)
-            # Populate the array with file names
-            extracted_files = zip_ref.namelist()
-
         try:
-            os.remove(output_file)
-        except OSError as err:
-            core_logger.print_to_log(
-                f"Error removing file {output_file}: {err}", "error", exc=err
+            # Get the activity gear and files without blocking the event loop
+            activity_gear, extracted_files = await core_thread_pool.run_in_thread_pool(
+                download_activity_files,
+                garminconnect_client,
+                activity_id,
+                budget_reserve,
             )
+        except Exception as err:
+            # Stop at a spent budget or a 429, the sync is resumed later
+            if (
+                isinstance(err, core_rate_limits.RateLimitExceeded)
+                or budget.is_paused()
+            ):
+                paused = True
+                break
+
+            # Keep the activities already downloaded
+            if parsed_files:
+                await store_activity_files(parsed_files, websocket_manager, db)
+            raise err
 
         for file_path_suffix in extracted_files:
-            # Parse and store the activity from the extracted file
+            # Parse the activity from the extracted file, it is saved in batches
             full_file_path = os.path.join(core_config.FILES_DIR, file_path_suffix)
 
+            parsed_file = await activities_utils.parse_activity_file(
+                user_id,
+                full_file_path,
+                db,
+                True,
+                activity_gear,
+            )
+            if parsed_file is not None:
+                parsed_files.append(parsed_file)
+
+        # Save the parsed activities in batches, one transaction per batch
+        if (
+            sum(len(parsed_file["parsed_infos"]) for parsed_file in parsed_files)
+            >= core_config.ACTIVITIES_STORE_BATCH_SIZE
+        ):
             parsed_activities.extend(
-                await activities_utils.parse_and_store_activity_from_file(
-                    user_id,
-                    full_file_path,
-                    websocket_manager,
-                    db,
-                    True,
-                    activity_gear,
-                )
-                or []
+                await store_activity_files(parsed_files, websocket_manager, db)
             )
+            parsed_files = []
+
+    if parsed_files:
+        parsed_activities.extend(
+            await store_activity_files(parsed_files, websocket_manager, db)
+        )
+
+    if paused:
+        await core_rate_limits.pause_backfill(
+            core_sync_orchestrator.PROVIDER_GARMINCONNECT, user_id, start_date, db
+        )
+    else:
+        await core_rate_limits.complete_backfill(
+            core_sync_orchestrator.PROVIDER_GARMINCONNECT, user_id, start_date, db
+        )
 
     # Return the number of activities processed
     return parsed_activities if parsed_activities else None
 
 
-async def retrieve_garminconnect_users_activities_for_days(days: int):
+async def store_activity_files(
+    parsed_files: list[dict],
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+) -> list[activities_schema.Activity]:
+    """
+    Stores a batch of parsed activity files in a single transaction.
+
+    If the batch fails, its files are stored one by one so a single failing
+    file doesn't hold back the others. Failing files are moved to the import
+    errors directory.
+
+    Args:
+        parsed_files (list[dict]): The files, as returned by
+            `activities.activity.utils.parse_activity_file`.
+        websocket_manager (websocket_schema.WebSocketManager): The manager used to send the notifications.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[activities_schema.Activity]: The created activities.
+    """
+    try:
+        return await activities_utils.store_activity_files(
+            parsed_files, websocket_manager, db
+        )
+    except Exception as err:
+        if len(parsed_files) == 1:
+            activities_utils.move_file_to_import_errors(
+                parsed_files[0]["file_path"], err
+            )
+            return []
+
+        core_logger.print_to_log(
+            f"Error storing a batch of {len(parsed_files)} Garmin Connect files, "
+            f"storing them one by one: {err}",
+            "warning",
+        )
+
+    created_activities = []
+    for parsed_file in parsed_files:
+        created_activities.extend(
+            await store_activity_files([parsed_file], websocket_manager, db)
+        )
+    return created_activities
+
+
+def download_activity_files(
+    garminconnect_client: garminconnect.Garmin,
+    activity_id: int,
+    budget_reserve: float = 0.0,
+) -> tuple[dict, list[str]]:
+    """
+    Downloads the original files of a Garmin Connect activity.
+
+    Args:
+        garminconnect_client (garminconnect.Garmin): The Garmin Connect client.
+        activity_id (int): The Garmin Connect activity ID.
+        budget_reserve (float): Share of the Garmin Connect request budget to
+            leave untouched, see `core.rate_limits.RequestBudget.acquire`.
+
+    Returns:
+        tuple[dict, list[str]]: The activity gear and the names of the files
+            extracted in the files directory.
+
+    Raises:
+        core_rate_limits.RateLimitExceeded: If the request budget is spent.
+    """
+    # Take the requests of the activity from the Garmin Connect budget
+    core_rate_limits.get_garminconnect_budget().acquire(
+        core_rate_limits.GARMINCONNECT_ACTIVITY_REQUESTS, budget_reserve
+    )
+
+    # Get activity gear
+    activity_gear = garminconnect_client.get_activity_gear(activity_id)
+
+    # Download the activity in original format (.zip file)
+    zip_data = garminconnect_client.download_activity(
+        activity_id, dl_fmt=garminconnect_client.ActivityDownloadFormat.ORIGINAL
+    )
+    # Save the zip file
+    output_file = f"{core_config.FILES_DIR}/{str(activity_id)}.zip"
+
+    # Write the ZIP data to the output file
+    with open(output_file, "wb") as fb:
+        fb.write(zip_data)
+
+    # Array to store the names of extracted files
+    extracted_files = []
+
+    # Open the ZIP file
+    with zipfile.ZipFile(output_file, "r") as zip_ref:
+        # Extract all contents to the specified directory
+        zip_ref.extractall(core_config.FILES_DIR)
+        # Populate the array with file names
+        extracted_files = zip_ref.namelist()
+
+    try:
+        os.remove(output_file)
+    except OSError as err:
+        core_logger.print_to_log(
+            f"Error removing file {output_file}: {err}", "error", exc=err
+        )
+
+    return activity_gear, extracted_files
+
+
+async def retrieve_garminconnect_users_activities_for_days(
+    days: int, spread_seconds: float = 0
+):
     # Create a new database session
     db = SessionLocal()
     websocket_manager = websocket_schema.get_websocket_manager()
 
     try:
-        # Get all users
-        users = users_crud.get_all_users(db)
-
-        # Calculate the start date and end date
-        calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
-        calculated_end_date = datetime.now(timezone.utc)
-
-        # Iterate through all users
-        for user in users:
-            try:
-                await get_user_garminconnect_activities_by_dates(
-                    calculated_start_date,
-                    calculated_end_date,
-                    user.id,
-                    websocket_manager,
-                    db,
-                )
-            except Exception as err:
-                # Log specific errors for each user
-                core_logger.print_to_log(
-                    f"Error processing activities for user {user.id} in retrieve_garminconnect_users_activities_for_days: {err}",
-                    "error",
-                    exc=err,
-                )
+        # Get the users with Garmin Connect linked
+        user_ids = await core_thread_pool.run_in_thread_pool(
+            user_integrations_crud.get_user_ids_with_garminconnect_linked, db
+        )
     except Exception as err:
         core_logger.print_to_log(
             f"Error getting users in retrieve_garminconnect_users_activities_for_days: {err}",
             "error",
             exc=err,
         )
+        return
     finally:
         # Ensure the session is closed after use
         db.close()
 
+    # Calculate the start date and end date
+    calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
+    calculated_end_date = datetime.now(timezone.utc)
+
+    async def sync_user(user_id: int, user_db: Session):
+        # Resume the backfill of the user paused by the rate limits, if any
+        user_start_date = await core_thread_pool.run_in_thread_pool(
+            core_rate_limits.get_backfill_start,
+            core_sync_orchestrator.PROVIDER_GARMINCONNECT,
+            user_id,
+            calculated_start_date,
+            user_db,
+        )
+
+        await get_user_garminconnect_activities_by_dates(
+            user_start_date,
+            calculated_end_date,
+            user_id,
+            websocket_manager,
+            user_db,
+        )
+
+    # Sync the users concurrently, each with its own session
+    await core_sync_orchestrator.sync_users(
+        core_sync_orchestrator.PROVIDER_GARMINCONNECT,
+        "Garmin Connect activities",
+        user_ids,
+        sync_user,
+        core_config.GARMINCONNECT_SYNC_CONCURRENCY,
+        spread_seconds,
+    )
+
 
 def get_user_garminconnect_client(user_id: int, db: Session):
     try:
@@ -201,7 +363,9 @@ async def get_user_garminconnect_activities_by_dates(
 ) -> list[activities_schema.Activity] | None:
     try:
         # Get the Garmin Connect client for the user
-        garminconnect_client = get_user_garminconnect_client(user_id, db)
+        garminconnect_client = await core_thread_pool.run_in_thread_pool(
+            get_user_garminconnect_client, user_id, db
+        )
 
         if garminconnect_client is not None:
             # Fetch Garmin Connect activities for the specified date range
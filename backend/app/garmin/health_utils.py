@@ -5,14 +5,18 @@ from datetime import datetime, timedelta, date, timezone
 import garminconnect
 from sqlalchemy.orm import Session
 
+import core.config as core_config
 import core.logger as core_logger
+import core.rate_limits as core_rate_limits
+import core.sync_orchestrator as core_sync_orchestrator
+import core.thread_pool as core_thread_pool
 
 import garmin.utils as garmin_utils
 
 import health_data.crud as health_data_crud
 import health_data.schema as health_data_schema
 
-import users.user.crud as users_crud
+import users.user_integrations.crud as user_integrations_crud
 
 from core.database import SessionLocal
 
@@ -25,6 +29,9 @@ def fetch_and_process_bc_by_dates(
     db: Session,
 ) -> int:
     try:
+        # Take the request from the Garmin Connect budget
+        core_rate_limits.get_garminconnect_budget().acquire(1)
+
         # Fetch Garmin Connect body composition data for the specified date range
         garmin_bc = garminconnect_client.get_body_composition(
             str(start_date.date()), str(end_date.date())
@@ -91,47 +98,58 @@ def fetch_and_process_bc_by_dates(
     return count_processed
 
 
-def retrieve_garminconnect_users_bc_for_days(days: int):
+async def retrieve_garminconnect_users_bc_for_days(
+    days: int, spread_seconds: float = 0
+):
     # Create a new database session
     db = SessionLocal()
+
     try:
-        # Get all users
-        users = users_crud.get_all_users(db)
-        # Calculate the start and end dates
-        calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
-        calculated_end_date = datetime.now(timezone.utc)
-
-        # Iterate through all users
-        for user in users:
-            try:
-                # Get the user's Garmin Connect body composition data
-                get_user_garminconnect_bc_by_dates(
-                    calculated_start_date,
-                    calculated_end_date,
-                    user.id,
-                )
-            except Exception as err:
-                core_logger.print_to_log(
-                    f"Error processing body composition for user {user.id} in retrieve_garminconnect_users_bc_for_days: {err}",
-                    "error",
-                    exc=err,
-                )
+        # Get the users with Garmin Connect linked
+        user_ids = await core_thread_pool.run_in_thread_pool(
+            user_integrations_crud.get_user_ids_with_garminconnect_linked, db
+        )
     except Exception as err:
         core_logger.print_to_log(
             f"Error getting users in retrieve_garminconnect_users_bc_for_days: {err}",
             "error",
             exc=err,
         )
+        return
     finally:
         # Ensure the session is closed after use
         db.close()
 
+    # Calculate the start and end dates
+    calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
+    calculated_end_date = datetime.now(timezone.utc)
+
+    def sync_user(user_id: int, user_db: Session):
+        # Get the user's Garmin Connect body composition data
+        get_user_garminconnect_bc_by_dates(
+            calculated_start_date, calculated_end_date, user_id, user_db
+        )
+
+    # Sync the users concurrently, each with its own session
+    await core_sync_orchestrator.sync_users(
+        core_sync_orchestrator.PROVIDER_GARMINCONNECT,
+        "Garmin Connect body composition",
+        user_ids,
+        sync_user,
+        core_config.GARMINCONNECT_SYNC_CONCURRENCY,
+        spread_seconds,
+    )
+
 
 def get_user_garminconnect_bc_by_dates(
-    start_date: datetime, end_date: datetime, user_id: int
+    start_date: datetime, end_date: datetime, user_id: int, db: Session = None
 ):
-    # Create a new database session
-    db = SessionLocal()
+    close_session = False
+    if db is None:
+        # Create a new database session
+        db = SessionLocal()
+        close_session = True
+
     try:
         # Get the user integrations by user ID
         user_integrations = garmin_utils.fetch_user_integrations_and_validate_token(
@@ -169,4 +187,5 @@ def get_user_garminconnect_bc_by_dates(
         )
     finally:
         # Ensure the session is closed after use
-        db.close()
+        if close_session:
+            db.close()
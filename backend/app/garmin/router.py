@@ -68,7 +68,7 @@ async def garminconnect_mfa_code(
     ],
 ):
     # Store the MFA code
-    mfa_codes.add_code(token_user_id, mfa_request.mfa_code)
+    await mfa_codes.publish_code(token_user_id, mfa_request.mfa_code)
     return {"message": "MFA code received successfully"}
 
 
@@ -76,7 +76,7 @@ async def garminconnect_mfa_code(
     "/activities",
     status_code=202,
 )
-async def garminconnect_retrieve_activities_days(
+def garminconnect_retrieve_activities_days(
     start_date: date,
     end_date: date,
     token_user_id: Annotated[
@@ -113,7 +113,7 @@ async def garminconnect_retrieve_activities_days(
 
 
 @router.get("/gear", status_code=202)
-async def garminconnect_retrieve_gear(
+def garminconnect_retrieve_gear(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -139,7 +139,7 @@ async def garminconnect_retrieve_gear(
     "/health",
     status_code=202,
 )
-async def garminconnect_retrieve_health_days(
+def garminconnect_retrieve_health_days(
     start_date: date,
     end_date: date,
     token_user_id: Annotated[
@@ -170,7 +170,7 @@ async def garminconnect_retrieve_health_days(
 
 
 @router.delete("/unlink")
-async def garminconnect_unlink(
+def garminconnect_unlink(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
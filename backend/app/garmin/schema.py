@@ -1,5 +1,10 @@
 from pydantic import BaseModel
 
+import core.pubsub as core_pubsub
+
+# Pub/sub topic of the MFA codes sent by the users
+MFA_CODE_TOPIC = "garmin_mfa_code"
+
 
 class GarminLogin(BaseModel):
     username: str
@@ -17,6 +22,13 @@ class MFACodeStore:
     def add_code(self, user_id, code):
         self._store[user_id] = code
 
+    async def publish_code(self, user_id, code):
+        # The login waiting for the code may run in another API process
+        await core_pubsub.publish(MFA_CODE_TOPIC, {"user_id": user_id, "code": code})
+
+    def receive_code(self, event):
+        self.add_code(event["user_id"], event["code"])
+
     def get_code(self, user_id):
         return self._store.get(user_id)
 
@@ -39,3 +51,4 @@ def get_mfa_store():
 
 
 mfa_store = MFACodeStore()
+core_pubsub.subscribe(MFA_CODE_TOPIC, mfa_store.receive_code)
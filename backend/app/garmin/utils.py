@@ -22,6 +22,8 @@ import websocket.utils as websocket_utils
 import garmin.schema as garmin_schema
 
 import core.logger as core_logger
+import core.rate_limits as core_rate_limits
+import core.thread_pool as core_thread_pool
 
 
 async def get_mfa(
@@ -29,7 +31,8 @@ async def get_mfa(
     mfa_codes: garmin_schema.MFACodeStore,
     websocket_manager: websocket_schema.WebSocketManager,
 ) -> str:
-    # Notify frontend that MFA is required
+    # Forget codes left by previous logins, then notify frontend that MFA is required
+    mfa_codes.delete_code(user_id)
     await notify_frontend_mfa_required(user_id, websocket_manager)
 
     # Wait for the MFA code
@@ -44,11 +47,8 @@ async def get_mfa(
 async def notify_frontend_mfa_required(
     user_id: int, websocket_manager: websocket_schema.WebSocketManager
 ):
-    try:
-        json_data = {"message": "MFA_REQUIRED", "user_id": user_id}
-        await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
-    except HTTPException as http_err:
-        raise http_err
+    json_data = {"message": "MFA_REQUIRED", "user_id": user_id}
+    await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
 
 
 async def link_garminconnect(
@@ -76,7 +76,7 @@ async def link_garminconnect(
 
     try:
         # Run the blocking `login()` call in a thread
-        garmin = await asyncio.to_thread(blocking_login)
+        garmin = await core_thread_pool.run_in_thread_pool(blocking_login)
 
         if not garmin.garth.oauth1_token:
             raise HTTPException(
@@ -85,7 +85,8 @@ async def link_garminconnect(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user_integrations_crud.link_garminconnect_account(
+        await core_thread_pool.run_in_thread_pool(
+            user_integrations_crud.link_garminconnect_account,
             user_id,
             serialize_oauth1_token(garmin.garth.oauth1_token),
             serialize_oauth2_token(garmin.garth.oauth2_token),
@@ -142,6 +143,9 @@ def login_garminconnect_using_tokens(oauth1_token, oauth2_token):
         garmin.garth.oauth1_token = deserialize_oauth1_token(oauth1_token)
         garmin.garth.oauth2_token = deserialize_oauth2_token(oauth2_token)
 
+        # Pause the Garmin Connect request budget when throttled
+        core_rate_limits.watch_garminconnect_responses(garmin.garth.sess)
+
         return garmin
     except (
         garminconnect.GarminConnectAuthenticationError,
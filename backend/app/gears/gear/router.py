@@ -19,7 +19,7 @@ router = APIRouter()
     "",
     response_model=list[gears_schema.Gear] | None,
 )
-async def read_gears(
+def read_gears(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:read"])
     ],
@@ -36,7 +36,7 @@ async def read_gears(
     "/id/{gear_id}",
     response_model=gears_schema.Gear | None,
 )
-async def read_gear_id(
+def read_gear_id(
     gear_id: int,
     validate_gear_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     check_scopes: Annotated[
@@ -55,7 +55,7 @@ async def read_gear_id(
     "/page_number/{page_number}/num_records/{num_records}",
     response_model=list[gears_schema.Gear] | None,
 )
-async def read_gear_user_pagination(
+def read_gear_user_pagination(
     page_number: int,
     num_records: int,
     check_scopes: Annotated[
@@ -79,7 +79,7 @@ async def read_gear_user_pagination(
     "/number",
     response_model=int,
 )
-async def read_gear_user_number(
+def read_gear_user_number(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:read"])
     ],
@@ -106,7 +106,7 @@ async def read_gear_user_number(
     "/nickname/contains/{nickname}",
     response_model=list[gears_schema.Gear] | None,
 )
-async def read_gear_user_contains_nickname(
+def read_gear_user_contains_nickname(
     nickname: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:read"])
@@ -127,7 +127,7 @@ async def read_gear_user_contains_nickname(
     "/nickname/{nickname}",
     response_model=gears_schema.Gear | None,
 )
-async def read_gear_user_by_nickname(
+def read_gear_user_by_nickname(
     nickname: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:read"])
@@ -148,7 +148,7 @@ async def read_gear_user_by_nickname(
     "/type/{gear_type}",
     response_model=list[gears_schema.Gear] | None,
 )
-async def read_gear_user_by_type(
+def read_gear_user_by_type(
     gear_type: int,
     validate_type: Annotated[Callable, Depends(gears_dependencies.validate_gear_type)],
     check_scopes: Annotated[
@@ -171,7 +171,7 @@ async def read_gear_user_by_type(
     response_model=gears_schema.Gear,
     status_code=201,
 )
-async def create_gear(
+def create_gear(
     gear: gears_schema.Gear,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:write"])
@@ -189,7 +189,7 @@ async def create_gear(
 
 
 @router.put("/{gear_id}")
-async def edit_gear(
+def edit_gear(
     gear_id: int,
     validate_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     gear: gears_schema.Gear,
@@ -228,7 +228,7 @@ async def edit_gear(
 
 
 @router.delete("/{gear_id}")
-async def delete_gear(
+def delete_gear(
     gear_id: int,
     validate_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     check_scopes: Annotated[
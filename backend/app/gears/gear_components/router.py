@@ -20,7 +20,7 @@ router = APIRouter()
     "",
     response_model=list[gears_components_schema.GearComponents] | None,
 )
-async def read_gear_components(
+def read_gear_components(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:read"])
     ],
@@ -37,7 +37,7 @@ async def read_gear_components(
     "/gear_id/{gear_id}",
     response_model=list[gears_components_schema.GearComponents] | None,
 )
-async def read_gear_components_gear_id(
+def read_gear_components_gear_id(
     gear_id: int,
     validate_gear_id: Annotated[Callable, Depends(gears_dependencies.validate_gear_id)],
     check_scopes: Annotated[
@@ -59,7 +59,7 @@ async def read_gear_components_gear_id(
     response_model=gears_components_schema.GearComponents,
     status_code=201,
 )
-async def create_gear_component(
+def create_gear_component(
     gear_component: gears_components_schema.GearComponents,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:write"])
@@ -82,7 +82,7 @@ async def create_gear_component(
 
 
 @router.put("")
-async def edit_gear_component(
+def edit_gear_component(
     gear_component: gears_components_schema.GearComponents,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["gears:write"])
@@ -133,7 +133,7 @@ async def edit_gear_component(
 
 
 @router.delete("/{gear_component_id}")
-async def delete_component_gear(
+def delete_component_gear(
     gear_component_id: int,
     validate_id: Annotated[
         Callable, Depends(gears_components_dependencies.validate_gear_component_id)
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import geocoding.models as geocoding_models
+
+import core.config as core_config
+import core.logger as core_logger
+
+
+def get_expiration_date() -> datetime | None:
+    """
+    Returns the creation date before which cache entries are expired.
+
+    Returns:
+        datetime | None: The expiration date, or None if entries never expire.
+    """
+    if core_config.REVERSE_GEO_CACHE_TTL_DAYS <= 0:
+        return None
+
+    return datetime.now() - timedelta(days=core_config.REVERSE_GEO_CACHE_TTL_DAYS)
+
+
+def get_geocode_cache_entry(
+    provider: str, cell: str, db: Session
+) -> geocoding_models.GeocodeCache | None:
+    """
+    Retrieve the non expired cache entry of a grid cell.
+
+    Args:
+        provider (str): The reverse geocoding provider.
+        cell (str): The geohash of the grid cell.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        geocoding_models.GeocodeCache | None: The cache entry, or None if there is none.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        query = db.query(geocoding_models.GeocodeCache).filter(
+            geocoding_models.GeocodeCache.provider == provider,
+            geocoding_models.GeocodeCache.cell == cell,
+        )
+
+        expiration_date = get_expiration_date()
+        if expiration_date is not None:
+            query = query.filter(
+                geocoding_models.GeocodeCache.created_at >= expiration_date
+            )
+
+        # Return the cache entry
+        return query.first()
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_geocode_cache_entry: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_geocode_cache_counts(db: Session) -> tuple[int, int]:
+    """
+    Count the cache entries.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        tuple[int, int]: The number of entries and of expired entries.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        entries = db.query(geocoding_models.GeocodeCache).count()
+
+        expired_entries = 0
+        expiration_date = get_expiration_date()
+        if expiration_date is not None:
+            expired_entries = (
+                db.query(geocoding_models.GeocodeCache)
+                .filter(geocoding_models.GeocodeCache.created_at < expiration_date)
+                .count()
+            )
+
+        # Return the counts
+        return entries, expired_entries
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_geocode_cache_counts: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def create_or_update_geocode_cache_entry(
+    provider: str, cell: str, location: dict, db: Session
+):
+    """
+    Store the location of a grid cell, replacing an expired entry.
+
+    Args:
+        provider (str): The reverse geocoding provider.
+        cell (str): The geohash of the grid cell.
+        location (dict): The location, with the city, town and country.
+        db (Session): The SQLAlchemy database session.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while storing the entry.
+    """
+    try:
+        db_entry = (
+            db.query(geocoding_models.GeocodeCache)
+            .filter(
+                geocoding_models.GeocodeCache.provider == provider,
+                geocoding_models.GeocodeCache.cell == cell,
+            )
+            .first()
+        )
+
+        if db_entry is None:
+            db_entry = geocoding_models.GeocodeCache(provider=provider, cell=cell)
+            db.add(db_entry)
+
+        db_entry.city = location.get("city")
+        db_entry.town = location.get("town")
+        db_entry.country = location.get("country")
+        db_entry.created_at = datetime.now()
+
+        # Commit the transaction
+        db.commit()
+    except IntegrityError:
+        # Another process cached the same cell first
+        db.rollback()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in create_or_update_geocode_cache_entry: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def delete_geocode_cache_entries(db: Session, expired_only: bool = False) -> int:
+    """
+    Delete the cache entries.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+        expired_only (bool): Only delete the expired entries.
+
+    Returns:
+        int: The number of deleted entries.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while deleting the entries.
+    """
+    try:
+        query = db.query(geocoding_models.GeocodeCache)
+
+        if expired_only:
+            expiration_date = get_expiration_date()
+            if expiration_date is None:
+                return 0
+            query = query.filter(
+                geocoding_models.GeocodeCache.created_at < expiration_date
+            )
+
+        deleted_entries = query.delete(synchronize_session=False)
+
+        # Commit the transaction
+        db.commit()
+
+        # Return the number of deleted entries
+        return deleted_entries
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in delete_geocode_cache_entries: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
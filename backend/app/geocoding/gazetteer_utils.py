@@ -0,0 +1,387 @@
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+import core.config as core_config
+import core.locks as core_locks
+import core.logger as core_logger
+
+# Places with at least this population are returned as a city, smaller ones as a town
+CITY_MIN_POPULATION = 10000
+
+# Places further away than this are not used (e.g. activities at sea)
+MAX_DISTANCE_METERS = 50000
+
+# Points scanned at once in a KD-tree leaf
+LEAF_SIZE = 32
+
+# Index files, written next to the dataset and memory-mapped on load
+INDEX_FILES = ("points", "populations", "country_codes", "name_offsets", "names")
+
+# Lock held while the index is built, the other processes wait for it
+INDEX_LOCK_NAME = "endurain_gazetteer_index"
+
+# GeoNames columns used from the cities and country info files
+CITIES_NAME_COLUMN = 1
+CITIES_LATITUDE_COLUMN = 4
+CITIES_LONGITUDE_COLUMN = 5
+CITIES_COUNTRY_CODE_COLUMN = 8
+CITIES_POPULATION_COLUMN = 14
+COUNTRIES_CODE_COLUMN = 0
+COUNTRIES_NAME_COLUMN = 4
+
+EARTH_MEAN_RADIUS = 6371008.8
+
+# Gazetteer loaded in this process
+gazetteer: dict | None = None
+gazetteer_lock = threading.Lock()
+
+
+def coordinates_to_points(latitudes, longitudes) -> np.ndarray:
+    """
+    Converts coordinates to points on the unit sphere.
+
+    The euclidean distance between two points grows with the great circle
+    distance, so the nearest point is also the nearest place, with no special
+    case at the poles or the antimeridian.
+
+    Args:
+        latitudes: Latitudes in degrees.
+        longitudes: Longitudes in degrees.
+
+    Returns:
+        Array with one (x, y, z) row per coordinate.
+    """
+    phi = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lambda_ = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.column_stack(
+        (np.cos(phi) * np.cos(lambda_), np.cos(phi) * np.sin(lambda_), np.sin(phi))
+    )
+
+
+def build_kd_tree(points: np.ndarray) -> np.ndarray:
+    """
+    Orders points as an implicit, balanced KD-tree.
+
+    The node of a range is its middle point, split on axis depth % 3, with
+    smaller points before it and larger ones after it. Ranges of up to
+    LEAF_SIZE points are leaves. The tree needs no other storage than the
+    ordered points, so it can be memory-mapped.
+
+    Args:
+        points: Array with one (x, y, z) row per point.
+
+    Returns:
+        Permutation of the point indexes in tree order.
+    """
+    order = np.arange(len(points))
+    stack = [(0, len(points), 0)]
+
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= LEAF_SIZE:
+            continue
+
+        middle = (low + high) // 2
+        axis = depth % 3
+        subrange = order[low:high]
+        order[low:high] = subrange[
+            np.argpartition(points[subrange, axis], middle - low)
+        ]
+
+        stack.append((low, middle, depth + 1))
+        stack.append((middle + 1, high, depth + 1))
+
+    return order
+
+
+def query_kd_tree(points: np.ndarray, point: np.ndarray) -> tuple[int, float]:
+    """
+    Finds the nearest point in a tree built by `build_kd_tree`.
+
+    Args:
+        points: Points in tree order.
+        point: The (x, y, z) point to look up.
+
+    Returns:
+        Tuple with the index of the nearest point and its squared distance.
+    """
+    best_index = -1
+    best_distance = np.inf
+    point_values = point.tolist()
+    stack = [(0, len(points), 0, 0.0)]
+
+    while stack:
+        low, high, depth, bound = stack.pop()
+        if bound >= best_distance:
+            continue
+
+        if high - low <= LEAF_SIZE:
+            distances = ((points[low:high] - point) ** 2).sum(axis=1)
+            index = int(distances.argmin())
+            if distances[index] < best_distance:
+                best_index = low + index
+                best_distance = float(distances[index])
+            continue
+
+        middle = (low + high) // 2
+        axis = depth % 3
+        # Plain floats are faster than numpy scalars for a single point
+        middle_values = points[middle].tolist()
+        distance = (
+            (middle_values[0] - point_values[0]) ** 2
+            + (middle_values[1] - point_values[1]) ** 2
+            + (middle_values[2] - point_values[2]) ** 2
+        )
+        if distance < best_distance:
+            best_index = middle
+            best_distance = distance
+
+        # Visit the side of the split containing the point first
+        difference = point_values[axis] - middle_values[axis]
+        near = (low, middle) if difference < 0 else (middle + 1, high)
+        far = (middle + 1, high) if difference < 0 else (low, middle)
+        stack.append((*far, depth + 1, difference**2))
+        stack.append((*near, depth + 1, 0.0))
+
+    return best_index, best_distance
+
+
+def read_country_names(countries_path: str) -> dict[str, str]:
+    """
+    Reads the country names of a GeoNames countryInfo.txt file.
+
+    Args:
+        countries_path: Path of the file.
+
+    Returns:
+        Dictionary with the country name of each ISO code. Empty if the file
+        doesn't exist, in which case countries are returned as ISO codes.
+    """
+    country_names = {}
+    if not os.path.isfile(countries_path):
+        return country_names
+
+    with open(countries_path, encoding="utf-8") as countries_file:
+        for line in countries_file:
+            if line.startswith("#"):
+                continue
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) > COUNTRIES_NAME_COLUMN:
+                country_names[columns[COUNTRIES_CODE_COLUMN]] = columns[
+                    COUNTRIES_NAME_COLUMN
+                ]
+
+    return country_names
+
+
+def build_gazetteer_index(dataset_path: str, index_dir: str):
+    """
+    Builds the index files of a GeoNames cities file (e.g. cities500.txt).
+
+    Args:
+        dataset_path: Path of the tab separated GeoNames cities file.
+        index_dir: Directory where the index files are written.
+    """
+    latitudes = []
+    longitudes = []
+    populations = []
+    country_codes = []
+    names = []
+
+    with open(dataset_path, encoding="utf-8") as dataset_file:
+        for line in dataset_file:
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) <= CITIES_POPULATION_COLUMN:
+                continue
+            try:
+                latitudes.append(float(columns[CITIES_LATITUDE_COLUMN]))
+                longitudes.append(float(columns[CITIES_LONGITUDE_COLUMN]))
+            except ValueError:
+                continue
+            populations.append(int(columns[CITIES_POPULATION_COLUMN] or 0))
+            country_codes.append(columns[CITIES_COUNTRY_CODE_COLUMN])
+            names.append(columns[CITIES_NAME_COLUMN].encode("utf-8"))
+
+    points = coordinates_to_points(latitudes, longitudes)
+    order = build_kd_tree(points)
+
+    # Names are stored as one UTF-8 blob and the offset of each name
+    ordered_names = [names[index] for index in order]
+    name_offsets = np.zeros(len(ordered_names) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in ordered_names], out=name_offsets[1:])
+
+    os.makedirs(index_dir, exist_ok=True)
+    arrays = {
+        "points": points[order],
+        "populations": np.asarray(populations, dtype=np.int64)[order],
+        "country_codes": np.asarray(country_codes, dtype="S2")[order],
+        "name_offsets": name_offsets,
+        "names": np.frombuffer(b"".join(ordered_names), dtype=np.uint8),
+    }
+    for name, array in arrays.items():
+        # Write to a temporary file of this process first, so other processes
+        # never load a partial index
+        temporary_fd, temporary_path = tempfile.mkstemp(
+            suffix=".npy", prefix=f"{name}.", dir=index_dir
+        )
+        try:
+            with os.fdopen(temporary_fd, "wb") as temporary_file:
+                np.save(temporary_file, array)
+            os.replace(temporary_path, os.path.join(index_dir, f"{name}.npy"))
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+    core_logger.print_to_log(
+        f"Built the local reverse geocoding index with {len(order)} places"
+    )
+
+
+def get_index_paths(index_dir: str) -> list[str]:
+    """
+    Returns the paths of the index files, in INDEX_FILES order.
+
+    Args:
+        index_dir: Directory of the index files.
+
+    Returns:
+        The path of each index file.
+    """
+    return [os.path.join(index_dir, f"{name}.npy") for name in INDEX_FILES]
+
+
+def is_index_stale(dataset_path: str, index_dir: str) -> bool:
+    """
+    Checks if the index is missing or older than the dataset.
+
+    Args:
+        dataset_path: Path of the GeoNames cities file.
+        index_dir: Directory of the index files.
+
+    Returns:
+        True if an index file is missing or older than the dataset.
+    """
+    index_paths = get_index_paths(index_dir)
+    return not all(os.path.isfile(path) for path in index_paths) or min(
+        os.path.getmtime(path) for path in index_paths
+    ) < os.path.getmtime(dataset_path)
+
+
+def build_gazetteer_index_if_stale():
+    """
+    Builds the index of REVERSE_GEO_LOCAL_DATASET if it is missing or stale.
+
+    Run before the API workers start (see docker/start.sh) and on startup.
+    The index is built under a cluster wide lock, so only one process builds
+    it and the others wait and then load the new index.
+
+    Raises:
+        FileNotFoundError: If the dataset doesn't exist.
+    """
+    dataset_path = core_config.REVERSE_GEO_LOCAL_DATASET
+    index_dir = f"{dataset_path}.index"
+
+    if not os.path.isfile(dataset_path):
+        raise FileNotFoundError(
+            f"Local reverse geocoding dataset {dataset_path} not found"
+        )
+
+    if not is_index_stale(dataset_path, index_dir):
+        return
+
+    with core_locks.hold_lock(INDEX_LOCK_NAME):
+        # Another process may have built it while this one waited
+        if is_index_stale(dataset_path, index_dir):
+            build_gazetteer_index(dataset_path, index_dir)
+
+
+def load_gazetteer() -> dict:
+    """
+    Returns the gazetteer of this process, loading it on first use.
+
+    The index is normally built on startup, it is built here only if the
+    dataset changed since. It is memory-mapped, so loading it is fast and
+    processes share its pages.
+
+    Returns:
+        Dictionary with the memory-mapped index arrays and the country names.
+
+    Raises:
+        FileNotFoundError: If the dataset doesn't exist.
+    """
+    global gazetteer
+
+    with gazetteer_lock:
+        if gazetteer is not None:
+            return gazetteer
+
+        build_gazetteer_index_if_stale()
+
+        index_dir = f"{core_config.REVERSE_GEO_LOCAL_DATASET}.index"
+        gazetteer = {
+            name: np.load(path, mmap_mode="r")
+            for name, path in zip(INDEX_FILES, get_index_paths(index_dir))
+        }
+        gazetteer["country_names"] = read_country_names(
+            core_config.REVERSE_GEO_LOCAL_COUNTRIES
+        )
+
+        return gazetteer
+
+
+def location_from_gazetteer(latitude: float, longitude: float) -> dict:
+    """
+    Returns the location of the nearest place in the local gazetteer.
+
+    Args:
+        latitude: The latitude in degrees.
+        longitude: The longitude in degrees.
+
+    Returns:
+        Dictionary with the city, town and country. The place is the city if it
+        has at least CITY_MIN_POPULATION people and the town otherwise. All
+        values are None if no place is within MAX_DISTANCE_METERS.
+    """
+    places = load_gazetteer()
+
+    index, squared_chord = query_kd_tree(
+        places["points"], coordinates_to_points([latitude], [longitude])[0]
+    )
+
+    # Convert the chord length between the points to a great circle distance
+    distance = 2 * EARTH_MEAN_RADIUS * np.arcsin(min(np.sqrt(squared_chord) / 2, 1.0))
+    if index < 0 or distance > MAX_DISTANCE_METERS:
+        return {
+            "city": None,
+            "town": None,
+            "country": None,
+        }
+
+    name = (
+        places["names"][places["name_offsets"][index] : places["name_offsets"][index + 1]]
+        .tobytes()
+        .decode("utf-8")
+    )
+    country_code = places["country_codes"][index].decode("ascii")
+    is_city = places["populations"][index] >= CITY_MIN_POPULATION
+
+    return {
+        "city": name if is_city else None,
+        "town": None if is_city else name,
+        "country": places["country_names"].get(country_code, country_code),
+    }
+
+
+if __name__ == "__main__":
+    # Build the index before the API workers start, see docker/start.sh
+    core_logger.setup_main_logger()
+    try:
+        build_gazetteer_index_if_stale()
+    except Exception as err:
+        # The API starts anyway, the geocoding calls report the error
+        core_logger.print_to_log_and_console(
+            f"Error building the local reverse geocoding index: {err}", "error"
+        )
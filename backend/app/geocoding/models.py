@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+    __table_args__ = (
+        UniqueConstraint("provider", "cell", name="uq_geocode_cache_provider_cell"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider = Column(
+        String(length=20),
+        nullable=False,
+        comment="Reverse geocoding provider that resolved the location",
+    )
+    cell = Column(
+        String(length=12),
+        nullable=False,
+        comment="Geohash of the grid cell the location belongs to",
+    )
+    city = Column(
+        String(length=250), nullable=True, comment="Cell city (May include spaces)"
+    )
+    town = Column(
+        String(length=250), nullable=True, comment="Cell town (May include spaces)"
+    )
+    country = Column(
+        String(length=250), nullable=True, comment="Cell country (May include spaces)"
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        index=True,
+        comment="Cache entry creation date (DateTime)",
+    )
@@ -0,0 +1,75 @@
+from typing import Annotated, Callable
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Security, status
+from sqlalchemy.orm import Session
+
+import geocoding.crud as geocoding_crud
+import geocoding.schema as geocoding_schema
+import geocoding.utils as geocoding_utils
+
+import session.security as session_security
+
+import core.database as core_database
+
+# Define the API router
+router = APIRouter()
+
+
+@router.get("/cache", response_model=geocoding_schema.GeocodeCacheStats)
+def read_geocode_cache_stats(
+    check_scopes: Annotated[
+        Callable,
+        Security(session_security.check_scopes, scopes=["server_settings:read"]),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+):
+    # Get the reverse geocoding cache statistics
+    return geocoding_utils.get_geocode_cache_stats(db)
+
+
+@router.post("/cache/warm", status_code=202)
+def warm_geocode_cache(
+    warm_attributes: geocoding_schema.GeocodeCacheWarm,
+    check_scopes: Annotated[
+        Callable,
+        Security(session_security.check_scopes, scopes=["server_settings:write"]),
+    ],
+    background_tasks: BackgroundTasks,
+):
+    if not geocoding_utils.is_cache_enabled():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Reverse geocoding cache is disabled",
+        )
+
+    # Resolve the coordinates in the background, they go through the provider rate limit
+    background_tasks.add_task(
+        geocoding_utils.warm_geocode_cache, warm_attributes.coordinates
+    )
+
+    # Return a success message
+    return {
+        "detail": f"Warming the reverse geocoding cache with {len(warm_attributes.coordinates)} coordinates"
+    }
+
+
+@router.delete("/cache")
+def delete_geocode_cache(
+    check_scopes: Annotated[
+        Callable,
+        Security(session_security.check_scopes, scopes=["server_settings:write"]),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    expired_only: bool = False,
+):
+    # Delete the cache entries
+    deleted_entries = geocoding_crud.delete_geocode_cache_entries(db, expired_only)
+
+    # Return a success message
+    return {"detail": f"{deleted_entries} reverse geocoding cache entries deleted"}
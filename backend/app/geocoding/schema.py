@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class GeocodeCacheStats(BaseModel):
+    provider: str
+    precision: int
+    ttl_days: int
+    entries: int
+    expired_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float | None = None
+
+
+class GeocodeCoordinate(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class GeocodeCacheWarm(BaseModel):
+    coordinates: list[GeocodeCoordinate] = Field(..., max_length=10000)
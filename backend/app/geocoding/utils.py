@@ -0,0 +1,254 @@
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.orm import Session
+
+import activities.activity.utils as activities_utils
+
+import geocoding.crud as geocoding_crud
+import geocoding.schema as geocoding_schema
+
+import core.config as core_config
+import core.locks as core_locks
+import core.logger as core_logger
+
+from core.database import SessionLocal
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Lock spacing the reverse geocoding requests of all the API processes
+REVERSE_GEO_LOCK_NAME = "endurain_reverse_geo"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int) -> str:
+    """
+    Encodes a coordinate as a geohash.
+
+    Each extra character divides the cell by 32: a precision of 5 is a cell of
+    about 4.9 x 4.9 km, 6 is about 1.2 x 0.6 km and 7 about 150 x 150 m.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+        precision (int): The number of geohash characters.
+
+    Returns:
+        str: The geohash of the cell containing the coordinate.
+    """
+    latitude_range = [-90.0, 90.0]
+    longitude_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even_bit = True
+
+    while len(geohash) < precision:
+        # Bits alternate between longitude and latitude, starting with longitude
+        value_range, value = (
+            (longitude_range, longitude) if even_bit else (latitude_range, latitude)
+        )
+        middle = (value_range[0] + value_range[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            value_range[0] = middle
+        else:
+            bits = bits * 2
+            value_range[1] = middle
+        even_bit = not even_bit
+
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def is_cache_enabled() -> bool:
+    return core_config.REVERSE_GEO_CACHE_PRECISION > 0
+
+
+def increment_counter(counter):
+    with counter.get_lock():
+        counter.value += 1
+
+
+def get_cached_location(latitude: float, longitude: float) -> dict | None:
+    """
+    Returns the cached location of the grid cell containing a coordinate.
+
+    Cache errors are logged and treated as misses, so they never fail an import.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+
+    Returns:
+        dict | None: The city, town and country, or None on a cache miss.
+    """
+    if not is_cache_enabled():
+        return None
+
+    # Create a new database session
+    db = SessionLocal()
+
+    try:
+        db_entry = geocoding_crud.get_geocode_cache_entry(
+            core_config.REVERSE_GEO_PROVIDER,
+            encode_geohash(
+                latitude, longitude, core_config.REVERSE_GEO_CACHE_PRECISION
+            ),
+            db,
+        )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Error reading the reverse geocoding cache: {err}", "warning"
+        )
+        db_entry = None
+    finally:
+        # Ensure the session is closed after use
+        db.close()
+
+    if db_entry is None:
+        increment_counter(core_config.REVERSE_GEO_CACHE_MISSES)
+        return None
+
+    increment_counter(core_config.REVERSE_GEO_CACHE_HITS)
+    return {
+        "city": db_entry.city,
+        "town": db_entry.town,
+        "country": db_entry.country,
+    }
+
+
+def store_cached_location(latitude: float, longitude: float, location: dict):
+    """
+    Caches the location of the grid cell containing a coordinate.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+        location (dict): The city, town and country returned by the provider.
+    """
+    if not is_cache_enabled():
+        return
+
+    # Create a new database session
+    db = SessionLocal()
+
+    try:
+        geocoding_crud.create_or_update_geocode_cache_entry(
+            core_config.REVERSE_GEO_PROVIDER,
+            encode_geohash(
+                latitude, longitude, core_config.REVERSE_GEO_CACHE_PRECISION
+            ),
+            location,
+            db,
+        )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Error writing the reverse geocoding cache: {err}", "warning"
+        )
+    finally:
+        # Ensure the session is closed after use
+        db.close()
+
+
+def get_geocode_cache_stats(db: Session) -> geocoding_schema.GeocodeCacheStats:
+    """
+    Returns the reverse geocoding cache settings, size and hit/miss counters.
+
+    The counters are kept in memory since the server started.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        geocoding_schema.GeocodeCacheStats: The cache statistics.
+    """
+    entries, expired_entries = geocoding_crud.get_geocode_cache_counts(db)
+    hits = core_config.REVERSE_GEO_CACHE_HITS.value
+    misses = core_config.REVERSE_GEO_CACHE_MISSES.value
+
+    return geocoding_schema.GeocodeCacheStats(
+        provider=core_config.REVERSE_GEO_PROVIDER,
+        precision=core_config.REVERSE_GEO_CACHE_PRECISION,
+        ttl_days=core_config.REVERSE_GEO_CACHE_TTL_DAYS,
+        entries=entries,
+        expired_entries=expired_entries,
+        hits=hits,
+        misses=misses,
+        hit_ratio=hits / (hits + misses) if hits + misses > 0 else None,
+    )
+
+
+def warm_geocode_cache(coordinates: list[geocoding_schema.GeocodeCoordinate]):
+    """
+    Resolves and caches the locations of a list of coordinates.
+
+    Coordinates in the same grid cell are resolved once and cells already
+    cached are skipped, the rest go through the provider rate limit.
+
+    Args:
+        coordinates (list[geocoding_schema.GeocodeCoordinate]): The coordinates to resolve.
+    """
+    cells = {}
+    for coordinate in coordinates:
+        cells.setdefault(
+            encode_geohash(
+                coordinate.latitude,
+                coordinate.longitude,
+                core_config.REVERSE_GEO_CACHE_PRECISION,
+            ),
+            coordinate,
+        )
+
+    core_logger.print_to_log(
+        f"Warming the reverse geocoding cache with {len(cells)} cells"
+    )
+
+    resolved = 0
+    for coordinate in cells.values():
+        try:
+            # Cached cells are returned without calling the provider
+            activities_utils.location_based_on_coordinates(
+                coordinate.latitude, coordinate.longitude
+            )
+            resolved += 1
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error warming the reverse geocoding cache for {coordinate.latitude}, {coordinate.longitude}: {err}",
+                "warning",
+            )
+
+    core_logger.print_to_log(
+        f"Reverse geocoding cache warmed, {resolved} of {len(cells)} cells resolved"
+    )
+
+
+@contextmanager
+def throttle_request():
+    """
+    Spaces the reverse geocoding requests by REVERSE_GEO_MIN_INTERVAL.
+
+    The request is made in the block, which holds a cluster wide lock until
+    it ends and the interval has passed, so REVERSE_GEO_RATE_LIMIT holds
+    across the API processes and replicas. REVERSE_GEO_LOCK queues the
+    requests of the threads and process pool workers of an API process
+    first, so each process waits for the lock with a single connection.
+    """
+    if core_config.REVERSE_GEO_MIN_INTERVAL <= 0:
+        yield
+        return
+
+    with core_config.REVERSE_GEO_LOCK, core_locks.hold_lock(REVERSE_GEO_LOCK_NAME):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            interval = core_config.REVERSE_GEO_MIN_INTERVAL - (
+                time.monotonic() - started
+            )
+            if interval > 0:
+                time.sleep(interval)
@@ -0,0 +1,285 @@
+import xml.etree.ElementTree as ET
+from array import array
+
+import gpxpy.gpxfield
+import numpy as np
+
+from fastapi import HTTPException, status
+
+# Garmin TrackPointExtension v1 heart rate and cadence elements
+GARMIN_HR_TAG = "{http://www.garmin.com/xmlschemas/TrackPointExtension/v1}hr"
+GARMIN_CAD_TAG = "{http://www.garmin.com/xmlschemas/TrackPointExtension/v1}cad"
+
+# Elements tracked while parsing, to clear them once read
+CONTAINER_TAGS = frozenset(("metadata", "wpt", "rte", "trk", "trkseg", "trkpt"))
+
+# Elements read when they end, all others are skipped
+READ_TAGS = CONTAINER_TAGS | {"name", "desc", "type"}
+
+# Point times converted to datetime64 at once
+TIME_CHUNK_SIZE = 8192
+
+
+def local_tag(element: ET.Element) -> str:
+    """
+    Returns the tag of an element without its namespace.
+
+    Args:
+        element: The XML element.
+
+    Returns:
+        The local tag name.
+    """
+    return element.tag.rpartition("}")[2]
+
+
+def parse_integer(text: str | None) -> int:
+    """
+    Parses an integer extension value.
+
+    Args:
+        text: The element text.
+
+    Returns:
+        The value, or 0 if the text is empty.
+    """
+    if not text:
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+def parse_wall_time(text: str) -> str:
+    """
+    Returns the local wall time of a GPX time as "%Y-%m-%dT%H:%M:%S".
+
+    ISO 8601 times (the GPX format) are sliced, other formats accepted by
+    gpxpy are parsed.
+
+    Args:
+        text: The GPX time.
+
+    Returns:
+        The wall time, without fractional seconds or UTC offset.
+    """
+    if len(text) >= 19 and text[10] == "T" and text[4] == "-" and text[16] == ":":
+        return text[:19]
+    return gpxpy.gpxfield.parse_time(text).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def read_point_extensions(extensions: ET.Element) -> tuple[int, int, int]:
+    """
+    Reads the heart rate, cadence and power of a track point's extensions.
+
+    Supports the Garmin TrackPointExtension (v1 and, through its children,
+    other versions and OpenTracks), and the power and heartrate elements
+    written by other devices.
+
+    Args:
+        extensions: The <extensions> element of the point.
+
+    Returns:
+        Tuple with the heart rate, cadence and power (0 if missing).
+    """
+    heart_rate, cadence, power = 0, 0, 0
+
+    for extension in extensions:
+        tag = local_tag(extension)
+        if tag.endswith("TrackPointExtension"):
+            is_garmin_v1 = False
+            for child in extension:
+                if child.tag == GARMIN_HR_TAG:
+                    heart_rate = parse_integer(child.text)
+                    is_garmin_v1 = True
+                elif child.tag == GARMIN_CAD_TAG:
+                    cadence = parse_integer(child.text)
+                    is_garmin_v1 = True
+
+            # OpenTracks extension
+            if not is_garmin_v1:
+                for child in extension:
+                    child_tag = local_tag(child)
+                    if child_tag.endswith("hr"):
+                        heart_rate = parse_integer(child.text)
+                    elif child_tag.endswith("cad"):
+                        cadence = parse_integer(child.text)
+        elif tag.endswith("power"):
+            power = parse_integer(extension.text)
+        elif tag.endswith("heartrate"):
+            # Tissot smartwatch and similar devices extension
+            heart_rate = parse_integer(extension.text)
+
+    return heart_rate, cadence, power
+
+
+def read_gpx_samples(file: str) -> dict:
+    """
+    Reads the track points of a GPX file into typed arrays.
+
+    The file is parsed incrementally and every point is dropped from the XML
+    tree once read, so memory only grows with the compact sample arrays, not
+    with the size of the file. Points without a time are skipped.
+
+    Args:
+        file: Path of the GPX file.
+
+    Returns:
+        Dictionary with:
+            - name, description and type: Of the last track (None if missing).
+            - gpx_name and gpx_description: Of the file (None if missing).
+            - first_time and last_time: Datetimes of the first and last points.
+            - times: datetime64[s] array with the local wall time of each point.
+            - latitudes, longitudes and elevations: Float arrays (NaN if missing).
+            - heart_rates, cadences and powers: Integer arrays (0 if missing).
+
+    Raises:
+        HTTPException: If the file has no tracks, or a track has no segments.
+    """
+    times = array("q")
+    latitudes = array("d")
+    longitudes = array("d")
+    elevations = array("d")
+    heart_rates = array("l")
+    cadences = array("l")
+    powers = array("l")
+    time_chunk = []
+
+    samples = {
+        "name": None,
+        "description": None,
+        "type": None,
+        "gpx_name": None,
+        "gpx_description": None,
+        "first_time": None,
+        "last_time": None,
+    }
+    first_time_text = None
+    last_time_text = None
+    tracks = 0
+    track_segments = 0
+    track_fields = {}
+
+    def flush_time_chunk():
+        times.frombytes(
+            np.array(time_chunk, dtype="datetime64[s]").astype(np.int64).tobytes()
+        )
+        time_chunk.clear()
+
+    # Local tag of each namespaced tag, the local tags of all the open
+    # elements (names and descriptions are read by their direct parent, not
+    # from e.g. <metadata><author><name>) and the open container elements
+    local_tags = {}
+    open_tags = []
+    containers = []
+    in_point = False
+
+    for event, element in ET.iterparse(file, events=("start", "end")):
+        tag = local_tags.get(element.tag)
+        if tag is None:
+            tag = local_tags[element.tag] = local_tag(element)
+
+        # The point children are read from the point when it ends
+        if in_point and tag != "trkpt":
+            continue
+
+        if event == "start":
+            open_tags.append(tag)
+            in_point = tag == "trkpt"
+            if tag in CONTAINER_TAGS:
+                containers.append(element)
+                if tag == "trk":
+                    track_segments = 0
+                    track_fields = {}
+            continue
+
+        open_tags.pop()
+        in_point = False
+        if tag not in READ_TAGS:
+            continue
+
+        if tag in CONTAINER_TAGS:
+            containers.pop()
+        parent_tag = open_tags[-1] if open_tags else None
+
+        if tag == "trkpt":
+            time_text = None
+            elevation = np.nan
+            heart_rate, cadence, power = 0, 0, 0
+            for child in element:
+                child_tag = local_tags.get(child.tag)
+                if child_tag is None:
+                    child_tag = local_tags[child.tag] = local_tag(child)
+                if child_tag == "time":
+                    time_text = child.text.strip() if child.text else None
+                elif child_tag == "ele" and child.text:
+                    elevation = float(child.text)
+                elif child_tag == "extensions":
+                    heart_rate, cadence, power = read_point_extensions(child)
+
+            # Skip trackpoints without time data (common in some OsmAnd exports)
+            if time_text:
+                if first_time_text is None:
+                    first_time_text = time_text
+                last_time_text = time_text
+
+                time_chunk.append(parse_wall_time(time_text))
+                if len(time_chunk) >= TIME_CHUNK_SIZE:
+                    flush_time_chunk()
+                latitudes.append(float(element.get("lat")))
+                longitudes.append(float(element.get("lon")))
+                elevations.append(elevation)
+                heart_rates.append(heart_rate)
+                cadences.append(cadence)
+                powers.append(power)
+
+            # Drop the point, so the tree never holds more than one
+            element.clear()
+            if containers:
+                containers[-1].remove(element)
+        elif tag == "trkseg":
+            track_segments += 1
+        elif tag == "trk":
+            if track_segments == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid GPX file - no segments found in the GPX file",
+                )
+            tracks += 1
+            samples["name"] = track_fields.get("name")
+            samples["description"] = track_fields.get("desc")
+            samples["type"] = track_fields.get("type")
+            element.clear()
+        elif tag in ("metadata", "wpt", "rte"):
+            element.clear()
+        elif parent_tag == "trk":
+            track_fields[tag] = element.text.strip() if element.text else None
+        elif parent_tag in ("gpx", "metadata") and tag != "type":
+            samples["gpx_name" if tag == "name" else "gpx_description"] = (
+                element.text.strip() if element.text else None
+            )
+
+    if tracks == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid GPX file - no tracks found in the GPX file",
+        )
+
+    if time_chunk:
+        flush_time_chunk()
+
+    samples.update(
+        {
+            "first_time": gpxpy.gpxfield.parse_time(first_time_text),
+            "last_time": gpxpy.gpxfield.parse_time(last_time_text),
+            "times": np.frombuffer(times, dtype=np.int64).astype("datetime64[s]"),
+            "latitudes": np.frombuffer(latitudes, dtype=np.float64),
+            "longitudes": np.frombuffer(longitudes, dtype=np.float64),
+            "elevations": np.frombuffer(elevations, dtype=np.float64),
+            "heart_rates": np.asarray(heart_rates, dtype=np.int64),
+            "cadences": np.asarray(cadences, dtype=np.int64),
+            "powers": np.asarray(powers, dtype=np.int64),
+        }
+    )
+    return samples
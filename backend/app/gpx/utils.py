@@ -1,12 +1,11 @@
-import gpxpy
-from geopy.distance import geodesic
-from timezonefinder import TimezoneFinder
+import numpy as np
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from fastapi import HTTPException, status
 
 import activities.activity.utils as activities_utils
+import activities.activity.geodesic_utils as geodesic_utils
+import activities.activity.metrics_utils as metrics_utils
 import activities.activity.schema as activities_schema
 
 import users.user_default_gear.utils as user_default_gear_utils
@@ -15,6 +14,9 @@ import users.user_privacy_settings.schema as users_privacy_settings_schema
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
+
+import gpx.reader_utils as gpx_reader_utils
 
 
 def parse_gpx_file(
@@ -24,8 +26,6 @@ def parse_gpx_file(
     db: Session,
 ) -> dict:
     try:
-        # Create an instance of TimezoneFinder
-        tf = TimezoneFinder()
         timezone = core_config.TZ
 
         # Initialize default values for various variables
@@ -42,12 +42,11 @@ def parse_gpx_file(
         max_power = None
         ele_gain = None
         ele_loss = None
-        np = None
+        normalized_power = None
         avg_speed = None
         max_speed = None
         activity_name = "Workout"
         activity_description = None
-        process_one_time_fields = 0
         gear_id = None
 
         city = None
@@ -55,216 +54,16 @@ def parse_gpx_file(
         country = None
         pace = 0
 
-        # Arrays to store waypoint data
-        lat_lon_waypoints = []
-        ele_waypoints = []
-        hr_waypoints = []
-        cad_waypoints = []
-        power_waypoints = []
-        vel_waypoints = []
-        pace_waypoints = []
-
-        # Initialize variables to store previous latitude and longitude
-        prev_latitude, prev_longitude = None, None
-
-        # Initialize variables to store whether elevation, power, heart rate, cadence, and velocity are set
-        is_lat_lon_set = False
-        is_elevation_set = False
-        is_power_set = False
-        is_heart_rate_set = False
-        is_cadence_set = False
-        is_velocity_set = False
-
-        # Parse the GPX file
-        with open(file, "r") as gpx_file:
-            gpx = gpxpy.parse(gpx_file)
-
-            if gpx.tracks:
-                # Iterate over tracks in the GPX file
-                for track in gpx.tracks:
-                    # Set activity name, description, and type if available
-                    activity_name = (
-                        track.name
-                        if track.name
-                        else gpx.name if gpx.name else "Workout"
-                    )
-                    activity_description = (
-                        track.description
-                        if track.description
-                        else gpx.description if gpx.description else None
-                    )
-                    activity_type = track.type if track.type else "Workout"
-
-                    if track.segments:
-                        # Iterate over segments in each track
-                        for segment in track.segments:
-                            # Iterate over points in each segment
-                            for point in segment.points:
-                                # Extract latitude and longitude from the point
-                                latitude, longitude = point.latitude, point.longitude
-
-                                # Extract elevation, time, and location details
-                                elevation, time = point.elevation, point.time
-                                
-                                # Skip trackpoints without time data (common in some OsmAnd exports)
-                                if time is None:
-                                    continue
-
-                                # Calculate distance between waypoints
-                                if (
-                                    prev_latitude is not None
-                                    and prev_longitude is not None
-                                ):
-                                    distance += geodesic(
-                                        (prev_latitude, prev_longitude),
-                                        (latitude, longitude),
-                                    ).meters
-
-                                if elevation != 0:
-                                    is_elevation_set = True
-
-                                if first_waypoint_time is None:
-                                    first_waypoint_time = point.time
-
-                                if process_one_time_fields == 0:
-                                    # Use geocoding API to get city, town, and country based on coordinates
-                                    location_data = (
-                                        activities_utils.location_based_on_coordinates(
-                                            latitude, longitude
-                                        )
-                                    )
-
-                                    # Extract city, town, and country from location data
-                                    if location_data:
-                                        city = location_data["city"]
-                                        town = location_data["town"]
-                                        country = location_data["country"]
-
-                                        process_one_time_fields = 1
-
-                                # Extract heart rate, cadence, and power data from point extensions
-                                heart_rate, cadence, power = 0, 0, 0
-
-                                if point.extensions:
-                                    # Iterate through each extension element
-                                    for extension in point.extensions:
-                                        if extension.tag.endswith(
-                                            "TrackPointExtension"
-                                        ):
-                                            hr_element = extension.find(
-                                                ".//{http://www.garmin.com/xmlschemas/TrackPointExtension/v1}hr"
-                                            )
-                                            if hr_element is not None:
-                                                heart_rate = hr_element.text
-                                            cad_element = extension.find(
-                                                ".//{http://www.garmin.com/xmlschemas/TrackPointExtension/v1}cad"
-                                            )
-                                            if cad_element is not None:
-                                                cadence = cad_element.text
-
-                                            # OpenTracks extension
-                                            if (
-                                                hr_element is None
-                                                and cad_element is None
-                                            ):
-                                                for child in extension:
-                                                    if child.tag.endswith("hr"):
-                                                        heart_rate = child.text
-                                                    elif child.tag.endswith("cad"):
-                                                        cadence = child.text
-                                        elif extension.tag.endswith("power"):
-                                            # Extract 'power' value
-                                            power = (
-                                                int(extension.text)
-                                                if extension.text
-                                                else 0
-                                            )
-                                        elif extension.tag.endswith("heartrate"):
-                                            # Tissot smartwatch and similar devices extension
-                                            heart_rate = (
-                                                int(extension.text)
-                                                if extension.text
-                                                else 0
-                                            )
-
-                                # Check if heart rate, cadence, power are set
-                                if heart_rate != 0:
-                                    is_heart_rate_set = True
-
-                                if cadence != 0:
-                                    is_cadence_set = True
-
-                                if power != 0:
-                                    is_power_set = True
-                                else:
-                                    power = None
-
-                                # Calculate instant speed, pace, and update waypoint arrays
-                                instant_speed = (
-                                    activities_utils.calculate_instant_speed(
-                                        last_waypoint_time,
-                                        time,
-                                        latitude,
-                                        longitude,
-                                        prev_latitude,
-                                        prev_longitude,
-                                    )
-                                )
-
-                                # Calculate instance pace
-                                instant_pace = 0
-                                if instant_speed > 0:
-                                    instant_pace = 1 / instant_speed
-                                    is_velocity_set = True
-
-                                timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-                                # Append waypoint data to respective arrays
-                                if latitude is not None and longitude is not None:
-                                    lat_lon_waypoints.append(
-                                        {
-                                            "time": timestamp,
-                                            "lat": latitude,
-                                            "lon": longitude,
-                                        }
-                                    )
-                                    is_lat_lon_set = True
-
-                                activities_utils.append_if_not_none(
-                                    ele_waypoints, timestamp, elevation, "ele"
-                                )
-                                activities_utils.append_if_not_none(
-                                    hr_waypoints, timestamp, heart_rate, "hr"
-                                )
-                                activities_utils.append_if_not_none(
-                                    cad_waypoints, timestamp, cadence, "cad"
-                                )
-                                activities_utils.append_if_not_none(
-                                    power_waypoints, timestamp, power, "power"
-                                )
-                                activities_utils.append_if_not_none(
-                                    vel_waypoints, timestamp, instant_speed, "vel"
-                                )
-                                activities_utils.append_if_not_none(
-                                    pace_waypoints, timestamp, instant_pace, "pace"
-                                )
-
-                                # Update previous latitude, longitude, and last waypoint time
-                                prev_latitude, prev_longitude, last_waypoint_time = (
-                                    latitude,
-                                    longitude,
-                                    time,
-                                )
-                    else:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail="Invalid GPX file - no segments found in the GPX file",
-                        )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid GPX file - no tracks found in the GPX file",
-                )
+        # Read the track points into typed arrays
+        samples = gpx_reader_utils.read_gpx_samples(file)
+
+        # Set activity name, description, and type if available
+        activity_name = samples["name"] or samples["gpx_name"] or "Workout"
+        activity_description = samples["description"] or samples["gpx_description"]
+        activity_type = samples["type"] or "Workout"
+
+        first_waypoint_time = samples["first_time"]
+        last_waypoint_time = samples["last_time"]
 
         # Check if we have at least one valid trackpoint with time data
         if first_waypoint_time is None or last_waypoint_time is None:
@@ -273,11 +72,69 @@ def parse_gpx_file(
                 detail="Invalid GPX file - no trackpoints with valid time data found",
             )
 
+        point_timestamps = np.datetime_as_string(samples["times"], unit="s").tolist()
+        point_latitudes = samples["latitudes"]
+        point_longitudes = samples["longitudes"]
+        elevations = samples["elevations"]
+        heart_rates = samples["heart_rates"]
+        cadences = samples["cadences"]
+        powers = samples["powers"]
+
+        # Check whether elevation, power, heart rate, cadence and position are set
+        is_elevation_set = bool((elevations != 0).any())
+        is_heart_rate_set = bool((heart_rates != 0).any())
+        is_cadence_set = bool((cadences != 0).any())
+        is_power_set = bool((powers != 0).any())
+
+        # Build the waypoint arrays from the samples
+        has_lat_lon = ~(np.isnan(point_latitudes) | np.isnan(point_longitudes))
+        lat_lon_waypoints = [
+            {"time": timestamp, "lat": latitude, "lon": longitude}
+            for timestamp, latitude, longitude, is_set in zip(
+                point_timestamps,
+                point_latitudes.tolist(),
+                point_longitudes.tolist(),
+                has_lat_lon.tolist(),
+            )
+            if is_set
+        ]
+        is_lat_lon_set = bool(lat_lon_waypoints)
+        ele_waypoints = [
+            {"time": timestamp, "ele": elevation}
+            for timestamp, elevation in zip(point_timestamps, elevations.tolist())
+            if elevation == elevation
+        ]
+        hr_waypoints = [
+            {"time": timestamp, "hr": heart_rate}
+            for timestamp, heart_rate in zip(point_timestamps, heart_rates.tolist())
+        ]
+        cad_waypoints = [
+            {"time": timestamp, "cad": cadence}
+            for timestamp, cadence in zip(point_timestamps, cadences.tolist())
+        ]
+        power_waypoints = [
+            {"time": timestamp, "power": power}
+            for timestamp, power in zip(point_timestamps, powers.tolist())
+            if power != 0
+        ]
+
+        # Calculate distance, instant speed and pace for all trackpoints at once
+        distance = geodesic_utils.cumulative_distances(
+            point_latitudes, point_longitudes
+        )[-1].item()
+        instant_speeds = geodesic_utils.instant_speeds(
+            samples["times"].astype(np.int64),
+            point_latitudes,
+            point_longitudes,
+        )
+        vel_waypoints, pace_waypoints = geodesic_utils.speed_and_pace_waypoints(
+            point_timestamps, instant_speeds
+        )
+        is_velocity_set = bool((instant_speeds > 0).any())
+
         # Calculate elevation gain/loss, pace, average speed, and average power
         if ele_waypoints:
-            ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
-                elevations=ele_waypoints
-            )
+            ele_gain, ele_loss = metrics_utils.elevation_gain_and_loss(elevations)
 
         pace = activities_utils.calculate_pace(
             distance, first_waypoint_time, last_waypoint_time
@@ -292,37 +149,35 @@ def parse_gpx_file(
 
         # Calculate average and maximum heart rate
         if hr_waypoints:
-            avg_hr, max_hr = activities_utils.calculate_avg_and_max(hr_waypoints, "hr")
+            avg_hr, max_hr = metrics_utils.average_and_max(heart_rates)
 
         # Calculate average and maximum cadence
         if cad_waypoints:
-            avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
-                cad_waypoints, "cad"
-            )
+            avg_cadence, max_cadence = metrics_utils.average_and_max(cadences)
 
         # Calculate average and maximum velocity
         if vel_waypoints:
-            avg_speed, max_speed = activities_utils.calculate_avg_and_max(
-                vel_waypoints, "vel"
-            )
+            avg_speed, max_speed = metrics_utils.average_and_max(instant_speeds)
 
         # Calculate average and maximum power
         if power_waypoints:
-            avg_power, max_power = activities_utils.calculate_avg_and_max(
-                power_waypoints, "power"
-            )
+            is_power = powers != 0
+            avg_power, max_power = metrics_utils.average_and_max(powers[is_power])
 
             # Calculate normalised power
-            np = activities_utils.calculate_np(power_waypoints)
+            normalized_power = metrics_utils.normalized_power(
+                powers[is_power].astype(np.float64),
+                samples["times"][is_power].astype(np.float64),
+            )
 
         # Calculate the elapsed time
         elapsed_time = last_waypoint_time - first_waypoint_time
 
         if activity_type != 3 and activity_type != 7:
             if is_lat_lon_set:
-                timezone = tf.timezone_at(
-                    lat=lat_lon_waypoints[0]["lat"],
-                    lng=lat_lon_waypoints[0]["lon"],
+                timezone = core_timezones.timezone_at(
+                    lat_lon_waypoints[0]["lat"],
+                    lat_lon_waypoints[0]["lon"],
                 )
 
         # Create an Activity object with parsed data
@@ -347,7 +202,7 @@ def parse_gpx_file(
             max_speed=max_speed,
             average_power=round(avg_power) if avg_power else None,
             max_power=round(max_power) if max_power else None,
-            normalized_power=round(np) if np else None,
+            normalized_power=round(normalized_power) if normalized_power else None,
             average_hr=round(avg_hr) if avg_hr else None,
             max_hr=round(max_hr) if max_hr else None,
             average_cad=round(avg_cadence) if avg_cadence else None,
@@ -381,11 +236,12 @@ def parse_gpx_file(
         # Generate activity laps
         laps = generate_activity_laps(
             lat_lon_waypoints,
-            ele_waypoints,
-            power_waypoints,
-            hr_waypoints,
-            cad_waypoints,
-            vel_waypoints,
+            samples["times"],
+            elevations,
+            powers,
+            heart_rates,
+            cadences,
+            instant_speeds,
         )
 
         # Return parsed data as a dictionary
@@ -423,233 +279,153 @@ def parse_gpx_file(
 
 def generate_activity_laps(
     lat_lon_waypoints: list[dict],
-    ele_waypoints: list[dict],
-    power_waypoints: list[dict],
-    hr_waypoints: list[dict],
-    cad_waypoints: list[dict],
-    vel_waypoints: list[dict],
+    times: np.ndarray,
+    elevations: np.ndarray,
+    powers: np.ndarray,
+    heart_rates: np.ndarray,
+    cadences: np.ndarray,
+    speeds: np.ndarray,
     distance_per_lap_km: float = 1.0,
 ) -> list[dict]:
     laps = []
     current_lap_distance = 0.0
     lap_start = None
-    lap_ele_waypoints = []
-    lap_power_waypoints = []
-    lap_hr_waypoints = []
-    lap_cad_waypoints = []
-    lap_vel_waypoints = []
-
-    def filter_waypoints(waypoints, start_time, end_time):
-        return [
-            waypoint
-            for waypoint in waypoints
-            if datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-            <= datetime.strptime(waypoint["time"], "%Y-%m-%dT%H:%M:%S")
-            <= datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-        ]
-
-    for i in range(1, len(lat_lon_waypoints)):
-        # Get the current and previous waypoints
-        prev_point = lat_lon_waypoints[i - 1]
-        current_point = lat_lon_waypoints[i]
-
-        # Calculate the distance between the two waypoints
-        segment_distance = geodesic(
-            (prev_point["lat"], prev_point["lon"]),
-            (current_point["lat"], current_point["lon"]),
-        ).kilometers
-
-        # Accumulate the distance
-        current_lap_distance += segment_distance
-
-        # Set the start of the lap if not already set
-        if lap_start is None:
-            lap_start = prev_point
-
-        # Check if the current lap distance exceeds or equals the lap distance
-        if current_lap_distance >= distance_per_lap_km:
-            # Filter waypoints for the current lap
-            start_time = lap_start["time"]
-            end_time = current_point["time"]
-            lap_ele_waypoints = filter_waypoints(ele_waypoints, start_time, end_time)
-            lap_power_waypoints = filter_waypoints(
-                power_waypoints, start_time, end_time
-            )
-            lap_hr_waypoints = filter_waypoints(hr_waypoints, start_time, end_time)
-            lap_cad_waypoints = filter_waypoints(cad_waypoints, start_time, end_time)
-            lap_vel_waypoints = filter_waypoints(vel_waypoints, start_time, end_time)
-            ele_gain = None
-            ele_loss = None
-            avg_hr = None
-            max_hr = None
-            avg_cadence = None
-            max_cadence = None
-            avg_speed = None
-            max_speed = None
-            avg_power = None
-            max_power = None
-            np = None
-
-            # Calculate total ascent and descent
-            if lap_ele_waypoints:
-                ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
-                    elevations=lap_ele_waypoints
-                )
-
-            # Calculate average and maximum heart rate
-            if lap_hr_waypoints:
-                avg_hr, max_hr = activities_utils.calculate_avg_and_max(
-                    lap_hr_waypoints, "hr"
-                )
-
-            # Calculate average and maximum cadence
-            if lap_cad_waypoints:
-                avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
-                    lap_cad_waypoints, "cad"
-                )
-
-            # Calculate average and maximum velocity
-            if lap_vel_waypoints:
-                avg_speed, max_speed = activities_utils.calculate_avg_and_max(
-                    lap_vel_waypoints, "vel"
-                )
-
-            # Calculate average and maximum power
-            if lap_power_waypoints:
-                avg_power, max_power = activities_utils.calculate_avg_and_max(
-                    lap_power_waypoints, "power"
-                )
+    lap_start_time = None
 
-                # Calculate normalised power
-                np = activities_utils.calculate_np(lap_power_waypoints)
+    # Each lap looks up its time range in the point times, with a binary search
+    # if the points are in chronological order
+    is_sorted = bool(np.all(times[1:] >= times[:-1]))
 
-            # Create a lap
-            laps.append(
-                {
-                    "start_time": lap_start["time"],
-                    "start_position_lat": lap_start["lat"],
-                    "start_position_long": lap_start["lon"],
-                    "end_position_lat": current_point["lat"],
-                    "end_position_long": current_point["lon"],
-                    "total_elapsed_time": (
-                        datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                        - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                    ).total_seconds(),
-                    "total_timer_time": (
-                        datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                        - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                    ).total_seconds(),
-                    "total_distance": current_lap_distance * 1000,
-                    "avg_heart_rate": round(avg_hr) if avg_hr else None,
-                    "max_heart_rate": round(max_hr) if max_hr else None,
-                    "avg_cadence": round(avg_cadence) if avg_cadence else None,
-                    "max_cadence": round(max_cadence) if max_cadence else None,
-                    "avg_power": round(avg_power) if avg_power else None,
-                    "max_power": round(max_power) if max_power else None,
-                    "total_ascent": round(ele_gain) if ele_gain else None,
-                    "total_descent": round(ele_loss) if ele_loss else None,
-                    "normalized_power": round(np) if np else None,
-                    "enhanced_avg_pace": (
-                        1 / avg_speed
-                        if avg_speed != 0 and avg_speed is not None
-                        else None
-                    ),
-                    "enhanced_avg_speed": avg_speed,
-                    "enhanced_max_pace": (
-                        1 / max_speed
-                        if max_speed != 0 and max_speed is not None
-                        else None
-                    ),
-                    "enhanced_max_speed": max_speed,
-                }
+    def select_lap_points(start_time, end_time):
+        if is_sorted:
+            return slice(
+                np.searchsorted(times, start_time, side="left"),
+                np.searchsorted(times, end_time, side="right"),
             )
-
-            # Reset for the next lap
-            lap_start = current_point
-            current_lap_distance = 0.0
-
-    # Add the final lap if it exists and is less than the lap distance
-    if lap_start is not None and current_lap_distance > 0:
-        start_time = lap_start["time"]
-        end_time = lat_lon_waypoints[-1]["time"]
-        lap_ele_waypoints = filter_waypoints(ele_waypoints, start_time, end_time)
-        lap_power_waypoints = filter_waypoints(power_waypoints, start_time, end_time)
-        lap_hr_waypoints = filter_waypoints(hr_waypoints, start_time, end_time)
-        lap_cad_waypoints = filter_waypoints(cad_waypoints, start_time, end_time)
-        lap_vel_waypoints = filter_waypoints(vel_waypoints, start_time, end_time)
+        return (times >= start_time) & (times <= end_time)
+
+    def create_lap(start_point, start_time, end_point, end_time, lap_distance):
+        # Select the lap points
+        lap_points = select_lap_points(start_time, end_time)
+        lap_times = times[lap_points]
+        lap_elevations = elevations[lap_points]
+        lap_elevations = lap_elevations[~np.isnan(lap_elevations)]
+        lap_powers = powers[lap_points]
+        is_lap_power = lap_powers != 0
+        lap_speeds = speeds[lap_points]
         ele_gain, ele_loss = None, None
         avg_hr, max_hr = None, None
         avg_cadence, max_cadence = None, None
         avg_speed, max_speed = None, None
-        avg_power, max_power, np = None, None, None
+        avg_power, max_power, normalized_power = None, None, None
 
         # Calculate total ascent and descent
-        if lap_ele_waypoints:
-            ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
-                lap_ele_waypoints
-            )
+        if lap_elevations.size:
+            ele_gain, ele_loss = metrics_utils.elevation_gain_and_loss(lap_elevations)
 
-        # Calculate average and maximum heart rate
-        if lap_hr_waypoints:
-            avg_hr, max_hr = activities_utils.calculate_avg_and_max(
-                lap_hr_waypoints, "hr"
+        if lap_times.size:
+            # Calculate average and maximum heart rate
+            avg_hr, max_hr = metrics_utils.average_and_max(
+                heart_rates[lap_points].astype(np.float64)
             )
 
-        # Calculate average and maximum cadence
-        if lap_cad_waypoints:
-            avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
-                lap_cad_waypoints, "cad"
+            # Calculate average and maximum cadence
+            avg_cadence, max_cadence = metrics_utils.average_and_max(
+                cadences[lap_points].astype(np.float64)
             )
 
         # Calculate average and maximum velocity
-        if lap_vel_waypoints:
-            avg_speed, max_speed = activities_utils.calculate_avg_and_max(
-                lap_vel_waypoints, "vel"
-            )
+        if (~np.isnan(lap_speeds)).any():
+            avg_speed, max_speed = metrics_utils.average_and_max(lap_speeds)
 
         # Calculate average and maximum power
-        if lap_power_waypoints:
-            avg_power, max_power = activities_utils.calculate_avg_and_max(
-                lap_power_waypoints, "power"
-            )
+        if is_lap_power.any():
+            lap_powers = lap_powers[is_lap_power].astype(np.float64)
+            avg_power, max_power = metrics_utils.average_and_max(lap_powers)
 
             # Calculate normalised power
-            np = activities_utils.calculate_np(lap_power_waypoints)
+            normalized_power = metrics_utils.normalized_power(
+                lap_powers, lap_times[is_lap_power].astype(np.float64)
+            )
 
+        elapsed_time = float((end_time - start_time) / np.timedelta64(1, "s"))
+
+        return {
+            "start_time": start_point["time"],
+            "start_position_lat": start_point["lat"],
+            "start_position_long": start_point["lon"],
+            "end_position_lat": end_point["lat"],
+            "end_position_long": end_point["lon"],
+            "total_elapsed_time": elapsed_time,
+            "total_timer_time": elapsed_time,
+            "total_distance": lap_distance * 1000,
+            "avg_heart_rate": round(avg_hr) if avg_hr else None,
+            "max_heart_rate": round(max_hr) if max_hr else None,
+            "avg_cadence": round(avg_cadence) if avg_cadence else None,
+            "max_cadence": round(max_cadence) if max_cadence else None,
+            "avg_power": round(avg_power) if avg_power else None,
+            "max_power": round(max_power) if max_power else None,
+            "total_ascent": round(ele_gain) if ele_gain else None,
+            "total_descent": round(ele_loss) if ele_loss else None,
+            "normalized_power": round(normalized_power) if normalized_power else None,
+            "enhanced_avg_pace": (
+                1 / avg_speed if avg_speed != 0 and avg_speed is not None else None
+            ),
+            "enhanced_avg_speed": avg_speed,
+            "enhanced_max_pace": (
+                1 / max_speed if max_speed != 0 and max_speed is not None else None
+            ),
+            "enhanced_max_speed": max_speed,
+        }
+
+    # Calculate the distance between all consecutive waypoints at once
+    segment_distances_km = (
+        geodesic_utils.segment_distances(
+            [waypoint["lat"] for waypoint in lat_lon_waypoints],
+            [waypoint["lon"] for waypoint in lat_lon_waypoints],
+        )
+        / 1000
+    ).tolist()
+    lat_lon_times = np.array(
+        [waypoint["time"] for waypoint in lat_lon_waypoints], dtype="datetime64[s]"
+    )
+
+    for i in range(1, len(lat_lon_waypoints)):
+        # Accumulate the distance between the previous and current waypoints
+        current_lap_distance += segment_distances_km[i - 1]
+
+        # Set the start of the lap if not already set
+        if lap_start is None:
+            lap_start = lat_lon_waypoints[i - 1]
+            lap_start_time = lat_lon_times[i - 1]
+
+        # Check if the current lap distance exceeds or equals the lap distance
+        if current_lap_distance >= distance_per_lap_km:
+            laps.append(
+                create_lap(
+                    lap_start,
+                    lap_start_time,
+                    lat_lon_waypoints[i],
+                    lat_lon_times[i],
+                    current_lap_distance,
+                )
+            )
+
+            # Reset for the next lap
+            lap_start = lat_lon_waypoints[i]
+            lap_start_time = lat_lon_times[i]
+            current_lap_distance = 0.0
+
+    # Add the final lap if it exists and is less than the lap distance
+    if lap_start is not None and current_lap_distance > 0:
         laps.append(
-            {
-                "start_time": lap_start["time"],
-                "start_position_lat": lap_start["lat"],
-                "start_position_long": lap_start["lon"],
-                "end_position_lat": lat_lon_waypoints[-1]["lat"],
-                "end_position_long": lat_lon_waypoints[-1]["lon"],
-                "total_elapsed_time": (
-                    datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                    - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                ).total_seconds(),
-                "total_timer_time": (
-                    datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                    - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                ).total_seconds(),
-                "total_distance": current_lap_distance * 1000,
-                "avg_heart_rate": round(avg_hr) if avg_hr else None,
-                "max_heart_rate": round(max_hr) if max_hr else None,
-                "avg_cadence": round(avg_cadence) if avg_cadence else None,
-                "max_cadence": round(max_cadence) if max_cadence else None,
-                "avg_power": round(avg_power) if avg_power else None,
-                "max_power": round(max_power) if max_power else None,
-                "total_ascent": round(ele_gain) if ele_gain else None,
-                "total_descent": round(ele_loss) if ele_loss else None,
-                "normalized_power": round(np) if np else None,
-                "enhanced_avg_pace": (
-                    1 / avg_speed if avg_speed != 0 and avg_speed is not None else None
-                ),
-                "enhanced_avg_speed": avg_speed,
-                "enhanced_max_pace": (
-                    1 / max_speed if max_speed != 0 and max_speed is not None else None
-                ),
-                "enhanced_max_speed": max_speed,
-            }
+            create_lap(
+                lap_start,
+                lap_start_time,
+                lat_lon_waypoints[-1],
+                lat_lon_times[-1],
+                current_lap_distance,
+            )
         )
 
     return laps
@@ -21,7 +21,7 @@ router = APIRouter()
     "/number",
     response_model=int,
 )
-async def read_health_data_number(
+def read_health_data_number(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:read"])
     ],
@@ -42,7 +42,7 @@ async def read_health_data_number(
     "",
     response_model=list[health_data_schema.HealthData] | None,
 )
-async def read_health_data_all(
+def read_health_data_all(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:read"])
     ],
@@ -63,7 +63,7 @@ async def read_health_data_all(
     "/page_number/{page_number}/num_records/{num_records}",
     response_model=list[health_data_schema.HealthData] | None,
 )
-async def read_health_data_all_pagination(
+def read_health_data_all_pagination(
     page_number: int,
     num_records: int,
     check_scopes: Annotated[
@@ -88,7 +88,7 @@ async def read_health_data_all_pagination(
 
 
 @router.post("", status_code=201)
-async def create_health_data(
+def create_health_data(
     health_data: health_data_schema.HealthData,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:write"])
@@ -117,7 +117,7 @@ async def create_health_data(
 
 
 @router.put("")
-async def edit_health_data(
+def edit_health_data(
     health_data: health_data_schema.HealthData,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:write"])
@@ -136,7 +136,7 @@ async def edit_health_data(
 
 
 @router.delete("/{health_data_id}")
-async def delete_health_data(
+def delete_health_data(
     health_data_id: int,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:write"])
@@ -18,7 +18,7 @@ router = APIRouter()
     "/",
     response_model=health_targets_schema.HealthTargets | None,
 )
-async def read_health_data_all_pagination(
+def read_health_data_all_pagination(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["health:read"])
     ],
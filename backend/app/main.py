@@ -4,27 +4,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from alembic.config import Config
-from alembic import command
+import activities.activity_bulk_imports.utils as activity_bulk_imports_utils
+
+import geocoding.gazetteer_utils as geocoding_gazetteer_utils
 
 import core.logger as core_logger
 import core.config as core_config
+import core.process_pool as core_process_pool
+import core.pubsub as core_pubsub
 import core.scheduler as core_scheduler
+import core.thread_pool as core_thread_pool
 import core.tracing as core_tracing
 import core.migrations as core_migrations
-
-import garmin.activity_utils as garmin_activity_utils
-import garmin.health_utils as garmin_health_utils
+import core.pagination as core_pagination
 
 import session.schema as session_schema
 
-import strava.activity_utils as strava_activity_utils
-import strava.utils as strava_utils
-
-import password_reset_tokens.utils as password_reset_tokens_utils
-
-import sign_up_tokens.utils as sign_up_tokens_utils
-
 from core.routes import router as api_router
 
 
@@ -33,57 +28,48 @@ async def startup_event():
         f"Backend startup event - {core_config.API_VERSION}"
     )
 
-    # Run Alembic migrations to ensure the database is up to date
-    alembic_cfg = Config("alembic.ini")
-    # Disable the logger configuration in Alembic to avoid conflicts with FastAPI
-    alembic_cfg.attributes["configure_logger"] = False
-    command.upgrade(alembic_cfg, "head")
-
-    # Migration check
-    core_migrations.check_migrations()
-
-    # Create a scheduler to run background jobs
+    # Bound the threads running the blocking work of the requests
+    core_thread_pool.configure_thread_pool()
+
+    # Run the migrations, a no-op if docker/start.sh already ran them
+    core_migrations.run_migrations()
+
+    # Build the local reverse geocoding index, a no-op if docker/start.sh
+    # already built it
+    if core_config.REVERSE_GEO_PROVIDER == "local":
+        try:
+            await core_thread_pool.run_in_thread_pool(
+                geocoding_gazetteer_utils.build_gazetteer_index_if_stale
+            )
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Error building the local reverse geocoding index: {err}", "error"
+            )
+
+    # Receive the websocket messages and events published by the other processes
+    await core_pubsub.start()
+
+    # Create a scheduler to run background jobs, the process elected as leader
+    # runs them and the startup jobs
     core_scheduler.start_scheduler()
 
-    # Retrieve last day activities from Garmin Connect and Strava
-    core_logger.print_to_log_and_console(
-        "Refreshing Strava tokens on startup on startup"
-    )
-    strava_utils.refresh_strava_tokens(True)
-
-    # Retrieve last day activities from Garmin Connect and Strava
-    core_logger.print_to_log_and_console(
-        "Retrieving last day activities from Garmin Connect and Strava on startup"
-    )
-    await garmin_activity_utils.retrieve_garminconnect_users_activities_for_days(1)
-    await strava_activity_utils.retrieve_strava_users_activities_for_days(1, True)
-
-    # Retrieve last day body composition from Garmin Connect
-    core_logger.print_to_log_and_console(
-        "Retrieving last day body composition from Garmin Connect on startup"
-    )
-    garmin_health_utils.retrieve_garminconnect_users_bc_for_days(1)
-
-    # Delete invalid password reset tokens
-    core_logger.print_to_log_and_console(
-        "Deleting invalid password reset tokens from the database"
-    )
-    password_reset_tokens_utils.delete_invalid_tokens_from_db()
-
-    # Delete invalid sign-up tokens
-    core_logger.print_to_log_and_console(
-        "Deleting invalid sign-up tokens from the database"
-    )
-    sign_up_tokens_utils.delete_invalid_tokens_from_db()
-
 
 def shutdown_event():
     # Log the shutdown event
     core_logger.print_to_log_and_console("Backend shutdown event")
 
-    # Shutdown the scheduler when the application is shutting down
+    # Shutdown the scheduler and hand the leader lock over to another process
     core_scheduler.stop_scheduler()
 
+    # Stop receiving the events of the other processes
+    core_pubsub.stop()
+
+    # Let the other processes queue again the bulk import files left parsing
+    activity_bulk_imports_utils.release_owner_lock()
+
+    # Shutdown the activity file parsing process pool
+    core_process_pool.shutdown_executor()
+
 
 def create_app() -> FastAPI:
     # Define the FastAPI object
@@ -117,6 +103,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[core_pagination.NEXT_CURSOR_HEADER],
     )
 
     app.add_middleware(session_schema.CSRFMiddleware)
@@ -0,0 +1,57 @@
+from sqlalchemy.orm import Session
+
+import activities.activity_streams.crud as activity_streams_crud
+
+import core.logger as core_logger
+
+import migrations.crud as migrations_crud
+
+# Number of streams converted per transaction
+STREAMS_BATCH_SIZE = 200
+
+
+def process_migration_7(db: Session):
+    core_logger.print_to_log_and_console("Started migration 7")
+
+    streams_processed_with_no_errors = True
+    last_stream_id = 0
+
+    while True:
+        try:
+            last_stream_id = activity_streams_crud.pack_legacy_activity_streams(
+                last_stream_id, STREAMS_BATCH_SIZE, db
+            )
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 7 - Error packing activity streams after id {last_stream_id}: {err}",
+                "error",
+                exc=err,
+            )
+            streams_processed_with_no_errors = False
+            break
+
+        if last_stream_id is None:
+            break
+
+        core_logger.print_to_log(
+            f"Migration 7 - Processed up to activity stream {last_stream_id}"
+        )
+
+    # Mark migration as executed
+    if streams_processed_with_no_errors:
+        try:
+            migrations_crud.set_migration_as_executed(7, db)
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 7 - Failed to set migration as executed: {err}",
+                "error",
+                exc=err,
+            )
+            return
+    else:
+        core_logger.print_to_log_and_console(
+            "Migration 7 failed to pack all activity streams. Will try again later.",
+            "error",
+        )
+
+    core_logger.print_to_log_and_console("Finished migration 7")
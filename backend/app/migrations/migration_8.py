@@ -0,0 +1,57 @@
+from sqlalchemy.orm import Session
+
+import activities.activity_summaries.crud as activity_summaries_crud
+
+import core.logger as core_logger
+
+import migrations.crud as migrations_crud
+
+# Number of users whose summaries are rebuilt per transaction
+USERS_BATCH_SIZE = 50
+
+
+def process_migration_8(db: Session):
+    core_logger.print_to_log_and_console("Started migration 8")
+
+    summaries_processed_with_no_errors = True
+    last_user_id = 0
+
+    while True:
+        try:
+            last_user_id = activity_summaries_crud.backfill_daily_summaries(
+                last_user_id, USERS_BATCH_SIZE, db
+            )
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 8 - Error backfilling daily summaries after user id {last_user_id}: {err}",
+                "error",
+                exc=err,
+            )
+            summaries_processed_with_no_errors = False
+            break
+
+        if last_user_id is None:
+            break
+
+        core_logger.print_to_log(
+            f"Migration 8 - Processed daily summaries up to user {last_user_id}"
+        )
+
+    # Mark migration as executed
+    if summaries_processed_with_no_errors:
+        try:
+            migrations_crud.set_migration_as_executed(8, db)
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 8 - Failed to set migration as executed: {err}",
+                "error",
+                exc=err,
+            )
+            return
+    else:
+        core_logger.print_to_log_and_console(
+            "Migration 8 failed to backfill all daily summaries. Will try again later.",
+            "error",
+        )
+
+    core_logger.print_to_log_and_console("Finished migration 8")
@@ -20,7 +20,7 @@ router = APIRouter()
     "/number",
     response_model=int,
 )
-async def read_notifications_number(
+def read_notifications_number(
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
     ],
@@ -49,7 +49,7 @@ async def read_notifications_number(
     "/{notification_id}",
     response_model=notifications_schema.Notification | None,
 )
-async def read_notifications_by_id(
+def read_notifications_by_id(
     notification_id: int,
     validate_notification_id: Annotated[
         Callable, Depends(notifications_dependencies.validate_notification_id)
@@ -82,7 +82,7 @@ async def read_notifications_by_id(
     "/page_number/{page_number}/num_records/{num_records}",
     response_model=list[notifications_schema.Notification] | None,
 )
-async def read_notifications_user_pagination(
+def read_notifications_user_pagination(
     page_number: int,
     num_records: int,
     validate_pagination_values: Annotated[
@@ -117,7 +117,7 @@ async def read_notifications_user_pagination(
 @router.put(
     "/{notification_id}/mark_as_read",
 )
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: int,
     validate_notification_id: Annotated[
         Callable, Depends(notifications_dependencies.validate_notification_id)
@@ -3,6 +3,7 @@ from fastapi import HTTPException, status
 from core.database import SessionLocal
 from sqlalchemy.orm import Session
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 
 import notifications.constants as notifications_constants
 import notifications.crud as notifications_crud
@@ -32,7 +33,8 @@ async def create_new_activity_notification(
 
     try:
         # Create a notification for the new activity
-        notification = notifications_crud.create_notification(
+        notification = await core_thread_pool.run_in_thread_pool(
+            notifications_crud.create_notification,
             notifications_schema.Notification(
                 user_id=user_id,
                 type=notifications_constants.TYPE_NEW_ACTIVITY,
@@ -75,7 +77,8 @@ async def create_new_duplicate_start_time_activity_notification(
 
     try:
         # Create a notification for the new activity
-        notification = notifications_crud.create_notification(
+        notification = await core_thread_pool.run_in_thread_pool(
+            notifications_crud.create_notification,
             notifications_schema.Notification(
                 user_id=user_id,
                 type=notifications_constants.TYPE_DUPLICATE_ACTIVITY,
@@ -119,7 +122,9 @@ async def create_new_follower_request_notification(
     db: Session,
 ):
     try:
-        user = users_crud.get_user_by_id(user_id, db)
+        user = await core_thread_pool.run_in_thread_pool(
+            users_crud.get_user_by_id, user_id, db
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -127,7 +132,8 @@ async def create_new_follower_request_notification(
             )
 
         # Create a notification for the new activity
-        notification = notifications_crud.create_notification(
+        notification = await core_thread_pool.run_in_thread_pool(
+            notifications_crud.create_notification,
             notifications_schema.Notification(
                 user_id=target_user_id,
                 type=notifications_constants.TYPE_NEW_FOLLOWER_REQUEST,
@@ -174,7 +180,9 @@ async def create_accepted_follower_request_notification(
     db: Session,
 ):
     try:
-        user = users_crud.get_user_by_id(user_id, db)
+        user = await core_thread_pool.run_in_thread_pool(
+            users_crud.get_user_by_id, user_id, db
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -182,7 +190,8 @@ async def create_accepted_follower_request_notification(
             )
 
         # Create a notification for the new activity
-        notification = notifications_crud.create_notification(
+        notification = await core_thread_pool.run_in_thread_pool(
+            notifications_crud.create_notification,
             notifications_schema.Notification(
                 user_id=target_user_id,
                 type=notifications_constants.TYPE_NEW_FOLLOWER_REQUEST_ACCEPTED,
@@ -226,12 +235,15 @@ async def create_admin_new_sign_up_approval_request_notification(
     db: Session,
 ):
     try:
-        admins = users_utils.get_admin_users(db)
+        admins = await core_thread_pool.run_in_thread_pool(
+            users_utils.get_admin_users, db
+        )
         
         # Send notification to all admin users
         for admin in admins:
             # Create a notification for the new sign up request
-            notification = notifications_crud.create_notification(
+            notification = await core_thread_pool.run_in_thread_pool(
+                notifications_crud.create_notification,
                 notifications_schema.Notification(
                     user_id=admin.id,
                     type=notifications_constants.TYPE_ADMIN_NEW_SIGN_UP_APPROVAL_REQUEST,
@@ -89,7 +89,7 @@ async def request_password_reset(
 
 
 @router.post("/password-reset/confirm")
-async def confirm_password_reset(
+def confirm_password_reset(
     confirm_data: password_reset_tokens_schema.PasswordResetConfirm,
     db: Annotated[
         Session,
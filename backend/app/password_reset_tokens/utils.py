@@ -16,6 +16,7 @@ import users.user.crud as users_crud
 
 import core.apprise as core_apprise
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 
 from core.database import SessionLocal
 
@@ -139,7 +140,9 @@ async def send_password_reset_email(
         )
 
     # Find user by email
-    user = users_crud.get_user_by_email(email, db)
+    user = await core_thread_pool.run_in_thread_pool(
+        users_crud.get_user_by_email, email, db
+    )
     if not user:
         # Don't reveal if email exists or not for security
         return True
@@ -150,7 +153,9 @@ async def send_password_reset_email(
         return True
 
     # Generate password reset token
-    token = create_password_reset_token(user.id, db)
+    token = await core_thread_pool.run_in_thread_pool(
+        create_password_reset_token, user.id, db
+    )
 
     # Generate reset link
     reset_link = f"{email_service.frontend_host}/reset-password?token={token}"
@@ -8,13 +8,55 @@ import activities.activity.crud as activities_crud
 import activities.activity.utils as activities_utils
 import core.config as core_config
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 from core.database import SessionLocal
 import websocket.schema as websocket_schema
 
 from polar import crud as polar_crud
+from polar import models as polar_models
 from polar import utils as polar_utils
 
 
+def download_exercise(
+    account: polar_models.PolarAccount,
+    exercise_id: str,
+    exercise_url: str | None = None,
+) -> tuple[str, dict | None]:
+    """
+    Downloads the GPX file and metadata of a Polar exercise.
+
+    Args:
+        account (polar_models.PolarAccount): The Polar account of the user.
+        exercise_id (str): The Polar exercise ID.
+        exercise_url (str | None): The URL of the exercise metadata.
+
+    Returns:
+        tuple[str, dict | None]: The path of the saved GPX file and the
+            exercise metadata, None if it couldn't be fetched.
+    """
+    access_token = polar_utils.get_access_token(account)
+    metadata = None
+    if exercise_url:
+        try:
+            metadata = polar_utils.fetch_json_with_token(access_token, exercise_url)
+        except HTTPException as err:
+            core_logger.print_to_log(
+                f"Unable to fetch exercise metadata for {exercise_id}: {err.detail}",
+                "warning",
+            )
+
+    gpx_bytes = polar_utils.download_gpx(access_token, exercise_id)
+
+    os.makedirs(core_config.FILES_DIR, exist_ok=True)
+    timestamp_suffix = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    file_name = f"polar_{account.user_id}_{exercise_id}_{timestamp_suffix}.gpx"
+    file_path = os.path.join(core_config.FILES_DIR, file_name)
+    with open(file_path, "wb") as gpx_file:
+        gpx_file.write(gpx_bytes)
+
+    return file_path, metadata
+
+
 async def process_exercise_notification(
     polar_user_id: int,
     exercise_id: str,
@@ -23,7 +65,9 @@ async def process_exercise_notification(
     db: Session | None = None
     try:
         db = SessionLocal()
-        account = polar_crud.get_account_by_polar_user_id(polar_user_id, db)
+        account = await core_thread_pool.run_in_thread_pool(
+            polar_crud.get_account_by_polar_user_id, polar_user_id, db
+        )
         if account is None:
             core_logger.print_to_log(
                 f"Skipping Polar webhook for unknown user_id {polar_user_id}",
@@ -31,8 +75,11 @@ async def process_exercise_notification(
             )
             return
 
-        if activities_crud.get_activity_by_polar_id_from_user_id(
-            exercise_id, account.user_id, db
+        if await core_thread_pool.run_in_thread_pool(
+            activities_crud.get_activity_by_polar_id_from_user_id,
+            exercise_id,
+            account.user_id,
+            db,
         ):
             core_logger.print_to_log(
                 f"Polar exercise {exercise_id} already stored for user {account.user_id}",
@@ -40,25 +87,10 @@ async def process_exercise_notification(
             )
             return
 
-        access_token = polar_utils.get_access_token(account)
-        metadata = None
-        if exercise_url:
-            try:
-                metadata = polar_utils.fetch_json_with_token(access_token, exercise_url)
-            except HTTPException as err:
-                core_logger.print_to_log(
-                    f"Unable to fetch exercise metadata for {exercise_id}: {err.detail}",
-                    "warning",
-                )
-
-        gpx_bytes = polar_utils.download_gpx(access_token, exercise_id)
-
-        os.makedirs(core_config.FILES_DIR, exist_ok=True)
-        timestamp_suffix = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        file_name = f"polar_{account.user_id}_{exercise_id}_{timestamp_suffix}.gpx"
-        file_path = os.path.join(core_config.FILES_DIR, file_name)
-        with open(file_path, "wb") as gpx_file:
-            gpx_file.write(gpx_bytes)
+        # Download the exercise from Polar without blocking the event loop
+        file_path, metadata = await core_thread_pool.run_in_thread_pool(
+            download_exercise, account, exercise_id, exercise_url
+        )
 
         websocket_manager = websocket_schema.get_websocket_manager()
         import_info = {
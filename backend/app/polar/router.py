@@ -25,7 +25,7 @@ router = APIRouter()
 
 
 @router.put("/client")
-async def polar_set_user_client(
+def polar_set_user_client(
     client: polar_schema.PolarClient,
     validate_access_token: Annotated[
         Callable,
@@ -50,7 +50,7 @@ async def polar_set_user_client(
 
 
 @router.put("/state/{state}")
-async def polar_set_user_state(
+def polar_set_user_state(
     state: str | None,
     validate_access_token: Annotated[
         Callable,
@@ -73,7 +73,7 @@ async def polar_set_user_state(
 
 
 @router.put("/link")
-async def polar_link(
+def polar_link(
     state: str,
     code: str,
     db: Annotated[
@@ -116,7 +116,7 @@ async def polar_link(
 
 
 @router.delete("/unlink")
-async def polar_unlink(
+def polar_unlink(
     validate_access_token: Annotated[
         Callable,
         Depends(session_security.validate_access_token),
@@ -181,7 +181,7 @@ class ImportService:
             "info",
         )
 
-    async def import_from_zip_data(self, zip_data: bytes) -> dict[str, Any]:
+    def import_from_zip_data(self, zip_data: bytes) -> dict[str, Any]:
         """
         Import profile data from ZIP file bytes.
 
@@ -229,7 +229,7 @@ class ImportService:
                     timeout_seconds, start_time, ImportTimeoutError, "Import"
                 )
                 gears_data = self._load_single_json(zipf, "data/gears.json")
-                gears_id_mapping = await self.collect_and_import_gears_data(gears_data)
+                gears_id_mapping = self.collect_and_import_gears_data(gears_data)
                 del gears_data  # Explicit memory cleanup
 
                 # Load and import gear components
@@ -239,7 +239,7 @@ class ImportService:
                 gear_components_data = self._load_single_json(
                     zipf, "data/gear_components.json"
                 )
-                await self.collect_and_import_gear_components_data(
+                self.collect_and_import_gear_components_data(
                     gear_components_data, gears_id_mapping
                 )
                 del gear_components_data
@@ -260,7 +260,7 @@ class ImportService:
                     zipf, "data/user_privacy_settings.json"
                 )
 
-                await self.collect_and_import_user_data(
+                self.collect_and_import_user_data(
                     user_data,
                     user_default_gear_data,
                     user_integrations_data,
@@ -278,7 +278,7 @@ class ImportService:
 
                 # Import activities and components using batched approach to avoid memory issues
                 activities_id_mapping = (
-                    await self.collect_and_import_activities_data_batched(
+                    self.collect_and_import_activities_data_batched(
                         zipf,
                         file_list,
                         gears_id_mapping,
@@ -296,7 +296,7 @@ class ImportService:
                     zipf, "data/health_targets.json"
                 )
 
-                await self.collect_and_import_health_data(
+                self.collect_and_import_health_data(
                     health_data_data, health_targets_data
                 )
                 del health_data_data, health_targets_data
@@ -305,13 +305,13 @@ class ImportService:
                 profile_utils.check_timeout(
                     timeout_seconds, start_time, ImportTimeoutError, "Import"
                 )
-                await self.add_activity_files_from_zip(
+                self.add_activity_files_from_zip(
                     zipf, file_list, activities_id_mapping
                 )
-                await self.add_activity_media_from_zip(
+                self.add_activity_media_from_zip(
                     zipf, file_list, activities_id_mapping
                 )
-                await self.add_user_images_from_zip(zipf, file_list)
+                self.add_user_images_from_zip(zipf, file_list)
 
         except zipfile.BadZipFile as e:
             raise FileFormatError(f"Invalid ZIP file format: {str(e)}") from e
@@ -361,7 +361,7 @@ class ImportService:
             core_logger.print_to_log(error_msg, "error")
             raise JSONParseError(error_msg) from err
 
-    async def collect_and_import_gears_data(
+    def collect_and_import_gears_data(
         self, gears_data: list[Any]
     ) -> dict[int, int]:
         """
@@ -392,7 +392,7 @@ class ImportService:
         core_logger.print_to_log(f"Imported {self.counts['gears']} gears", "info")
         return gears_id_mapping
 
-    async def collect_and_import_gear_components_data(
+    def collect_and_import_gear_components_data(
         self, gear_components_data: list[Any], gears_id_mapping: dict[int, int]
     ) -> None:
         """
@@ -428,7 +428,7 @@ class ImportService:
             f"Imported {self.counts['gear_components']} gear components", "info"
         )
 
-    async def collect_and_import_user_data(
+    def collect_and_import_user_data(
         self,
         user_data: list[Any],
         user_default_gear_data: list[Any],
@@ -467,14 +467,14 @@ class ImportService:
         self.counts["user"] += 1
 
         # Import user-related settings
-        await self.collect_and_import_user_default_gear(
+        self.collect_and_import_user_default_gear(
             user_default_gear_data, gears_id_mapping
         )
-        await self.collect_and_import_user_integrations(user_integrations_data)
-        await self.collect_and_import_user_goals(user_goals_data)
-        await self.collect_and_import_user_privacy_settings(user_privacy_settings_data)
+        self.collect_and_import_user_integrations(user_integrations_data)
+        self.collect_and_import_user_goals(user_goals_data)
+        self.collect_and_import_user_privacy_settings(user_privacy_settings_data)
 
-    async def collect_and_import_user_default_gear(
+    def collect_and_import_user_default_gear(
         self, user_default_gear_data: list[Any], gears_id_mapping: dict[int, int]
     ) -> None:
         """
@@ -530,7 +530,7 @@ class ImportService:
         core_logger.print_to_log(f"Imported user default gear", "info")
         self.counts["user_default_gear"] += 1
 
-    async def collect_and_import_user_integrations(
+    def collect_and_import_user_integrations(
         self, user_integrations_data: list[Any]
     ) -> None:
         """
@@ -562,7 +562,7 @@ class ImportService:
         core_logger.print_to_log(f"Imported user integrations", "info")
         self.counts["user_integrations"] += 1
 
-    async def collect_and_import_user_goals(self, user_goals_data: list[Any]) -> None:
+    def collect_and_import_user_goals(self, user_goals_data: list[Any]) -> None:
         """
         Import user goals data.
 
@@ -585,7 +585,7 @@ class ImportService:
             f"Imported {self.counts['user_goals']} user goals", "info"
         )
 
-    async def collect_and_import_user_privacy_settings(
+    def collect_and_import_user_privacy_settings(
         self, user_privacy_settings_data: list[Any]
     ) -> None:
         """
@@ -617,7 +617,7 @@ class ImportService:
         core_logger.print_to_log(f"Imported user privacy settings", "info")
         self.counts["user_privacy_settings"] += 1
 
-    async def collect_and_import_activity_components(
+    def collect_and_import_activity_components(
         self,
         activity_laps_data: list[Any],
         activity_sets_data: list[Any],
@@ -766,7 +766,7 @@ class ImportService:
                 )
                 self.counts["activity_exercise_titles"] += len(titles)
 
-    async def collect_and_import_activities_data_batched(
+    def collect_and_import_activities_data_batched(
         self,
         zipf: zipfile.ZipFile,
         file_list: set[str],
@@ -866,16 +866,14 @@ class ImportService:
                 original_activity_id = activity_data.get("id")
                 activity_data.pop("id", None)
 
-                activity = activity_schema.Activity(**activity_data)
-                new_activity = await activities_crud.create_activity(
-                    activity, self.websocket_manager, self.db, False
-                )
+                new_activity = activity_schema.Activity(**activity_data)
+                activities_crud.insert_activities([new_activity], self.db)
 
                 if original_activity_id is not None and new_activity.id is not None:
                     activities_id_mapping[original_activity_id] = new_activity.id
 
                     # Import activity components using batch-loaded data
-                    await self.collect_and_import_activity_components(
+                    self.collect_and_import_activity_components(
                         batch_laps,
                         batch_sets,
                         batch_streams,
@@ -987,7 +985,7 @@ class ImportService:
 
         return all_components
 
-    async def collect_and_import_health_data(
+    def collect_and_import_health_data(
         self, health_data_data: list[Any], health_targets_data: list[Any]
     ) -> None:
         """
@@ -1036,7 +1034,7 @@ class ImportService:
         else:
             core_logger.print_to_log(f"No health targets to import", "debug")
 
-    async def add_activity_files_from_zip(
+    def add_activity_files_from_zip(
         self,
         zipf: zipfile.ZipFile,
         file_list: set,
@@ -1084,7 +1082,7 @@ class ImportService:
                     # Skip files that don't have numeric activity IDs
                     continue
 
-    async def add_activity_media_from_zip(
+    def add_activity_media_from_zip(
         self,
         zipf: zipfile.ZipFile,
         file_list: set,
@@ -1135,7 +1133,7 @@ class ImportService:
                         # Skip files that don't have numeric activity IDs
                         continue
 
-    async def add_user_images_from_zip(
+    def add_user_images_from_zip(
         self,
         zipf: zipfile.ZipFile,
         file_list: set,
@@ -25,6 +25,7 @@ import session.crud as session_crud
 
 import core.database as core_database
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 
 from core.file_security.config import FileSecurityConfig, SecurityLimits
 from core.file_security.file_validator import FileValidator
@@ -47,7 +48,7 @@ file_validator = FileValidator(config=custom_config)
 
 
 @router.get("", response_model=users_schema.UserMe)
-async def read_users_me(
+def read_users_me(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -117,7 +118,7 @@ async def read_users_me(
 
 
 @router.get("/sessions")
-async def read_sessions_me(
+def read_sessions_me(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -180,11 +181,13 @@ async def upload_profile_image(
         ) from err
 
     # If validation passes, proceed with saving
-    return await users_utils.save_user_image(token_user_id, file, db)
+    return await core_thread_pool.run_in_thread_pool(
+        users_utils.save_user_image, token_user_id, file, db
+    )
 
 
 @router.put("")
-async def edit_user(
+def edit_user(
     user_attributtes: users_schema.UserRead,
     token_user_id: Annotated[
         int,
@@ -214,7 +217,7 @@ async def edit_user(
 
 
 @router.put("/privacy")
-async def edit_profile_privacy_settings(
+def edit_profile_privacy_settings(
     user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
     token_user_id: Annotated[
         int,
@@ -246,7 +249,7 @@ async def edit_profile_privacy_settings(
 
 
 @router.put("/password")
-async def edit_profile_password(
+def edit_profile_password(
     user_attributtes: users_schema.UserEditPassword,
     token_user_id: Annotated[
         int,
@@ -289,7 +292,7 @@ async def edit_profile_password(
 
 
 @router.put("/photo")
-async def delete_profile_photo(
+def delete_profile_photo(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -317,7 +320,7 @@ async def delete_profile_photo(
 
 
 @router.delete("/sessions/{session_id}")
-async def delete_profile_session(
+def delete_profile_session(
     session_id: str,
     token_user_id: Annotated[
         int,
@@ -347,7 +350,7 @@ async def delete_profile_session(
 
 
 @router.get("/export")
-async def export_profile_data(
+def export_profile_data(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -475,7 +478,9 @@ async def import_profile_data(
         import_service = profile_import_service.ImportService(
             token_user_id, db, websocket_manager
         )
-        result = await import_service.import_from_zip_data(zip_data)
+        result = await core_thread_pool.run_in_thread_pool(
+            import_service.import_from_zip_data, zip_data
+        )
 
         core_logger.print_to_log(
             f"Successfully imported profile data for user {token_user_id}: {result['imported']}",
@@ -569,7 +574,7 @@ async def import_profile_data(
 
 # MFA logic
 @router.get("/mfa/status", response_model=profile_schema.MFAStatusResponse)
-async def get_mfa_status(
+def get_mfa_status(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -591,7 +596,7 @@ async def get_mfa_status(
 
 
 @router.post("/mfa/setup", response_model=profile_schema.MFASetupResponse)
-async def setup_mfa(
+def setup_mfa(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -621,7 +626,7 @@ async def setup_mfa(
 
 
 @router.post("/mfa/enable")
-async def enable_mfa(
+def enable_mfa(
     request: profile_schema.MFASetupRequest,
     token_user_id: Annotated[
         int,
@@ -667,7 +672,7 @@ async def enable_mfa(
 
 
 @router.post("/mfa/disable")
-async def disable_mfa(
+def disable_mfa(
     request: profile_schema.MFADisableRequest,
     token_user_id: Annotated[
         int,
@@ -691,7 +696,7 @@ async def disable_mfa(
 
 
 @router.post("/mfa/verify")
-async def verify_mfa(
+def verify_mfa(
     request: profile_schema.MFARequest,
     token_user_id: Annotated[
         int,
@@ -19,7 +19,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=server_settings_schema.ServerSettingsRead)
-async def read_server_settings(
+def read_server_settings(
     check_scopes: Annotated[
         Callable,
         Security(session_security.check_scopes, scopes=["server_settings:read"]),
@@ -34,7 +34,7 @@ async def read_server_settings(
 
 
 @router.put("", response_model=server_settings_schema.ServerSettingsRead)
-async def edit_server_settings(
+def edit_server_settings(
     server_settings_attributtes: server_settings_schema.ServerSettingsEdit,
     check_scopes: Annotated[
         Callable,
@@ -53,7 +53,7 @@ async def edit_server_settings(
     "/upload/login",
     status_code=201,
 )
-async def upload_login_photo(
+def upload_login_photo(
     file: UploadFile,
     check_scopes: Annotated[
         Callable,
@@ -85,7 +85,7 @@ async def upload_login_photo(
     "/upload/login",
     status_code=200,
 )
-async def delete_login_photo(
+def delete_login_photo(
     check_scopes: Annotated[
         Callable,
         Security(session_security.check_scopes, scopes=["server_settings:write"]),
@@ -28,7 +28,7 @@ router = APIRouter()
 
 
 @router.post("/token")
-async def login_for_access_token(
+def login_for_access_token(
     response: Response,
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
@@ -67,10 +67,10 @@ async def login_for_access_token(
             }
 
     # If no MFA required, proceed with normal login
-    return await complete_login(response, request, user, client_type, db)
+    return complete_login(response, request, user, client_type, db)
 
 
-async def complete_login(
+def complete_login(
     response: Response, request: Request, user, client_type: str, db: Session
 ):
     # Create the tokens
@@ -106,7 +106,7 @@ async def complete_login(
 
 
 @router.post("/mfa/verify")
-async def verify_mfa_and_login(
+def verify_mfa_and_login(
     response: Response,
     request: Request,
     mfa_request: session_schema.MFALoginRequest,
@@ -148,11 +148,11 @@ async def verify_mfa_and_login(
     pending_mfa_store.delete_pending_login(mfa_request.username)
 
     # Complete the login
-    return await complete_login(response, request, user, client_type, db)
+    return complete_login(response, request, user, client_type, db)
 
 
 @router.post("/refresh")
-async def refresh_token(
+def refresh_token(
     response: Response,
     request: Request,
     validate_refresh_token: Annotated[
@@ -219,7 +219,7 @@ async def refresh_token(
 
 
 @router.post("/logout")
-async def logout(
+def logout(
     response: Response,
     refresh_token: Annotated[
         str,
@@ -260,7 +260,7 @@ async def logout(
 
 
 @router.get("/sessions/user/{user_id}")
-async def read_sessions_user(
+def read_sessions_user(
     user_id: int,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["sessions:read"])
@@ -275,7 +275,7 @@ async def read_sessions_user(
 
 
 @router.delete("/sessions/{session_id}/user/{user_id}")
-async def delete_session_user(
+def delete_session_user(
     session_id: str,
     user_id: int,
     check_scopes: Annotated[
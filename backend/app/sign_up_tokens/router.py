@@ -26,6 +26,7 @@ import server_settings.utils as server_settings_utils
 
 import core.database as core_database
 import core.apprise as core_apprise
+import core.thread_pool as core_thread_pool
 
 import websocket.schema as websocket_schema
 
@@ -97,7 +98,9 @@ async def signup(
         callers and tests should account for these side effects (e.g., by using transactions, fakes, or mocks).
     """
     # Get server settings to check if signup is enabled
-    server_settings = server_settings_utils.get_server_settings(db)
+    server_settings = await core_thread_pool.run_in_thread_pool(
+        server_settings_utils.get_server_settings, db
+    )
 
     # Check if signup is enabled
     if not server_settings.signup_enabled:
@@ -107,19 +110,29 @@ async def signup(
         )
 
     # Create the user in the database
-    created_user = users_crud.create_signup_user(user, server_settings, db)
+    created_user = await core_thread_pool.run_in_thread_pool(
+        users_crud.create_signup_user, user, server_settings, db
+    )
 
     # Create the user integrations in the database
-    user_integrations_crud.create_user_integrations(created_user.id, db)
+    await core_thread_pool.run_in_thread_pool(
+        user_integrations_crud.create_user_integrations, created_user.id, db
+    )
 
     # Create the user privacy settings
-    users_privacy_settings_crud.create_user_privacy_settings(created_user.id, db)
+    await core_thread_pool.run_in_thread_pool(
+        users_privacy_settings_crud.create_user_privacy_settings, created_user.id, db
+    )
 
     # Create the user health targets
-    health_targets_crud.create_health_targets(created_user.id, db)
+    await core_thread_pool.run_in_thread_pool(
+        health_targets_crud.create_health_targets, created_user.id, db
+    )
 
     # Create the user default gear
-    user_default_gear_crud.create_user_default_gear(created_user.id, db)
+    await core_thread_pool.run_in_thread_pool(
+        user_default_gear_crud.create_user_default_gear, created_user.id, db
+    )
 
     # Return appropriate response based on server configuration
     response_data = {"message": "User created successfully."}
@@ -170,7 +183,9 @@ async def verify_email(
     ],
 ):
     # Get server settings
-    server_settings = server_settings_utils.get_server_settings(db)
+    server_settings = await core_thread_pool.run_in_thread_pool(
+        server_settings_utils.get_server_settings, db
+    )
     if not server_settings.signup_require_email_verification:
         raise HTTPException(
             status_code=status.HTTP_412_PRECONDITION_FAILED,
@@ -178,11 +193,17 @@ async def verify_email(
         )
 
     # Verify the email
-    user_id = sign_up_tokens_utils.use_sign_up_token(confirm_data.token, db)
-    users_crud.verify_user_email(user_id, server_settings, db)
+    user_id = await core_thread_pool.run_in_thread_pool(
+        sign_up_tokens_utils.use_sign_up_token, confirm_data.token, db
+    )
+    await core_thread_pool.run_in_thread_pool(
+        users_crud.verify_user_email, user_id, server_settings, db
+    )
 
     if email_service.is_configured():
-        user = users_crud.get_user_by_id(user_id, db)
+        user = await core_thread_pool.run_in_thread_pool(
+            users_crud.get_user_by_id, user_id, db
+        )
         await sign_up_tokens_utils.send_sign_up_admin_approval_email(
             user, email_service, db
         )
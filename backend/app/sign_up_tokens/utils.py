@@ -18,6 +18,7 @@ import users.user.utils as users_utils
 
 import core.apprise as core_apprise
 import core.logger as core_logger
+import core.thread_pool as core_thread_pool
 
 from core.database import SessionLocal
 
@@ -55,7 +56,9 @@ async def send_sign_up_email(
         )
 
     # Generate sign up token
-    token = create_sign_up_token(user.id, db)
+    token = await core_thread_pool.run_in_thread_pool(
+        create_sign_up_token, user.id, db
+    )
 
     # Generate reset link
     reset_link = f"{email_service.frontend_host}/verify-email?token={token}"
@@ -86,7 +89,9 @@ async def send_sign_up_admin_approval_email(
             detail="Email service is not configured",
         )
 
-    admins = users_utils.get_admin_users(db)
+    admins = await core_thread_pool.run_in_thread_pool(
+        users_utils.get_admin_users, db
+    )
 
     # Send email to all admin users
     for admin in admins:
@@ -117,7 +122,9 @@ async def send_sign_up_approval_email(
         )
     
     # Get user info
-    user = users_crud.get_user_by_id(user_id, db)
+    user = await core_thread_pool.run_in_thread_pool(
+        users_crud.get_user_by_id, user_id, db
+    )
 
     if not user:
         raise HTTPException(
@@ -3,10 +3,13 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from stravalib.client import Client
 from stravalib.exc import AccessUnauthorized
-from timezonefinder import TimezoneFinder
 
 import core.logger as core_logger
+import core.rate_limits as core_rate_limits
 import core.config as core_config
+import core.sync_orchestrator as core_sync_orchestrator
+import core.thread_pool as core_thread_pool
+import core.timezones as core_timezones
 
 import activities.activity.schema as activities_schema
 import activities.activity.crud as activities_crud
@@ -17,6 +20,7 @@ import activities.activity_laps.crud as activity_laps_crud
 import activities.activity_streams.schema as activity_streams_schema
 import activities.activity_streams.crud as activity_streams_crud
 
+import users.user_integrations.crud as user_integrations_crud
 import users.user_integrations.schema as user_integrations_schema
 
 import users.user_default_gear.utils as user_default_gear_utils
@@ -35,6 +39,13 @@ import websocket.schema as websocket_schema
 from core.database import SessionLocal
 
 
+def start_date_to_datetime(start_date: datetime | str) -> datetime:
+    # The syncs pass the start date as a "%Y-%m-%dT%H:%M:%S" UTC string
+    if isinstance(start_date, str):
+        return datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
+    return start_date
+
+
 async def fetch_and_process_activities(
     strava_client: Client,
     start_date: datetime,
@@ -47,9 +58,27 @@ async def fetch_and_process_activities(
     # set the strava activities to None
     strava_activities = None
 
+    # Backfills leave part of the request budget to the recent activities
+    budget = core_rate_limits.get_strava_budget(user_id)
+    budget_reserve = core_rate_limits.get_backfill_reserve(
+        start_date_to_datetime(start_date)
+    )
+
+    def get_activities():
+        budget.acquire(1, budget_reserve)
+        return list(strava_client.get_activities(after=start_date))
+
     # Fetch Strava activities after the specified start date
     try:
-        strava_activities = list(strava_client.get_activities(after=start_date))
+        strava_activities = await core_thread_pool.run_in_thread_pool(get_activities)
+    except core_rate_limits.RateLimitExceeded:
+        await core_rate_limits.pause_backfill(
+            core_sync_orchestrator.PROVIDER_STRAVA,
+            user_id,
+            start_date_to_datetime(start_date),
+            db,
+        )
+        return 0
     except AccessUnauthorized as auth_err:
         # Log a more specific error message for authentication issues
         core_logger.print_to_log(
@@ -92,7 +121,9 @@ async def fetch_and_process_activities(
         # Return 0 to indicate no activities were processed
         return 0
 
-    user = users_crud.get_user_by_id(user_id, db)
+    user = await core_thread_pool.run_in_thread_pool(
+        users_crud.get_user_by_id, user_id, db
+    )
     if user is None:
         if not is_startup:
             raise HTTPException(
@@ -100,24 +131,79 @@ async def fetch_and_process_activities(
                 detail="User not found",
             )
 
-    user_privacy_settings = (
-        users_privacy_settings_crud.get_user_privacy_settings_by_user_id(user.id, db)
+    user_privacy_settings = await core_thread_pool.run_in_thread_pool(
+        users_privacy_settings_crud.get_user_privacy_settings_by_user_id, user.id, db
     )
 
     processed_activities = []
+    parsed_activities = []
+    paused = False
+
+    # Process the newest activities first, they are kept if the budget runs out
+    strava_activities.sort(key=lambda activity: activity.start_date, reverse=True)
 
     # Process the activities
     for activity in strava_activities:
-        processed_activities.append(
-            await process_activity(
+        try:
+            # Fetch the activity details from Strava without blocking the event loop
+            parsed_activity = await core_thread_pool.run_in_thread_pool(
+                process_activity,
                 activity,
                 user_id,
                 user_privacy_settings,
                 strava_client,
                 user_integrations,
-                websocket_manager,
                 db,
+                budget_reserve,
+            )
+        except Exception as err:
+            # Stop at a spent budget or a 429, the sync is resumed later
+            if (
+                isinstance(err, core_rate_limits.RateLimitExceeded)
+                or budget.is_paused()
+            ):
+                paused = True
+                break
+
+            # Skip the failing activity, so it doesn't hold back the others
+            core_logger.print_to_log(
+                f"User {user_id}: Error processing Strava activity {activity.id}, "
+                f"skipping it: {str(err)}",
+                "error",
+                exc=err,
+            )
+            continue
+
+        if parsed_activity is not None:
+            parsed_activities.append(parsed_activity)
+
+        # Save the parsed activities in batches, one transaction per batch
+        if len(parsed_activities) >= core_config.ACTIVITIES_STORE_BATCH_SIZE:
+            processed_activities.extend(
+                await save_activities_streams_laps(
+                    parsed_activities, websocket_manager, db
+                )
             )
+            parsed_activities = []
+
+    if parsed_activities:
+        processed_activities.extend(
+            await save_activities_streams_laps(parsed_activities, websocket_manager, db)
+        )
+
+    if paused:
+        await core_rate_limits.pause_backfill(
+            core_sync_orchestrator.PROVIDER_STRAVA,
+            user_id,
+            start_date_to_datetime(start_date),
+            db,
+        )
+    else:
+        await core_rate_limits.complete_backfill(
+            core_sync_orchestrator.PROVIDER_STRAVA,
+            user_id,
+            start_date_to_datetime(start_date),
+            db,
         )
 
     # Return the activities processed
@@ -132,8 +218,6 @@ def parse_activity(
     user_integrations: user_integrations_schema.UsersIntegrations,
     db: Session,
 ) -> dict:
-    # Create an instance of TimezoneFinder
-    tf = TimezoneFinder()
     timezone = core_config.TZ
 
     # Get the detailed activity
@@ -290,9 +374,9 @@ def parse_activity(
 
     if activity_type != 3 and activity_type != 7:
         if is_lat_lon_set:
-            timezone = tf.timezone_at(
-                lat=lat_lon_waypoints[0]["lat"],
-                lng=lat_lon_waypoints[0]["lon"],
+            timezone = core_timezones.timezone_at(
+                lat_lon_waypoints[0]["lat"],
+                lat_lon_waypoints[0]["lon"],
             )
 
     # Create the activity object
@@ -362,55 +446,63 @@ def parse_activity(
     }
 
 
-async def save_activity_streams_laps(
-    activity: activities_schema.Activity,
-    stream_data: list,
-    laps: dict,
-    websocket_manager: websocket_schema.WebSocketManager,
-    db: Session,
-) -> activities_schema.Activity:
-    # Create the activity and get the ID
-    created_activity = await activities_crud.create_activity(
-        activity, websocket_manager, db
-    )
+def create_activity_streams_laps_objects(
+    activity_id: int, stream_data: list, laps: dict
+) -> list:
+    # Create the empty array of activity streams
+    activity_streams = []
 
     if stream_data is not None:
-        # Create the empty array of activity streams
-        activity_streams = []
-
         # Create the activity streams objects
         for is_set, stream_type, waypoints in stream_data:
             if is_set:
                 activity_streams.append(
                     activity_streams_schema.ActivityStreams(
-                        activity_id=created_activity.id,
+                        activity_id=activity_id,
                         stream_type=stream_type,
                         stream_waypoints=waypoints,
                         strava_activity_stream_id=None,
                     )
                 )
 
-        # Create the activity streams in the database
-        activity_streams_crud.create_activity_streams(activity_streams, db)
+    children = activity_streams_crud.create_activity_streams_objects(activity_streams)
 
     # Append activity id to laps
     if laps is not None:
-        # Create the laps in the database
-        activity_laps_crud.create_activity_laps(laps, created_activity.id, db)
+        children.extend(
+            activity_laps_crud.create_activity_laps_objects(laps, activity_id)
+        )
+
+    return children
+
 
-    # return the created activity
-    return created_activity
+async def save_activities_streams_laps(
+    parsed_activities: list[dict],
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+) -> list[activities_schema.Activity]:
+    # Create the activities, streams and laps in a single transaction
+    return await activities_crud.create_activities(
+        [parsed_activity["activity_to_store"] for parsed_activity in parsed_activities],
+        websocket_manager,
+        db,
+        children_builder=lambda index, activity_id: create_activity_streams_laps_objects(
+            activity_id,
+            parsed_activities[index]["stream_data"],
+            parsed_activities[index]["laps"],
+        ),
+    )
 
 
-async def process_activity(
+def process_activity(
     activity,
     user_id: int,
     user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
     strava_client: Client,
     user_integrations: user_integrations_schema.UsersIntegrations,
-    websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
-):
+    budget_reserve: float = 0.0,
+) -> dict | None:
     # Get the activity by Strava ID from the user
     activity_db = strava_utils.fetch_and_validate_activity(activity.id, user_id, db)
 
@@ -418,13 +510,18 @@ async def process_activity(
     if activity_db is not None:
         return None
 
+    # Take the requests of the activity from the user's Strava budget
+    core_rate_limits.get_strava_budget(user_id).acquire(
+        core_rate_limits.STRAVA_ACTIVITY_REQUESTS, budget_reserve
+    )
+
     # Log an informational event for activity processing
     core_logger.print_to_log(
         f"User {user_id}: Strava activity {activity.id} will be processed"
     )
 
-    # Parse the activity and streams
-    parsed_activity = parse_activity(
+    # Parse the activity and streams, they are saved in batches by the caller
+    return parse_activity(
         activity,
         user_id,
         user_privacy_settings,
@@ -433,15 +530,6 @@ async def process_activity(
         db,
     )
 
-    # Save the activity and streams to the database
-    return await save_activity_streams_laps(
-        parsed_activity["activity_to_store"],
-        parsed_activity["stream_data"],
-        parsed_activity["laps"],
-        websocket_manager,
-        db,
-    )
-
 
 def fetch_and_process_activity_streams(
     strava_client: Client,
@@ -690,61 +778,20 @@ def fetch_and_process_activity_laps(
 
 
 async def retrieve_strava_users_activities_for_days(
-    days: int, is_startup: bool = False
+    days: int, is_startup: bool = False, spread_seconds: float = 0
 ):
+    start_date = (datetime.now(timezone.utc) - timedelta(days=days)).strftime(
+        "%Y-%m-%dT%H:%M:%S"
+    )
+
     # Create a new database session
     db = SessionLocal()
 
     try:
-        # Get all users
-        users = users_crud.get_all_users(db)
-
-        # Process the activities for each user
-        if users:
-            for user in users:
-                try:
-                    await get_user_strava_activities_by_days(
-                        (datetime.now(timezone.utc) - timedelta(days=days)).strftime(
-                            "%Y-%m-%dT%H:%M:%S"
-                        ),
-                        user.id,
-                        None,
-                        None,
-                        is_startup,
-                    )
-                except HTTPException as err:
-                    # Log the error but continue processing other users
-                    core_logger.print_to_log(
-                        f"User {user.id}: Error processing Strava activities: {str(err)}",
-                        "error",
-                        exc=err,
-                    )
-                    # Don't reraise the exception if we're in startup mode
-                    if not is_startup:
-                        raise err
-                except Exception as err:
-                    # Log the error but continue processing other users
-                    core_logger.print_to_log(
-                        f"User {user.id}: Unexpected error processing Strava activities: {str(err)}",
-                        "error",
-                        exc=err,
-                    )
-                    # Don't reraise the exception if we're in startup mode
-                    if not is_startup:
-                        raise HTTPException(
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Internal Server Error",
-                        ) from err
-    except HTTPException as err:
-        # Log an error event if an HTTPException occurred
-        core_logger.print_to_log(
-            f"Error retrieving users: {str(err)}",
-            "error",
-            exc=err,
+        # Get the users with Strava linked
+        user_ids = await core_thread_pool.run_in_thread_pool(
+            user_integrations_crud.get_user_ids_with_strava_linked, db
         )
-        # Raise the HTTPException to propagate the error
-        if not is_startup:
-            raise err
     except Exception as err:
         # Log an error event if an exception occurred
         core_logger.print_to_log(
@@ -752,16 +799,40 @@ async def retrieve_strava_users_activities_for_days(
             "error",
             exc=err,
         )
-        # Raise an HTTPException with a 500 Internal Server Error status code
+        # Raise the exception to propagate the error
         if not is_startup:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal Server Error",
-            ) from err
+            raise err
+        return
     finally:
         # Ensure the session is closed after use
-        if db is not None:
-            db.close()
+        db.close()
+
+    async def sync_user(user_id: int, user_db: Session):
+        # Resume the backfill of the user paused by the rate limits, if any
+        user_start_date = (
+            await core_thread_pool.run_in_thread_pool(
+                core_rate_limits.get_backfill_start,
+                core_sync_orchestrator.PROVIDER_STRAVA,
+                user_id,
+                start_date_to_datetime(start_date),
+                user_db,
+            )
+        ).strftime("%Y-%m-%dT%H:%M:%S")
+
+        # Errors are raised so the orchestrator logs the user sync outcome
+        await get_user_strava_activities_by_days(
+            user_start_date, user_id, None, user_db
+        )
+
+    # Sync the users concurrently, each with its own session
+    await core_sync_orchestrator.sync_users(
+        core_sync_orchestrator.PROVIDER_STRAVA,
+        "Strava activities",
+        user_ids,
+        sync_user,
+        core_config.STRAVA_SYNC_CONCURRENCY,
+        spread_seconds,
+    )
 
 
 async def get_user_strava_activities_by_days(
@@ -783,8 +854,8 @@ async def get_user_strava_activities_by_days(
 
     try:
         # Get the user integrations by user ID
-        user_integrations = strava_utils.fetch_user_integrations_and_validate_token(
-            user_id, db
+        user_integrations = await core_thread_pool.run_in_thread_pool(
+            strava_utils.fetch_user_integrations_and_validate_token, user_id, db
         )
 
         if user_integrations is None:
@@ -35,7 +35,7 @@ router = APIRouter()
 @router.put(
     "/link",
 )
-async def strava_link(
+def strava_link(
     state: str,
     code: str,
     db: Annotated[
@@ -106,7 +106,7 @@ async def strava_link(
     "/activities/days/{days}",
     status_code=202,
 )
-async def strava_retrieve_activities_days(
+def strava_retrieve_activities_days(
     days: int,
     validate_access_token: Annotated[
         Callable,
@@ -147,7 +147,7 @@ async def strava_retrieve_activities_days(
 
 
 @router.get("/gear", status_code=201)
-async def strava_retrieve_gear(
+def strava_retrieve_gear(
     validate_access_token: Annotated[
         Callable,
         Depends(session_security.validate_access_token),
@@ -178,7 +178,7 @@ async def strava_retrieve_gear(
 
 
 @router.post("/import/bikes", status_code=201)
-async def import_bikes_from_strava_export(
+def import_bikes_from_strava_export(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -234,7 +234,7 @@ async def import_bikes_from_strava_export(
 
 
 @router.post("/import/shoes", status_code=201)
-async def import_shoes_from_strava_export(
+def import_shoes_from_strava_export(
     token_user_id: Annotated[
         int,
         Depends(session_security.get_user_id_from_access_token),
@@ -290,7 +290,7 @@ async def import_shoes_from_strava_export(
 
 
 @router.put("/client")
-async def strava_set_user_client(
+def strava_set_user_client(
     client: strava_schema.StravaClient,
     validate_access_token: Annotated[
         Callable,
@@ -318,7 +318,7 @@ async def strava_set_user_client(
 @router.put(
     "/state/{state}",
 )
-async def strava_set_user_unique_state(
+def strava_set_user_unique_state(
     state: str | None,
     validate_access_token: Annotated[
         Callable,
@@ -342,7 +342,7 @@ async def strava_set_user_unique_state(
 
 
 @router.delete("/unlink")
-async def strava_unlink(
+def strava_unlink(
     validate_access_token: Annotated[
         Callable,
         Depends(session_security.validate_access_token),
@@ -6,6 +6,7 @@ import time
 
 import core.cryptography as core_cryptography
 import core.logger as core_logger
+import core.rate_limits as core_rate_limits
 
 import activities.activity.schema as activities_schema
 import activities.activity.crud as activities_crud
@@ -163,6 +164,9 @@ def create_strava_client(
                 else None
             ),
             token_expires=epoch_time,
+            rate_limiter=core_rate_limits.StravaRateLimiter(
+                core_rate_limits.get_strava_budget(user_integrations.user_id)
+            ),
         )
     except Exception as err:
         # Log the error and re-raise the exception
@@ -1,23 +1,22 @@
 from collections import defaultdict
-from timezonefinder import TimezoneFinder
 from datetime import datetime
 
 import tcxreader
 import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
+import activities.activity.geodesic_utils as geodesic_utils
 
 import users.user_default_gear.utils as user_default_gear_utils
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
 
 
 def parse_tcx_file(file, user_id, user_privacy_settings, db):
     tcx_file = tcxreader.TCXReader().read(file)
     trackpoints = tcx_file.trackpoints_to_dict()
 
-    # Create an instance of TimezoneFinder
-    tf = TimezoneFinder()
     timezone = core_config.TZ
 
     # Initialize variables
@@ -30,10 +29,7 @@ def parse_tcx_file(file, user_id, user_privacy_settings, db):
     avg_power = None
     max_power = None
     np = None
-    last_waypoint_time, prev_latitude, prev_longitude = None, None, None
     cad_waypoints = []
-    vel_waypoints = []
-    pace_waypoints = []
 
     laps = []
 
@@ -167,43 +163,16 @@ def parse_tcx_file(file, user_id, user_privacy_settings, db):
         if hasattr(trackpoint, "tpx_ext") and "Watts" in trackpoint.tpx_ext
     ]
 
-    for trackpoint in trackpoints:
-        latitude, longitude, time = (
-            trackpoint["latitude"],
-            trackpoint["longitude"],
-            trackpoint["time"],
-        )
-
-        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-        # Calculate instant speed, pace, and update waypoint arrays
-        instant_speed = activities_utils.calculate_instant_speed(
-            last_waypoint_time,
-            time,
-            latitude,
-            longitude,
-            prev_latitude,
-            prev_longitude,
-        )
-
-        # Calculate instance pace
-        instant_pace = 0
-        if instant_speed > 0:
-            instant_pace = 1 / instant_speed
-
-        activities_utils.append_if_not_none(
-            vel_waypoints, timestamp, instant_speed, "vel"
-        )
-        activities_utils.append_if_not_none(
-            pace_waypoints, timestamp, instant_pace, "pace"
-        )
-
-        # Update previous latitude, longitude, and last waypoint time
-        prev_latitude, prev_longitude, last_waypoint_time = (
-            latitude,
-            longitude,
-            time,
-        )
+    # Calculate instant speed and pace for all trackpoints at once
+    timestamps = [waypoint["time"] for waypoint in lat_lon_waypoints]
+    instant_speeds = geodesic_utils.instant_speeds(
+        geodesic_utils.waypoint_times_to_seconds(timestamps),
+        [waypoint["lat"] for waypoint in lat_lon_waypoints],
+        [waypoint["lon"] for waypoint in lat_lon_waypoints],
+    )
+    vel_waypoints, pace_waypoints = geodesic_utils.speed_and_pace_waypoints(
+        timestamps, instant_speeds
+    )
 
     distance = round(tcx_file.distance) if tcx_file.distance else 0
 
@@ -213,21 +182,10 @@ def parse_tcx_file(file, user_id, user_privacy_settings, db):
             distance, trackpoints[0]["time"], trackpoints[-1]["time"]
         )
 
-        # Calculate location data based on the first waypoint
-        location_data = activities_utils.location_based_on_coordinates(
-            trackpoints[0]["latitude"], trackpoints[0]["longitude"]
-        )
-
-        # Extract city, town, and country from location data
-        if location_data:
-            city = location_data["city"]
-            town = location_data["town"]
-            country = location_data["country"]
-
         # Get timezone based on the first waypoint's coordinates
-        timezone = tf.timezone_at(
-            lat=trackpoints[0]["latitude"],
-            lng=trackpoints[0]["longitude"],
+        timezone = core_timezones.timezone_at(
+            trackpoints[0]["latitude"],
+            trackpoints[0]["longitude"],
         )
 
     if power_waypoints:
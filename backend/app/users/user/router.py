@@ -22,13 +22,14 @@ import session.security as session_security
 import core.apprise as core_apprise
 import core.database as core_database
 import core.dependencies as core_dependencies
+import core.thread_pool as core_thread_pool
 
 # Define the API router
 router = APIRouter()
 
 
 @router.get("/number", response_model=int)
-async def read_users_number(
+def read_users_number(
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["users:read"])
     ],
@@ -44,7 +45,7 @@ async def read_users_number(
     "/page_number/{page_number}/num_records/{num_records}",
     response_model=list[users_schema.UserRead] | None,
 )
-async def read_users_all_pagination(
+def read_users_all_pagination(
     page_number: int,
     num_records: int,
     validate_pagination_values: Annotated[
@@ -66,7 +67,7 @@ async def read_users_all_pagination(
     "/username/contains/{username}",
     response_model=list[users_schema.UserRead] | None,
 )
-async def read_users_contain_username(
+def read_users_contain_username(
     username: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["users:read"])
@@ -84,7 +85,7 @@ async def read_users_contain_username(
     "/username/{username}",
     response_model=users_schema.UserRead | None,
 )
-async def read_users_username(
+def read_users_username(
     username: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["users:read"])
@@ -102,7 +103,7 @@ async def read_users_username(
     "/email/{email}",
     response_model=users_schema.UserRead | None,
 )
-async def read_users_email(
+def read_users_email(
     email: str,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["users:read"])
@@ -117,7 +118,7 @@ async def read_users_email(
 
 
 @router.get("/id/{user_id}", response_model=users_schema.UserRead)
-async def read_users_id(
+def read_users_id(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -133,7 +134,7 @@ async def read_users_id(
 
 
 @router.post("", response_model=users_schema.UserRead, status_code=201)
-async def create_user(
+def create_user(
     user: users_schema.UserCreate,
     check_scopes: Annotated[
         Callable, Security(session_security.check_scopes, scopes=["users:write"])
@@ -167,7 +168,7 @@ async def create_user(
     status_code=201,
     response_model=str | None,
 )
-async def upload_user_image(
+def upload_user_image(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     file: UploadFile,
@@ -179,11 +180,11 @@ async def upload_user_image(
         Depends(core_database.get_db),
     ],
 ):
-    return await users_utils.save_user_image(user_id, file, db)
+    return users_utils.save_user_image(user_id, file, db)
 
 
 @router.put("/{user_id}")
-async def edit_user(
+def edit_user(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     user_attributtes: users_schema.UserRead,
@@ -219,7 +220,7 @@ async def approve_user(
     ],
 ):
     # Approve the user in the database
-    users_crud.approve_user(user_id, db)
+    await core_thread_pool.run_in_thread_pool(users_crud.approve_user, user_id, db)
 
     # Send approval email
     await sign_up_tokens_utils.send_sign_up_approval_email(user_id, email_service, db)
@@ -229,7 +230,7 @@ async def approve_user(
 
 
 @router.put("/{user_id}/password")
-async def edit_user_password(
+def edit_user_password(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     user_attributes: users_schema.UserEditPassword,
@@ -259,7 +260,7 @@ async def edit_user_password(
 
 
 @router.delete("/{user_id}/photo")
-async def delete_user_photo(
+def delete_user_photo(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -278,7 +279,7 @@ async def delete_user_photo(
 
 
 @router.delete("/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     validate_id: Annotated[Callable, Depends(users_dependencies.validate_user_id)],
     check_scopes: Annotated[
@@ -89,7 +89,7 @@ def format_user_birthdate(user):
     return user
 
 
-async def save_user_image(user_id: int, file: UploadFile, db: Session):
+def save_user_image(user_id: int, file: UploadFile, db: Session):
     """
     Saves a user's image to the server and updates the user's photo path in the database.
 
@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=user_default_gear_schema.UserDefaultGear)
-async def read_user_default_gear(
+def read_user_default_gear(
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
     ],
@@ -29,7 +29,7 @@ async def read_user_default_gear(
 
 
 @router.put("", response_model=user_default_gear_schema.UserDefaultGear)
-async def edit_user_default_gear(
+def edit_user_default_gear(
     user_default_gear: user_default_gear_schema.UserDefaultGear,
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
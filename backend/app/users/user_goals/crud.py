@@ -1,12 +1,25 @@
+from datetime import datetime
 from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 from typing import List
 
 import users.user_goals.schema as user_goals_schema
 import users.user_goals.models as user_goals_models
 
+import activities.activity.crud as activities_crud
+import activities.activity.models as activities_models
+
 import core.logger as core_logger
 
+# Activity column summed by each goal type, activities goals count activities
+GOAL_TYPE_COLUMNS = {
+    user_goals_schema.GoalType.CALORIES: activities_models.Activity.calories,
+    user_goals_schema.GoalType.DISTANCE: activities_models.Activity.distance,
+    user_goals_schema.GoalType.ELEVATION: activities_models.Activity.elevation_gain,
+    user_goals_schema.GoalType.DURATION: activities_models.Activity.total_elapsed_time,
+}
+
 
 def get_user_goals_by_user_id(
     user_id: int, db: Session
@@ -44,6 +57,88 @@ def get_user_goals_by_user_id(
         ) from err
 
 
+def get_user_goals_totals(
+    user_id: int,
+    goals_periods: List[
+        tuple[user_goals_models.UserGoal, List[int], datetime, datetime]
+    ],
+    db: Session,
+) -> dict[int, int | float]:
+    """
+    Calculates the totals of several goals of a user with a single query.
+
+    Each goal adds up the column of its goal type (or counts the activities
+    for activities goals) over the user activities of its activity types
+    that start within its period. All goals are aggregated in one row with
+    conditional sums, so no activity is loaded.
+
+    Args:
+        user_id (int): The ID of the user whose activities are aggregated.
+        goals_periods (List[tuple[user_goals_models.UserGoal, List[int], datetime, datetime]]):
+            For each goal, the goal, its activity types and the start and end
+            datetimes of its period. Periods cover whole days, from the start
+            day to the end day included.
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        dict[int, int | float]: The total of each goal by goal ID, 0 if no activity matches.
+
+    Raises:
+        HTTPException: If an unexpected exception is raised.
+    """
+    try:
+        if not goals_periods:
+            return {}
+
+        totals_columns = []
+        for goal, activity_types, start_date, end_date in goals_periods:
+            # Activities that count towards the goal
+            is_goal_activity = and_(
+                activities_models.Activity.activity_type.in_(activity_types),
+                activities_crud.start_time_in_days_filter(start_date, end_date),
+            )
+
+            column = GOAL_TYPE_COLUMNS.get(goal.goal_type)
+            if column is not None:
+                total = func.coalesce(
+                    func.sum(case((is_goal_activity, column), else_=0)), 0
+                )
+            else:
+                total = func.count(
+                    case((is_goal_activity, activities_models.Activity.id))
+                )
+            totals_columns.append(total.label(f"goal_{goal.id}"))
+
+        totals = (
+            db.query(*totals_columns)
+            .filter(
+                activities_models.Activity.user_id == user_id,
+                activities_crud.start_time_in_days_filter(
+                    min(start_date for _, _, start_date, _ in goals_periods),
+                    max(end_date for _, _, _, end_date in goals_periods),
+                ),
+            )
+            .one()
+        )
+
+        return {
+            goal.id: total or 0
+            for (goal, _, _, _), total in zip(goals_periods, totals)
+        }
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_goals_totals: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def create_user_goal(user_id: int, user_goal: user_goals_schema.UserGoalCreate, db: Session):
     """
     Creates a new user goal for a specific user, activity type, and interval.
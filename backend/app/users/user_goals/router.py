@@ -18,7 +18,7 @@ router = APIRouter()
 
 
 @router.get("", response_model=List[user_goals_schema.UserGoalRead] | None)
-async def get_user_goals(
+def get_user_goals(
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
     ],
@@ -38,7 +38,7 @@ async def get_user_goals(
 
 
 @router.get("/results", response_model=List[user_goals_schema.UserGoalProgress] | None)
-async def get_user_goals_results(
+def get_user_goals_results(
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
     ],
@@ -58,7 +58,7 @@ async def get_user_goals_results(
 
 
 @router.post("", response_model=user_goals_schema.UserGoalRead, status_code=201)
-async def create_user_goal(
+def create_user_goal(
     user_goal: user_goals_schema.UserGoalCreate,
     token_user_id: Annotated[
         int, Depends(session_security.get_user_id_from_access_token)
@@ -83,7 +83,7 @@ async def create_user_goal(
 
 
 @router.put("/{goal_id}", response_model=user_goals_schema.UserGoalRead)
-async def update_user_goal(
+def update_user_goal(
     goal_id: int,
     validate_id: Annotated[Callable, Depends(user_goals_dependencies.validate_goal_id)],
     user_goal: user_goals_schema.UserGoalEdit,
@@ -112,7 +112,7 @@ async def update_user_goal(
 
 
 @router.delete("/{goal_id}")
-async def delete_user_goal(
+def delete_user_goal(
     goal_id: int,
     validate_id: Annotated[Callable, Depends(user_goals_dependencies.validate_goal_id)],
     token_user_id: Annotated[
@@ -3,22 +3,31 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List
 
-from activities.activity.utils import ACTIVITY_ID_TO_NAME
-
 import users.user_goals.schema as user_goals_schema
 import users.user_goals.models as user_goals_models
 import users.user_goals.crud as user_goals_crud
 
-import activities.activity.crud as activity_crud
 import core.logger as core_logger
 
 
+# Activity types of each goal activity type
+GOAL_ACTIVITY_TYPES = {
+    user_goals_schema.ActivityType.RUN: [1, 2, 3, 34, 40],
+    user_goals_schema.ActivityType.BIKE: [4, 5, 6, 7, 27, 28, 29, 35, 36],
+    user_goals_schema.ActivityType.SWIM: [8, 9],
+    user_goals_schema.ActivityType.WALK: [11, 12],
+}
+DEFAULT_GOAL_ACTIVITY_TYPES = [19, 20]
+
+
 def calculate_user_goals(
     user_id: int, date: str | None, db: Session
 ) -> List[user_goals_schema.UserGoalProgress] | None:
     """
     Calculates the progress of all goals for a given user on a specified date.
 
+    The totals of all goals are aggregated with a single query.
+
     Args:
         user_id (int): The ID of the user whose goals are to be calculated.
         date (str | None): The date for which to calculate goal progress, in "YYYY-MM-DD" format. If None, uses the current date.
@@ -39,8 +48,24 @@ def calculate_user_goals(
         if not goals:
             return None
 
+        # Get the period and activity types of each goal
+        goals_periods = [
+            (
+                goal,
+                GOAL_ACTIVITY_TYPES.get(
+                    goal.activity_type, DEFAULT_GOAL_ACTIVITY_TYPES
+                ),
+                *get_start_end_date_by_interval(goal.interval, date),
+            )
+            for goal in goals
+        ]
+
+        # Aggregate the totals of all goals in a single query
+        totals = user_goals_crud.get_user_goals_totals(user_id, goals_periods, db)
+
         return [
-            calculate_goal_progress_by_activity_type(goal, date, db) for goal in goals
+            calculate_goal_progress(goal, start_date, end_date, totals[goal.id])
+            for goal, _, start_date, end_date in goals_periods
         ]
     except HTTPException as http_err:
         raise http_err
@@ -56,114 +81,75 @@ def calculate_user_goals(
         ) from err
 
 
-def calculate_goal_progress_by_activity_type(
+def calculate_goal_progress(
     goal: user_goals_models.UserGoal,
-    date: str,
-    db: Session,
-) -> user_goals_schema.UserGoalProgress | None:
+    start_date: datetime,
+    end_date: datetime,
+    total: int | float,
+) -> user_goals_schema.UserGoalProgress:
     """
-    Calculates the progress of a user's goal for a specific activity type within a given time interval.
-    This function determines the progress of a goal (calories, distance, elevation, duration, or number of activities)
-    based on the user's activities of a specified type (run, bike, swim, walk) within the interval defined by the goal.
-    It fetches relevant activities from the database, aggregates the required metrics, and computes the percentage
-    completion of the goal.
+    Builds the progress of a user's goal from its total within the goal interval.
+
     Args:
         goal (user_goals_models.UserGoal): The user goal object containing goal details and parameters.
-        date (str): The reference date (in 'YYYY-MM-DD' format) to determine the interval for progress calculation.
-        db (Session): The SQLAlchemy database session used for querying activities.
+        start_date (datetime): The start of the goal interval.
+        end_date (datetime): The end of the goal interval.
+        total (int | float): The total of the goal type (calories, distance, elevation,
+            duration or number of activities) over the goal activities within the interval,
+            as returned by `user_goals_crud.get_user_goals_totals`.
+
     Returns:
-        user_goals_schema.UserGoalProgress | None: An object containing progress details for the goal, or None if no activities are found.
-    Raises:
-        HTTPException: If an error occurs during processing or database access.
+        user_goals_schema.UserGoalProgress: An object containing progress details for the goal.
     """
-    try:
-        start_date, end_date = get_start_end_date_by_interval(goal.interval, date)
-
-        # Define activity type mappings
-        TYPE_MAP = {
-            user_goals_schema.ActivityType.RUN: [1, 2, 3, 34, 40],
-            user_goals_schema.ActivityType.BIKE: [4, 5, 6, 7, 27, 28, 29, 35, 36],
-            user_goals_schema.ActivityType.SWIM: [8, 9],
-            user_goals_schema.ActivityType.WALK: [11, 12],
-        }
-        DEFAULT_TYPES = (19, 20)
-
-        # Get activity types based on goal.activity_type, default to [10, 19, 20]
-        activity_types = TYPE_MAP.get(goal.activity_type, DEFAULT_TYPES)
-
-        # Fetch all activities in a single query
-        activities = activity_crud.get_user_activities_per_timeframe_and_activity_types(
-            goal.user_id, activity_types, start_date, end_date, db, True
-        )
-
-        # Calculate totals based on goal type
-        percentage_completed = 0
-        total_calories = 0
-        total_activities_number = 0
-        total_distance = 0
-        total_elevation = 0
-        total_duration = 0
-
-        if activities:
-            if goal.goal_type == user_goals_schema.GoalType.CALORIES:
-                total_calories = sum(activity.calories or 0 for activity in activities)
-                percentage_completed = (total_calories / goal.goal_calories) * 100
-            elif goal.goal_type == user_goals_schema.GoalType.DISTANCE:
-                total_distance = sum(activity.distance or 0 for activity in activities)
-                percentage_completed = (total_distance / goal.goal_distance) * 100
-            elif goal.goal_type == user_goals_schema.GoalType.ELEVATION:
-                total_elevation = sum(
-                    activity.elevation_gain or 0 for activity in activities
-                )
-                percentage_completed = (total_elevation / goal.goal_elevation) * 100
-            elif goal.goal_type == user_goals_schema.GoalType.DURATION:
-                total_duration = sum(
-                    activity.total_elapsed_time or 0 for activity in activities
-                )
-                percentage_completed = (total_duration / goal.goal_duration) * 100
-            elif goal.goal_type == user_goals_schema.GoalType.ACTIVITIES:
-                total_activities_number = len(activities)
-                percentage_completed = (
-                    total_activities_number / goal.goal_activities_number
-                ) * 100
-
-        if percentage_completed > 100:
-            percentage_completed = 100
-
-        # Create and return the progress object
-        return user_goals_schema.UserGoalProgress(
-            goal_id=goal.id,
-            interval=goal.interval,
-            activity_type=goal.activity_type,
-            goal_type=goal.goal_type,
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-            percentage_completed=round(percentage_completed),
-            total_calories=total_calories,
-            total_activities_number=total_activities_number,
-            total_distance=round(total_distance),
-            total_elevation=round(total_elevation),
-            total_duration=total_duration,
-            goal_calories=goal.goal_calories,
-            goal_activities_number=goal.goal_activities_number,
-            goal_distance=goal.goal_distance,
-            goal_elevation=goal.goal_elevation,
-            goal_duration=goal.goal_duration,
-        )
-    except HTTPException as http_err:
-        raise http_err
-    except Exception as err:
-        # Log the exception
-        core_logger.print_to_log(
-            f"Error in calculate_goal_progress_by_activity_type: {err}",
-            "error",
-            exc=err,
-        )
-        # Raise an HTTPException with a 500 Internal Server Error status code
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal Server Error",
-        ) from err
+    # Calculate totals based on goal type
+    percentage_completed = 0
+    total_calories = 0
+    total_activities_number = 0
+    total_distance = 0
+    total_elevation = 0
+    total_duration = 0
+
+    if goal.goal_type == user_goals_schema.GoalType.CALORIES:
+        total_calories = total
+        percentage_completed = (total_calories / goal.goal_calories) * 100
+    elif goal.goal_type == user_goals_schema.GoalType.DISTANCE:
+        total_distance = total
+        percentage_completed = (total_distance / goal.goal_distance) * 100
+    elif goal.goal_type == user_goals_schema.GoalType.ELEVATION:
+        total_elevation = total
+        percentage_completed = (total_elevation / goal.goal_elevation) * 100
+    elif goal.goal_type == user_goals_schema.GoalType.DURATION:
+        total_duration = total
+        percentage_completed = (total_duration / goal.goal_duration) * 100
+    elif goal.goal_type == user_goals_schema.GoalType.ACTIVITIES:
+        total_activities_number = total
+        percentage_completed = (
+            total_activities_number / goal.goal_activities_number
+        ) * 100
+
+    if percentage_completed > 100:
+        percentage_completed = 100
+
+    # Create and return the progress object
+    return user_goals_schema.UserGoalProgress(
+        goal_id=goal.id,
+        interval=goal.interval,
+        activity_type=goal.activity_type,
+        goal_type=goal.goal_type,
+        start_date=start_date.strftime("%Y-%m-%d"),
+        end_date=end_date.strftime("%Y-%m-%d"),
+        percentage_completed=round(percentage_completed),
+        total_calories=total_calories,
+        total_activities_number=total_activities_number,
+        total_distance=round(total_distance),
+        total_elevation=round(total_elevation),
+        total_duration=round(total_duration),
+        goal_calories=goal.goal_calories,
+        goal_activities_number=goal.goal_activities_number,
+        goal_distance=goal.goal_distance,
+        goal_elevation=goal.goal_elevation,
+        goal_duration=goal.goal_duration,
+    )
 
 
 def get_start_end_date_by_interval(
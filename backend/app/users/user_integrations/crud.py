@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -42,6 +43,84 @@ def get_user_integrations_by_user_id(user_id: int, db: Session):
         ) from err
 
 
+def get_user_ids_with_strava_linked(db: Session) -> list[int]:
+    """
+    Gets the IDs of the users with a linked Strava account.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[int]: The user IDs.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while querying the users.
+    """
+    try:
+        user_ids = (
+            db.query(user_integrations_models.UsersIntegrations.user_id)
+            .filter(
+                user_integrations_models.UsersIntegrations.strava_token_expires_at.isnot(
+                    None
+                )
+            )
+            .all()
+        )
+
+        return [user_id for (user_id,) in user_ids]
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_ids_with_strava_linked: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def get_user_ids_with_garminconnect_linked(db: Session) -> list[int]:
+    """
+    Gets the IDs of the users with a linked Garmin Connect account.
+
+    Args:
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        list[int]: The user IDs.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while querying the users.
+    """
+    try:
+        rows = (
+            db.query(
+                user_integrations_models.UsersIntegrations.user_id,
+                user_integrations_models.UsersIntegrations.garminconnect_oauth1,
+            )
+            .filter(
+                user_integrations_models.UsersIntegrations.garminconnect_oauth1.isnot(
+                    None
+                )
+            )
+            .all()
+        )
+
+        # Unlinked tokens may be stored as a JSON null, which is not SQL NULL
+        return [user_id for user_id, oauth1 in rows if oauth1 is not None]
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_ids_with_garminconnect_linked: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_user_integrations_by_strava_state(strava_state: str, db: Session):
     try:
         # Get user integrations based on the strava state
@@ -162,6 +241,7 @@ def unlink_strava_account(user_id: int, db: Session):
         user_integrations.strava_sync_gear = False
         user_integrations.strava_client_id = None
         user_integrations.strava_client_secret = None
+        user_integrations.strava_backfill_start = None
 
         # Commit the changes to the database
         db.commit()
@@ -374,6 +454,7 @@ def unlink_garminconnect_account(user_id: int, db: Session):
         user_integrations.garminconnect_oauth1 = None
         user_integrations.garminconnect_oauth2 = None
         user_integrations.garminconnect_sync_gear = False
+        user_integrations.garminconnect_backfill_start = None
 
         # Commit the changes to the database
         db.commit()
@@ -395,6 +476,138 @@ def unlink_garminconnect_account(user_id: int, db: Session):
         ) from err
 
 
+def get_backfill_start_column(provider: str):
+    """
+    Returns the users_integrations column of a provider's paused backfill.
+
+    Args:
+        provider (str): The provider, "strava" or "garminconnect".
+
+    Returns:
+        The strava_backfill_start or garminconnect_backfill_start column.
+    """
+    return getattr(
+        user_integrations_models.UsersIntegrations, f"{provider}_backfill_start"
+    )
+
+
+def get_user_backfill_start(
+    user_id: int, provider: str, db: Session
+) -> datetime | None:
+    """
+    Get the start date of the user's backfill paused by the rate limits.
+
+    Args:
+        user_id (int): The ID of the user.
+        provider (str): The provider, "strava" or "garminconnect".
+        db (Session): The SQLAlchemy database session.
+
+    Returns:
+        datetime | None: The start date (naive UTC), or None if no backfill is paused.
+
+    Raises:
+        HTTPException: If an unexpected error occurs during the database query.
+    """
+    try:
+        return (
+            db.query(get_backfill_start_column(provider))
+            .filter(user_integrations_models.UsersIntegrations.user_id == user_id)
+            .scalar()
+        )
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_backfill_start: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def pause_user_backfill(
+    user_id: int, provider: str, start_date: datetime, db: Session
+):
+    """
+    Record the start date of a user's sync paused by the rate limits.
+
+    A backfill already paused since an earlier date keeps its start date.
+
+    Args:
+        user_id (int): The ID of the user.
+        provider (str): The provider, "strava" or "garminconnect".
+        start_date (datetime): The start date (naive UTC) of the paused sync.
+        db (Session): The SQLAlchemy database session.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the integrations.
+    """
+    try:
+        column = get_backfill_start_column(provider)
+        db.query(user_integrations_models.UsersIntegrations).filter(
+            user_integrations_models.UsersIntegrations.user_id == user_id,
+            or_(column.is_(None), column > start_date),
+        ).update({column: start_date}, synchronize_session=False)
+
+        # Commit the changes to the database
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in pause_user_backfill: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def complete_user_backfill(
+    user_id: int, provider: str, start_date: datetime, db: Session
+):
+    """
+    Clear the paused backfill of a user covered by a completed sync.
+
+    Args:
+        user_id (int): The ID of the user.
+        provider (str): The provider, "strava" or "garminconnect".
+        start_date (datetime): The start date (naive UTC) of the completed sync.
+        db (Session): The SQLAlchemy database session.
+
+    Raises:
+        HTTPException: If an unexpected error occurs while updating the integrations.
+    """
+    try:
+        column = get_backfill_start_column(provider)
+        db.query(user_integrations_models.UsersIntegrations).filter(
+            user_integrations_models.UsersIntegrations.user_id == user_id,
+            column >= start_date,
+        ).update({column: None}, synchronize_session=False)
+
+        # Commit the changes to the database
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in complete_user_backfill: {err}", "error", exc=err
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def edit_user_integrations(
     user_integrations: user_integrations_schema.UsersIntegrations,
     user_id: int,
@@ -55,6 +55,12 @@ class UsersIntegrations(Base):
         default=False,
         comment="Whether Strava gear is to be synced",
     )
+    strava_backfill_start = Column(
+        DateTime,
+        default=None,
+        nullable=True,
+        comment="Start date (UTC) of the Strava sync paused by the rate limits",
+    )
     garminconnect_oauth1 = Column(
         JSON, default=None, nullable=True, doc="Garmin OAuth1 token"
     )
@@ -67,6 +73,12 @@ class UsersIntegrations(Base):
         default=False,
         comment="Whether Garmin Connect gear is to be synced",
     )
+    garminconnect_backfill_start = Column(
+        DateTime,
+        default=None,
+        nullable=True,
+        comment="Start date (UTC) of the Garmin Connect sync paused by the rate limits",
+    )
 
     # Define a relationship to the User model
     user = relationship("User", back_populates="users_integrations")
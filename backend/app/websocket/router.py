@@ -25,4 +25,4 @@ async def websocket_endpoint(
             data = await websocket.receive_json()
     except WebSocketDisconnect:
         # Disconnect using the manager
-        websocket_manager.disconnect(user_id)
+        websocket_manager.disconnect(user_id, websocket)
@@ -1,30 +1,89 @@
+import asyncio
+
 from fastapi import WebSocket
 from typing import Dict
 
+import core.logger as core_logger
+import core.pubsub as core_pubsub
+
+# Pub/sub topic of the messages sent to the websockets
+WEBSOCKET_TOPIC = "websocket"
+
 
 class WebSocketManager:
+    """
+    Sends messages to the users' websockets, whatever API process they are
+    connected to.
+
+    Messages are published on the pub/sub backend and every process sends
+    them to the websockets connected to it. A user may have several
+    connections (e.g. browser tabs), each one receives the messages.
+    """
+
     def __init__(self):
-        self.active_connections: Dict[int, WebSocket] = {}
+        self.active_connections: Dict[int, set[WebSocket]] = {}
 
     async def connect(self, user_id: int, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        self.active_connections.setdefault(user_id, set()).add(websocket)
+
+    def disconnect(self, user_id: int, websocket: WebSocket):
+        connections = self.active_connections.get(user_id)
+        if connections is None:
+            return
 
-    def disconnect(self, user_id: int):
-        if user_id in self.active_connections:
+        connections.discard(websocket)
+        if not connections:
             del self.active_connections[user_id]
 
-    async def send_message(self, user_id: int, message: str):
-        if user_id in self.active_connections:
-            websocket = self.active_connections[user_id]
-            await websocket.send_json(message)
+    async def send_message(self, user_id: int, message: dict):
+        await core_pubsub.publish(
+            WEBSOCKET_TOPIC, {"user_id": user_id, "message": message}
+        )
 
-    async def broadcast(self, message: str):
-        for websocket in self.active_connections.values():
-            await websocket.send_json(message)
+    async def broadcast(self, message: dict):
+        await core_pubsub.publish(WEBSOCKET_TOPIC, {"user_id": None, "message": message})
+
+    async def deliver(self, event: dict):
+        """
+        Sends a published message to the matching websockets of this process.
+
+        The sends run concurrently, so a slow client doesn't delay the others.
+        Connections that fail are dropped.
 
-    def get_connection(self, user_id: int) -> WebSocket | None:
-        return self.active_connections.get(user_id)
+        Args:
+            event (dict): The published event, with the target user ID (None
+                for everyone) and the message.
+        """
+        user_id = event["user_id"]
+        if user_id is None:
+            targets = [
+                (target_user_id, websocket)
+                for target_user_id, connections in self.active_connections.items()
+                for websocket in connections
+            ]
+        else:
+            targets = [
+                (user_id, websocket)
+                for websocket in self.active_connections.get(user_id, ())
+            ]
+
+        await asyncio.gather(
+            *(
+                self.send_json(target_user_id, websocket, event["message"])
+                for target_user_id, websocket in targets
+            )
+        )
+
+    async def send_json(self, user_id: int, websocket: WebSocket, message: dict):
+        try:
+            await websocket.send_json(message)
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Dropping websocket of user {user_id} after send error: {err}",
+                "warning",
+            )
+            self.disconnect(user_id, websocket)
 
 
 def get_websocket_manager():
@@ -32,3 +91,4 @@ def get_websocket_manager():
 
 
 websocket_manager = WebSocketManager()
+core_pubsub.subscribe(WEBSOCKET_TOPIC, websocket_manager.deliver)
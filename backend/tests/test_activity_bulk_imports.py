@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import activities.activity_bulk_imports.constants as activity_bulk_imports_constants
+import activities.activity_bulk_imports.crud as activity_bulk_imports_crud
+import activities.activity_bulk_imports.models as activity_bulk_imports_models
+import activities.activity_bulk_imports.utils as activity_bulk_imports_utils
+
+
+def test_files_of_dead_owners_are_queued_again_at_once(sqlite_db, monkeypatch):
+    # Only the "alive" owner lock is held by another connection
+    monkeypatch.setattr(
+        activity_bulk_imports_utils.core_locks,
+        "acquire_lock",
+        lambda name, wait=False: None if name == "alive" else object(),
+    )
+    monkeypatch.setattr(
+        activity_bulk_imports_utils.core_locks,
+        "release_lock",
+        lambda connection, name: None,
+    )
+    monkeypatch.setattr(activity_bulk_imports_utils, "SessionLocal", lambda: sqlite_db)
+
+    now = datetime.now()
+    lease_expired = now - timedelta(
+        seconds=activity_bulk_imports_constants.PARSING_LEASE_SECONDS + 60
+    )
+    bulk_import = activity_bulk_imports_models.ActivityBulkImport(
+        user_id=1, status=0, total_files=6, created_at=now
+    )
+    sqlite_db.add(bulk_import)
+    sqlite_db.flush()
+    files = {
+        "dead": ("dead", now),
+        "alive": ("alive", now),
+        "own": (activity_bulk_imports_utils.OWNER_LOCK_NAME, now),
+        "ownerless recent": (None, now),
+        "ownerless expired": (None, lease_expired),
+    }
+    for file_path, (claimed_by, updated_at) in files.items():
+        sqlite_db.add(
+            activity_bulk_imports_models.ActivityBulkImportFile(
+                bulk_import_id=bulk_import.id,
+                file_path=file_path,
+                status=activity_bulk_imports_constants.FILE_STATUS_PARSING,
+                claimed_by=claimed_by,
+                updated_at=updated_at,
+            )
+        )
+    sqlite_db.commit()
+
+    assert activity_bulk_imports_utils.requeue_interrupted_bulk_imports()
+
+    statuses = {
+        bulk_import_file.file_path: (
+            bulk_import_file.status,
+            bulk_import_file.claimed_by,
+        )
+        for bulk_import_file in sqlite_db.query(
+            activity_bulk_imports_models.ActivityBulkImportFile
+        )
+    }
+    queued = activity_bulk_imports_constants.FILE_STATUS_QUEUED
+    parsing = activity_bulk_imports_constants.FILE_STATUS_PARSING
+    assert statuses == {
+        "dead": (queued, None),
+        "alive": (parsing, "alive"),
+        "own": (parsing, activity_bulk_imports_utils.OWNER_LOCK_NAME),
+        "ownerless recent": (parsing, None),
+        "ownerless expired": (queued, None),
+    }
+
+
+def test_claimed_files_record_their_owner(sqlite_db):
+    bulk_import = activity_bulk_imports_models.ActivityBulkImport(
+        user_id=1, status=0, total_files=1, created_at=datetime.now()
+    )
+    sqlite_db.add(bulk_import)
+    sqlite_db.flush()
+    sqlite_db.add(
+        activity_bulk_imports_models.ActivityBulkImportFile(
+            bulk_import_id=bulk_import.id,
+            file_path="file.gpx",
+            status=activity_bulk_imports_constants.FILE_STATUS_QUEUED,
+            updated_at=datetime.now(),
+        )
+    )
+    sqlite_db.commit()
+
+    bulk_import_file = activity_bulk_imports_crud.claim_next_queued_file(
+        sqlite_db, "owner"
+    )
+
+    parsing = activity_bulk_imports_constants.FILE_STATUS_PARSING
+    assert bulk_import_file.status == parsing
+    assert bulk_import_file.claimed_by == "owner"
+    assert activity_bulk_imports_crud.get_parsing_files_owners(sqlite_db) == ["owner"]
+    assert activity_bulk_imports_crud.claim_next_queued_file(sqlite_db, "owner") is None
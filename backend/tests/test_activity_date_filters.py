@@ -0,0 +1,207 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.dialects import mysql, postgresql
+
+import activities.activity.crud as activities_crud
+import activities.activity.models as activities_models
+import users.user.models as users_models
+
+from conftest import create_test_user
+
+
+def compile_filter(expression, dialect) -> str:
+    return str(
+        expression.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    )
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), mysql.dialect()])
+def test_start_time_in_days_filter_compares_the_start_time_column(dialect):
+    sql = compile_filter(
+        activities_crud.start_time_in_days_filter(
+            date(2024, 3, 1), datetime(2024, 3, 31, 18, 30)
+        ),
+        dialect,
+    )
+
+    # A function on start_time keeps the start_time indexes from being used
+    assert "date(" not in sql.lower()
+    assert "activities.start_time >= '2024-03-01 00:00:00'" in sql
+    assert "activities.start_time < '2024-04-01 00:00:00'" in sql
+
+
+def test_start_time_in_days_filter_with_open_bounds():
+    dialect = postgresql.dialect()
+
+    assert compile_filter(
+        activities_crud.start_time_in_days_filter(date(2024, 3, 1), None), dialect
+    ) == "activities.start_time >= '2024-03-01 00:00:00'"
+    assert compile_filter(
+        activities_crud.start_time_in_days_filter(None, date(2024, 12, 31)), dialect
+    ) == "activities.start_time < '2025-01-01 00:00:00'"
+
+
+# The activity queries filtering on days, called with March 2024
+MARCH_START = datetime(2024, 3, 1)
+MARCH_END = datetime(2024, 3, 31, 18, 30)
+DAY_QUERIES = {
+    "per_timeframe": lambda db: activities_crud.get_user_activities_per_timeframe(
+        1, MARCH_START, MARCH_END, db
+    ),
+    "per_timeframe_and_activity_type": lambda db: (
+        activities_crud.get_user_activities_per_timeframe_and_activity_type(
+            1, 1, MARCH_START, MARCH_END, db
+        )
+    ),
+    "per_timeframe_and_activity_types": lambda db: (
+        activities_crud.get_user_activities_per_timeframe_and_activity_types(
+            1, [1, 4], MARCH_START, MARCH_END, db
+        )
+    ),
+    "following_per_timeframe": lambda db: (
+        activities_crud.get_user_following_activities_per_timeframe(
+            1, MARCH_START, MARCH_END, db
+        )
+    ),
+    "user_activities": lambda db: activities_crud.get_user_activities(
+        1, db, start_date=MARCH_START.date(), end_date=MARCH_END.date()
+    ),
+    "with_pagination": lambda db: activities_crud.get_user_activities_with_pagination(
+        1,
+        db,
+        start_date=MARCH_START.date(),
+        end_date=MARCH_END.date(),
+        user_is_owner=True,
+    ),
+}
+
+
+def capture_activity_queries(db, run_query) -> list[tuple[str, object]]:
+    """Runs a query function and returns the statements it sent on activities."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if "FROM activities" in statement:
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run_query(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert statements, "the query function sent no query on activities"
+    return statements
+
+
+@pytest.mark.parametrize("query_name", DAY_QUERIES)
+def test_activity_queries_filter_on_the_start_time_range(sqlite_db, query_name):
+    for statement, parameters in capture_activity_queries(
+        sqlite_db, DAY_QUERIES[query_name]
+    ):
+        assert "date(" not in statement.lower()
+        assert "activities.start_time >= ?" in statement
+        assert "activities.start_time < ?" in statement
+        assert "2024-03-01 00:00:00" in str(parameters)
+        assert "2024-04-01 00:00:00" in str(parameters)
+
+
+@pytest.fixture
+def explain_db(session_factory):
+    """Session of the test database with 500 activities of a user, analyzed."""
+    dialect_name = session_factory.kw["bind"].dialect.name
+    if dialect_name not in ("postgresql", "mysql", "mariadb"):
+        pytest.skip("EXPLAIN is only checked on PostgreSQL and MariaDB/MySQL")
+
+    user_id = create_test_user(session_factory, 1)
+    with session_factory() as db:
+        db.execute(
+            activities_models.Activity.__table__.insert(),
+            [
+                {
+                    "user_id": user_id,
+                    "name": f"Run {i}",
+                    "distance": 1000,
+                    "activity_type": [1, 4][i % 2],
+                    "start_time": datetime(2020, 1, 1) + timedelta(days=i * 3),
+                    "end_time": datetime(2020, 1, 1) + timedelta(days=i * 3),
+                    "total_elapsed_time": 600,
+                    "total_timer_time": 600,
+                    "visibility": 0,
+                    "created_at": datetime(2020, 1, 1),
+                    "timezone": "UTC",
+                    "is_hidden": False,
+                    **{
+                        column.name: False
+                        for column in activities_models.Activity.__table__.columns
+                        if column.name.startswith("hide_")
+                    },
+                }
+                for i in range(500)
+            ],
+        )
+        db.execute(
+            text(
+                "ANALYZE activities"
+                if is_postgresql(db)
+                else "ANALYZE TABLE activities"
+            )
+        )
+        db.commit()
+
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.execute(
+            activities_models.Activity.__table__.delete().where(
+                activities_models.Activity.user_id == user_id
+            )
+        )
+        db.execute(
+            users_models.User.__table__.delete().where(
+                users_models.User.id == user_id
+            )
+        )
+        db.commit()
+        db.close()
+
+
+def is_postgresql(db) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+@pytest.mark.parametrize("query_name", DAY_QUERIES)
+def test_activity_queries_use_a_start_time_index(explain_db, query_name):
+    for statement, parameters in capture_activity_queries(
+        explain_db, DAY_QUERIES[query_name]
+    ):
+        connection = explain_db.connection()
+        if is_postgresql(explain_db):
+            # Rule out a sequential scan, the table is small
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            plan = "\n".join(
+                row[0]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN {statement}", parameters
+                )
+            )
+            assert any(
+                "Index Cond" in line and "start_time" in line
+                for line in plan.splitlines()
+            ), plan
+        else:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN {statement}", parameters
+            ).mappings().all()
+            activities_rows = [row for row in rows if row["table"] == "activities"]
+            # A range scan of an index starting with user_id and ending with
+            # start_time, not a full scan of the user's activities
+            assert any(
+                row["type"] == "range" and "start_time" in (row["key"] or "")
+                for row in activities_rows
+            ), rows
@@ -0,0 +1,107 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import activities.activity.crud as activities_crud
+import activities.activity.models as activities_models
+import activities.activity.utils as activities_utils
+
+
+@pytest.fixture
+def activities_db(sqlite_db, monkeypatch):
+    # Keep the models, the serialized activities are not needed here
+    monkeypatch.setattr(activities_utils, "serialize_activity", lambda a: a)
+
+    for i in range(20):
+        start_time = datetime(2024, 1, 1) + timedelta(hours=i)
+        sqlite_db.add(
+            activities_models.Activity(
+                user_id=1,
+                name=f"Run {i}",
+                distance=1000 * i,
+                activity_type=1,
+                start_time=start_time,
+                end_time=start_time,
+                total_elapsed_time=600,
+                total_timer_time=600,
+                country=["PT", "ES"][i % 2],
+                city=["Lisbon", "Porto", "Madrid"][i % 3],
+                visibility=0,
+                created_at=start_time,
+                timezone="UTC",
+                hide_start_time=True,
+                hide_location=True,
+                hide_map=False,
+                hide_hr=False,
+                hide_power=False,
+                hide_cadence=False,
+                hide_elevation=False,
+                hide_speed=False,
+                hide_pace=False,
+                hide_laps=False,
+                hide_workout_sets_steps=False,
+                hide_gear=False,
+                is_hidden=False,
+            )
+        )
+    sqlite_db.commit()
+    return sqlite_db
+
+
+def decode(cursor: str) -> dict:
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def encode(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def get_page(db, sort_by, cursor, user_is_owner=False):
+    db.expire_all()
+    return activities_crud.get_user_activities_with_pagination(
+        1,
+        db,
+        num_records=5,
+        sort_by=sort_by,
+        user_is_owner=user_is_owner,
+        cursor=cursor,
+    )
+
+
+@pytest.mark.parametrize("sort_by", ["start_time", "location", "distance"])
+def test_non_owner_cursors_have_no_sort_values(activities_db, sort_by):
+    ids, cursor = [], None
+    while True:
+        activities, cursor = get_page(activities_db, sort_by, cursor)
+        ids += [activity.id for activity in activities or []]
+        if cursor is None:
+            break
+        assert "values" not in decode(cursor)
+
+    owner_activities, _ = activities_crud.get_user_activities_with_pagination(
+        1, activities_db, num_records=100, sort_by=sort_by, user_is_owner=True
+    )
+    assert ids == [activity.id for activity in owner_activities]
+
+
+@pytest.mark.parametrize(
+    "sort_by, forged_values",
+    [
+        ("start_time", [{"datetime": "2024-01-01T03:30:00"}]),
+        ("location", ["PT", "Lisbon", ""]),
+    ],
+)
+def test_non_owner_cursor_values_are_ignored(activities_db, sort_by, forged_values):
+    _, cursor = get_page(activities_db, sort_by, None)
+    expected, _ = get_page(activities_db, sort_by, cursor)
+
+    # Probing a hidden value with forged values gives the same page
+    payload = decode(cursor)
+    payload["values"] = forged_values
+    activities, _ = get_page(activities_db, sort_by, encode(payload))
+
+    assert [activity.id for activity in activities] == [
+        activity.id for activity in expected
+    ]
@@ -0,0 +1,86 @@
+import threading
+
+import activities.activity.crud as activities_crud
+import activities.activity.schema as activities_schema
+import activities.activity_summaries.crud as activity_summaries_crud
+import activities.activity_summaries.models as activity_summaries_models
+
+from conftest import create_test_user
+
+
+def make_activity(user_id: int, start_time: str, distance: int):
+    hidden_fields = {
+        field: False
+        for field in activities_schema.Activity.model_fields
+        if field.startswith("hide_")
+    }
+    return activities_schema.Activity(
+        user_id=user_id,
+        name="Run",
+        activity_type=1,
+        distance=distance,
+        start_time=start_time,
+        end_time=start_time,
+        total_elapsed_time=600,
+        total_timer_time=600,
+        visibility=0,
+        timezone="UTC",
+        **hidden_fields,
+    )
+
+
+def test_concurrent_activity_inserts_of_a_user(session_factory, monkeypatch):
+    user_id = create_test_user(session_factory, 1001)
+
+    # Hold both transactions right before the summaries are rebuilt, after
+    # their activities are inserted. If the user weren't locked before the
+    # inserts, both would hold the foreign key lock of the user row here and
+    # deadlock. Locked first, the second waits for the first to commit and
+    # the barrier times out.
+    barrier = threading.Barrier(2)
+    refresh_daily_summaries = activity_summaries_crud.refresh_daily_summaries
+
+    def refresh_after_barrier(user_days, db):
+        try:
+            barrier.wait(timeout=2)
+        except threading.BrokenBarrierError:
+            pass
+        refresh_daily_summaries(user_days, db)
+
+    monkeypatch.setattr(
+        activity_summaries_crud, "refresh_daily_summaries", refresh_after_barrier
+    )
+
+    errors = []
+
+    def insert(start_time, distance):
+        with session_factory() as db:
+            try:
+                activities_crud.insert_activities(
+                    [make_activity(user_id, start_time, distance)], db
+                )
+            except Exception as err:
+                errors.append(err)
+
+    threads = [
+        threading.Thread(target=insert, args=("2024-05-01T08:00:00", 1000)),
+        threading.Thread(target=insert, args=("2024-05-01T18:00:00", 2500)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with session_factory() as db:
+        summaries = (
+            db.query(activity_summaries_models.ActivityDailySummary)
+            .filter(
+                activity_summaries_models.ActivityDailySummary.user_id == user_id
+            )
+            .all()
+        )
+    assert [
+        (summary.activity_count, float(summary.total_distance))
+        for summary in summaries
+    ] == [(2, 3500.0)]
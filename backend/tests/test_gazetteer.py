@@ -0,0 +1,83 @@
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+import geocoding.gazetteer_utils as geocoding_gazetteer_utils
+
+PLACES = [
+    ("Lisbon", 38.72, -9.14, "PT", 500000),
+    ("Porto", 41.15, -8.61, "PT", 230000),
+    ("Madrid", 40.42, -3.70, "ES", 3200000),
+]
+
+
+def write_dataset(path):
+    with open(path, "w", encoding="utf-8") as dataset_file:
+        for geonameid, (name, latitude, longitude, country, population) in enumerate(
+            PLACES
+        ):
+            columns = [""] * 19
+            columns[0] = str(geonameid)
+            columns[1] = name
+            columns[4] = str(latitude)
+            columns[5] = str(longitude)
+            columns[8] = country
+            columns[14] = str(population)
+            dataset_file.write("\t".join(columns) + "\n")
+
+
+def test_concurrent_builds_publish_complete_files(tmp_path):
+    dataset_path = tmp_path / "cities.txt"
+    write_dataset(dataset_path)
+    index_dir = str(tmp_path / "cities.txt.index")
+
+    errors = []
+
+    def build():
+        try:
+            geocoding_gazetteer_utils.build_gazetteer_index(
+                str(dataset_path), index_dir
+            )
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=build) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(os.listdir(index_dir)) == sorted(
+        f"{name}.npy" for name in geocoding_gazetteer_utils.INDEX_FILES
+    )
+    assert len(np.load(os.path.join(index_dir, "points.npy"))) == len(PLACES)
+
+
+def test_stale_index_is_built_once_under_the_lock(tmp_path, monkeypatch):
+    dataset_path = tmp_path / "cities.txt"
+    write_dataset(dataset_path)
+    monkeypatch.setattr(
+        geocoding_gazetteer_utils.core_config,
+        "REVERSE_GEO_LOCAL_DATASET",
+        str(dataset_path),
+    )
+
+    held = []
+
+    @contextlib.contextmanager
+    def hold_lock(name):
+        held.append(name)
+        yield
+
+    monkeypatch.setattr(geocoding_gazetteer_utils.core_locks, "hold_lock", hold_lock)
+
+    geocoding_gazetteer_utils.build_gazetteer_index_if_stale()
+    geocoding_gazetteer_utils.build_gazetteer_index_if_stale()
+
+    assert held == [geocoding_gazetteer_utils.INDEX_LOCK_NAME]
+    assert not geocoding_gazetteer_utils.is_index_stale(
+        str(dataset_path), f"{dataset_path}.index"
+    )
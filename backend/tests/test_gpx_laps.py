@@ -0,0 +1,259 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+import activities.activity.geodesic_utils as geodesic_utils
+import activities.activity.utils as activities_utils
+import gpx.utils as gpx_utils
+
+
+def generate_activity_laps_before(
+    lat_lon_waypoints: list[dict],
+    ele_waypoints: list[dict],
+    power_waypoints: list[dict],
+    hr_waypoints: list[dict],
+    cad_waypoints: list[dict],
+    vel_waypoints: list[dict],
+    distance_per_lap_km: float = 1.0,
+) -> list[dict]:
+    """The quadratic generate_activity_laps replaced in user-004, as reference."""
+    laps = []
+    current_lap_distance = 0.0
+    lap_start = None
+
+    def filter_waypoints(waypoints, start_time, end_time):
+        return [
+            waypoint
+            for waypoint in waypoints
+            if datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
+            <= datetime.strptime(waypoint["time"], "%Y-%m-%dT%H:%M:%S")
+            <= datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
+        ]
+
+    def create_lap(start_point, end_point, lap_distance):
+        start_time = start_point["time"]
+        end_time = end_point["time"]
+        lap_ele_waypoints = filter_waypoints(ele_waypoints, start_time, end_time)
+        lap_power_waypoints = filter_waypoints(power_waypoints, start_time, end_time)
+        lap_hr_waypoints = filter_waypoints(hr_waypoints, start_time, end_time)
+        lap_cad_waypoints = filter_waypoints(cad_waypoints, start_time, end_time)
+        lap_vel_waypoints = filter_waypoints(vel_waypoints, start_time, end_time)
+        ele_gain, ele_loss = None, None
+        avg_hr, max_hr = None, None
+        avg_cadence, max_cadence = None, None
+        avg_speed, max_speed = None, None
+        avg_power, max_power, normalized_power = None, None, None
+
+        if lap_ele_waypoints:
+            ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
+                lap_ele_waypoints
+            )
+        if lap_hr_waypoints:
+            avg_hr, max_hr = activities_utils.calculate_avg_and_max(
+                lap_hr_waypoints, "hr"
+            )
+        if lap_cad_waypoints:
+            avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
+                lap_cad_waypoints, "cad"
+            )
+        if lap_vel_waypoints:
+            avg_speed, max_speed = activities_utils.calculate_avg_and_max(
+                lap_vel_waypoints, "vel"
+            )
+        if lap_power_waypoints:
+            avg_power, max_power = activities_utils.calculate_avg_and_max(
+                lap_power_waypoints, "power"
+            )
+            normalized_power = activities_utils.calculate_np(lap_power_waypoints)
+
+        elapsed_time = (
+            datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
+            - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
+        ).total_seconds()
+
+        return {
+            "start_time": start_time,
+            "start_position_lat": start_point["lat"],
+            "start_position_long": start_point["lon"],
+            "end_position_lat": end_point["lat"],
+            "end_position_long": end_point["lon"],
+            "total_elapsed_time": elapsed_time,
+            "total_timer_time": elapsed_time,
+            "total_distance": lap_distance * 1000,
+            "avg_heart_rate": round(avg_hr) if avg_hr else None,
+            "max_heart_rate": round(max_hr) if max_hr else None,
+            "avg_cadence": round(avg_cadence) if avg_cadence else None,
+            "max_cadence": round(max_cadence) if max_cadence else None,
+            "avg_power": round(avg_power) if avg_power else None,
+            "max_power": round(max_power) if max_power else None,
+            "total_ascent": round(ele_gain) if ele_gain else None,
+            "total_descent": round(ele_loss) if ele_loss else None,
+            "normalized_power": round(normalized_power) if normalized_power else None,
+            "enhanced_avg_pace": (
+                1 / avg_speed if avg_speed != 0 and avg_speed is not None else None
+            ),
+            "enhanced_avg_speed": avg_speed,
+            "enhanced_max_pace": (
+                1 / max_speed if max_speed != 0 and max_speed is not None else None
+            ),
+            "enhanced_max_speed": max_speed,
+        }
+
+    for i in range(1, len(lat_lon_waypoints)):
+        prev_point = lat_lon_waypoints[i - 1]
+        current_point = lat_lon_waypoints[i]
+
+        current_lap_distance += geodesic(
+            (prev_point["lat"], prev_point["lon"]),
+            (current_point["lat"], current_point["lon"]),
+        ).kilometers
+
+        if lap_start is None:
+            lap_start = prev_point
+
+        if current_lap_distance >= distance_per_lap_km:
+            laps.append(create_lap(lap_start, current_point, current_lap_distance))
+            lap_start = current_point
+            current_lap_distance = 0.0
+
+    if lap_start is not None and current_lap_distance > 0:
+        laps.append(
+            create_lap(lap_start, lat_lon_waypoints[-1], current_lap_distance)
+        )
+
+    return laps
+
+
+def make_track(points: int, seed: int) -> dict:
+    """Builds the samples of a 1 Hz GPX track, as gpx.utils.parse_gpx_file does."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 5, 1, 8, 0, 0)
+    times = np.array(
+        [start + timedelta(seconds=i) for i in range(points)], dtype="datetime64[s]"
+    )
+    latitudes = 38.7 + np.cumsum(rng.uniform(0, 0.00004, points))
+    longitudes = -9.1 + np.cumsum(rng.uniform(-0.00001, 0.00002, points))
+    elevations = (100 + np.cumsum(rng.normal(0, 0.4, points))).round(1)
+    elevations[rng.random(points) < 0.05] = np.nan
+    heart_rates = rng.integers(110, 180, points)
+    cadences = rng.integers(80, 95, points)
+    powers = rng.integers(0, 400, points)
+    powers[rng.random(points) < 0.1] = 0
+
+    timestamps = np.datetime_as_string(times, unit="s").tolist()
+    speeds = geodesic_utils.instant_speeds(
+        times.astype(np.int64), latitudes, longitudes
+    )
+    vel_waypoints, _ = geodesic_utils.speed_and_pace_waypoints(timestamps, speeds)
+
+    return {
+        "lat_lon_waypoints": [
+            {"time": timestamp, "lat": latitude, "lon": longitude}
+            for timestamp, latitude, longitude in zip(
+                timestamps, latitudes.tolist(), longitudes.tolist()
+            )
+        ],
+        "times": times,
+        "elevations": elevations,
+        "powers": powers,
+        "heart_rates": heart_rates,
+        "cadences": cadences,
+        "speeds": speeds,
+        "ele_waypoints": [
+            {"time": timestamp, "ele": elevation}
+            for timestamp, elevation in zip(timestamps, elevations.tolist())
+            if elevation == elevation
+        ],
+        "power_waypoints": [
+            {"time": timestamp, "power": power}
+            for timestamp, power in zip(timestamps, powers.tolist())
+            if power != 0
+        ],
+        "hr_waypoints": [
+            {"time": timestamp, "hr": heart_rate}
+            for timestamp, heart_rate in zip(timestamps, heart_rates.tolist())
+        ],
+        "cad_waypoints": [
+            {"time": timestamp, "cad": cadence}
+            for timestamp, cadence in zip(timestamps, cadences.tolist())
+        ],
+        "vel_waypoints": vel_waypoints,
+    }
+
+
+@pytest.mark.parametrize(
+    "points, seed, distance_per_lap_km",
+    [
+        (0, 0, 1.0),
+        (1, 0, 1.0),
+        (2, 1, 1.0),
+        (60, 2, 1.0),
+        (1500, 3, 1.0),
+        (1500, 4, 0.25),
+    ],
+)
+def test_generate_activity_laps_matches_previous_implementation(
+    points, seed, distance_per_lap_km
+):
+    track = make_track(points, seed)
+
+    laps = gpx_utils.generate_activity_laps(
+        track["lat_lon_waypoints"],
+        track["times"],
+        track["elevations"],
+        track["powers"],
+        track["heart_rates"],
+        track["cadences"],
+        track["speeds"],
+        distance_per_lap_km,
+    )
+    expected_laps = generate_activity_laps_before(
+        track["lat_lon_waypoints"],
+        track["ele_waypoints"],
+        track["power_waypoints"],
+        track["hr_waypoints"],
+        track["cad_waypoints"],
+        track["vel_waypoints"],
+        distance_per_lap_km,
+    )
+
+    # The vectorized geodesic distances agree with geopy to about 1e-9
+    assert len(laps) == len(expected_laps)
+    for lap, expected_lap in zip(laps, expected_laps):
+        assert lap == pytest.approx(expected_lap, rel=1e-6)
+
+
+def test_generate_activity_laps_with_unsorted_times():
+    track = make_track(600, 5)
+    # Swap two heart rate samples, so the times aren't in chronological order
+    times = track["times"].copy()
+    times[[100, 101]] = times[[101, 100]]
+    heart_rates = track["heart_rates"].copy()
+    heart_rates[[100, 101]] = heart_rates[[101, 100]]
+
+    laps = gpx_utils.generate_activity_laps(
+        track["lat_lon_waypoints"],
+        times,
+        track["elevations"],
+        track["powers"],
+        heart_rates,
+        track["cadences"],
+        track["speeds"],
+        0.1,
+    )
+    expected_laps = gpx_utils.generate_activity_laps(
+        track["lat_lon_waypoints"],
+        track["times"],
+        track["elevations"],
+        track["powers"],
+        track["heart_rates"],
+        track["cadences"],
+        track["speeds"],
+        0.1,
+    )
+
+    assert [lap["avg_heart_rate"] for lap in laps] == [
+        lap["avg_heart_rate"] for lap in expected_laps
+    ]
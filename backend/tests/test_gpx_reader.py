@@ -0,0 +1,65 @@
+import gpxpy
+import pytest
+
+import gpx.reader_utils as gpx_reader_utils
+
+TRACK = """
+  <trk>
+    {track_fields}
+    <trkseg>
+      <trkpt lat="38.7" lon="-9.1"><ele>10</ele><time>2024-05-01T08:00:00Z</time></trkpt>
+      <trkpt lat="38.701" lon="-9.1"><ele>11</ele><time>2024-05-01T08:00:05Z</time></trkpt>
+    </trkseg>
+  </trk>
+"""
+
+GPX_FILES = {
+    "metadata_author": """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">
+  <metadata>
+    <name>Morning run</name>
+    <desc>Along the river</desc>
+    <author>
+      <name>Jane Doe</name>
+      <link href="https://example.com"><text>Jane's site</text></link>
+    </author>
+    <copyright author="Jane Doe"><year>2024</year></copyright>
+    <link href="https://example.com/run"><text>Run page</text></link>
+  </metadata>
+  <wpt lat="38.7" lon="-9.1"><name>Start</name><desc>Start line</desc></wpt>
+  <rte><name>Planned route</name></rte>
+""" + TRACK.format(track_fields="") + "</gpx>",
+    "author_only": """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">
+  <metadata>
+    <author><name>Jane Doe</name></author>
+  </metadata>
+""" + TRACK.format(
+        track_fields='<name>Track</name><link href="x"><text>Link</text></link>'
+        "<type>running</type>"
+    ) + "</gpx>",
+    "gpx_1_0": """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.0" creator="test" xmlns="http://www.topografix.com/GPX/1/0">
+  <name>File name</name>
+  <desc>File description</desc>
+  <author>Jane Doe</author>
+""" + TRACK.format(track_fields="<name>Track</name><desc>Track description</desc>")
+    + "</gpx>",
+}
+
+
+@pytest.mark.parametrize("name", GPX_FILES)
+def test_read_gpx_samples_names_match_gpxpy(tmp_path, name):
+    file = tmp_path / f"{name}.gpx"
+    file.write_text(GPX_FILES[name])
+
+    samples = gpx_reader_utils.read_gpx_samples(str(file))
+    with open(file) as gpx_file:
+        gpx = gpxpy.parse(gpx_file)
+
+    assert samples["gpx_name"] == gpx.name
+    assert samples["gpx_description"] == gpx.description
+    assert samples["name"] == gpx.tracks[-1].name
+    assert samples["description"] == gpx.tracks[-1].description
+    assert samples["type"] == gpx.tracks[-1].type
+    assert samples["times"].size == 2
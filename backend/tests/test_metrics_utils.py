@@ -0,0 +1,154 @@
+import statistics
+from datetime import datetime, timedelta
+from statistics import mean
+
+import numpy as np
+import pytest
+
+import activities.activity.metrics_utils as metrics_utils
+import activities.activity.utils as activities_utils
+
+
+# The pure Python helpers replaced in user-015, as reference
+def compute_elevation_gain_and_loss_before(
+    elevations, median_window=6, avg_window=3, threshold=0.1
+):
+    def median_filter(values, window_size):
+        if window_size < 2:
+            return values[:]
+        half = window_size // 2
+        filtered = []
+        for i in range(len(values)):
+            start = max(0, i - half)
+            end = min(len(values), i + half + 1)
+            filtered.append(statistics.median(values[start:end]))
+        return filtered
+
+    def moving_average(values, window_size):
+        if window_size < 2:
+            return values[:]
+        half = window_size // 2
+        smoothed = []
+        n = len(values)
+        for i in range(n):
+            start = max(0, i - half)
+            end = min(n, i + half + 1)
+            smoothed.append(statistics.mean(values[start:end]))
+        return smoothed
+
+    values = [float(waypoint["ele"]) for waypoint in elevations]
+
+    filtered = median_filter(values, median_window)
+    filtered = moving_average(filtered, avg_window)
+
+    total_gain = 0.0
+    total_loss = 0.0
+    for i in range(1, len(filtered)):
+        diff = filtered[i] - filtered[i - 1]
+        if diff > threshold:
+            total_gain += diff
+        elif diff < -threshold:
+            total_loss -= diff
+    return total_gain, total_loss
+
+
+def calculate_avg_and_max_before(data, stream_type):
+    values = [
+        float(waypoint[stream_type])
+        for waypoint in data
+        if waypoint.get(stream_type) is not None
+    ]
+    return mean(values), max(values)
+
+
+def calculate_np_before(data):
+    values = [float(waypoint["power"]) for waypoint in data]
+    return (sum(value**4 for value in values) / len(values)) ** (1 / 4)
+
+
+def power_waypoints(powers, start=datetime(2024, 5, 1, 8, 0, 0)):
+    return [
+        {
+            "time": (start + timedelta(seconds=i)).strftime("%Y-%m-%dT%H:%M:%S"),
+            "power": power,
+        }
+        for i, power in enumerate(powers)
+    ]
+
+
+@pytest.mark.parametrize("points", [1, 2, 3, 5, 6, 7, 13, 100, 2000])
+@pytest.mark.parametrize("seed", range(5))
+def test_compute_elevation_gain_and_loss_matches_previous_implementation(
+    points, seed
+):
+    rng = np.random.default_rng(seed)
+    # Elevations are recorded with 0.1 m precision
+    elevations = (100 + np.cumsum(rng.normal(0, 0.5, points))).round(1)
+    waypoints = [{"ele": elevation} for elevation in elevations.tolist()]
+
+    gain, loss = activities_utils.compute_elevation_gain_and_loss(waypoints)
+    expected_gain, expected_loss = compute_elevation_gain_and_loss_before(waypoints)
+
+    assert gain == pytest.approx(expected_gain, abs=1e-9)
+    assert loss == pytest.approx(expected_loss, abs=1e-9)
+
+
+@pytest.mark.parametrize("points", [1, 2, 10, 5000])
+@pytest.mark.parametrize("stream_type", ["hr", "vel"])
+def test_calculate_avg_and_max_matches_previous_implementation(points, stream_type):
+    rng = np.random.default_rng(points)
+    values = (
+        rng.integers(60, 190, points).tolist()
+        if stream_type == "hr"
+        else rng.uniform(0, 6, points).tolist()
+    )
+    data = [{stream_type: value} for value in values] + [{stream_type: None}]
+
+    average, maximum = activities_utils.calculate_avg_and_max(data, stream_type)
+    expected_average, expected_maximum = calculate_avg_and_max_before(
+        data, stream_type
+    )
+
+    assert average == pytest.approx(expected_average, rel=1e-12)
+    assert maximum == expected_maximum
+
+
+@pytest.mark.parametrize("seconds", [1, 10, 29])
+def test_calculate_np_shorter_than_window_matches_previous_implementation(seconds):
+    powers = np.random.default_rng(seconds).integers(0, 400, seconds).tolist()
+    data = power_waypoints(powers)
+
+    assert activities_utils.calculate_np(data) == pytest.approx(
+        calculate_np_before(data), rel=1e-12
+    )
+
+
+def test_calculate_np_of_constant_power_matches_previous_implementation():
+    data = power_waypoints([250] * 600)
+
+    assert activities_utils.calculate_np(data) == pytest.approx(
+        calculate_np_before(data), rel=1e-12
+    )
+
+
+def test_calculate_np_uses_30_seconds_rolling_average():
+    powers = np.random.default_rng(0).integers(0, 400, 3600).astype(np.float64)
+    rolling_powers = np.convolve(powers, np.ones(30) / 30, mode="valid")
+    expected = np.mean(rolling_powers**4) ** 0.25
+
+    assert activities_utils.calculate_np(
+        power_waypoints(powers.tolist())
+    ) == pytest.approx(expected, rel=1e-9)
+    # The previous plain fourth power mean overstated variable efforts
+    assert calculate_np_before(power_waypoints(powers.tolist())) > expected
+
+
+def test_normalized_power_is_independent_of_the_sampling_rate():
+    powers = np.random.default_rng(1).integers(0, 400, 1800).astype(np.float64)
+
+    one_hertz = metrics_utils.normalized_power(powers)
+    two_hertz = metrics_utils.normalized_power(
+        np.repeat(powers, 2), np.arange(powers.size * 2) / 2
+    )
+
+    assert two_hertz == pytest.approx(one_hertz, rel=1e-3)
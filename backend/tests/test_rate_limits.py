@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timezone
+
+import core.rate_limits as core_rate_limits
+import core.sync_orchestrator as core_sync_orchestrator
+import users.user_integrations.models as user_integrations_models
+
+STRAVA = core_sync_orchestrator.PROVIDER_STRAVA
+GARMINCONNECT = core_sync_orchestrator.PROVIDER_GARMINCONNECT
+
+
+def add_user_integrations(db, user_id):
+    db.add(
+        user_integrations_models.UsersIntegrations(
+            user_id=user_id, strava_sync_gear=False, garminconnect_sync_gear=False
+        )
+    )
+    db.commit()
+
+
+def test_paused_backfills_are_stored_in_the_database(sqlite_db):
+    add_user_integrations(sqlite_db, 1)
+    add_user_integrations(sqlite_db, 2)
+    today = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    paused_start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    asyncio.run(core_rate_limits.pause_backfill(STRAVA, 1, paused_start, sqlite_db))
+    # A later pause of the resumed sync keeps the earliest start date
+    asyncio.run(
+        core_rate_limits.pause_backfill(
+            STRAVA, 1, datetime(2025, 9, 1, tzinfo=timezone.utc), sqlite_db
+        )
+    )
+
+    # Read back by a new session, as after a restart or by another process
+    sqlite_db.expire_all()
+    assert core_rate_limits.get_backfill_start(STRAVA, 1, today, sqlite_db) == (
+        paused_start
+    )
+    assert core_rate_limits.get_backfill_start(GARMINCONNECT, 1, today, sqlite_db) == (
+        today
+    )
+    assert core_rate_limits.get_backfill_start(STRAVA, 2, today, sqlite_db) == today
+
+
+def test_completed_sync_clears_the_paused_backfill_it_covers(sqlite_db):
+    add_user_integrations(sqlite_db, 1)
+    today = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    paused_start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    asyncio.run(
+        core_rate_limits.pause_backfill(GARMINCONNECT, 1, paused_start, sqlite_db)
+    )
+
+    # A sync of the last day doesn't cover the paused backfill
+    asyncio.run(
+        core_rate_limits.complete_backfill(
+            GARMINCONNECT, 1, datetime(2026, 2, 28, tzinfo=timezone.utc), sqlite_db
+        )
+    )
+    assert (
+        core_rate_limits.get_backfill_start(GARMINCONNECT, 1, today, sqlite_db)
+        == paused_start
+    )
+
+    # The resumed sync starting at the paused start date does
+    asyncio.run(
+        core_rate_limits.complete_backfill(GARMINCONNECT, 1, paused_start, sqlite_db)
+    )
+    assert core_rate_limits.get_backfill_start(GARMINCONNECT, 1, today, sqlite_db) == (
+        today
+    )
@@ -29,9 +29,32 @@ if [ -n "$ENDURAIN_HOST" ]; then
     echo_info_log "Runtime env.js written with ENDURAIN_HOST=$ENDURAIN_HOST"
 fi
 
-echo_info_log "Starting FastAPI with BEHIND_PROXY=$BEHIND_PROXY"
+API_WORKERS="${API_WORKERS:-1}"
+validate_workers() {
+    case "$1" in
+        ''|0|*[!0-9]*)
+            echo_error_log "Invalid API_WORKERS: $1. Must be a positive integer."
+            exit 1
+            ;;
+    esac
+}
+
+validate_workers "$API_WORKERS"
+
+# Migrate once before the workers start
+echo_info_log "Running database migrations"
+gosu "$UID:$GID" python -m core.migrations
+
+# Build the local reverse geocoding index once before the workers start
+REVERSE_GEO_PROVIDER_LOWER=$(echo "${REVERSE_GEO_PROVIDER:-}" | tr '[:upper:]' '[:lower:]')
+if [ "$REVERSE_GEO_PROVIDER_LOWER" = "local" ]; then
+    echo_info_log "Building the local reverse geocoding index"
+    gosu "$UID:$GID" python -m geocoding.gazetteer_utils
+fi
+
+echo_info_log "Starting FastAPI with BEHIND_PROXY=$BEHIND_PROXY and API_WORKERS=$API_WORKERS"
 
-CMD="uvicorn main:app --host 0.0.0.0 --port 8080"
+CMD="uvicorn main:app --host 0.0.0.0 --port 8080 --workers $API_WORKERS"
 if [ "$BEHIND_PROXY" = "true" ]; then
     CMD="$CMD --proxy-headers"
 fi